@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+from db.models.user import UserModel
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import Engine, delete, event, insert
+
+from config.config import Config
+from container.container import Container
+from server import Server
+
+USERS = 200
+ROUNDS = 5
+
+
+async def fetch(app, client_index: int, url: str) -> int:
+    transport = ASGITransport(
+        app=app, client=(f"10.1.{client_index // 256}.{client_index % 256}", 0)
+    )
+    async with AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        response = await client.get(url)
+        return response.status_code
+
+
+async def main() -> None:
+    config = Config()
+    app = Server(config).app
+    db_service = Container().db_service_provider()
+    db_service.connect_database(config.get_database_url())
+    async with db_service.async_engine.connect() as conn:
+        query = (
+            insert(UserModel)
+            .values(
+                [
+                    {"name": f"benchmark{index}", "email": f"benchmark{index}@fan.in"}
+                    for index in range(USERS)
+                ]
+            )
+            .returning(UserModel.id)
+        )
+        user_ids = (await conn.execute(query)).scalars().all()
+        await conn.commit()
+    statements = 0
+
+    def count_statement(*args) -> None:
+        nonlocal statements
+        statements += 1
+
+    try:
+        print(
+            f"user loader window={config.get_user_loader_window()}s "
+            f"max_batch_size={config.get_user_loader_max_batch_size()}"
+        )
+        event.listen(Engine, "before_cursor_execute", count_statement)
+        started_at = time.perf_counter()
+        for _ in range(ROUNDS):
+            status_codes = await asyncio.gather(
+                *(
+                    fetch(app, index, f"/users/{user_id}")
+                    for index, user_id in enumerate(user_ids)
+                )
+            )
+            assert set(status_codes) == {200}
+        elapsed = time.perf_counter() - started_at
+        print(
+            f"requests={USERS * ROUNDS} statements={statements} "
+            f"elapsed={elapsed:.2f}s throughput={USERS * ROUNDS / elapsed:.0f}req/s"
+        )
+    finally:
+        async with db_service.async_engine.connect() as conn:
+            await conn.execute(delete(UserModel).where(UserModel.id.in_(user_ids)))
+            await conn.commit()
+        await db_service.deactivate_database()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+from db.models.default import ID_GENERATORS, generate_id, set_id_generator
+from sqlalchemy import text
+
+from config.config import Config
+from container.container import Container
+
+TABLE_SIZE = 1000000
+BATCH_SIZE = 5000
+SEGMENTS = 5
+BENCHMARK_TABLE = "users_id_benchmark"
+
+
+async def run(db_service, id_generator: str) -> None:
+    set_id_generator(id_generator)
+    # The rows are bound as arrays so that building the statements costs the
+    # client next to nothing and the time is spent in the database.
+    query = text(
+        f"""
+        INSERT INTO {BENCHMARK_TABLE} (id, name, email, created_at)
+        SELECT id, name, email, now()
+        FROM unnest(
+            CAST(:ids AS uuid[]), CAST(:names AS text[]), CAST(:emails AS text[])
+        ) AS rows (id, name, email)
+        """
+    )
+    async with db_service.async_engine.connect() as conn:
+        # Every generator fills a fresh copy of the users table, indexes
+        # included, so that neither run inherits the pages of the other.
+        await conn.execute(text(f"DROP TABLE IF EXISTS {BENCHMARK_TABLE}"))
+        await conn.execute(
+            text(f"CREATE TABLE {BENCHMARK_TABLE} (LIKE users INCLUDING ALL)")
+        )
+        await conn.commit()
+        segment_size = TABLE_SIZE // SEGMENTS
+        elapsed_by_segment: list[float] = []
+        for segment in range(SEGMENTS):
+            started_at = time.perf_counter()
+            for start in range(0, segment_size, BATCH_SIZE):
+                offset = segment * segment_size + start
+                offsets = range(offset, offset + BATCH_SIZE)
+                await conn.execute(
+                    query,
+                    {
+                        "ids": [generate_id() for _ in offsets],
+                        "names": [f"user{index}" for index in offsets],
+                        "emails": [f"user{index}@id.benchmark" for index in offsets],
+                    },
+                )
+                await conn.commit()
+            elapsed_by_segment.append(time.perf_counter() - started_at)
+        size_query = text(
+            "SELECT pg_relation_size(indexrelid) FROM pg_index "
+            "WHERE indrelid = CAST(:table_name AS regclass) AND indisprimary"
+        )
+        primary_key_size = (
+            await conn.execute(size_query, {"table_name": BENCHMARK_TABLE})
+        ).scalar_one()
+        await conn.execute(text(f"DROP TABLE {BENCHMARK_TABLE}"))
+        await conn.commit()
+    print(
+        f"{id_generator}: "
+        + " ".join(
+            f"{segment_size / elapsed:,.0f}rows/s" for elapsed in elapsed_by_segment
+        )
+        + f" total={TABLE_SIZE / sum(elapsed_by_segment):,.0f}rows/s"
+        f" primary_key={primary_key_size / 2**20:.1f}MiB"
+    )
+
+
+async def main() -> None:
+    config = Config()
+    db_service = Container().db_service_provider()
+    db_service.connect_database(config.get_database_url())
+    try:
+        print(f"rows={TABLE_SIZE} in {SEGMENTS} segments of batches of {BATCH_SIZE}")
+        for id_generator in ID_GENERATORS:
+            await run(db_service, id_generator)
+    finally:
+        set_id_generator(config.get_id_generator())
+        await db_service.deactivate_database()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
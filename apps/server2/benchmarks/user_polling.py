@@ -0,0 +1,76 @@
+import asyncio
+import statistics
+import time
+
+from db.models.user import UserModel
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete, insert
+
+from config.config import Config
+from container.container import Container
+from server import Server
+
+CLIENTS = 50
+POLLS_PER_CLIENT = 20
+
+
+async def poll(app, client_index: int, url: str, conditional: bool) -> list:
+    transport = ASGITransport(
+        app=app, client=(f"10.0.{client_index // 256}.{client_index % 256}", 0)
+    )
+    samples = []
+    async with AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        etag = None
+        for _ in range(POLLS_PER_CLIENT):
+            headers = {"If-None-Match": etag} if conditional and etag else {}
+            started_at = time.perf_counter()
+            response = await client.get(url, headers=headers)
+            elapsed = time.perf_counter() - started_at
+            etag = response.headers.get("ETag")
+            samples.append((response.status_code, len(response.content), elapsed))
+    return samples
+
+
+async def run(app, url: str, conditional: bool) -> None:
+    results = await asyncio.gather(
+        *(poll(app, index, url, conditional) for index in range(CLIENTS))
+    )
+    samples = [sample for result in results for sample in result]
+    latencies = sorted(elapsed * 1000 for _, _, elapsed in samples)
+    not_modified = sum(1 for status_code, _, _ in samples if status_code == 304)
+    print(
+        f"{'conditional' if conditional else 'unconditional':>13}: "
+        f"requests={len(samples)} "
+        f"304s={not_modified} "
+        f"body_bytes={sum(size for _, size, _ in samples)} "
+        f"p50={statistics.median(latencies):.2f}ms "
+        f"p95={latencies[int(len(latencies) * 0.95)]:.2f}ms"
+    )
+
+
+async def main() -> None:
+    config = Config()
+    app = Server(config).app
+    db_service = Container().db_service_provider()
+    db_service.connect_database(config.get_database_url())
+    async with db_service.async_engine.connect() as conn:
+        query = (
+            insert(UserModel)
+            .values(name="benchmark", email="benchmark@benchmark.com")
+            .returning(UserModel.id)
+        )
+        user_id = (await conn.execute(query)).scalar_one()
+        await conn.commit()
+    try:
+        print(f"user cache ttl={config.get_user_cache_ttl()}s")
+        for conditional in (False, True):
+            await run(app, f"/users/{user_id}", conditional)
+    finally:
+        async with db_service.async_engine.connect() as conn:
+            await conn.execute(delete(UserModel).where(UserModel.id == user_id))
+            await conn.commit()
+        await db_service.deactivate_database()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
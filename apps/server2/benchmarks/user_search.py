@@ -0,0 +1,94 @@
+import asyncio
+import random
+import statistics
+import time
+
+from db.models.user import UserModel
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete, text
+
+from config.config import Config
+from container.container import Container
+from server import Server
+
+TABLE_SIZES = (1000, 10000, 100000)
+SEARCHES = 200
+WORDS = ("alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel")
+EMAIL_DOMAIN = "search.benchmark"
+
+
+async def populate(db_service, table_size: int) -> None:
+    async with db_service.async_engine.connect() as conn:
+        await conn.execute(
+            delete(UserModel).where(UserModel.email.endswith(f"@{EMAIL_DOMAIN}"))
+        )
+        await conn.execute(
+            text(
+                """
+                INSERT INTO users (id, name, email, created_at)
+                SELECT gen_random_uuid(),
+                       words[1 + g % 8] || '_' || words[1 + (g / 8) % 8] || g,
+                       'user' || g || '@' || :domain,
+                       now()
+                FROM generate_series(1, :table_size) AS g,
+                     CAST(:words AS text[]) AS words
+                """
+            ),
+            {"words": list(WORDS), "domain": EMAIL_DOMAIN, "table_size": table_size},
+        )
+        await conn.execute(text("ANALYZE users"))
+        await conn.commit()
+
+
+async def search(app, client_index: int, query: str) -> float:
+    # Every search comes from its own address so that the rate limiter, which is
+    # not what is measured here, never rejects any of them.
+    transport = ASGITransport(
+        app=app, client=(f"10.2.{client_index // 256}.{client_index % 256}", 0)
+    )
+    async with AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        started_at = time.perf_counter()
+        response = await client.get("/users/search", params={"q": query, "limit": 20})
+        elapsed = time.perf_counter() - started_at
+        assert response.status_code == 200, response.text
+    return elapsed
+
+
+async def run(app, table_size: int) -> None:
+    queries = [
+        f"{random.choice(WORDS)} {random.choice(WORDS)[:2]}" for _ in range(SEARCHES)
+    ] + [f"user{random.randint(1, table_size)}" for _ in range(SEARCHES)]
+    latencies = sorted(
+        [
+            await search(app, client_index, query) * 1000
+            for client_index, query in enumerate(queries)
+        ]
+    )
+    print(
+        f"rows={table_size:>6}: "
+        f"searches={len(latencies)} "
+        f"p50={statistics.median(latencies):.2f}ms "
+        f"p95={latencies[int(len(latencies) * 0.95)]:.2f}ms"
+    )
+
+
+async def main() -> None:
+    config = Config()
+    app = Server(config).app
+    db_service = Container().db_service_provider()
+    db_service.connect_database(config.get_database_url())
+    try:
+        for table_size in TABLE_SIZES:
+            await populate(db_service, table_size)
+            await run(app, table_size)
+    finally:
+        async with db_service.async_engine.connect() as conn:
+            await conn.execute(
+                delete(UserModel).where(UserModel.email.endswith(f"@{EMAIL_DOMAIN}"))
+            )
+            await conn.commit()
+        await db_service.deactivate_database()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
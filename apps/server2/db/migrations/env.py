@@ -4,7 +4,13 @@ from logging.config import fileConfig
 
 from alembic import context
 from db.migrations.base import Base
+from db.models.idempotency_key import IdempotencyKeyModel  # noqa: F401
+from db.models.rate_limit_bucket import RateLimitBucketModel  # noqa: F401
+from db.models.table_version import TableVersionModel  # noqa: F401
 from db.models.user import UserModel  # noqa: F401
+from db.models.user_change import UserChangeModel  # noqa: F401
+from db.models.user_email import UserEmailModel  # noqa: F401
+from db.models.user_write import UserWriteModel  # noqa: F401
 from sqlalchemy import engine_from_config, pool
 from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
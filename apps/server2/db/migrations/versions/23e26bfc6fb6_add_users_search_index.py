@@ -0,0 +1,26 @@
+"""add users search index
+
+Revision ID: 23e26bfc6fb6
+Revises: fea2b7f85ff7
+Create Date: 2026-10-19 18:31:43.463917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '23e26bfc6fb6'
+down_revision: Union[str, None] = 'fea2b7f85ff7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_users_search_vector', 'users', [sa.text("to_tsvector('simple', name || ' ' || email || ' ' || regexp_replace(email, '[^[:alnum:]]+', ' ', 'g'))")], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_search_vector', table_name='users', postgresql_using='gin')
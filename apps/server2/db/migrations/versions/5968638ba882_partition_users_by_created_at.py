@@ -0,0 +1,231 @@
+"""partition users by created_at
+
+Revision ID: 5968638ba882
+Revises: a317951ef4d7
+Create Date: 2026-10-19 18:51:04.875542
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5968638ba882'
+down_revision: Union[str, None] = 'a317951ef4d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+
+def create_indexes() -> None:
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+    op.create_index('ix_users_name_id', 'users', ['name', 'id'], unique=False)
+    op.create_index('ix_users_email_pattern', 'users', ['email'], unique=False, postgresql_ops={'email': 'text_pattern_ops'})
+    op.create_index('ix_users_search_vector', 'users', [sa.text("to_tsvector('simple', name || ' ' || email || ' ' || regexp_replace(email, '[^[:alnum:]]+', ' ', 'g'))")], unique=False, postgresql_using='gin')
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+                CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                CREATE INDEX IF NOT EXISTS ix_users_name_trgm ON users USING gin (name gin_trgm_ops);
+            END IF;
+        END
+        $$;
+        """
+    )
+
+
+def drop_indexes() -> None:
+    op.execute('DROP INDEX IF EXISTS ix_users_name_trgm')
+    op.drop_index('ix_users_search_vector', table_name='users', postgresql_using='gin')
+    op.drop_index('ix_users_email_pattern', table_name='users', postgresql_ops={'email': 'text_pattern_ops'})
+    op.drop_index('ix_users_name_id', table_name='users')
+    op.drop_index('ix_users_created_at_id', table_name='users')
+
+
+def create_table_version_triggers() -> None:
+    op.execute("""
+        CREATE TRIGGER users_bump_table_version_on_insert
+        AFTER INSERT ON users REFERENCING NEW TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+    """)
+    op.execute("""
+        CREATE TRIGGER users_bump_table_version_on_update
+        AFTER UPDATE ON users REFERENCING NEW TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+    """)
+    op.execute("""
+        CREATE TRIGGER users_bump_table_version_on_delete
+        AFTER DELETE ON users REFERENCING OLD TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+    """)
+    op.execute("""
+        CREATE TRIGGER users_bump_table_version_on_truncate
+        AFTER TRUNCATE ON users
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+    """)
+
+
+def upgrade() -> None:
+    # The unpartitioned table is kept aside until its rows are copied, so its
+    # primary key and indexes are dropped first to free their names.
+    drop_indexes()
+    op.drop_index('ux_users_lower_email', table_name='users')
+    op.drop_constraint('users_pkey', 'users', type_='primary')
+    op.rename_table('users', 'users_unpartitioned')
+    op.create_table('users',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    create_indexes()
+    op.create_index('ix_users_lower_email', 'users', [sa.text('lower(email)')], unique=False)
+    # A unique index on a partitioned table has to hold the partition key, so
+    # emails are kept unique, whatever their case, through a table of their own.
+    op.create_table('user_emails',
+    sa.Column('email', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('email')
+    )
+    op.execute("""
+        CREATE OR REPLACE FUNCTION sync_user_emails() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'TRUNCATE' THEN
+                DELETE FROM user_emails;
+                RETURN NULL;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM user_emails WHERE email = lower(OLD.email);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO user_emails (email) VALUES (lower(NEW.email));
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER users_sync_user_emails_on_insert
+        AFTER INSERT ON users
+        FOR EACH ROW EXECUTE FUNCTION sync_user_emails();
+    """)
+    op.execute("""
+        CREATE TRIGGER users_sync_user_emails_on_update
+        AFTER UPDATE OF email ON users
+        FOR EACH ROW WHEN (lower(OLD.email) IS DISTINCT FROM lower(NEW.email))
+        EXECUTE FUNCTION sync_user_emails();
+    """)
+    op.execute("""
+        CREATE TRIGGER users_sync_user_emails_on_delete
+        AFTER DELETE ON users
+        FOR EACH ROW EXECUTE FUNCTION sync_user_emails();
+    """)
+    op.execute("""
+        CREATE TRIGGER users_sync_user_emails_on_truncate
+        AFTER TRUNCATE ON users
+        FOR EACH STATEMENT EXECUTE FUNCTION sync_user_emails();
+    """)
+    # Partitions hold a calendar month each. They are created from the month of
+    # the given timestamp up to the given number of months ahead of the current
+    # one, and a partition created concurrently by another session is skipped.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION create_users_partitions(since timestamp, months_ahead integer)
+        RETURNS void AS $$
+        DECLARE
+            partition_start timestamp := date_trunc('month', since);
+        BEGIN
+            WHILE partition_start <= date_trunc('month', localtimestamp) + make_interval(months => months_ahead) LOOP
+                BEGIN
+                    EXECUTE format(
+                        'CREATE TABLE IF NOT EXISTS %I PARTITION OF users FOR VALUES FROM (%L) TO (%L)',
+                        'users_p' || to_char(partition_start, 'YYYYMM'),
+                        partition_start,
+                        partition_start + interval '1 month'
+                    );
+                EXCEPTION WHEN duplicate_table THEN
+                    NULL;
+                END;
+                partition_start := partition_start + interval '1 month';
+            END LOOP;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    # Purging the users of whole months is a matter of dropping their
+    # partitions. No trigger fires for a dropped partition, so its emails are
+    # released and the users version is bumped here instead.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION drop_users_partitions(before timestamp)
+        RETURNS integer AS $$
+        DECLARE
+            partition_name text;
+            dropped_partitions integer := 0;
+        BEGIN
+            FOR partition_name IN
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE pg_inherits.inhparent = 'users'::regclass
+                    AND child.relname ~ '^users_p[0-9]{6}$'
+                    AND to_date(substr(child.relname, 8), 'YYYYMM') + interval '1 month' <= before
+            LOOP
+                EXECUTE format(
+                    'DELETE FROM user_emails WHERE email IN (SELECT lower(email) FROM %I)',
+                    partition_name
+                );
+                EXECUTE format('DROP TABLE %I', partition_name);
+                dropped_partitions := dropped_partitions + 1;
+            END LOOP;
+            IF dropped_partitions > 0 THEN
+                INSERT INTO table_versions (table_name, version)
+                VALUES ('users', 1)
+                ON CONFLICT (table_name)
+                DO UPDATE SET version = table_versions.version + 1;
+            END IF;
+            RETURN dropped_partitions;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        SELECT create_users_partitions(
+            coalesce((SELECT min(created_at) FROM users_unpartitioned), localtimestamp), 3
+        );
+    """)
+    op.execute("""
+        INSERT INTO users (id, name, email, created_at, updated_at)
+        SELECT id, name, email, created_at, updated_at FROM users_unpartitioned;
+    """)
+    op.drop_table('users_unpartitioned')
+    create_table_version_triggers()
+
+
+def downgrade() -> None:
+    drop_indexes()
+    op.drop_index('ix_users_lower_email', table_name='users')
+    op.drop_constraint('users_pkey', 'users', type_='primary')
+    op.rename_table('users', 'users_partitioned')
+    op.create_table('users',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("""
+        INSERT INTO users (id, name, email, created_at, updated_at)
+        SELECT id, name, email, created_at, updated_at FROM users_partitioned;
+    """)
+    op.drop_table('users_partitioned')
+    op.drop_table('user_emails')
+    op.execute('DROP FUNCTION drop_users_partitions(timestamp);')
+    op.execute('DROP FUNCTION create_users_partitions(timestamp, integer);')
+    op.execute('DROP FUNCTION sync_user_emails();')
+    create_indexes()
+    op.create_index('ux_users_lower_email', 'users', [sa.text('lower(email)')], unique=True)
+    create_table_version_triggers()
@@ -0,0 +1,81 @@
+"""skip table version bump on no-op writes
+
+Revision ID: 7ad784dfc4db
+Revises: 7c4ccb500da3
+Create Date: 2026-10-19 18:18:12.634966
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7ad784dfc4db'
+down_revision: Union[str, None] = '7c4ccb500da3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('DROP TRIGGER users_bump_table_version ON users;')
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'TRUNCATE' THEN
+                IF NOT EXISTS (SELECT 1 FROM changed_rows) THEN
+                    RETURN NULL;
+                END IF;
+            END IF;
+            INSERT INTO table_versions (table_name, version)
+            VALUES (TG_TABLE_NAME, 1)
+            ON CONFLICT (table_name)
+            DO UPDATE SET version = table_versions.version + 1;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER users_bump_table_version_on_insert
+        AFTER INSERT ON users REFERENCING NEW TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+    """)
+    op.execute("""
+        CREATE TRIGGER users_bump_table_version_on_update
+        AFTER UPDATE ON users REFERENCING NEW TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+    """)
+    op.execute("""
+        CREATE TRIGGER users_bump_table_version_on_delete
+        AFTER DELETE ON users REFERENCING OLD TABLE AS changed_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+    """)
+    op.execute("""
+        CREATE TRIGGER users_bump_table_version_on_truncate
+        AFTER TRUNCATE ON users
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER users_bump_table_version_on_truncate ON users;')
+    op.execute('DROP TRIGGER users_bump_table_version_on_delete ON users;')
+    op.execute('DROP TRIGGER users_bump_table_version_on_update ON users;')
+    op.execute('DROP TRIGGER users_bump_table_version_on_insert ON users;')
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO table_versions (table_name, version)
+            VALUES (TG_TABLE_NAME, 1)
+            ON CONFLICT (table_name)
+            DO UPDATE SET version = table_versions.version + 1;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER users_bump_table_version
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON users
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+    """)
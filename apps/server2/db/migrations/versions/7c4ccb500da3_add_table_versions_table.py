@@ -0,0 +1,48 @@
+"""add table versions table
+
+Revision ID: 7c4ccb500da3
+Revises: 27e2e065add6
+Create Date: 2026-10-19 18:15:01.357695
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c4ccb500da3'
+down_revision: Union[str, None] = '27e2e065add6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('table_versions',
+    sa.Column('table_name', sa.String(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO table_versions (table_name, version)
+            VALUES (TG_TABLE_NAME, 1)
+            ON CONFLICT (table_name)
+            DO UPDATE SET version = table_versions.version + 1;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER users_bump_table_version
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON users
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER users_bump_table_version ON users;')
+    op.execute('DROP FUNCTION bump_table_version();')
+    op.drop_table('table_versions')
@@ -0,0 +1,28 @@
+"""make user emails unique regardless of case
+
+Revision ID: a317951ef4d7
+Revises: 23e26bfc6fb6
+Create Date: 2026-10-19 18:33:57.427509
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a317951ef4d7'
+down_revision: Union[str, None] = '23e26bfc6fb6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ux_users_lower_email', 'users', [sa.text('lower(email)')], unique=True)
+    op.drop_constraint('users_email_key', 'users', type_='unique')
+
+
+def downgrade() -> None:
+    op.create_unique_constraint('users_email_key', 'users', ['email'])
+    op.drop_index('ux_users_lower_email', table_name='users')
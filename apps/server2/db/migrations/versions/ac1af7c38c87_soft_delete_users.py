@@ -0,0 +1,160 @@
+"""soft delete users
+
+Revision ID: ac1af7c38c87
+Revises: 5968638ba882
+Create Date: 2026-10-19 19:00:04.458858
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ac1af7c38c87'
+down_revision: Union[str, None] = '5968638ba882'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def create_indexes(postgresql_where: str | None) -> None:
+    where = sa.text(postgresql_where) if postgresql_where is not None else None
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False, postgresql_where=where)
+    op.create_index('ix_users_name_id', 'users', ['name', 'id'], unique=False, postgresql_where=where)
+    op.create_index('ix_users_email_pattern', 'users', ['email'], unique=False, postgresql_ops={'email': 'text_pattern_ops'}, postgresql_where=where)
+    op.create_index('ix_users_lower_email', 'users', [sa.text('lower(email)')], unique=False, postgresql_where=where)
+    op.create_index('ix_users_search_vector', 'users', [sa.text("to_tsvector('simple', name || ' ' || email || ' ' || regexp_replace(email, '[^[:alnum:]]+', ' ', 'g'))")], unique=False, postgresql_using='gin', postgresql_where=where)
+    op.execute(
+        f"""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm') THEN
+                CREATE INDEX IF NOT EXISTS ix_users_name_trgm ON users USING gin (name gin_trgm_ops)
+                {'' if postgresql_where is None else f'WHERE {postgresql_where}'};
+            END IF;
+        END
+        $$;
+        """
+    )
+
+
+def drop_indexes() -> None:
+    op.execute('DROP INDEX IF EXISTS ix_users_name_trgm')
+    op.drop_index('ix_users_search_vector', table_name='users', postgresql_using='gin')
+    op.drop_index('ix_users_lower_email', table_name='users')
+    op.drop_index('ix_users_email_pattern', table_name='users', postgresql_ops={'email': 'text_pattern_ops'})
+    op.drop_index('ix_users_name_id', table_name='users')
+    op.drop_index('ix_users_created_at_id', table_name='users')
+
+
+def create_sync_user_emails_on_update_trigger(columns: str, when: str) -> None:
+    op.execute('DROP TRIGGER users_sync_user_emails_on_update ON users;')
+    op.execute(f"""
+        CREATE TRIGGER users_sync_user_emails_on_update
+        AFTER UPDATE OF {columns} ON users
+        FOR EACH ROW WHEN ({when})
+        EXECUTE FUNCTION sync_user_emails();
+    """)
+
+
+def create_drop_users_partitions_function(released_emails: str) -> None:
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION drop_users_partitions(before timestamp)
+        RETURNS integer AS $$
+        DECLARE
+            partition_name text;
+            dropped_partitions integer := 0;
+        BEGIN
+            FOR partition_name IN
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE pg_inherits.inhparent = 'users'::regclass
+                    AND child.relname ~ '^users_p[0-9]{{6}}$'
+                    AND to_date(substr(child.relname, 8), 'YYYYMM') + interval '1 month' <= before
+            LOOP
+                EXECUTE format(
+                    'DELETE FROM user_emails WHERE email IN ({released_emails})',
+                    partition_name
+                );
+                EXECUTE format('DROP TABLE %I', partition_name);
+                dropped_partitions := dropped_partitions + 1;
+            END LOOP;
+            IF dropped_partitions > 0 THEN
+                INSERT INTO table_versions (table_name, version)
+                VALUES ('users', 1)
+                ON CONFLICT (table_name)
+                DO UPDATE SET version = table_versions.version + 1;
+            END IF;
+            RETURN dropped_partitions;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    # Every read only looks at the users that are not deleted, so the indexes
+    # leave the deleted ones out, and a separate index finds them for the purge.
+    drop_indexes()
+    create_indexes('deleted_at IS NULL')
+    op.create_index('ix_users_deleted_at', 'users', ['deleted_at'], unique=False, postgresql_where=sa.text('deleted_at IS NOT NULL'))
+    # A deleted user gives its email up right away, so the email can be taken
+    # by a new user before the deleted one is purged.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION sync_user_emails() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'TRUNCATE' THEN
+                DELETE FROM user_emails;
+                RETURN NULL;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.deleted_at IS NULL THEN
+                DELETE FROM user_emails WHERE email = lower(OLD.email);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.deleted_at IS NULL THEN
+                INSERT INTO user_emails (email) VALUES (lower(NEW.email));
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    create_sync_user_emails_on_update_trigger(
+        'email, deleted_at',
+        'lower(OLD.email) IS DISTINCT FROM lower(NEW.email) '
+        'OR (OLD.deleted_at IS NULL) <> (NEW.deleted_at IS NULL)'
+    )
+    create_drop_users_partitions_function(
+        'SELECT lower(email) FROM %I WHERE deleted_at IS NULL'
+    )
+
+
+def downgrade() -> None:
+    # The deleted users would come back along with their emails, which may
+    # belong to other users by now, so they are purged first.
+    op.execute('DELETE FROM users WHERE deleted_at IS NOT NULL;')
+    create_drop_users_partitions_function('SELECT lower(email) FROM %I')
+    create_sync_user_emails_on_update_trigger(
+        'email', 'lower(OLD.email) IS DISTINCT FROM lower(NEW.email)'
+    )
+    op.execute("""
+        CREATE OR REPLACE FUNCTION sync_user_emails() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'TRUNCATE' THEN
+                DELETE FROM user_emails;
+                RETURN NULL;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM user_emails WHERE email = lower(OLD.email);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO user_emails (email) VALUES (lower(NEW.email));
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.drop_index('ix_users_deleted_at', table_name='users', postgresql_where=sa.text('deleted_at IS NOT NULL'))
+    drop_indexes()
+    create_indexes(None)
+    op.drop_column('users', 'deleted_at')
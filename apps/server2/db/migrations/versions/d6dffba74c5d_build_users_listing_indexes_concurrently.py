@@ -0,0 +1,83 @@
+"""build users listing indexes concurrently
+
+Revision ID: d6dffba74c5d
+Revises: e34d1e57358f
+Create Date: 2026-10-19 19:55:26.744440
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6dffba74c5d'
+down_revision: Union[str, None] = 'e34d1e57358f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+listing_indexes = {
+    'ix_users_created_at_id': 'USING btree (created_at, id) WHERE deleted_at IS NULL',
+    'ix_users_name_id': 'USING btree (name, id) WHERE deleted_at IS NULL',
+    'ix_users_email_pattern': 'USING btree (email text_pattern_ops) WHERE deleted_at IS NULL',
+    'ix_users_name_trgm': 'USING gin (name gin_trgm_ops) WHERE deleted_at IS NULL',
+}
+
+
+def build_index_concurrently(bind: sa.Connection, name: str, definition: str) -> None:
+    # An index cannot be built concurrently on a partitioned table, so it is
+    # first created on the table alone, where it stays invalid, and then built
+    # concurrently on each partition and attached to it, which validates it
+    # once every partition has one.
+    is_valid = bind.execute(
+        sa.text('SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)'),
+        {'name': name},
+    ).scalar()
+    if is_valid:
+        return
+    if is_valid is None:
+        bind.execute(sa.text(f'CREATE INDEX {name} ON ONLY users {definition}'))
+    partitions = bind.execute(
+        sa.text("""
+            SELECT partitions.inhrelid::regclass::text
+            FROM pg_inherits partitions
+            WHERE partitions.inhparent = 'users'::regclass
+            AND NOT EXISTS (
+                SELECT 1
+                FROM pg_inherits partition_indexes
+                JOIN pg_index ON pg_index.indexrelid = partition_indexes.inhrelid
+                WHERE partition_indexes.inhparent = to_regclass(:name)
+                AND pg_index.indrelid = partitions.inhrelid
+            )
+        """),
+        {'name': name},
+    ).scalars().all()
+    for partition in partitions:
+        partition_index = f'{partition}_{name.removeprefix("ix_users_")}_idx'
+        # A build that was interrupted leaves an invalid index behind, which
+        # is dropped rather than kept under the name of a usable one.
+        bind.execute(sa.text(f'DROP INDEX CONCURRENTLY IF EXISTS {partition_index}'))
+        bind.execute(sa.text(f'CREATE INDEX CONCURRENTLY {partition_index} ON {partition} {definition}'))
+        bind.execute(sa.text(f'ALTER INDEX {name} ATTACH PARTITION {partition_index}'))
+
+
+def upgrade() -> None:
+    # The earlier revisions built the listing indexes within their transaction,
+    # blocking the writes to the users while they ran. Any of them that is
+    # missing, or left invalid, is built again here without blocking them.
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        has_pg_trgm = bind.execute(
+            sa.text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        ).scalar()
+        for name, definition in listing_indexes.items():
+            if name == 'ix_users_name_trgm' and not has_pg_trgm:
+                continue
+            build_index_concurrently(bind, name, definition)
+
+
+def downgrade() -> None:
+    # The indexes belong to the earlier revisions, which drop them.
+    pass
@@ -0,0 +1,91 @@
+"""add user changes outbox
+
+Revision ID: ddbce24311e5
+Revises: cdce5e8b9815
+Create Date: 2026-10-19 19:11:26.032808
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ddbce24311e5'
+down_revision: Union[str, None] = 'cdce5e8b9815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('user_changes',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=False), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('operation', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # SQLAlchemy has no type for xid8, whose ids keep growing instead of wrapping
+    # around like those of xid.
+    op.execute('ALTER TABLE user_changes ADD COLUMN transaction_id xid8 NOT NULL DEFAULT pg_current_xact_id();')
+    op.create_index('ix_user_changes_transaction_id_id', 'user_changes', ['transaction_id', 'id'], unique=False)
+    # The changes are recorded by the statement that makes them, so they are
+    # committed or rolled back along with it whichever query writes the users.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION record_user_changes() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO user_changes (user_id, operation, name, email, created_at)
+                SELECT id, 'created', name, email, created_at
+                FROM new_rows;
+            ELSIF TG_OP = 'UPDATE' THEN
+                INSERT INTO user_changes (user_id, operation, name, email, created_at)
+                SELECT
+                    new_rows.id,
+                    CASE WHEN new_rows.deleted_at IS NULL THEN 'updated' ELSE 'deleted' END,
+                    new_rows.name,
+                    new_rows.email,
+                    new_rows.created_at
+                FROM new_rows
+                JOIN old_rows ON old_rows.id = new_rows.id
+                WHERE old_rows.deleted_at IS NULL
+                AND (old_rows.name, old_rows.email, old_rows.deleted_at)
+                    IS DISTINCT FROM (new_rows.name, new_rows.email, new_rows.deleted_at);
+            ELSE
+                INSERT INTO user_changes (user_id, operation, name, email, created_at)
+                SELECT id, 'deleted', name, email, created_at
+                FROM old_rows
+                WHERE deleted_at IS NULL;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER users_record_changes_on_insert
+        AFTER INSERT ON users REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION record_user_changes();
+    """)
+    op.execute("""
+        CREATE TRIGGER users_record_changes_on_update
+        AFTER UPDATE ON users REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION record_user_changes();
+    """)
+    op.execute("""
+        CREATE TRIGGER users_record_changes_on_delete
+        AFTER DELETE ON users REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION record_user_changes();
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER users_record_changes_on_delete ON users;')
+    op.execute('DROP TRIGGER users_record_changes_on_update ON users;')
+    op.execute('DROP TRIGGER users_record_changes_on_insert ON users;')
+    op.execute('DROP FUNCTION record_user_changes();')
+    op.drop_index('ix_user_changes_transaction_id_id', table_name='user_changes')
+    op.drop_table('user_changes')
@@ -0,0 +1,94 @@
+"""notify user changes
+
+Revision ID: e34d1e57358f
+Revises: ddbce24311e5
+Create Date: 2026-10-19 19:17:27.330129
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e34d1e57358f'
+down_revision: Union[str, None] = 'ddbce24311e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The listeners are told that changes were recorded, and read them from the
+    # outbox, so the notification stays small however many users a statement
+    # writes. Identical notifications of a transaction are delivered once, on
+    # commit.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION record_user_changes() RETURNS trigger AS $$
+        DECLARE
+            recorded_count bigint;
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO user_changes (user_id, operation, name, email, created_at)
+                SELECT id, 'created', name, email, created_at
+                FROM new_rows;
+            ELSIF TG_OP = 'UPDATE' THEN
+                INSERT INTO user_changes (user_id, operation, name, email, created_at)
+                SELECT
+                    new_rows.id,
+                    CASE WHEN new_rows.deleted_at IS NULL THEN 'updated' ELSE 'deleted' END,
+                    new_rows.name,
+                    new_rows.email,
+                    new_rows.created_at
+                FROM new_rows
+                JOIN old_rows ON old_rows.id = new_rows.id
+                WHERE old_rows.deleted_at IS NULL
+                AND (old_rows.name, old_rows.email, old_rows.deleted_at)
+                    IS DISTINCT FROM (new_rows.name, new_rows.email, new_rows.deleted_at);
+            ELSE
+                INSERT INTO user_changes (user_id, operation, name, email, created_at)
+                SELECT id, 'deleted', name, email, created_at
+                FROM old_rows
+                WHERE deleted_at IS NULL;
+            END IF;
+            GET DIAGNOSTICS recorded_count = ROW_COUNT;
+            IF recorded_count > 0 THEN
+                PERFORM pg_notify('user_changes', '');
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION record_user_changes() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO user_changes (user_id, operation, name, email, created_at)
+                SELECT id, 'created', name, email, created_at
+                FROM new_rows;
+            ELSIF TG_OP = 'UPDATE' THEN
+                INSERT INTO user_changes (user_id, operation, name, email, created_at)
+                SELECT
+                    new_rows.id,
+                    CASE WHEN new_rows.deleted_at IS NULL THEN 'updated' ELSE 'deleted' END,
+                    new_rows.name,
+                    new_rows.email,
+                    new_rows.created_at
+                FROM new_rows
+                JOIN old_rows ON old_rows.id = new_rows.id
+                WHERE old_rows.deleted_at IS NULL
+                AND (old_rows.name, old_rows.email, old_rows.deleted_at)
+                    IS DISTINCT FROM (new_rows.name, new_rows.email, new_rows.deleted_at);
+            ELSE
+                INSERT INTO user_changes (user_id, operation, name, email, created_at)
+                SELECT id, 'deleted', name, email, created_at
+                FROM old_rows
+                WHERE deleted_at IS NULL;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
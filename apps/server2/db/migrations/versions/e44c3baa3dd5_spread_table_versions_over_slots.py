@@ -0,0 +1,131 @@
+"""spread table versions over slots
+
+Revision ID: e44c3baa3dd5
+Revises: d6dffba74c5d
+Create Date: 2026-10-19 20:00:10.653825
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e44c3baa3dd5'
+down_revision: Union[str, None] = 'd6dffba74c5d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def create_drop_users_partitions_function(bump_version: str) -> None:
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION drop_users_partitions(before timestamp)
+        RETURNS integer AS $$
+        DECLARE
+            partition_name text;
+            dropped_partitions integer := 0;
+        BEGIN
+            FOR partition_name IN
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE pg_inherits.inhparent = 'users'::regclass
+                    AND child.relname ~ '^users_p[0-9]{{6}}$'
+                    AND to_date(substr(child.relname, 8), 'YYYYMM') + interval '1 month' <= before
+            LOOP
+                EXECUTE format(
+                    'DELETE FROM user_emails WHERE email IN (SELECT lower(email) FROM %I WHERE deleted_at IS NULL)',
+                    partition_name
+                );
+                EXECUTE format('DROP TABLE %I', partition_name);
+                dropped_partitions := dropped_partitions + 1;
+            END LOOP;
+            IF dropped_partitions > 0 THEN
+                {bump_version}
+            END IF;
+            RETURN dropped_partitions;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+
+def upgrade() -> None:
+    # Every write to the users bumped the same row, so concurrent writers
+    # queued up on its lock. The version is now spread over 16 rows, each
+    # backend bumping the one its pid falls on, and is their sum. A sequence
+    # would take no lock at all, but its last value shows bumps of writes that
+    # have not committed yet, which an ETag would then hold on to.
+    op.add_column('table_versions', sa.Column('slot', sa.SmallInteger(), server_default='0', nullable=False))
+    op.drop_constraint('table_versions_pkey', 'table_versions', type_='primary')
+    op.create_primary_key('table_versions_pkey', 'table_versions', ['table_name', 'slot'])
+    op.alter_column('table_versions', 'slot', server_default=None)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_table_version_slot(name text) RETURNS void AS $$
+        BEGIN
+            INSERT INTO table_versions (table_name, slot, version)
+            VALUES (name, pg_backend_pid() % 16, 1)
+            ON CONFLICT (table_name, slot)
+            DO UPDATE SET version = table_versions.version + 1;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'TRUNCATE' THEN
+                IF NOT EXISTS (SELECT 1 FROM changed_rows) THEN
+                    RETURN NULL;
+                END IF;
+            END IF;
+            PERFORM bump_table_version_slot(TG_TABLE_NAME);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    create_drop_users_partitions_function("PERFORM bump_table_version_slot('users');")
+
+
+def downgrade() -> None:
+    create_drop_users_partitions_function("""
+                INSERT INTO table_versions (table_name, version)
+                VALUES ('users', 1)
+                ON CONFLICT (table_name)
+                DO UPDATE SET version = table_versions.version + 1;
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'TRUNCATE' THEN
+                IF NOT EXISTS (SELECT 1 FROM changed_rows) THEN
+                    RETURN NULL;
+                END IF;
+            END IF;
+            INSERT INTO table_versions (table_name, version)
+            VALUES (TG_TABLE_NAME, 1)
+            ON CONFLICT (table_name)
+            DO UPDATE SET version = table_versions.version + 1;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute('DROP FUNCTION bump_table_version_slot(text);')
+    # The slots of a table are folded back into one row holding their sum.
+    op.execute("""
+        UPDATE table_versions
+        SET version = totals.version, slot = 0
+        FROM (
+            SELECT table_name, sum(version)::bigint AS version
+            FROM table_versions
+            GROUP BY table_name
+        ) totals
+        WHERE table_versions.table_name = totals.table_name
+            AND table_versions.ctid = (
+                SELECT min(ctid) FROM table_versions first_slot
+                WHERE first_slot.table_name = totals.table_name
+            );
+    """)
+    op.execute('DELETE FROM table_versions WHERE slot <> 0;')
+    op.drop_constraint('table_versions_pkey', 'table_versions', type_='primary')
+    op.create_primary_key('table_versions_pkey', 'table_versions', ['table_name'])
+    op.drop_column('table_versions', 'slot')
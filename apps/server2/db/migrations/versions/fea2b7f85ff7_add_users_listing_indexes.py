@@ -0,0 +1,45 @@
+"""add users listing indexes
+
+Revision ID: fea2b7f85ff7
+Revises: 6afe0b9ee8fb
+Create Date: 2026-10-19 18:29:27.832693
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fea2b7f85ff7'
+down_revision: Union[str, None] = '6afe0b9ee8fb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+    op.create_index('ix_users_name_id', 'users', ['name', 'id'], unique=False)
+    op.create_index('ix_users_email_pattern', 'users', ['email'], unique=False, postgresql_ops={'email': 'text_pattern_ops'})
+    # A name_contains filter can only use an index through trigrams, so the
+    # index is added wherever the pg_trgm extension is shipped with the server.
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+                CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                CREATE INDEX IF NOT EXISTS ix_users_name_trgm ON users USING gin (name gin_trgm_ops);
+            END IF;
+        END
+        $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IF EXISTS ix_users_name_trgm')
+    op.drop_index('ix_users_email_pattern', table_name='users', postgresql_ops={'email': 'text_pattern_ops'})
+    op.drop_index('ix_users_name_id', table_name='users')
+    op.drop_index('ix_users_created_at_id', table_name='users')
@@ -1,13 +1,50 @@
+import os
+import time
 import uuid
-from datetime import datetime, timezone
+from typing import Callable
 from sqlalchemy import Column, DateTime, func
 from sqlalchemy.dialects.postgresql import UUID
 
+_last_uuid7 = 0
+
+def uuid7() -> uuid.UUID:
+    # A UUIDv7 (RFC 9562) starts with the Unix time in milliseconds, so new ids
+    # land next to each other at the right edge of the primary key index. Ids
+    # made within the same millisecond step up from the previous one by a random
+    # amount, so they keep increasing without becoming guessable.
+    global _last_uuid7
+    timestamp = time.time_ns() // 1_000_000
+    value = max(
+        timestamp << 74 | int.from_bytes(os.urandom(10)) >> 6,
+        _last_uuid7 + 1 + int.from_bytes(os.urandom(4)),
+    )
+    _last_uuid7 = value
+    unix_ts_ms, rand_a, rand_b = value >> 74, value >> 62 & 0xFFF, value & (1 << 62) - 1
+    return uuid.UUID(int=unix_ts_ms << 80 | 0x7 << 76 | rand_a << 64 | 0x2 << 62 | rand_b)
+
+ID_GENERATORS: dict[str, Callable[[], uuid.UUID]] = {
+    "uuid4": uuid.uuid4,
+    "uuid7": uuid7,
+}
+
+_id_generator = uuid7
+
+def set_id_generator(name: str) -> None:
+    global _id_generator
+    if name not in ID_GENERATORS:
+        raise ValueError(f"Unknown id generator: {name}")
+    _id_generator = ID_GENERATORS[name]
+
+def generate_id() -> uuid.UUID:
+    # Both kinds of ids share the same column type, so rows created with one
+    # generator stay valid after switching to the other.
+    return _id_generator()
+
 class Default:
     id = Column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
+        default=generate_id,
     )
     created_at = Column(
         DateTime(), nullable=False, default=func.now()
@@ -0,0 +1,14 @@
+from db.migrations.base import Base
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+class IdempotencyKeyModel(Base):
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String, primary_key=True)
+    fingerprint = Column(String, nullable=False)
+    status_code = Column(Integer, nullable=True)
+    body = Column(JSONB, nullable=True)
+    headers = Column(JSONB, nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
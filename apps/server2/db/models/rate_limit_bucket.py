@@ -0,0 +1,11 @@
+from db.migrations.base import Base
+from sqlalchemy import Column, DateTime, Float, String
+
+
+class RateLimitBucketModel(Base):
+    __tablename__ = "rate_limit_buckets"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    key = Column(String, primary_key=True)
+    tokens = Column(Float, nullable=False)
+    refreshed_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,12 @@
+from db.migrations.base import Base
+from sqlalchemy import BigInteger, Column, SmallInteger, String
+
+
+class TableVersionModel(Base):
+    __tablename__ = "table_versions"
+
+    table_name = Column(String, primary_key=True)
+    # The version of a table is the sum over its slots, which are bumped by
+    # different backends so that concurrent writers do not wait on each other.
+    slot = Column(SmallInteger, primary_key=True)
+    version = Column(BigInteger, nullable=False)
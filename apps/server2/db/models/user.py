@@ -1,10 +1,48 @@
 from db.migrations.base import Base
-from sqlalchemy import Column, DateTime, Integer, String, func
+from sqlalchemy import Column, DateTime, Index, Integer, String, func, literal_column, text
 
 from db.models.default import Default
 
 class UserModel(Default, Base):
     __tablename__ = "users"
+    # Users are range partitioned by month of creation. The partitions are
+    # created by create_users_partitions() and purged by drop_users_partitions().
+    # Deleted users are left out of every index that serves the reads.
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_users_name_id", "name", "id", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_users_email_pattern", "email", postgresql_ops={"email": "text_pattern_ops"}, postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_users_deleted_at", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
+    # The partition key has to be part of the primary key.
+    created_at = Column(
+        DateTime(), primary_key=True, nullable=False, default=func.now()
+    )
     name = Column(String, nullable=False)
-    email = Column(String, unique=True, nullable=False)
\ No newline at end of file
+    email = Column(String, nullable=False)
+    # Set when the user is soft deleted, until the purge deletes the row.
+    deleted_at = Column(DateTime(), nullable=True, default=None)
+
+
+# A partitioned table cannot hold a unique index on emails alone, so their
+# uniqueness is kept by UserEmailModel and this index only serves the lookups.
+Index("ix_users_lower_email", func.lower(UserModel.email), postgresql_where=text("deleted_at IS NULL"))
+
+# Names and emails are indexed word by word, with the email also split on its
+# punctuation, so that a search for "doe" or "example" finds "jane.doe@example.com".
+search_vector = func.to_tsvector(
+    literal_column("'simple'"),
+    UserModel.name
+    + literal_column("' '")
+    + UserModel.email
+    + literal_column("' '")
+    + func.regexp_replace(
+        UserModel.email,
+        literal_column("'[^[:alnum:]]+'"),
+        literal_column("' '"),
+        literal_column("'g'"),
+    ),
+)
+Index("ix_users_search_vector", search_vector, postgresql_using="gin", postgresql_where=text("deleted_at IS NULL"))
@@ -0,0 +1,27 @@
+from db.migrations.base import Base
+from sqlalchemy import BigInteger, Column, DateTime, Identity, Index, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.types import UserDefinedType
+
+
+class XID8(UserDefinedType):
+    cache_ok = True
+
+    def get_col_spec(self, **kw) -> str:
+        return "xid8"
+
+
+class UserChangeModel(Base):
+    __tablename__ = "user_changes"
+    __table_args__ = (
+        Index("ix_user_changes_transaction_id_id", "transaction_id", "id"),
+    )
+
+    id = Column(BigInteger, Identity(), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), nullable=False)
+    operation = Column(String, nullable=False)
+    name = Column(String, nullable=False)
+    email = Column(String, nullable=False)
+    created_at = Column(DateTime(), nullable=False)
+    changed_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    transaction_id = Column(XID8(), nullable=False, server_default=func.pg_current_xact_id())
@@ -0,0 +1,9 @@
+from db.migrations.base import Base
+from sqlalchemy import Column, String
+
+
+class UserEmailModel(Base):
+    __tablename__ = "user_emails"
+
+    # The lowercased emails of the users, kept in sync by triggers on users.
+    email = Column(String, primary_key=True)
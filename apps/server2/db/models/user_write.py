@@ -0,0 +1,14 @@
+from db.migrations.base import Base
+from sqlalchemy import BigInteger, Column, DateTime, Identity, String, func
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class UserWriteModel(Base):
+    __tablename__ = "user_writes"
+
+    id = Column(BigInteger, Identity(), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), nullable=False)
+    name = Column(String, nullable=False)
+    email = Column(String, nullable=False)
+    queued_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    claimed_until = Column(DateTime(timezone=True), nullable=True)
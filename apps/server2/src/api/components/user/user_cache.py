@@ -0,0 +1,103 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from uuid import UUID
+
+from api.components.user.user_models import User
+
+
+class IUserCache(ABC):
+    @abstractmethod
+    def configure(self, ttl: float, max_size: int) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def get(self, userId: str) -> User | None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def get_by_email(self, email: str) -> User | None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def set(self, user: User) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def delete(self, userId: str) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def clear(self) -> None:
+        raise Exception("NotImplementedException")
+
+
+class UserCache(IUserCache):
+    __entries: OrderedDict[str, tuple[User, float]]
+    __keys_by_email: dict[str, str]
+
+    def __init__(self, ttl: float = 0, max_size: int = 10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.__entries = OrderedDict()
+        self.__keys_by_email = {}
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.ttl > 0 and self.max_size > 0
+
+    def configure(self, ttl: float, max_size: int) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self.clear()
+
+    def get(self, userId: str) -> User | None:
+        key = self.__to_key(userId)
+        entry = self.__entries.get(key)
+        if entry is None:
+            return None
+        user, expires_at = entry
+        if expires_at <= time.monotonic():
+            self.__remove(key)
+            return None
+        self.__entries.move_to_end(key)
+        return user
+
+    def get_by_email(self, email: str) -> User | None:
+        key = self.__keys_by_email.get(email.lower())
+        if key is None:
+            return None
+        return self.get(key)
+
+    def set(self, user: User) -> None:
+        if not self.is_enabled:
+            return
+        key = self.__to_key(user.id)
+        self.__remove(key)
+        self.__entries[key] = (user, time.monotonic() + self.ttl)
+        self.__keys_by_email[user.email.lower()] = key
+        while len(self.__entries) > self.max_size:
+            self.__remove(next(iter(self.__entries)))
+
+    def delete(self, userId: str) -> None:
+        self.__remove(self.__to_key(userId))
+
+    def clear(self) -> None:
+        self.__entries.clear()
+        self.__keys_by_email.clear()
+
+    def __remove(self, key: str) -> None:
+        entry = self.__entries.pop(key, None)
+        if entry is None:
+            return
+        email = entry[0].email.lower()
+        # The email may already point at a newer user that took it over.
+        if self.__keys_by_email.get(email) == key:
+            del self.__keys_by_email[email]
+
+    @staticmethod
+    def __to_key(userId: str) -> str:
+        try:
+            return UUID(userId).hex
+        except ValueError:
+            return userId
@@ -0,0 +1,53 @@
+from abc import ABC, abstractmethod
+
+from api.components.user.user_cache import UserCache
+from api.components.user.user_repository import UserRepository
+from services.db_service import DBService
+
+
+class IUserCacheInvalidator(ABC):
+    @abstractmethod
+    async def start(self) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def stop(self) -> None:
+        raise Exception("NotImplementedException")
+
+
+class UserCacheInvalidator(IUserCacheInvalidator):
+    CHANNEL = UserRepository.CACHE_CHANNEL
+
+    __is_listening: bool
+
+    def __init__(self, user_cache: UserCache, db_service: DBService):
+        self.user_cache = user_cache
+        self.db_service = db_service
+        self.__is_listening = False
+
+    async def start(self) -> None:
+        # The users written by any worker are dropped from the cache of this
+        # one, which is otherwise left serving them until they expire.
+        if not self.user_cache.is_enabled or self.__is_listening:
+            return
+        await self.db_service.listen(self.CHANNEL, self.__invalidate)
+        self.__is_listening = True
+
+    async def stop(self) -> None:
+        if not self.__is_listening:
+            return
+        self.__is_listening = False
+        try:
+            await self.db_service.unlisten(self.CHANNEL, self.__invalidate)
+        except Exception as error:
+            message = "An error occurred when no longer listening to user writes"
+            print(message, error)
+
+    def __invalidate(self, payload: str | None) -> None:
+        # The writes made while the connection was lost went unnoticed, so
+        # nothing cached up to then can be trusted anymore.
+        if payload is None:
+            self.user_cache.clear()
+            return
+        for userId in payload.split(","):
+            self.user_cache.delete(userId)
@@ -1,15 +1,44 @@
+from datetime import datetime
 from typing import Annotated
+from uuid import UUID
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import EmailStr
 
 from api.components.user.user_mapper import UserMapper
-from api.components.user.user_models import UserRequest, UserResponse
+from api.components.user.user_models import (
+    UserBatchGetRequest,
+    UserBatchGetResponse,
+    UserBatchRequest,
+    UserBatchResponse,
+    UserBulkDeleteRequest,
+    UserBulkResponse,
+    UserBulkUpdateRequest,
+    UserBulkUpsertRequest,
+    UserChangesResponse,
+    UserPatchRequest,
+    UserRequest,
+    UserResponse,
+    UserSearchResponse,
+    UserSort,
+    UserUpsertRequest,
+    UserUpsertResponse,
+    UserWriteQueueMetrics,
+)
 from api.components.user.user_service import UserService
 from api.shared.api_error_response import APIErrorResponse
 from api.shared.api_pagination_response import APIPaginationResponse
+from api.utils.cursor import Cursor
+from api.utils.etag import ETag
+from api.utils.prefer import Prefer
+from api.utils.rate_limiter import rate_limiter
 from container.container import Container
 from services.api_pagination_service import APIPaginationData, APIPaginationService
+from services.idempotency_service import IdempotencyService, IdempotentResponse
+from services.rate_limit_service import RateLimit
 
 
 class UserController(APIRouter):
@@ -19,9 +48,30 @@ class UserController(APIRouter):
         dependencies=[
             Depends(Provide[Container.user_service_provider]),
             Depends(Provide[Container.api_pagination_service_provider]),
+            Depends(Provide[Container.idempotency_service_provider]),
         ],
+        rate_limits={
+            "add_user": RateLimit(capacity=20, refill_rate=2),
+            "fetch_paginated_users": RateLimit(capacity=60, refill_rate=10),
+            "fetch_batch_of_users": RateLimit(capacity=60, refill_rate=10),
+            "process_batch_of_users": RateLimit(capacity=5, refill_rate=0.5),
+            "fetch_user": RateLimit(capacity=120, refill_rate=20),
+            "renew_user": RateLimit(capacity=20, refill_rate=2),
+            "amend_user": RateLimit(capacity=20, refill_rate=2),
+            "destroy_user": RateLimit(capacity=20, refill_rate=2),
+            "amend_batch_of_users": RateLimit(capacity=5, refill_rate=0.5),
+            "destroy_batch_of_users": RateLimit(capacity=5, refill_rate=0.5),
+            "save_user": RateLimit(capacity=20, refill_rate=2),
+            "save_batch_of_users": RateLimit(capacity=5, refill_rate=0.5),
+            "search_users": RateLimit(capacity=30, refill_rate=5),
+            "fetch_user_by_email": RateLimit(capacity=120, refill_rate=20),
+            "fetch_user_write_queue_metrics": RateLimit(capacity=60, refill_rate=10),
+            "fetch_user_changes": RateLimit(capacity=60, refill_rate=10),
+            "fetch_user_stream": RateLimit(capacity=60, refill_rate=10),
+        },
     ):
         super().__init__(prefix=prefix, dependencies=dependencies)
+        self.rate_limits = rate_limits
         self.setup_routes()
 
     def setup_routes(self):
@@ -30,31 +80,1228 @@ class UserController(APIRouter):
             path="",
             methods=["POST"],
             tags=["users"],
-            description="API endpoint used to create a new user",
+            dependencies=[rate_limiter("users:add_user", self.rate_limits["add_user"])],
+            description="""
+            API endpoint used to create a new user.
+            * @header Idempotency-Key Replays the first response on retries.
+            """,
+            responses={
+                status.HTTP_201_CREATED: {
+                    "model": UserResponse,
+                    "description": "Created",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "id": "XXXXXXXX-XXXX-XXXX-XXXX-XXXXXXXXXXXX",
+                                "name": "name",
+                                "email": "email@email.com",
+                                "created_at": "XXXX-XX-XXTXX:XX:XX.XXXXXX",
+                                "updated_at": "",
+                            }
+                        }
+                    },
+                },
+                status.HTTP_409_CONFLICT: {
+                    "model": APIErrorResponse,
+                    "description": "Conflict",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "User already exists",
+                                "detail": {"context": "", "cause": None},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_422_UNPROCESSABLE_ENTITY: {
+                    "model": APIErrorResponse,
+                    "description": "Unprocessable Entity",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "",
+                                "detail": {"context": "", "cause": ""},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_429_TOO_MANY_REQUESTS: {
+                    "model": APIErrorResponse,
+                    "description": "Too Many Requests",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Too many requests",
+                                "detail": {"context": "context", "cause": None},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_500_INTERNAL_SERVER_ERROR: {
+                    "model": APIErrorResponse,
+                    "description": "Internal Server Error",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Internal Server Error",
+                                "detail": {"context": "", "cause": ""},
+                                "isOperational": False,
+                            }
+                        }
+                    },
+                },
+            },
+        )
+        @inject
+        async def add_user(
+            response: Response,
+            user_request: UserRequest,
+            idempotency_key: Annotated[str | None, Header(max_length=255)] = None,
+            user_service: UserService = self.dependencies[0],
+            idempotency_service: IdempotencyService = self.dependencies[2],
+        ) -> UserResponse:
+            async def register_user() -> IdempotentResponse:
+                domain_user = UserMapper.to_domain(user_request)
+                returned_user = await user_service.register_user(domain_user)
+                return IdempotentResponse(
+                    status_code=status.HTTP_201_CREATED,
+                    body=jsonable_encoder(UserMapper.to_response(returned_user)),
+                    headers={"ETag": UserMapper.to_etag(returned_user)},
+                )
+
+            if idempotency_key is None:
+                idempotent_response = await register_user()
+            else:
+                idempotent_response = await idempotency_service.execute(
+                    f"users:add_user:{idempotency_key}",
+                    user_request.model_dump_json(),
+                    register_user,
+                )
+            response.headers.update(idempotent_response.headers)
+            if idempotent_response.replayed:
+                response.headers["Idempotent-Replayed"] = "true"
+            response.status_code = idempotent_response.status_code
+            return UserResponse(**idempotent_response.body)
+
+        @APIRouter.api_route(
+            self,
+            path="",
+            methods=["GET"],
+            tags=["users"],
+            dependencies=[
+                rate_limiter(
+                    "users:fetch_paginated_users",
+                    self.rate_limits["fetch_paginated_users"],
+                )
+            ],
+            description="""
+            API endpoint used to get users through page-based pagination schema.
+            * @param page The number of the page. If isn't provided, it will be set to 1.
+            * @param limit The number of records per page. If isn't provided, it will be set to 1.
+            * @param email_prefix The start of the emails of the users.
+            * @param name_contains A part of the names of the users.
+            * @param created_after The earliest creation date of the users (exclusive).
+            * @param created_before The latest creation date of the users (exclusive).
+            * @param sort The key records are sorted by. Prefix it with - to reverse it.
+            * @param fields The comma-separated fields of the records. All by default.
+            * @header If-None-Match The ETag of a fetched page. 304 if nothing changed.
+            """,
+            responses={
+                status.HTTP_200_OK: {
+                    "model": UserResponse,
+                    "description": "OK",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "id": "XXXXXXXX-XXXX-XXXX-XXXX-XXXXXXXXXXXX",
+                                "name": "name",
+                                "email": "email@email.com",
+                                "created_at": "XXXX-XX-XXTXX:XX:XX.XXXXXX",
+                                "updated_at": None,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_304_NOT_MODIFIED: {
+                    "description": "Not Modified",
+                },
+                status.HTTP_422_UNPROCESSABLE_ENTITY: {
+                    "model": APIErrorResponse,
+                    "description": "Unprocessable Entity",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Invalid fields",
+                                "detail": {"context": "context", "cause": None},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_429_TOO_MANY_REQUESTS: {
+                    "model": APIErrorResponse,
+                    "description": "Too Many Requests",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Too many requests",
+                                "detail": {"context": "context", "cause": None},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_500_INTERNAL_SERVER_ERROR: {
+                    "model": APIErrorResponse,
+                    "description": "Internal Server Error",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Internal Server Error",
+                                "detail": {"context": "context", "cause": "cause"},
+                                "isOperational": False,
+                            }
+                        }
+                    },
+                },
+            },
+        )
+        @inject
+        async def fetch_paginated_users(
+            request: Request,
+            response: Response,
+            page: Annotated[int | None, Query()] = 1,
+            limit: Annotated[int | None, Query()] = 1,
+            email_prefix: Annotated[str | None, Query(min_length=1)] = None,
+            name_contains: Annotated[str | None, Query(min_length=1)] = None,
+            created_after: Annotated[datetime | None, Query()] = None,
+            created_before: Annotated[datetime | None, Query()] = None,
+            sort: Annotated[UserSort, Query()] = "-created_at",
+            fields: Annotated[str | None, Query(min_length=1)] = None,
+            if_none_match: Annotated[str | None, Header()] = None,
+            user_service: UserService = self.dependencies[0],
+            api_pagination_service: APIPaginationService = self.dependencies[1],
+        ) -> APIPaginationResponse:
+            base_url = str(request.url)
+            selected_fields = UserMapper.to_fields(fields)
+            # The version is read before the page so that a concurrent write can
+            # only make the ETag older than the records, never newer.
+            users_version = await user_service.retrieve_users_version()
+            etag = ETag.from_version(users_version, request.url.query)
+            if ETag.matches(if_none_match, etag):
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+                )
+            (
+                retrieved_users,
+                total_records,
+            ) = await user_service.retrieve_and_count_users(
+                page,
+                limit,
+                UserMapper.to_filter(
+                    email_prefix=email_prefix,
+                    name_contains=name_contains,
+                    created_after=created_after,
+                    created_before=created_before,
+                ),
+                sort,
+                selected_fields,
+            )
+            if selected_fields is not None:
+                retrieved_users = [
+                    UserMapper.to_partial_response(retrieved_user, selected_fields)
+                    for retrieved_user in retrieved_users
+                ]
+            api_pagination_data = APIPaginationData(
+                page=page,
+                limit=limit,
+                total_records=total_records,
+                records=retrieved_users,
+            )
+            api_pagination_response = api_pagination_service.create_response(
+                base_url, api_pagination_data
+            )
+            response.headers["ETag"] = etag
+            response.status_code = status.HTTP_200_OK
+            return api_pagination_response
+
+        @APIRouter.api_route(
+            self,
+            path="/batch-get",
+            methods=["POST"],
+            tags=["users"],
+            dependencies=[
+                rate_limiter(
+                    "users:fetch_batch_of_users",
+                    self.rate_limits["fetch_batch_of_users"],
+                )
+            ],
+            description="""
+            API endpoint used to get up to 100 users by their IDs in a single request.
+            * @body ids The IDs of the users. Records keep their order.
+            """,
+            responses={
+                status.HTTP_200_OK: {
+                    "model": UserBatchGetResponse,
+                    "description": "OK",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "records": [
+                                    {
+                                        "id": "XXXXXXXX-XXXX-XXXX-XXXX-XXXXXXXXXXXX",
+                                        "name": "name",
+                                        "email": "email@email.com",
+                                        "created_at": "XXXX-XX-XXTXX:XX:XX.XXXXXX",
+                                        "updated_at": None,
+                                    }
+                                ],
+                                "missing": ["XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX"],
+                            }
+                        }
+                    },
+                },
+                status.HTTP_422_UNPROCESSABLE_ENTITY: {
+                    "model": APIErrorResponse,
+                    "description": "Unprocessable Entity",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Unprocessable Entity",
+                                "detail": {"context": "context", "cause": "cause"},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_429_TOO_MANY_REQUESTS: {
+                    "model": APIErrorResponse,
+                    "description": "Too Many Requests",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Too many requests",
+                                "detail": {"context": "context", "cause": None},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_500_INTERNAL_SERVER_ERROR: {
+                    "model": APIErrorResponse,
+                    "description": "Internal Server Error",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Internal Server Error",
+                                "detail": {"context": "context", "cause": "cause"},
+                                "isOperational": False,
+                            }
+                        }
+                    },
+                },
+            },
+        )
+        @inject
+        async def fetch_batch_of_users(
+            response: Response,
+            user_batch_get_request: UserBatchGetRequest,
+            user_service: UserService = self.dependencies[0],
+        ) -> UserBatchGetResponse:
+            retrieved_users, missing_user_ids = await user_service.retrieve_users(
+                UserMapper.to_ids(user_batch_get_request.ids)
+            )
+            user_batch_get_response = UserBatchGetResponse(
+                records=[UserMapper.to_response(user) for user in retrieved_users],
+                missing=missing_user_ids,
+            )
+            response.status_code = status.HTTP_200_OK
+            return user_batch_get_response
+
+        @APIRouter.api_route(
+            self,
+            path="/batch",
+            methods=["POST"],
+            tags=["users"],
+            dependencies=[
+                rate_limiter(
+                    "users:process_batch_of_users",
+                    self.rate_limits["process_batch_of_users"],
+                )
+            ],
+            description="""
+            API endpoint used to create, replace, patch and delete users in order.
+            * @body operations The operations. Results keep their order.
+            * @body atomic Whether all the operations are undone when one of them fails.
+            Otherwise every operation succeeds or fails on its own.
+            """,
+            responses={
+                status.HTTP_200_OK: {
+                    "model": UserBatchResponse,
+                    "description": "OK",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "results": [
+                                    {
+                                        "status": 201,
+                                        "record": {
+                                            "id": "XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX",
+                                            "name": "name",
+                                            "email": "email@email.com",
+                                            "created_at": "XXXX-XX-XXTXX:XX:XX.XXXXXX",
+                                            "updated_at": None,
+                                        },
+                                        "error": None,
+                                    },
+                                    {
+                                        "status": 404,
+                                        "record": None,
+                                        "error": {
+                                            "message": "User not found",
+                                            "detail": {
+                                                "context": "context",
+                                                "cause": None,
+                                            },
+                                            "is_operational": True,
+                                        },
+                                    },
+                                ]
+                            }
+                        }
+                    },
+                },
+                status.HTTP_422_UNPROCESSABLE_ENTITY: {
+                    "model": APIErrorResponse,
+                    "description": "Unprocessable Entity",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Unprocessable Entity",
+                                "detail": {"context": "context", "cause": "cause"},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_429_TOO_MANY_REQUESTS: {
+                    "model": APIErrorResponse,
+                    "description": "Too Many Requests",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Too many requests",
+                                "detail": {"context": "context", "cause": None},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+            },
+        )
+        @inject
+        async def process_batch_of_users(
+            response: Response,
+            user_batch_request: UserBatchRequest,
+            user_service: UserService = self.dependencies[0],
+        ) -> UserBatchResponse:
+            operations = [
+                UserMapper.to_operation(operation)
+                for operation in user_batch_request.operations
+            ]
+            results = await user_service.apply_user_operations(
+                operations, user_batch_request.atomic
+            )
+            user_batch_response = UserBatchResponse(
+                results=[
+                    UserMapper.to_batch_result(operation, result)
+                    for operation, result in zip(operations, results)
+                ]
+            )
+            response.status_code = status.HTTP_200_OK
+            return user_batch_response
+
+        @APIRouter.api_route(
+            self,
+            path="/bulk-update",
+            methods=["POST"],
+            tags=["users"],
+            dependencies=[
+                rate_limiter(
+                    "users:amend_batch_of_users",
+                    self.rate_limits["amend_batch_of_users"],
+                )
+            ],
+            description="""
+            API endpoint used to partially update many users at once.
+            * @body ids The IDs of the users. Either ids or filter must be set.
+            * @body filter The conditions the users must meet.
+            * @body chunk_size The number of users written per transaction.
+            * @body changes The fields to update. Email cannot be bulk updated.
+            """,
+            responses={
+                status.HTTP_200_OK: {
+                    "model": UserBulkResponse,
+                    "description": "OK",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "count": 1,
+                                "ids": ["XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX"],
+                            }
+                        }
+                    },
+                },
+                status.HTTP_422_UNPROCESSABLE_ENTITY: {
+                    "model": APIErrorResponse,
+                    "description": "Unprocessable Entity",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Unprocessable Entity",
+                                "detail": {"context": "context", "cause": "cause"},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_429_TOO_MANY_REQUESTS: {
+                    "model": APIErrorResponse,
+                    "description": "Too Many Requests",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Too many requests",
+                                "detail": {"context": "context", "cause": None},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_500_INTERNAL_SERVER_ERROR: {
+                    "model": APIErrorResponse,
+                    "description": "Internal Server Error",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Internal Server Error",
+                                "detail": {"context": "context", "cause": "cause"},
+                                "isOperational": False,
+                            }
+                        }
+                    },
+                },
+            },
+        )
+        @inject
+        async def amend_batch_of_users(
+            response: Response,
+            user_bulk_update_request: UserBulkUpdateRequest,
+            user_service: UserService = self.dependencies[0],
+        ) -> UserBulkResponse:
+            user_ids = await user_service.modify_users(
+                UserMapper.to_ids(user_bulk_update_request.ids),
+                user_bulk_update_request.filter,
+                UserMapper.to_changes(user_bulk_update_request.changes),
+                user_bulk_update_request.chunk_size,
+            )
+            response.status_code = status.HTTP_200_OK
+            return UserBulkResponse(count=len(user_ids), ids=user_ids)
+
+        @APIRouter.api_route(
+            self,
+            path="/bulk-delete",
+            methods=["POST"],
+            tags=["users"],
+            dependencies=[
+                rate_limiter(
+                    "users:destroy_batch_of_users",
+                    self.rate_limits["destroy_batch_of_users"],
+                )
+            ],
+            description="""
+            API endpoint used to delete many users at once.
+            * @body ids The IDs of the users. Either ids or filter must be set.
+            * @body filter The conditions the users must meet.
+            * @body chunk_size The number of users written per transaction.
+            """,
+            responses={
+                status.HTTP_200_OK: {
+                    "model": UserBulkResponse,
+                    "description": "OK",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "count": 1,
+                                "ids": ["XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX"],
+                            }
+                        }
+                    },
+                },
+                status.HTTP_422_UNPROCESSABLE_ENTITY: {
+                    "model": APIErrorResponse,
+                    "description": "Unprocessable Entity",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Unprocessable Entity",
+                                "detail": {"context": "context", "cause": "cause"},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_429_TOO_MANY_REQUESTS: {
+                    "model": APIErrorResponse,
+                    "description": "Too Many Requests",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Too many requests",
+                                "detail": {"context": "context", "cause": None},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_500_INTERNAL_SERVER_ERROR: {
+                    "model": APIErrorResponse,
+                    "description": "Internal Server Error",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Internal Server Error",
+                                "detail": {"context": "context", "cause": "cause"},
+                                "isOperational": False,
+                            }
+                        }
+                    },
+                },
+            },
+        )
+        @inject
+        async def destroy_batch_of_users(
+            response: Response,
+            user_bulk_delete_request: UserBulkDeleteRequest,
+            user_service: UserService = self.dependencies[0],
+        ) -> UserBulkResponse:
+            user_ids = await user_service.remove_users(
+                UserMapper.to_ids(user_bulk_delete_request.ids),
+                user_bulk_delete_request.filter,
+                user_bulk_delete_request.chunk_size,
+            )
+            response.status_code = status.HTTP_200_OK
+            return UserBulkResponse(count=len(user_ids), ids=user_ids)
+
+        @APIRouter.api_route(
+            self,
+            path="/by-email",
+            methods=["PUT"],
+            tags=["users"],
+            dependencies=[
+                rate_limiter(
+                    "users:save_batch_of_users",
+                    self.rate_limits["save_batch_of_users"],
+                )
+            ],
+            description="""
+            API endpoint used to create or update many users by their emails at once.
+            * @body users The users to be saved. Their emails must be unique.
+            """,
+            responses={
+                status.HTTP_200_OK: {
+                    "model": list[UserUpsertResponse],
+                    "description": "OK",
+                    "content": {
+                        "application/json": {
+                            "example": [
+                                {
+                                    "id": "XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX",
+                                    "name": "name",
+                                    "email": "email@email.com",
+                                    "created_at": "XXXX-XX-XXTXX:XX:XX.XXXXXX",
+                                    "updated_at": "XXXX-XX-XXTXX:XX:XX.XXXXXX",
+                                    "status": "updated",
+                                }
+                            ]
+                        }
+                    },
+                },
+                status.HTTP_422_UNPROCESSABLE_ENTITY: {
+                    "model": APIErrorResponse,
+                    "description": "Unprocessable Entity",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Unprocessable Entity",
+                                "detail": {"context": "context", "cause": "cause"},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_429_TOO_MANY_REQUESTS: {
+                    "model": APIErrorResponse,
+                    "description": "Too Many Requests",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Too many requests",
+                                "detail": {"context": "context", "cause": None},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_500_INTERNAL_SERVER_ERROR: {
+                    "model": APIErrorResponse,
+                    "description": "Internal Server Error",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Internal Server Error",
+                                "detail": {"context": "context", "cause": "cause"},
+                                "isOperational": False,
+                            }
+                        }
+                    },
+                },
+            },
+        )
+        @inject
+        async def save_batch_of_users(
+            response: Response,
+            user_bulk_upsert_request: UserBulkUpsertRequest,
+            user_service: UserService = self.dependencies[0],
+        ) -> list[UserUpsertResponse]:
+            domain_users = [
+                UserMapper.to_domain(user_request)
+                for user_request in user_bulk_upsert_request.users
+            ]
+            upserted_users = await user_service.upsert_users(domain_users)
+            response.status_code = status.HTTP_200_OK
+            return [
+                UserMapper.to_upsert_response(upserted_user, upsert_status)
+                for upserted_user, upsert_status in upserted_users
+            ]
+
+        @APIRouter.api_route(
+            self,
+            path="/by-email/{email}",
+            methods=["PUT"],
+            tags=["users"],
+            dependencies=[
+                rate_limiter("users:save_user", self.rate_limits["save_user"])
+            ],
+            description="""
+            API endpoint used to create or update a user by its email.
+            * @param email The email of the user.
+            """,
+            responses={
+                status.HTTP_200_OK: {
+                    "model": UserUpsertResponse,
+                    "description": "OK",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "id": "XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX",
+                                "name": "name",
+                                "email": "email@email.com",
+                                "created_at": "XXXX-XX-XXTXX:XX:XX.XXXXXX",
+                                "updated_at": "XXXX-XX-XXTXX:XX:XX.XXXXXX",
+                                "status": "updated",
+                            }
+                        }
+                    },
+                },
+                status.HTTP_201_CREATED: {
+                    "model": UserUpsertResponse,
+                    "description": "Created",
+                },
+                status.HTTP_422_UNPROCESSABLE_ENTITY: {
+                    "model": APIErrorResponse,
+                    "description": "Unprocessable Entity",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Unprocessable Entity",
+                                "detail": {"context": "context", "cause": "cause"},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_429_TOO_MANY_REQUESTS: {
+                    "model": APIErrorResponse,
+                    "description": "Too Many Requests",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Too many requests",
+                                "detail": {"context": "context", "cause": None},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_500_INTERNAL_SERVER_ERROR: {
+                    "model": APIErrorResponse,
+                    "description": "Internal Server Error",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Internal Server Error",
+                                "detail": {"context": "context", "cause": "cause"},
+                                "isOperational": False,
+                            }
+                        }
+                    },
+                },
+            },
+        )
+        @inject
+        async def save_user(
+            response: Response,
+            email: EmailStr,
+            user_upsert_request: UserUpsertRequest,
+            user_service: UserService = self.dependencies[0],
+        ) -> UserUpsertResponse:
+            domain_user = UserMapper.to_domain(
+                UserRequest(name=user_upsert_request.name, email=email)
+            )
+            [(upserted_user, upsert_status)] = await user_service.upsert_users(
+                [domain_user]
+            )
+            user_response = UserMapper.to_upsert_response(upserted_user, upsert_status)
+            response.headers["ETag"] = UserMapper.to_etag(upserted_user)
+            response.status_code = (
+                status.HTTP_201_CREATED
+                if upsert_status == "created"
+                else status.HTTP_200_OK
+            )
+            return user_response
+
+        @APIRouter.api_route(
+            self,
+            path="/search",
+            methods=["GET"],
+            tags=["users"],
+            dependencies=[
+                rate_limiter("users:search_users", self.rate_limits["search_users"])
+            ],
+            description="""
+            API endpoint used to search users by words of their names or emails.
+            * @param q The words to search for. Each one matches as a prefix.
+            * @param limit The number of records per page. Up to 100.
+            * @param cursor The position to continue from, taken from the next link.
+            """,
+            responses={
+                status.HTTP_200_OK: {
+                    "model": UserSearchResponse,
+                    "description": "OK",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "records": [
+                                    {
+                                        "id": "XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX",
+                                        "name": "name",
+                                        "email": "email@email.com",
+                                        "created_at": "XXXX-XX-XXTXX:XX:XX.XXXXXX",
+                                        "updated_at": None,
+                                    }
+                                ],
+                                "next": None,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_422_UNPROCESSABLE_ENTITY: {
+                    "model": APIErrorResponse,
+                    "description": "Unprocessable Entity",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Unprocessable Entity",
+                                "detail": {"context": "context", "cause": "cause"},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_429_TOO_MANY_REQUESTS: {
+                    "model": APIErrorResponse,
+                    "description": "Too Many Requests",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Too many requests",
+                                "detail": {"context": "context", "cause": None},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_500_INTERNAL_SERVER_ERROR: {
+                    "model": APIErrorResponse,
+                    "description": "Internal Server Error",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Internal Server Error",
+                                "detail": {"context": "context", "cause": "cause"},
+                                "isOperational": False,
+                            }
+                        }
+                    },
+                },
+            },
+        )
+        @inject
+        async def search_users(
+            request: Request,
+            response: Response,
+            q: Annotated[str, Query(min_length=1, max_length=256)],
+            limit: Annotated[int, Query(ge=1, le=100)] = 20,
+            cursor: Annotated[str | None, Query()] = None,
+            user_service: UserService = self.dependencies[0],
+        ) -> UserSearchResponse:
+            after = None
+            if cursor is not None:
+                after_rank, after_id = Cursor.decode(cursor, tuple[float, UUID])
+                after = (after_rank, after_id.hex)
+            found_users, next_after = await user_service.search_users(q, limit, after)
+            next_url = None
+            if next_after is not None:
+                next_url = str(
+                    request.url.include_query_params(
+                        cursor=Cursor.encode(list(next_after))
+                    )
+                )
+            response.status_code = status.HTTP_200_OK
+            return UserSearchResponse(
+                records=[UserMapper.to_response(user) for user in found_users],
+                next=next_url,
+            )
+
+        @APIRouter.api_route(
+            self,
+            path="/by-email/{email}",
+            methods=["GET"],
+            tags=["users"],
+            dependencies=[
+                rate_limiter(
+                    "users:fetch_user_by_email", self.rate_limits["fetch_user_by_email"]
+                )
+            ],
+            description="""
+            API endpoint used to get a user by its email, whatever its case.
+            * @param email The email of the user.
+            * @header If-None-Match The ETag of a fetched user. 304 if it still matches.
+            """,
+            responses={
+                status.HTTP_200_OK: {
+                    "model": UserResponse,
+                    "description": "OK",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "id": "XXXXXXXX-XXXX-XXXX-XXXX-XXXXXXXXXXXX",
+                                "name": "name",
+                                "email": "email@email.com",
+                                "created_at": "XXXX-XX-XXTXX:XX:XX.XXXXXX",
+                                "updated_at": None,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_304_NOT_MODIFIED: {
+                    "description": "Not Modified",
+                },
+                status.HTTP_404_NOT_FOUND: {
+                    "model": APIErrorResponse,
+                    "description": "Not Found",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Not Found",
+                                "detail": {"context": "context", "cause": "cause"},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_429_TOO_MANY_REQUESTS: {
+                    "model": APIErrorResponse,
+                    "description": "Too Many Requests",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Too many requests",
+                                "detail": {"context": "context", "cause": None},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_500_INTERNAL_SERVER_ERROR: {
+                    "model": APIErrorResponse,
+                    "description": "Internal Server Error",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Internal Server Error",
+                                "detail": {"context": "context", "cause": "cause"},
+                                "isOperational": False,
+                            }
+                        }
+                    },
+                },
+            },
+        )
+        @inject
+        async def fetch_user_by_email(
+            response: Response,
+            email: EmailStr,
+            if_none_match: Annotated[str | None, Header()] = None,
+            user_service: UserService = self.dependencies[0],
+        ) -> UserResponse:
+            retrieved_user = await user_service.retrieve_user_by_email(email)
+            etag = UserMapper.to_etag(retrieved_user)
+            if ETag.matches(if_none_match, etag):
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+                )
+            user_response = UserMapper.to_response(retrieved_user)
+            response.headers["ETag"] = etag
+            response.status_code = status.HTTP_200_OK
+            return user_response
+
+        @APIRouter.api_route(
+            self,
+            path="/changes",
+            methods=["GET"],
+            tags=["users"],
+            dependencies=[
+                rate_limiter(
+                    "users:fetch_user_changes", self.rate_limits["fetch_user_changes"]
+                )
+            ],
+            description="""
+            API endpoint used to get the changes made to users, oldest first.
+            A deleted user is reported with the last data it had.
+            * @param since The position to continue from, taken from the next link.
+            * @param limit The number of records per page. Up to 1000.
+            """,
+            responses={
+                status.HTTP_200_OK: {
+                    "model": UserChangesResponse,
+                    "description": "OK",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "records": [
+                                    {
+                                        "user_id": "XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX",
+                                        "operation": "created",
+                                        "name": "name",
+                                        "email": "email@email.com",
+                                        "created_at": "XXXX-XX-XXTXX:XX:XX.XXXXXX",
+                                        "changed_at": "XXXX-XX-XXTXX:XX:XX.XXXXXXZ",
+                                    }
+                                ],
+                                "next": "http://localhost:5001/users/changes?since=XXXX",
+                            }
+                        }
+                    },
+                },
+                status.HTTP_422_UNPROCESSABLE_ENTITY: {
+                    "model": APIErrorResponse,
+                    "description": "Unprocessable Entity",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Unprocessable Entity",
+                                "detail": {"context": "context", "cause": "cause"},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_429_TOO_MANY_REQUESTS: {
+                    "model": APIErrorResponse,
+                    "description": "Too Many Requests",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Too many requests",
+                                "detail": {"context": "context", "cause": None},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_500_INTERNAL_SERVER_ERROR: {
+                    "model": APIErrorResponse,
+                    "description": "Internal Server Error",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Internal Server Error",
+                                "detail": {"context": "context", "cause": "cause"},
+                                "isOperational": False,
+                            }
+                        }
+                    },
+                },
+            },
+        )
+        @inject
+        async def fetch_user_changes(
+            request: Request,
+            response: Response,
+            since: Annotated[str | None, Query()] = None,
+            limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+            user_service: UserService = self.dependencies[0],
+        ) -> UserChangesResponse:
+            after = None
+            if since is not None:
+                after = Cursor.decode(since, list[tuple[int, int]])
+            changes, next_after = await user_service.retrieve_user_changes(after, limit)
+            # The next link is always given, as a consumer keeps following it to
+            # pick up the changes made after it has caught up.
+            next_url = str(
+                request.url.include_query_params(
+                    since=Cursor.encode([list(position) for position in next_after])
+                )
+            )
+            response.status_code = status.HTTP_200_OK
+            return UserChangesResponse(
+                records=[UserMapper.to_change_response(change) for change in changes],
+                next=next_url,
+            )
+
+        @APIRouter.api_route(
+            self,
+            path="/stream",
+            methods=["GET"],
+            tags=["users"],
+            dependencies=[
+                rate_limiter(
+                    "users:fetch_user_stream", self.rate_limits["fetch_user_stream"]
+                )
+            ],
+            description="""
+            API endpoint used to stream the changes made to users as server-sent events.
+            Only the changes made after connecting are sent. An event with an id ends
+            a batch, and the id can be passed as since to the changes endpoint.
+            A client that falls too far behind is disconnected.
+            """,
+            response_class=StreamingResponse,
             responses={
-                status.HTTP_201_CREATED: {
-                    "model": UserResponse,
-                    "description": "Created",
+                status.HTTP_200_OK: {
+                    "description": "OK",
+                    "content": {
+                        "text/event-stream": {
+                            "example": 'data: {"user_id": "XXXX", "operation": "created", ...}\nid: XXXX\n\n'  # noqa: E501
+                        }
+                    },
+                },
+                status.HTTP_429_TOO_MANY_REQUESTS: {
+                    "model": APIErrorResponse,
+                    "description": "Too Many Requests",
                     "content": {
                         "application/json": {
                             "example": {
-                                "id": "XXXXXXXX-XXXX-XXXX-XXXX-XXXXXXXXXXXX",
-                                "name": "name",
-                                "email": "email@email.com",
-                                "created_at": "XXXX-XX-XXTXX:XX:XX.XXXXXX",
-                                "updated_at": "",
+                                "message": "Too many requests",
+                                "detail": {"context": "context", "cause": None},
+                                "isOperational": True,
                             }
                         }
                     },
                 },
-                status.HTTP_422_UNPROCESSABLE_ENTITY: {
+                status.HTTP_500_INTERNAL_SERVER_ERROR: {
                     "model": APIErrorResponse,
-                    "description": "Unprocessable Entity",
+                    "description": "Internal Server Error",
                     "content": {
                         "application/json": {
                             "example": {
-                                "message": "",
-                                "detail": {"context": "", "cause": ""},
+                                "message": "Internal Server Error",
+                                "detail": {"context": "context", "cause": "cause"},
+                                "isOperational": False,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_503_SERVICE_UNAVAILABLE: {
+                    "model": APIErrorResponse,
+                    "description": "Service Unavailable",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Too many subscribers to user changes",
+                                "detail": {"context": "context", "cause": None},
+                                "isOperational": False,
+                            }
+                        }
+                    },
+                },
+            },
+        )
+        @inject
+        async def fetch_user_stream(
+            user_service: UserService = self.dependencies[0],
+        ) -> StreamingResponse:
+            events = await user_service.stream_user_changes()
+            return StreamingResponse(
+                events,
+                status_code=status.HTTP_200_OK,
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+
+        @APIRouter.api_route(
+            self,
+            path="/write-queue",
+            methods=["GET"],
+            tags=["users"],
+            dependencies=[
+                rate_limiter(
+                    "users:fetch_user_write_queue_metrics",
+                    self.rate_limits["fetch_user_write_queue_metrics"],
+                )
+            ],
+            description="""
+            API endpoint used to get the metrics of the queue of user updates.
+            Lag is the age in seconds of the oldest update still waiting.
+            """,
+            responses={
+                status.HTTP_200_OK: {
+                    "model": UserWriteQueueMetrics,
+                    "description": "OK",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "depth": 0,
+                                "lag": 0.0,
+                                "flush_latency": 0.0,
+                                "flushed": 0,
+                                "failed": 0,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_429_TOO_MANY_REQUESTS: {
+                    "model": APIErrorResponse,
+                    "description": "Too Many Requests",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Too many requests",
+                                "detail": {"context": "context", "cause": None},
                                 "isOperational": True,
                             }
                         }
@@ -67,7 +1314,7 @@ class UserController(APIRouter):
                         "application/json": {
                             "example": {
                                 "message": "Internal Server Error",
-                                "detail": {"context": "", "cause": ""},
+                                "detail": {"context": "context", "cause": "cause"},
                                 "isOperational": False,
                             }
                         }
@@ -76,26 +1323,26 @@ class UserController(APIRouter):
             },
         )
         @inject
-        async def add_user(
+        async def fetch_user_write_queue_metrics(
             response: Response,
-            user_request: UserRequest,
             user_service: UserService = self.dependencies[0],
-        ) -> UserResponse:
-            domain_user = UserMapper.to_domain(user_request)
-            returned_user = await user_service.register_user(domain_user)
-            user_response = UserMapper.to_response(returned_user)
-            response.status_code = status.HTTP_201_CREATED
-            return user_response
+        ) -> UserWriteQueueMetrics:
+            metrics = await user_service.retrieve_user_write_queue_metrics()
+            response.status_code = status.HTTP_200_OK
+            return metrics
 
         @APIRouter.api_route(
             self,
-            path="",
+            path="/{user_id}",
             methods=["GET"],
             tags=["users"],
+            dependencies=[
+                rate_limiter("users:fetch_user", self.rate_limits["fetch_user"])
+            ],
             description="""
-            API endpoint used to get users through page-based pagination schema.
-            * @param page The number of the page. If isn't provided, it will be set to 1.
-            * @param limit The number of records per page. If isn't provided, it will be set to 1.
+            API endpoint used to get a user by its ID.
+            * @param fields The comma-separated fields of the user. All by default.
+            * @header If-None-Match The ETag of a fetched user. 304 if it still matches.
             """,
             responses={
                 status.HTTP_200_OK: {
@@ -113,6 +1360,48 @@ class UserController(APIRouter):
                         }
                     },
                 },
+                status.HTTP_304_NOT_MODIFIED: {
+                    "description": "Not Modified",
+                },
+                status.HTTP_404_NOT_FOUND: {
+                    "model": APIErrorResponse,
+                    "description": "Not Found",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Not Found",
+                                "detail": {"context": "context", "cause": "cause"},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_422_UNPROCESSABLE_ENTITY: {
+                    "model": APIErrorResponse,
+                    "description": "Unprocessable Entity",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Invalid fields",
+                                "detail": {"context": "context", "cause": None},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_429_TOO_MANY_REQUESTS: {
+                    "model": APIErrorResponse,
+                    "description": "Too Many Requests",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Too many requests",
+                                "detail": {"context": "context", "cause": None},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
                 status.HTTP_500_INTERNAL_SERVER_ERROR: {
                     "model": APIErrorResponse,
                     "description": "Internal Server Error",
@@ -129,34 +1418,50 @@ class UserController(APIRouter):
             },
         )
         @inject
-        async def fetch_paginated_users(
-            request: Request,
+        async def fetch_user(
             response: Response,
-            page: Annotated[int | None, Query()] = 1,
-            limit: Annotated[int | None, Query()] = 1,
+            user_id: str,
+            fields: Annotated[str | None, Query(min_length=1)] = None,
+            if_none_match: Annotated[str | None, Header()] = None,
             user_service: UserService = self.dependencies[0],
-            api_pagination_service: APIPaginationService = self.dependencies[1],
-        ) -> APIPaginationResponse:
-            base_url = str(request.url)
-            (
-                retrieved_users,
-                total_records,
-            ) = await user_service.retrieve_and_count_users(page, limit)
-            api_pagination_data = APIPaginationData(
-                page, limit, total_records, retrieved_users
-            )
-            api_pagination_response = api_pagination_service.create_response(
-                base_url, api_pagination_data
+        ) -> UserResponse:
+            selected_fields = UserMapper.to_fields(fields)
+            # The ETag is derived from the ID and the version of the user, so
+            # those are read whatever fields are selected.
+            retrieved_user = await user_service.retrieve_user(
+                user_id,
+                UserMapper.to_fields(fields, "id", "created_at", "updated_at"),
             )
+            etag = UserMapper.to_etag(retrieved_user)
+            if ETag.matches(if_none_match, etag):
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+                )
+            if selected_fields is not None:
+                return JSONResponse(
+                    content=jsonable_encoder(
+                        UserMapper.to_partial_response(retrieved_user, selected_fields)
+                    ),
+                    headers={"ETag": etag},
+                )
+            user_response = UserMapper.to_response(retrieved_user)
+            response.headers["ETag"] = etag
             response.status_code = status.HTTP_200_OK
-            return api_pagination_response
+            return user_response
 
         @APIRouter.api_route(
             self,
             path="/{user_id}",
-            methods=["GET"],
+            methods=["PUT"],
             tags=["users"],
-            description="API endpoint used to get a user by its ID",
+            dependencies=[
+                rate_limiter("users:renew_user", self.rate_limits["renew_user"])
+            ],
+            description="""
+            API endpoint used to update a user by its ID.
+            * @header If-Match The ETag of a fetched user. 412 if it is stale.
+            * @header Prefer respond-async queues the update and answers 202 at once.
+            """,
             responses={
                 status.HTTP_200_OK: {
                     "model": UserResponse,
@@ -173,6 +1478,18 @@ class UserController(APIRouter):
                         }
                     },
                 },
+                status.HTTP_202_ACCEPTED: {
+                    "model": UserRequest,
+                    "description": "Accepted",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "name": "name",
+                                "email": "email@email.com",
+                            }
+                        }
+                    },
+                },
                 status.HTTP_404_NOT_FOUND: {
                     "model": APIErrorResponse,
                     "description": "Not Found",
@@ -180,12 +1497,51 @@ class UserController(APIRouter):
                         "application/json": {
                             "example": {
                                 "message": "Not Found",
+                                "detail": {"context": "context", "cause": ""},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_412_PRECONDITION_FAILED: {
+                    "model": APIErrorResponse,
+                    "description": "Precondition Failed",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "User has been modified",
+                                "detail": {"context": "context", "cause": None},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
+                status.HTTP_422_UNPROCESSABLE_ENTITY: {
+                    "model": APIErrorResponse,
+                    "description": "Unprocessable Entity",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Unprocessable Entity",
                                 "detail": {"context": "context", "cause": "cause"},
                                 "isOperational": True,
                             }
                         }
                     },
                 },
+                status.HTTP_429_TOO_MANY_REQUESTS: {
+                    "model": APIErrorResponse,
+                    "description": "Too Many Requests",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Too many requests",
+                                "detail": {"context": "context", "cause": None},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
                 status.HTTP_500_INTERNAL_SERVER_ERROR: {
                     "model": APIErrorResponse,
                     "description": "Internal Server Error",
@@ -202,22 +1558,54 @@ class UserController(APIRouter):
             },
         )
         @inject
-        async def fetch_user(
+        async def renew_user(
             response: Response,
             user_id: str,
+            user_request: UserRequest,
+            if_match: Annotated[str | None, Header()] = None,
+            prefer: Annotated[str | None, Header()] = None,
             user_service: UserService = self.dependencies[0],
         ) -> UserResponse:
-            retrieved_user = await user_service.retrieve_user(user_id)
-            user_response = UserMapper.to_response(retrieved_user)
+            domain_user = UserMapper.to_domain(user_request)
+            # A conditional update has to report whether it won, so it is never
+            # queued, and neither is one that finds the queue full, which is
+            # written right away instead so that callers slow down with it.
+            if (
+                if_match is None
+                and Prefer.has(prefer, "respond-async")
+                and await user_service.enqueue_user_replacement(user_id, domain_user)
+            ):
+                return JSONResponse(
+                    status_code=status.HTTP_202_ACCEPTED,
+                    content=jsonable_encoder(user_request),
+                    headers={"Preference-Applied": "respond-async"},
+                )
+            expected_versions = None
+            if if_match is not None and if_match.strip() != "*":
+                expected_versions = UserMapper.to_versions(
+                    user_id, ETag.parse(if_match)
+                )
+            returned_user = await user_service.replace_user(
+                user_id, domain_user, expected_versions
+            )
+            user_response = UserMapper.to_response(returned_user)
+            response.headers["ETag"] = UserMapper.to_etag(returned_user)
             response.status_code = status.HTTP_200_OK
             return user_response
 
         @APIRouter.api_route(
             self,
             path="/{user_id}",
-            methods=["PUT"],
+            methods=["PATCH"],
             tags=["users"],
-            description="API endpoint used to update a user by its ID",
+            dependencies=[
+                rate_limiter("users:amend_user", self.rate_limits["amend_user"])
+            ],
+            description="""
+            API endpoint used to partially update a user by its ID.
+            Only the supplied fields are written, and nothing if none changes.
+            * @header If-Match The ETag of a fetched user. 412 if it is stale.
+            """,
             responses={
                 status.HTTP_200_OK: {
                     "model": UserResponse,
@@ -247,6 +1635,19 @@ class UserController(APIRouter):
                         }
                     },
                 },
+                status.HTTP_412_PRECONDITION_FAILED: {
+                    "model": APIErrorResponse,
+                    "description": "Precondition Failed",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "User has been modified",
+                                "detail": {"context": "context", "cause": None},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
                 status.HTTP_422_UNPROCESSABLE_ENTITY: {
                     "model": APIErrorResponse,
                     "description": "Unprocessable Entity",
@@ -260,6 +1661,19 @@ class UserController(APIRouter):
                         }
                     },
                 },
+                status.HTTP_429_TOO_MANY_REQUESTS: {
+                    "model": APIErrorResponse,
+                    "description": "Too Many Requests",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Too many requests",
+                                "detail": {"context": "context", "cause": None},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
                 status.HTTP_500_INTERNAL_SERVER_ERROR: {
                     "model": APIErrorResponse,
                     "description": "Internal Server Error",
@@ -276,15 +1690,24 @@ class UserController(APIRouter):
             },
         )
         @inject
-        async def renew_user(
+        async def amend_user(
             response: Response,
             user_id: str,
-            user_request: UserRequest,
+            user_patch_request: UserPatchRequest,
+            if_match: Annotated[str | None, Header()] = None,
             user_service: UserService = self.dependencies[0],
         ) -> UserResponse:
-            domain_user = UserMapper.to_domain(user_request)
-            returned_user = await user_service.replace_user(user_id, domain_user)
+            changes = UserMapper.to_changes(user_patch_request)
+            expected_versions = None
+            if if_match is not None and if_match.strip() != "*":
+                expected_versions = UserMapper.to_versions(
+                    user_id, ETag.parse(if_match)
+                )
+            returned_user = await user_service.modify_user(
+                user_id, changes, expected_versions
+            )
             user_response = UserMapper.to_response(returned_user)
+            response.headers["ETag"] = UserMapper.to_etag(returned_user)
             response.status_code = status.HTTP_200_OK
             return user_response
 
@@ -293,6 +1716,9 @@ class UserController(APIRouter):
             path="/{user_id}",
             methods=["DELETE"],
             tags=["users"],
+            dependencies=[
+                rate_limiter("users:destroy_user", self.rate_limits["destroy_user"])
+            ],
             description="API endpoint used to delete a user by its ID",
             responses={
                 status.HTTP_200_OK: {
@@ -323,6 +1749,19 @@ class UserController(APIRouter):
                         }
                     },
                 },
+                status.HTTP_429_TOO_MANY_REQUESTS: {
+                    "model": APIErrorResponse,
+                    "description": "Too Many Requests",
+                    "content": {
+                        "application/json": {
+                            "example": {
+                                "message": "Too many requests",
+                                "detail": {"context": "context", "cause": None},
+                                "isOperational": True,
+                            }
+                        }
+                    },
+                },
                 status.HTTP_500_INTERNAL_SERVER_ERROR: {
                     "model": APIErrorResponse,
                     "description": "Internal Server Error",
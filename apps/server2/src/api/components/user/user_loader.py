@@ -0,0 +1,84 @@
+import asyncio
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+from api.components.user.user_models import User
+from api.components.user.user_repository import UserRepository
+
+
+class IUserLoader(ABC):
+    @abstractmethod
+    def configure(self, window: float, max_batch_size: int) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def load(self, userId: str) -> User | None:
+        raise Exception("NotImplementedException")
+
+
+class UserLoader(IUserLoader):
+    __pending: dict[str, asyncio.Future]
+    __flush_handle: asyncio.TimerHandle | None
+    __tasks: set[asyncio.Task]
+
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        window: float = 0,
+        max_batch_size: int = 1,
+    ):
+        self.user_repository = user_repository
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.__pending = {}
+        self.__flush_handle = None
+        self.__tasks = set()
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.max_batch_size > 1
+
+    def configure(self, window: float, max_batch_size: int) -> None:
+        self.window = window
+        self.max_batch_size = max_batch_size
+
+    async def load(self, userId: str) -> User | None:
+        if not self.is_enabled:
+            return await self.user_repository.read_user(userId)
+        key = UUID(userId).hex
+        future = self.__pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self.__pending[key] = future
+            if len(self.__pending) >= self.max_batch_size:
+                self.__flush()
+            elif self.__flush_handle is None:
+                self.__flush_handle = loop.call_later(self.window, self.__flush)
+        # The future is shared by every caller of the same key, so one of them
+        # being cancelled must not cancel it for the others.
+        return await asyncio.shield(future)
+
+    def __flush(self) -> None:
+        if self.__flush_handle is not None:
+            self.__flush_handle.cancel()
+            self.__flush_handle = None
+        batch, self.__pending = self.__pending, {}
+        if not batch:
+            return
+        task = asyncio.ensure_future(self.__resolve(batch))
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+
+    async def __resolve(self, batch: dict[str, asyncio.Future]) -> None:
+        try:
+            users = await self.user_repository.read_users(list(batch))
+        except Exception as error:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(error)
+            return
+        users_by_key = {UUID(user.id).hex: user for user in users}
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(users_by_key.get(key))
@@ -1,7 +1,29 @@
 from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
 from typing import Any
+from uuid import UUID
 
-from api.components.user.user_models import User, UserResponse
+from fastapi import status
+from pydantic import TypeAdapter, ValidationError
+
+from api.components.user.user_models import (
+    User,
+    UserBatchResult,
+    UserChange,
+    UserChangeResponse,
+    UserCreateOperation,
+    UserDeleteOperation,
+    UserField,
+    UserFilter,
+    UserOperation,
+    UserPatchOperation,
+    UserPatchRequest,
+    UserReplaceOperation,
+    UserResponse,
+    UserUpsertResponse,
+)
+from api.shared.api_error_response import APIErrorResponse
+from server_error import Detail, ServerError
 
 
 class IUserMapper(ABC):
@@ -13,10 +35,69 @@ class IUserMapper(ABC):
     def to_domain(raw: Any) -> User:
         raise Exception("NotImplementedException")
 
+    @abstractmethod
+    def to_partial_domain(raw: Any) -> User:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def to_changes(user_patch_request: UserPatchRequest) -> dict[str, Any]:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def to_ids(ids: list[UUID] | None) -> list[str] | None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def to_filter(**conditions: Any) -> UserFilter | None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def to_fields(fields: str | None, *required_fields: str) -> list[str] | None:
+        raise Exception("NotImplementedException")
+
     @abstractmethod
     def to_response(user: User) -> UserResponse:
         raise Exception("NotImplementedException")
 
+    @abstractmethod
+    def to_partial_response(user: User, fields: list[str]) -> dict[str, Any]:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def to_upsert_response(user: User, status: str) -> UserUpsertResponse:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def to_change(raw: Any) -> UserChange:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def to_change_response(change: UserChange) -> UserChangeResponse:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def to_operation(
+        operation: UserCreateOperation
+        | UserReplaceOperation
+        | UserPatchOperation
+        | UserDeleteOperation,
+    ) -> UserOperation:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def to_batch_result(
+        operation: UserOperation, result: User | ServerError
+    ) -> UserBatchResult:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def to_etag(user: User) -> str:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def to_versions(userId: str, etags: list[str]) -> list[datetime]:
+        raise Exception("NotImplementedException")
+
 
 class UserMapper(IUserMapper):
     @staticmethod
@@ -33,6 +114,46 @@ class UserMapper(IUserMapper):
             updated_at=raw.updated_at if hasattr(raw, "updated_at") else None,
         )
 
+    @staticmethod
+    def to_partial_domain(raw: Any) -> User:
+        # Only the selected columns are read, so the user is built without
+        # validation and carries none of the fields that were left out.
+        return User.model_construct(**vars(raw))
+
+    @staticmethod
+    def to_changes(user_patch_request: UserPatchRequest) -> dict[str, Any]:
+        return user_patch_request.model_dump(exclude_unset=True)
+
+    @staticmethod
+    def to_ids(ids: list[UUID] | None) -> list[str] | None:
+        if ids is None:
+            return None
+        return [id.hex for id in ids]
+
+    @staticmethod
+    def to_filter(**conditions: Any) -> UserFilter | None:
+        if all(condition is None for condition in conditions.values()):
+            return None
+        return UserFilter(**conditions)
+
+    @staticmethod
+    def to_fields(fields: str | None, *required_fields: str) -> list[str] | None:
+        if fields is None:
+            return None
+        try:
+            selected_fields = TypeAdapter(list[UserField]).validate_python(
+                fields.split(",")
+            )
+        except ValidationError as error:
+            message = "Invalid fields"
+            print(message, error)
+            raise ServerError(
+                message,
+                status.HTTP_422_UNPROCESSABLE_ENTITY,
+                Detail(context=fields, cause=None),
+            )
+        return list(dict.fromkeys([*selected_fields, *required_fields]))
+
     @staticmethod
     def to_response(user: User) -> UserResponse:
         return UserResponse(
@@ -42,3 +163,94 @@ class UserMapper(IUserMapper):
             created_at=user.created_at,
             updated_at=user.updated_at,
         )
+
+    @staticmethod
+    def to_partial_response(user: User, fields: list[str]) -> dict[str, Any]:
+        return {field: getattr(user, field) for field in fields}
+
+    @staticmethod
+    def to_upsert_response(user: User, status: str) -> UserUpsertResponse:
+        return UserUpsertResponse(
+            **UserMapper.to_response(user).model_dump(), status=status
+        )
+
+    @staticmethod
+    def to_change(raw: Any) -> UserChange:
+        return UserChange(
+            user_id=raw.user_id,
+            operation=raw.operation,
+            name=raw.name,
+            email=raw.email,
+            created_at=raw.created_at,
+            changed_at=raw.changed_at,
+        )
+
+    @staticmethod
+    def to_change_response(change: UserChange) -> UserChangeResponse:
+        return UserChangeResponse(**change.model_dump())
+
+    @staticmethod
+    def to_operation(
+        operation: UserCreateOperation
+        | UserReplaceOperation
+        | UserPatchOperation
+        | UserDeleteOperation,
+    ) -> UserOperation:
+        if isinstance(operation, UserCreateOperation):
+            return UserOperation(
+                method=operation.method, user=UserMapper.to_domain(operation.user)
+            )
+        if isinstance(operation, UserReplaceOperation):
+            return UserOperation(
+                method=operation.method,
+                userId=operation.id.hex,
+                user=UserMapper.to_domain(operation.user),
+            )
+        if isinstance(operation, UserPatchOperation):
+            return UserOperation(
+                method=operation.method,
+                userId=operation.id.hex,
+                changes=UserMapper.to_changes(operation.changes),
+            )
+        return UserOperation(method=operation.method, userId=operation.id.hex)
+
+    @staticmethod
+    def to_batch_result(
+        operation: UserOperation, result: User | ServerError
+    ) -> UserBatchResult:
+        if isinstance(result, ServerError):
+            return UserBatchResult(
+                status=result.status_code,
+                error=APIErrorResponse(
+                    message=result.message,
+                    detail=result.detail,
+                    is_operational=result.is_operational,
+                ),
+            )
+        return UserBatchResult(
+            status=status.HTTP_201_CREATED
+            if operation.method == "create"
+            else status.HTTP_200_OK,
+            record=UserMapper.to_response(result),
+        )
+
+    @staticmethod
+    def to_etag(user: User) -> str:
+        version = user.updated_at or user.created_at
+        elapsed = version.replace(tzinfo=None) - datetime(1970, 1, 1)
+        return f'"{user.id}-{elapsed // timedelta(microseconds=1):x}"'
+
+    @staticmethod
+    def to_versions(userId: str, etags: list[str]) -> list[datetime]:
+        versions: list[datetime] = []
+        for etag in etags:
+            try:
+                id, elapsed = etag.strip('"').rsplit("-", 1)
+                if UUID(id) != UUID(userId):
+                    continue
+                versions.append(
+                    datetime(1970, 1, 1) + timedelta(microseconds=int(elapsed, 16))
+                )
+            except ValueError:
+                continue
+        return versions
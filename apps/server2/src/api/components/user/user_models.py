@@ -1,8 +1,12 @@
 import datetime
+from typing import Annotated, Any, Literal, Union
+from uuid import UUID
 
 from pydantic import BaseModel, EmailStr, Field, model_validator
 from typing_extensions import Self
 
+from api.shared.api_error_response import APIErrorResponse
+
 
 class UserRequest(BaseModel):
     name: str = Field(max_length=256)
@@ -13,6 +17,33 @@ class UserRequest(BaseModel):
         return self
 
 
+class UserUpsertRequest(BaseModel):
+    name: str = Field(max_length=256)
+
+
+class UserBulkUpsertRequest(BaseModel):
+    users: list[UserRequest] = Field(min_length=1, max_length=1000)
+
+    @model_validator(mode="after")
+    def validate(self) -> Self:
+        emails = [user.email.lower() for user in self.users]
+        if len(set(emails)) != len(emails):
+            raise ValueError("emails must be unique")
+        return self
+
+
+class UserPatchRequest(BaseModel):
+    name: str | None = Field(default=None, max_length=256)
+    email: EmailStr | None = None
+
+    @model_validator(mode="after")
+    def validate(self) -> Self:
+        for field_name in self.model_fields_set:
+            if getattr(self, field_name) is None:
+                raise ValueError(f"{field_name} cannot be null")
+        return self
+
+
 class User(BaseModel):
     id: str | None = None
     name: str
@@ -27,3 +58,153 @@ class UserResponse(BaseModel):
     email: str
     created_at: datetime.datetime
     updated_at: datetime.datetime | None
+
+
+class UserUpsertResponse(UserResponse):
+    status: Literal["created", "updated", "unchanged"]
+
+
+class UserChange(BaseModel):
+    user_id: str
+    operation: Literal["created", "updated", "deleted"]
+    name: str
+    email: str
+    created_at: datetime.datetime
+    changed_at: datetime.datetime
+
+
+class UserChangeResponse(UserChange):
+    pass
+
+
+class UserChangesResponse(BaseModel):
+    records: list[UserChangeResponse]
+    next: str
+
+
+class UserSearchResponse(BaseModel):
+    records: list[UserResponse]
+    next: str | None
+
+
+class UserBatchGetRequest(BaseModel):
+    ids: list[UUID] = Field(min_length=1, max_length=100)
+
+
+class UserBatchGetResponse(BaseModel):
+    records: list[UserResponse]
+    missing: list[str]
+
+
+UserField = Literal["id", "name", "email", "created_at", "updated_at"]
+
+
+UserSort = Literal["created_at", "-created_at", "name", "-name", "email", "-email"]
+
+
+class UserFilter(BaseModel):
+    name_prefix: str | None = Field(default=None, min_length=1)
+    name_contains: str | None = Field(default=None, min_length=1)
+    email_prefix: str | None = Field(default=None, min_length=1)
+    email_suffix: str | None = Field(default=None, min_length=1)
+    created_after: datetime.datetime | None = None
+    created_before: datetime.datetime | None = None
+
+    @model_validator(mode="after")
+    def validate(self) -> Self:
+        if all(
+            getattr(self, field_name) is None for field_name in type(self).model_fields
+        ):
+            raise ValueError("filter must set at least one field")
+        return self
+
+
+class UserBulkDeleteRequest(BaseModel):
+    ids: list[UUID] | None = Field(default=None, min_length=1, max_length=10000)
+    filter: UserFilter | None = None
+    chunk_size: int = Field(default=1000, ge=1, le=10000)
+
+    @model_validator(mode="after")
+    def validate(self) -> Self:
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("exactly one of ids or filter must be set")
+        return self
+
+
+class UserBulkUpdateRequest(UserBulkDeleteRequest):
+    changes: UserPatchRequest
+
+    @model_validator(mode="after")
+    def validate_changes(self) -> Self:
+        if not self.changes.model_fields_set:
+            raise ValueError("changes must set at least one field")
+        if "email" in self.changes.model_fields_set:
+            raise ValueError("email is unique and cannot be bulk updated")
+        return self
+
+
+class UserBulkResponse(BaseModel):
+    count: int
+    ids: list[str]
+
+
+class UserCreateOperation(BaseModel):
+    method: Literal["create"]
+    user: UserRequest
+
+
+class UserReplaceOperation(BaseModel):
+    method: Literal["replace"]
+    id: UUID
+    user: UserRequest
+
+
+class UserPatchOperation(BaseModel):
+    method: Literal["patch"]
+    id: UUID
+    changes: UserPatchRequest
+
+
+class UserDeleteOperation(BaseModel):
+    method: Literal["delete"]
+    id: UUID
+
+
+class UserBatchRequest(BaseModel):
+    operations: list[
+        Annotated[
+            Union[
+                UserCreateOperation,
+                UserReplaceOperation,
+                UserPatchOperation,
+                UserDeleteOperation,
+            ],
+            Field(discriminator="method"),
+        ]
+    ] = Field(min_length=1, max_length=100)
+    atomic: bool = False
+
+
+class UserOperation(BaseModel):
+    method: Literal["create", "replace", "patch", "delete"]
+    userId: str | None = None
+    user: User | None = None
+    changes: dict[str, Any] | None = None
+
+
+class UserBatchResult(BaseModel):
+    status: int
+    record: UserResponse | None = None
+    error: APIErrorResponse | None = None
+
+
+class UserBatchResponse(BaseModel):
+    results: list[UserBatchResult]
+
+
+class UserWriteQueueMetrics(BaseModel):
+    depth: int
+    lag: float
+    flush_latency: float
+    flushed: int
+    failed: int
@@ -0,0 +1,89 @@
+import asyncio
+from abc import ABC, abstractmethod
+
+from api.components.user.user_repository import UserRepository
+from services.db_service import DBService
+
+
+class IUserPurger(ABC):
+    @abstractmethod
+    def configure(
+        self, batch_size: int, interval: float, max_active_queries: int
+    ) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def start(self) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def stop(self) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def purge(self) -> int:
+        raise Exception("NotImplementedException")
+
+
+class UserPurger(IUserPurger):
+    __task: asyncio.Task | None
+
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        db_service: DBService,
+        batch_size: int = 100,
+        interval: float = 1,
+        max_active_queries: int = 2,
+    ):
+        self.user_repository = user_repository
+        self.db_service = db_service
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_active_queries = max_active_queries
+        self.__task = None
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.user_repository.soft_delete and self.batch_size > 0
+
+    def configure(
+        self, batch_size: int, interval: float, max_active_queries: int
+    ) -> None:
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_active_queries = max_active_queries
+
+    def start(self) -> None:
+        if not self.is_enabled or self.__task is not None:
+            return
+        self.__task = asyncio.ensure_future(self.__run())
+
+    async def stop(self) -> None:
+        if self.__task is None:
+            return
+        self.__task.cancel()
+        try:
+            await self.__task
+        except asyncio.CancelledError:
+            pass
+        self.__task = None
+
+    async def purge(self) -> int:
+        # A batch only runs while the database is quiet, so that the deletes and
+        # the index maintenance they cause stay away from the busy periods.
+        active_query_count = await self.db_service.get_database_active_query_count()
+        if active_query_count > self.max_active_queries:
+            return 0
+        return await self.user_repository.purge_users(self.batch_size)
+
+    async def __run(self) -> None:
+        while True:
+            try:
+                await self.purge()
+            except Exception as error:
+                message = "An error occurred when purging the deleted users"
+                print(message, error)
+            # The pause between batches throttles the purge however many users
+            # are waiting for it.
+            await asyncio.sleep(self.interval)
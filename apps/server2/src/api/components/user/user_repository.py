@@ -1,120 +1,1138 @@
+import asyncio
+import heapq
+import re
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractAsyncContextManager
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, TypeVar
 from uuid import UUID
 
-from db.models.user import UserModel
-from sqlalchemy import delete, desc, func, insert, select, update
+from db.models.default import generate_id
+from db.models.table_version import TableVersionModel
+from db.models.user import UserModel, search_vector
+from db.models.user_change import XID8, UserChangeModel
+from db.models.user_email import UserEmailModel
+from sqlalchemy import (
+    CursorResult,
+    DateTime,
+    Executable,
+    String,
+    and_,
+    any_,
+    bindparam,
+    column,
+    delete,
+    exists,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.sql.elements import ColumnElement
 
 from api.components.user.user_mapper import UserMapper
-from api.components.user.user_models import User
+from api.components.user.user_models import User, UserChange, UserFilter, UserSort
 from api.utils.dict_to_obj import DictToObj
 from services.db_service import DBService
 
+T = TypeVar("T")
+
+# Every read and write leaves the soft deleted users out, which also lets the
+# partial indexes on the users that are not deleted serve them.
+is_not_deleted = UserModel.deleted_at.is_(None)
+
 
 class IUserRepository(ABC):
     @abstractmethod
-    async def create_user(self, user: User) -> User:
+    def configure(
+        self, soft_delete: bool, insert_window: float, insert_max_batch_size: int
+    ) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def transaction(self) -> AbstractAsyncContextManager[None]:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def create_user(self, user: User) -> User | None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def upsert_users(self, users: list[User]) -> list[tuple[User, str]]:
         raise Exception("NotImplementedException")
 
     @abstractmethod
     async def read_and_count_users(
-        self, page: int, limit: int
+        self,
+        page: int,
+        limit: int,
+        user_filter: UserFilter | None = None,
+        sort: UserSort = "-created_at",
+        fields: list[str] | None = None,
     ) -> tuple[list[User], int]:
         raise Exception("NotImplementedException")
 
     @abstractmethod
-    async def read_user(self, userId: str) -> User | None:
+    async def read_users_version(self) -> int:
         raise Exception("NotImplementedException")
 
     @abstractmethod
-    async def update_user(self, userId: str, user: User) -> User | None:
+    async def read_users(self, userIds: list[str]) -> list[User]:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def read_user(
+        self, userId: str, fields: list[str] | None = None
+    ) -> User | None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def read_user_by_email(self, email: str) -> User | None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def search_users(
+        self, text: str, limit: int, after: tuple[float, str] | None = None
+    ) -> list[tuple[User, float]]:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def read_user_changes(
+        self, after: list[tuple[int, int]] | None, limit: int
+    ) -> tuple[list[UserChange], list[tuple[int, int]]]:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def read_latest_user_change_positions(self) -> list[tuple[int, int]]:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def update_user(
+        self,
+        userId: str,
+        user: User,
+        expected_versions: list[datetime] | None = None,
+    ) -> User | None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def update_users(
+        self, users: list[tuple[str, User]], written_at: list[datetime] | None = None
+    ) -> list[User]:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def patch_user(
+        self,
+        userId: str,
+        changes: dict[str, Any],
+        expected_versions: list[datetime] | None = None,
+    ) -> User | None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def patch_users(
+        self,
+        userIds: list[str] | None,
+        user_filter: UserFilter | None,
+        changes: dict[str, Any],
+        chunk_size: int,
+    ) -> list[str]:
         raise Exception("NotImplementedException")
 
     @abstractmethod
     async def delete_user(self, userId: str) -> User | None:
         raise Exception("NotImplementedException")
 
+    @abstractmethod
+    async def delete_users(
+        self,
+        userIds: list[str] | None,
+        user_filter: UserFilter | None,
+        chunk_size: int,
+    ) -> list[str]:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def purge_users(self, batch_size: int) -> int:
+        raise Exception("NotImplementedException")
+
 
 class UserRepository(IUserRepository):
-    def __init__(self, db_service: DBService):
+    NO_PARTITION_FOUND = "23514"
+    UNIQUE_VIOLATION = "23505"
+    CACHE_CHANNEL = "user_cache"
+    # A notification payload has to stay under 8000 bytes.
+    CACHE_NOTIFY_CHUNK_SIZE = 200
+
+    __pending_inserts: dict[AsyncEngine, list[tuple[dict[str, Any], asyncio.Future]]]
+    __insert_flush_handles: dict[AsyncEngine, asyncio.TimerHandle]
+    __tasks: set[asyncio.Task]
+
+    def __init__(
+        self,
+        db_service: DBService,
+        partitions_ahead: int = 3,
+        soft_delete: bool = False,
+        insert_window: float = 0,
+        insert_max_batch_size: int = 1,
+    ):
         self.db_service = db_service
+        self.partitions_ahead = partitions_ahead
+        self.soft_delete = soft_delete
+        self.insert_window = insert_window
+        self.insert_max_batch_size = insert_max_batch_size
+        self.__pending_inserts = {}
+        self.__insert_flush_handles = {}
+        self.__tasks = set()
+
+    def configure(
+        self, soft_delete: bool, insert_window: float, insert_max_batch_size: int
+    ) -> None:
+        self.soft_delete = soft_delete
+        self.insert_window = insert_window
+        self.insert_max_batch_size = insert_max_batch_size
+
+    @property
+    def is_group_commit_enabled(self) -> bool:
+        return self.insert_max_batch_size > 1
+
+    @property
+    def is_sharded(self) -> bool:
+        return len(self.db_service.shard_async_engines) > 1
 
-    async def create_user(self, user: User) -> User:
+    def transaction(self) -> AbstractAsyncContextManager[None]:
+        return self.db_service.transaction()
+
+    async def create_user(self, user: User) -> User | None:
         raw_user_data = UserMapper.to_persistence(user)
-        async with self.db_service.async_engine.connect() as conn:
-            query = insert(UserModel).values(raw_user_data).returning(UserModel)
-            result = await conn.execute(query)
-            obj = DictToObj(result.first()._asdict())
-            await conn.commit()
-            return UserMapper.to_domain(obj)
+        # The id is generated up front since it decides the shard of the user.
+        raw_user_data["id"] = generate_id()
+        # Each shard only knows its own emails, so the others are checked first.
+        # Unlike the check within a shard, this one can race with a concurrent
+        # insert of the same email landing on another shard.
+        if self.is_sharded and await self.read_user_by_email(user.email) is not None:
+            return None
+        async_engine = self.db_service.get_shard_async_engine(str(raw_user_data["id"]))
+        # Within a transaction the insert has to run on its connection, which
+        # the inserts gathered from other requests cannot share.
+        if self.is_group_commit_enabled and not self.db_service.in_transaction:
+            return await self.__enqueue_insert(async_engine, raw_user_data)
+        [created_user] = await self.__insert_users(async_engine, [raw_user_data])
+        return created_user
+
+    async def upsert_users(self, users: list[User]) -> list[tuple[User, str]]:
+        # Every user goes to the shard that already holds its email, or to the
+        # shard of a new id when none does.
+        input_users_by_engine: dict[AsyncEngine, list[tuple[UUID, User]]] = {}
+        engines_by_email = await self.__read_engines_by_email(
+            [user.email for user in users]
+        )
+        for user in users:
+            id = generate_id()
+            async_engine = engines_by_email.get(
+                user.email.lower(), self.db_service.get_shard_async_engine(str(id))
+            )
+            input_users_by_engine.setdefault(async_engine, []).append((id, user))
+        records_by_email: dict[str, tuple[User, str]] = {}
+        for records in await asyncio.gather(
+            *[
+                self.__upsert_shard_users(async_engine, input_users)
+                for async_engine, input_users in input_users_by_engine.items()
+            ]
+        ):
+            records_by_email.update(records)
+        return [records_by_email[user.email.lower()] for user in users]
 
     async def read_and_count_users(
-        self, page: int, limit: int
+        self,
+        page: int,
+        limit: int,
+        user_filter: UserFilter | None = None,
+        sort: UserSort = "-created_at",
+        fields: list[str] | None = None,
     ) -> tuple[list[User], int]:
-        async with self.db_service.async_engine.connect() as conn:
+        conditions = [
+            is_not_deleted,
+            *([] if user_filter is None else self.__to_filter_conditions(user_filter)),
+        ]
+        order_by = self.__to_order_by(sort)
+        offset = (page - 1) * limit
+        sort_field = sort.removeprefix("-")
+        shard_limit, shard_offset, shard_fields = limit, offset, fields
+        if self.is_sharded:
+            # Each shard returns all its users up to the end of the page, along
+            # with the keys they are merged by, and the page is cut from the
+            # merged users.
+            shard_limit, shard_offset = offset + limit, 0
+            if fields is not None:
+                shard_fields = list(dict.fromkeys([*fields, sort_field, "id"]))
+
+        async def read_shard(conn: AsyncConnection) -> tuple[list[User], int]:
             subquery = (
-                select(UserModel.id)
-                .order_by(desc(UserModel.created_at))
-                .limit(limit)
-                .offset((page - 1) * limit)
+                select(UserModel.id, UserModel.created_at)
+                .where(*conditions)
+                .order_by(*order_by)
+                .limit(shard_limit)
+                .offset(shard_offset)
                 .subquery()
             )
+            # The conditions are repeated on the outer query so that the users
+            # of the page are looked up only in the partitions they can be in.
             query = (
-                select(UserModel)
+                select(*self.__to_columns(shard_fields))
                 .join(
                     subquery,
-                    UserModel.id == subquery.c.id,
+                    and_(
+                        UserModel.id == subquery.c.id,
+                        UserModel.created_at == subquery.c.created_at,
+                    ),
                 )
-                .order_by(desc(UserModel.created_at))
+                .where(*conditions)
+                .order_by(*order_by)
             )
             result = await conn.execute(query)
             records_result: list[User] = []
             for record in result.all():
                 obj = DictToObj(record._asdict())
-                records_result.append(UserMapper.to_domain(obj))
+                records_result.append(self.__to_domain(obj, shard_fields))
 
-            query = select(func.count(UserModel.id).label("count"))
+            query = select(func.count(UserModel.id).label("count")).where(*conditions)
             result = await conn.execute(query)
             obj = DictToObj(result.first()._asdict())
-            total_result = obj.count
-            await conn.commit()
+            return records_result, obj.count
+
+        shard_results = await self.__gather(read_shard)
+        if not self.is_sharded:
+            return shard_results[0]
+        records_result = list(
+            islice(
+                heapq.merge(
+                    *[records for records, _ in shard_results],
+                    key=lambda user: (
+                        getattr(user, sort_field),
+                        UUID(str(user.id)),
+                    ),
+                    reverse=sort.startswith("-"),
+                ),
+                offset,
+                offset + limit,
+            )
+        )
+        if shard_fields != fields:
+            records_result = [
+                UserMapper.to_partial_domain(
+                    DictToObj({field: getattr(user, field) for field in fields})
+                )
+                for user in records_result
+            ]
+        return records_result, sum(total for _, total in shard_results)
+
+    async def read_users_version(self) -> int:
+        # Every shard bumps its own version, spread over the slots of its
+        # table_versions, so the sum of them all grows whenever the users of
+        # any shard are written.
+        async def read_shard(conn: AsyncConnection) -> int:
+            query = select(func.coalesce(func.sum(TableVersionModel.version), 0)).where(
+                TableVersionModel.table_name == UserModel.__tablename__
+            )
+            result = await conn.execute(query)
+            return int(result.scalar_one())
+
+        return sum(await self.__gather(read_shard))
+
+    async def read_users(self, userIds: list[str]) -> list[User]:
+        async def read_shard(async_engine: AsyncEngine, userIds: list[str]):
+            async with self.db_service.connect(async_engine) as conn:
+                query = select(UserModel).where(
+                    UserModel.id == any_(self.__to_id_array(userIds)), is_not_deleted
+                )
+                result = await conn.execute(query)
+                records_result: list[User] = []
+                for record in result.all():
+                    obj = DictToObj(record._asdict())
+                    records_result.append(UserMapper.to_domain(obj))
+                await conn.commit()
+                return records_result
 
-            return records_result, total_result
+        shard_results = await asyncio.gather(
+            *[
+                read_shard(async_engine, userIds)
+                for async_engine, userIds in self.__group_by_engine(userIds).items()
+            ]
+        )
+        return [user for records_result in shard_results for user in records_result]
 
-    async def read_user(self, userId: str) -> User | None:
-        async with self.db_service.async_engine.connect() as conn:
-            query = select(UserModel).where(UserModel.id == UUID(userId))
+    async def read_user(
+        self, userId: str, fields: list[str] | None = None
+    ) -> User | None:
+        async_engine = self.db_service.get_shard_async_engine(userId)
+        async with self.db_service.connect(async_engine) as conn:
+            query = select(*self.__to_columns(fields)).where(
+                UserModel.id == UUID(userId), is_not_deleted
+            )
             result = await conn.execute(query)
             if result.rowcount == 0:
                 return None
             obj = DictToObj(result.first()._asdict())
             await conn.commit()
+            return self.__to_domain(obj, fields)
+
+    async def read_user_by_email(self, email: str) -> User | None:
+        async def read_shard(conn: AsyncConnection) -> User | None:
+            query = select(UserModel).where(
+                func.lower(UserModel.email) == func.lower(email), is_not_deleted
+            )
+            result = await conn.execute(query)
+            record = result.first()
+            if record is None:
+                return None
+            obj = DictToObj(record._asdict())
             return UserMapper.to_domain(obj)
 
-    async def update_user(self, userId: str, user: User) -> User | None:
-        async with self.db_service.async_engine.connect() as conn:
+        for user in await self.__gather(read_shard):
+            if user is not None:
+                return user
+        return None
+
+    async def search_users(
+        self, text: str, limit: int, after: tuple[float, str] | None = None
+    ) -> list[tuple[User, float]]:
+        terms = re.findall(r"[^\W_]+", text.lower())
+        if not terms:
+            return []
+        # Each term matches as a prefix, and only letters and digits reach the
+        # query so that no input can break the tsquery syntax.
+        search_query = func.to_tsquery(
+            literal_column("'simple'"),
+            bindparam("search_query", " & ".join(f"{term}:*" for term in terms)),
+        )
+        rank = func.ts_rank(search_vector, search_query)
+        conditions = [search_vector.op("@@")(search_query), is_not_deleted]
+        if after is not None:
+            after_rank, after_id = after
+            conditions.append(
+                or_(
+                    rank < after_rank,
+                    and_(rank == after_rank, UserModel.id > UUID(after_id)),
+                )
+            )
+
+        async def read_shard(conn: AsyncConnection) -> list[tuple[User, float]]:
+            query = (
+                select(UserModel, rank.label("rank"))
+                .where(*conditions)
+                .order_by(rank.desc(), UserModel.id)
+                .limit(limit)
+            )
+            result = await conn.execute(query)
+            records_result: list[tuple[User, float]] = []
+            for record in result.all():
+                obj = DictToObj(record._asdict())
+                records_result.append((UserMapper.to_domain(obj), obj.rank))
+            return records_result
+
+        return list(
+            islice(
+                heapq.merge(
+                    *await self.__gather(read_shard),
+                    key=lambda record: (-record[1], UUID(record[0].id)),
+                ),
+                limit,
+            )
+        )
+
+    async def read_user_changes(
+        self, after: list[tuple[int, int]] | None, limit: int
+    ) -> tuple[list[UserChange], list[tuple[int, int]]]:
+        # The changes are read in the order of the transactions that made them,
+        # and only from those older than any still running, which could yet
+        # commit changes ordered before the ones already read.
+        async def read_shard(
+            async_engine: AsyncEngine, position: tuple[int, int]
+        ) -> list[Any]:
+            async with self.db_service.connect(async_engine) as conn:
+                transaction_id, id = position
+                query = (
+                    select(UserChangeModel)
+                    .where(
+                        UserChangeModel.transaction_id
+                        < func.pg_snapshot_xmin(func.pg_current_snapshot()),
+                        tuple_(UserChangeModel.transaction_id, UserChangeModel.id)
+                        > tuple_(
+                            bindparam("transaction_id", transaction_id, type_=XID8()),
+                            bindparam("id", id),
+                        ),
+                    )
+                    .order_by(UserChangeModel.transaction_id, UserChangeModel.id)
+                    .limit(limit)
+                )
+                result = await conn.execute(query)
+                records = result.all()
+                await conn.commit()
+                return records
+
+        # Every shard has a position of its own, as their transactions are not
+        # ordered against each other.
+        positions = list(after or [])[: len(self.db_service.shard_async_engines)]
+        positions += [(0, 0)] * (
+            len(self.db_service.shard_async_engines) - len(positions)
+        )
+        shard_results = await asyncio.gather(
+            *[
+                read_shard(async_engine, position)
+                for async_engine, position in zip(
+                    self.db_service.shard_async_engines, positions
+                )
+            ]
+        )
+        changes: list[UserChange] = []
+        for index, record in islice(
+            heapq.merge(
+                *[
+                    [(index, record) for record in records]
+                    for index, records in enumerate(shard_results)
+                ],
+                key=lambda item: item[1].changed_at,
+            ),
+            limit,
+        ):
+            positions[index] = (record.transaction_id, record.id)
+            changes.append(UserMapper.to_change(DictToObj(record._asdict())))
+        return changes, positions
+
+    async def read_latest_user_change_positions(self) -> list[tuple[int, int]]:
+        async def read_shard(conn: AsyncConnection) -> tuple[int, int]:
+            query = (
+                select(UserChangeModel.transaction_id, UserChangeModel.id)
+                .where(
+                    UserChangeModel.transaction_id
+                    < func.pg_snapshot_xmin(func.pg_current_snapshot())
+                )
+                .order_by(
+                    UserChangeModel.transaction_id.desc(), UserChangeModel.id.desc()
+                )
+                .limit(1)
+            )
+            result = await conn.execute(query)
+            record = result.first()
+            return (0, 0) if record is None else tuple(record)
+
+        return await self.__gather(read_shard)
+
+    async def update_user(
+        self,
+        userId: str,
+        user: User,
+        expected_versions: list[datetime] | None = None,
+    ) -> User | None:
+        async_engine = self.db_service.get_shard_async_engine(userId)
+        async with self.db_service.connect(async_engine) as conn:
             query = (
                 update(UserModel)
-                .where(UserModel.id == UUID(userId))
+                .where(UserModel.id == UUID(userId), is_not_deleted)
                 .values(name=user.name, email=user.email)
                 .returning(UserModel)
             )
+            if expected_versions is not None:
+                query = query.where(
+                    func.coalesce(UserModel.updated_at, UserModel.created_at).in_(
+                        expected_versions
+                    )
+                )
             result = await conn.execute(query)
             if result.rowcount == 0:
                 return None
             obj = DictToObj(result.first()._asdict())
+            await self.__notify_cache(conn, [userId])
             await conn.commit()
             return UserMapper.to_domain(obj)
 
+    async def update_users(
+        self, users: list[tuple[str, User]], written_at: list[datetime] | None = None
+    ) -> list[User]:
+        # All the users of a shard are written by a single UPDATE in a single
+        # transaction, so a batch costs one round trip and one commit per shard.
+        async def update_shard(
+            async_engine: AsyncEngine, userIds: list[str]
+        ) -> list[User]:
+            input_users = values(
+                column("id", PG_UUID(as_uuid=True)),
+                column("name", String),
+                column("email", String),
+                column("written_at", DateTime(timezone=True)),
+                name="input_users",
+            ).data(
+                [
+                    (
+                        UUID(userId),
+                        users_by_id[userId].name,
+                        users_by_id[userId].email,
+                        written_at_by_id.get(userId),
+                    )
+                    for userId in userIds
+                ]
+            )
+            query = (
+                update(UserModel)
+                .where(UserModel.id == input_users.c.id, is_not_deleted)
+                .values(name=input_users.c.name, email=input_users.c.email)
+                .returning(UserModel)
+            )
+            if written_at is not None:
+                # A write made earlier than the last one of its user is left
+                # out, and otherwise its time becomes the version of the user,
+                # so that the writes made after it still apply.
+                query = query.where(
+                    func.coalesce(UserModel.updated_at, UserModel.created_at)
+                    < input_users.c.written_at
+                ).values(updated_at=input_users.c.written_at)
+            async with self.db_service.connect(async_engine) as conn:
+                result = await conn.execute(query)
+                records_result: list[User] = []
+                for record in result.all():
+                    obj = DictToObj(record._asdict())
+                    records_result.append(UserMapper.to_domain(obj))
+                await self.__notify_cache(conn, [user.id for user in records_result])
+                await conn.commit()
+                return records_result
+
+        # A user written more than once keeps only the last of its writes.
+        users_by_id = {UUID(userId).hex: user for userId, user in users}
+        written_at_by_id = {
+            UUID(userId).hex: write_time
+            for (userId, _), write_time in zip(users, written_at or [])
+        }
+        shard_results = await asyncio.gather(
+            *[
+                update_shard(async_engine, userIds)
+                for async_engine, userIds in self.__group_by_engine(
+                    list(users_by_id)
+                ).items()
+            ]
+        )
+        return [user for records_result in shard_results for user in records_result]
+
+    async def patch_user(
+        self,
+        userId: str,
+        changes: dict[str, Any],
+        expected_versions: list[datetime] | None = None,
+    ) -> User | None:
+        async_engine = self.db_service.get_shard_async_engine(userId)
+        async with self.db_service.connect(async_engine) as conn:
+            conditions = [UserModel.id == UUID(userId), is_not_deleted]
+            if expected_versions is not None:
+                conditions.append(
+                    func.coalesce(UserModel.updated_at, UserModel.created_at).in_(
+                        expected_versions
+                    )
+                )
+            query = select(UserModel).where(*conditions)
+            if changes:
+                # Only the columns whose value actually differs are written, and
+                # when none does the UPDATE matches no row and the current row
+                # is returned as it was, so a no-op patch never writes.
+                updated_users = (
+                    update(UserModel)
+                    .where(*conditions, self.__to_changed_condition(changes))
+                    .values(changes)
+                    .returning(UserModel)
+                    .cte("updated_users")
+                )
+                query = select(updated_users).union_all(
+                    query.where(~exists(select(updated_users.c.id)))
+                )
+            result = await conn.execute(query)
+            record = result.first()
+            if record is not None and changes:
+                await self.__notify_cache(conn, [userId])
+            await conn.commit()
+            if record is None:
+                return None
+            obj = DictToObj(record._asdict())
+            return UserMapper.to_domain(obj)
+
+    async def patch_users(
+        self,
+        userIds: list[str] | None,
+        user_filter: UserFilter | None,
+        changes: dict[str, Any],
+        chunk_size: int,
+    ) -> list[str]:
+        changed_condition = self.__to_changed_condition(changes)
+        return await self.__run_in_chunks(
+            userIds,
+            user_filter,
+            chunk_size,
+            lambda condition: update(UserModel)
+            .where(condition, changed_condition)
+            .values(changes)
+            .returning(UserModel.id),
+            changed_condition,
+        )
+
     async def delete_user(self, userId: str) -> User | None:
-        async with self.db_service.async_engine.connect() as conn:
+        async_engine = self.db_service.get_shard_async_engine(userId)
+        async with self.db_service.connect(async_engine) as conn:
             query = (
-                delete(UserModel)
-                .where(UserModel.id == UUID(userId))
+                self.__to_delete_query()
+                .where(UserModel.id == UUID(userId), is_not_deleted)
                 .returning(UserModel)
             )
             result = await conn.execute(query)
             if result.rowcount == 0:
                 return None
             obj = DictToObj(result.first()._asdict())
+            await self.__notify_cache(conn, [userId])
             await conn.commit()
             return UserMapper.to_domain(obj)
+
+    async def delete_users(
+        self,
+        userIds: list[str] | None,
+        user_filter: UserFilter | None,
+        chunk_size: int,
+    ) -> list[str]:
+        return await self.__run_in_chunks(
+            userIds,
+            user_filter,
+            chunk_size,
+            lambda condition: self.__to_delete_query()
+            .where(condition)
+            .returning(UserModel.id),
+        )
+
+    async def purge_users(self, batch_size: int) -> int:
+        # The users deleted first are purged first, and the ones locked by a
+        # concurrent purge are skipped rather than waited for.
+        purged_users = (
+            select(UserModel.id, UserModel.created_at)
+            .where(UserModel.deleted_at.is_not(None))
+            .order_by(UserModel.deleted_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        query = delete(UserModel).where(
+            tuple_(UserModel.id, UserModel.created_at).in_(purged_users)
+        )
+
+        async def purge_shard(conn: AsyncConnection) -> int:
+            result = await conn.execute(query)
+            return result.rowcount
+
+        return sum(await self.__gather(purge_shard))
+
+    async def __enqueue_insert(
+        self, async_engine: AsyncEngine, raw_user_data: dict[str, Any]
+    ) -> User | None:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self.__pending_inserts.setdefault(async_engine, [])
+        pending.append((raw_user_data, future))
+        if len(pending) >= self.insert_max_batch_size:
+            self.__flush_inserts(async_engine)
+        elif async_engine not in self.__insert_flush_handles:
+            self.__insert_flush_handles[async_engine] = loop.call_later(
+                self.insert_window, self.__flush_inserts, async_engine
+            )
+        # The insert goes ahead with the rest of its batch even if its caller
+        # is cancelled, as the other callers are waiting on the same commit.
+        return await asyncio.shield(future)
+
+    def __flush_inserts(self, async_engine: AsyncEngine) -> None:
+        flush_handle = self.__insert_flush_handles.pop(async_engine, None)
+        if flush_handle is not None:
+            flush_handle.cancel()
+        batch = self.__pending_inserts.pop(async_engine, [])
+        if not batch:
+            return
+        task = asyncio.ensure_future(self.__resolve_inserts(async_engine, batch))
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+
+    async def __resolve_inserts(
+        self,
+        async_engine: AsyncEngine,
+        batch: list[tuple[dict[str, Any], asyncio.Future]],
+    ) -> None:
+        try:
+            created_users = await self.__insert_users(
+                async_engine, [raw_user_data for raw_user_data, _ in batch]
+            )
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for created_user, (_, future) in zip(created_users, batch):
+            if not future.done():
+                future.set_result(created_user)
+
+    async def __insert_users(
+        self, async_engine: AsyncEngine, raw_users_data: list[dict[str, Any]]
+    ) -> list[User | None]:
+        # All the users are inserted by a single statement and committed
+        # together, so a batch costs one round trip and one flush of the WAL.
+        records_by_id: dict[UUID, Any] = {}
+        async with self.db_service.connect(async_engine) as conn:
+            query = insert(UserModel).values(raw_users_data).returning(UserModel)
+            try:
+                result = await self.__execute_insert(conn, query)
+                records_by_id = {record.id: record for record in result.all()}
+            except IntegrityError as error:
+                # The only unique key a new user can collide on is its email.
+                if self.__to_sqlstate(error) != self.UNIQUE_VIOLATION:
+                    raise
+                await conn.rollback()
+                # Any user of the batch may hold the email that collided, so each
+                # one is inserted again under its own savepoint, which fails it
+                # alone while the others are still committed together.
+                if len(raw_users_data) > 1:
+                    for raw_user_data in raw_users_data:
+                        query = (
+                            insert(UserModel).values(raw_user_data).returning(UserModel)
+                        )
+                        try:
+                            async with conn.begin_nested():
+                                result = await conn.execute(query)
+                                record = result.first()
+                        except IntegrityError as error:
+                            if self.__to_sqlstate(error) != self.UNIQUE_VIOLATION:
+                                raise
+                            continue
+                        records_by_id[record.id] = record
+            await conn.commit()
+        created_users: list[User | None] = []
+        for raw_user_data in raw_users_data:
+            record = records_by_id.get(raw_user_data["id"])
+            created_users.append(
+                None
+                if record is None
+                else UserMapper.to_domain(DictToObj(record._asdict()))
+            )
+        return created_users
+
+    async def __notify_cache(self, conn: AsyncConnection, userIds: list[str]) -> None:
+        # The workers drop the users from their caches once the write commits,
+        # as a notification is only sent then, and never when it rolls back.
+        # New users are left out since no cache can hold them yet.
+        userIds = [UUID(userId).hex for userId in userIds]
+        for start in range(0, len(userIds), self.CACHE_NOTIFY_CHUNK_SIZE):
+            chunk = userIds[start : start + self.CACHE_NOTIFY_CHUNK_SIZE]
+            await conn.execute(
+                select(func.pg_notify(self.CACHE_CHANNEL, ",".join(chunk)))
+            )
+
+    async def __execute_insert(
+        self, conn: AsyncConnection, query: Executable
+    ) -> CursorResult:
+        # A new user finds no partition when its month has none yet, in which
+        # case the partitions are created and the insert is run again.
+        try:
+            return await conn.execute(query)
+        except IntegrityError as error:
+            if self.__to_sqlstate(error) != self.NO_PARTITION_FOUND:
+                raise
+            await conn.rollback()
+        await conn.execute(
+            select(
+                func.create_users_partitions(
+                    func.localtimestamp(), self.partitions_ahead
+                )
+            )
+        )
+        await conn.commit()
+        return await conn.execute(query)
+
+    async def __run_in_chunks(
+        self,
+        userIds: list[str] | None,
+        user_filter: UserFilter | None,
+        chunk_size: int,
+        to_query: Callable[[ColumnElement[bool]], Any],
+        *conditions: ColumnElement[bool],
+    ) -> list[str]:
+        # Every chunk is committed on its own so that row locks are only held
+        # for the duration of a single chunk, however large the whole set is.
+        async def run_shard(
+            async_engine: AsyncEngine, userIds: list[str] | None
+        ) -> list[str]:
+            affected_ids: list[str] = []
+            async with self.db_service.connect(async_engine) as conn:
+                if userIds is not None:
+                    for start in range(0, len(userIds), chunk_size):
+                        chunk = userIds[start : start + chunk_size]
+                        query = to_query(
+                            and_(
+                                UserModel.id == any_(self.__to_id_array(chunk)),
+                                is_not_deleted,
+                            )
+                        )
+                        result = await conn.execute(query)
+                        chunk_ids = [id.hex for id in result.scalars()]
+                        await self.__notify_cache(conn, chunk_ids)
+                        await conn.commit()
+                        affected_ids.extend(chunk_ids)
+                    return affected_ids
+                while True:
+                    chunk = (
+                        select(UserModel.id)
+                        .where(
+                            is_not_deleted,
+                            *self.__to_filter_conditions(user_filter),
+                            *conditions,
+                        )
+                        .limit(chunk_size)
+                        .with_for_update()
+                    )
+                    query = to_query(UserModel.id.in_(chunk.scalar_subquery()))
+                    result = await conn.execute(query)
+                    chunk_ids = [id.hex for id in result.scalars()]
+                    await self.__notify_cache(conn, chunk_ids)
+                    await conn.commit()
+                    affected_ids.extend(chunk_ids)
+                    if len(chunk_ids) < chunk_size:
+                        return affected_ids
+
+        if userIds is not None:
+            userIds_by_engine = self.__group_by_engine(userIds)
+        else:
+            userIds_by_engine = dict.fromkeys(self.db_service.shard_async_engines)
+        shard_results = await asyncio.gather(
+            *[
+                run_shard(async_engine, userIds)
+                for async_engine, userIds in userIds_by_engine.items()
+            ]
+        )
+        return [id for affected_ids in shard_results for id in affected_ids]
+
+    async def __upsert_shard_users(
+        self, async_engine: AsyncEngine, users: list[tuple[UUID, User]]
+    ) -> dict[str, tuple[User, str]]:
+        input_users = (
+            select(
+                values(
+                    column("id", PG_UUID(as_uuid=True)),
+                    column("name", String),
+                    column("email", String),
+                    name="input_users",
+                ).data([(id, user.name, user.email) for id, user in users])
+            )
+        ).cte("input_users")
+        is_input_user = func.lower(UserModel.email) == func.lower(input_users.c.email)
+        # A row that already holds the same name is left untouched by the
+        # conditional update and comes back through the last SELECT, which
+        # still sees the snapshot taken before the INSERT and the UPDATE.
+        updated_users = (
+            update(UserModel)
+            .where(
+                is_input_user,
+                is_not_deleted,
+                UserModel.name.is_distinct_from(input_users.c.name),
+            )
+            .values(name=input_users.c.name, updated_at=func.now())
+            .returning(*UserModel.__table__.c, literal("updated").label("status"))
+            .cte("updated_users")
+        )
+        inserted_users = (
+            insert(UserModel)
+            .from_select(
+                ["id", "name", "email"],
+                select(input_users).where(
+                    ~exists().where(
+                        UserEmailModel.email == func.lower(input_users.c.email)
+                    )
+                ),
+            )
+            .returning(*UserModel.__table__.c, literal("created").label("status"))
+            .cte("inserted_users")
+        )
+        query = select(inserted_users).union_all(
+            select(updated_users),
+            select(*UserModel.__table__.c, literal("unchanged").label("status"))
+            .join(input_users, is_input_user)
+            .where(is_not_deleted, UserModel.id.not_in(select(updated_users.c.id))),
+        )
+        async with self.db_service.connect(async_engine) as conn:
+            try:
+                result = await self.__execute_insert(conn, query)
+            except IntegrityError as error:
+                # A user inserted concurrently with the same email is seen, and
+                # updated, once the upsert runs again.
+                if self.__to_sqlstate(error) != self.UNIQUE_VIOLATION:
+                    raise
+                await conn.rollback()
+                result = await self.__execute_insert(conn, query)
+            records_by_email: dict[str, tuple[User, str]] = {}
+            for record in result.all():
+                obj = DictToObj(record._asdict())
+                records_by_email[obj.email.lower()] = (
+                    UserMapper.to_domain(obj),
+                    obj.status,
+                )
+            await self.__notify_cache(
+                conn,
+                [
+                    user.id
+                    for user, status in records_by_email.values()
+                    if status == "updated"
+                ],
+            )
+            await conn.commit()
+            return records_by_email
+
+    async def __read_engines_by_email(
+        self, emails: list[str]
+    ) -> dict[str, AsyncEngine]:
+        if not self.is_sharded:
+            return {}
+        query = select(UserEmailModel.email).where(
+            UserEmailModel.email
+            == any_(
+                bindparam(
+                    "emails",
+                    [email.lower() for email in emails],
+                    type_=ARRAY(String),
+                )
+            )
+        )
+
+        async def read_shard(conn: AsyncConnection) -> list[str]:
+            result = await conn.execute(query)
+            return list(result.scalars())
+
+        engines_by_email: dict[str, AsyncEngine] = {}
+        for async_engine, shard_emails in zip(
+            self.db_service.shard_async_engines, await self.__gather(read_shard)
+        ):
+            engines_by_email.update(dict.fromkeys(shard_emails, async_engine))
+        return engines_by_email
+
+    async def __gather(
+        self, read: Callable[[AsyncConnection], Awaitable[T]]
+    ) -> list[T]:
+        async def read_shard(async_engine: AsyncEngine) -> T:
+            async with self.db_service.connect(async_engine) as conn:
+                result = await read(conn)
+                await conn.commit()
+                return result
+
+        return list(
+            await asyncio.gather(
+                *[
+                    read_shard(async_engine)
+                    for async_engine in self.db_service.shard_async_engines
+                ]
+            )
+        )
+
+    def __group_by_engine(self, userIds: list[str]) -> dict[AsyncEngine, list[str]]:
+        userIds_by_engine: dict[AsyncEngine, list[str]] = {}
+        for userId in userIds:
+            async_engine = self.db_service.get_shard_async_engine(userId)
+            userIds_by_engine.setdefault(async_engine, []).append(userId)
+        return userIds_by_engine
+
+    def __to_delete_query(self) -> Any:
+        # A soft delete only marks the user, whose row is left to the purge, and
+        # keeps its updated_at from being bumped as if its data had changed.
+        if self.soft_delete:
+            return update(UserModel).values(
+                deleted_at=func.now(), updated_at=UserModel.updated_at
+            )
+        return delete(UserModel)
+
+    @staticmethod
+    def __to_sqlstate(error: IntegrityError) -> str | None:
+        return getattr(error.orig, "sqlstate", None)
+
+    @staticmethod
+    def __to_columns(fields: list[str] | None) -> list[Any]:
+        if fields is None:
+            return [UserModel]
+        return [UserModel.__table__.c[field] for field in fields]
+
+    @staticmethod
+    def __to_domain(obj: DictToObj, fields: list[str] | None) -> User:
+        if fields is None:
+            return UserMapper.to_domain(obj)
+        return UserMapper.to_partial_domain(obj)
+
+    @staticmethod
+    def __to_id_array(userIds: list[str]) -> Any:
+        # The ids are bound as a single array parameter so the statement
+        # text, and its prepared plan, is the same whatever their number.
+        return bindparam(
+            "user_ids",
+            [UUID(userId) for userId in userIds],
+            type_=ARRAY(PG_UUID(as_uuid=True)),
+        )
+
+    @staticmethod
+    def __to_changed_condition(changes: dict[str, Any]) -> ColumnElement[bool]:
+        return or_(
+            *[
+                getattr(UserModel, name).is_distinct_from(value)
+                for name, value in changes.items()
+            ]
+        )
+
+    @staticmethod
+    def __to_filter_conditions(user_filter: UserFilter) -> list[ColumnElement[bool]]:
+        conditions: list[ColumnElement[bool]] = []
+        if user_filter.name_prefix is not None:
+            conditions.append(
+                UserModel.name.startswith(user_filter.name_prefix, autoescape=True)
+            )
+        if user_filter.name_contains is not None:
+            conditions.append(
+                UserModel.name.contains(user_filter.name_contains, autoescape=True)
+            )
+        if user_filter.email_prefix is not None:
+            conditions.append(
+                UserModel.email.startswith(user_filter.email_prefix, autoescape=True)
+            )
+        if user_filter.email_suffix is not None:
+            conditions.append(
+                UserModel.email.endswith(user_filter.email_suffix, autoescape=True)
+            )
+        if user_filter.created_after is not None:
+            conditions.append(
+                UserModel.created_at
+                > UserRepository.__to_naive(user_filter.created_after)
+            )
+        if user_filter.created_before is not None:
+            conditions.append(
+                UserModel.created_at
+                < UserRepository.__to_naive(user_filter.created_before)
+            )
+        return conditions
+
+    @staticmethod
+    def __to_order_by(sort: UserSort) -> list[ColumnElement[Any]]:
+        column = UserModel.__table__.c[sort.removeprefix("-")]
+        columns = [column]
+        # The id breaks ties between equal keys so that pages neither repeat
+        # nor skip rows, and it matches the composite indexes on the table.
+        if not column.unique:
+            columns.append(UserModel.__table__.c.id)
+        if sort.startswith("-"):
+            return [column.desc() for column in columns]
+        return [column.asc() for column in columns]
+
+    @staticmethod
+    def __to_naive(value: datetime) -> datetime:
+        if value.tzinfo is None:
+            return value
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
@@ -1,9 +1,24 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any
+from uuid import UUID
 
 from fastapi import status
 
-from api.components.user.user_models import User
+from api.components.user.user_cache import UserCache
+from api.components.user.user_loader import UserLoader
+from api.components.user.user_models import (
+    User,
+    UserChange,
+    UserFilter,
+    UserOperation,
+    UserSort,
+    UserWriteQueueMetrics,
+)
 from api.components.user.user_repository import UserRepository
+from api.components.user.user_stream import UserStream
+from api.components.user.user_write_queue import UserWriteQueue
 from server_error import Detail, ServerError
 
 
@@ -12,32 +27,128 @@ class IUserService(ABC):
     async def register_user(self, user: User) -> User:
         raise Exception("NotImplementedException")
 
+    @abstractmethod
+    async def upsert_users(self, users: list[User]) -> list[tuple[User, str]]:
+        raise Exception("NotImplementedException")
+
     @abstractmethod
     async def retrieve_and_count_users(
-        self, page: int, limit: int
+        self,
+        page: int,
+        limit: int,
+        user_filter: UserFilter | None = None,
+        sort: UserSort = "-created_at",
+        fields: list[str] | None = None,
     ) -> tuple[list[User], int]:
         raise Exception("NotImplementedException")
 
     @abstractmethod
-    async def retrieve_user(self, userId: str) -> User:
+    async def retrieve_users_version(self) -> int:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def retrieve_users(self, userIds: list[str]) -> tuple[list[User], list[str]]:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def retrieve_user(self, userId: str, fields: list[str] | None = None) -> User:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def retrieve_user_by_email(self, email: str) -> User:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def search_users(
+        self, text: str, limit: int, after: tuple[float, str] | None = None
+    ) -> tuple[list[User], tuple[float, str] | None]:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def retrieve_user_changes(
+        self, after: list[tuple[int, int]] | None, limit: int
+    ) -> tuple[list[UserChange], list[tuple[int, int]]]:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def stream_user_changes(self) -> AsyncIterator[bytes]:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def replace_user(
+        self,
+        userId: str,
+        user: User,
+        expected_versions: list[datetime] | None = None,
+    ) -> User:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def enqueue_user_replacement(self, userId: str, user: User) -> bool:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def retrieve_user_write_queue_metrics(self) -> UserWriteQueueMetrics:
         raise Exception("NotImplementedException")
 
     @abstractmethod
-    async def replace_user(self, userId: str, user: User) -> User:
+    async def modify_user(
+        self,
+        userId: str,
+        changes: dict[str, Any],
+        expected_versions: list[datetime] | None = None,
+    ) -> User:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def modify_users(
+        self,
+        userIds: list[str] | None,
+        user_filter: UserFilter | None,
+        changes: dict[str, Any],
+        chunk_size: int,
+    ) -> list[str]:
         raise Exception("NotImplementedException")
 
     @abstractmethod
     async def remove_user(self, userId: str) -> User:
         raise Exception("NotImplementedException")
 
+    @abstractmethod
+    async def remove_users(
+        self,
+        userIds: list[str] | None,
+        user_filter: UserFilter | None,
+        chunk_size: int,
+    ) -> list[str]:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def apply_user_operations(
+        self, operations: list[UserOperation], atomic: bool
+    ) -> list[User | ServerError]:
+        raise Exception("NotImplementedException")
+
 
 class UserService(IUserService):
-    def __init__(self, user_repository: UserRepository):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        user_cache: UserCache,
+        user_loader: UserLoader,
+        user_write_queue: UserWriteQueue,
+        user_stream: UserStream,
+    ):
         self.user_repository = user_repository
+        self.user_cache = user_cache
+        self.user_loader = user_loader
+        self.user_write_queue = user_write_queue
+        self.user_stream = user_stream
 
     async def register_user(self, user: User) -> User:
+        registered_user: User
         try:
-            return await self.user_repository.create_user(user)
+            registered_user = await self.user_repository.create_user(user)
         except Exception as error:
             message = "An error occurred when creating a new user into database"
             print(message, error)
@@ -46,25 +157,108 @@ class UserService(IUserService):
                 status.HTTP_500_INTERNAL_SERVER_ERROR,
                 Detail(context=user, cause=str(error)),
             )
+        if registered_user is None:
+            message = "User already exists"
+            print(message)
+            raise ServerError(
+                message,
+                status.HTTP_409_CONFLICT,
+                Detail(context=user, cause=None),
+            )
+        return registered_user
+
+    async def upsert_users(self, users: list[User]) -> list[tuple[User, str]]:
+        try:
+            upserted_users = await self.user_repository.upsert_users(users)
+        except Exception as error:
+            message = "An error occurred when upserting users into database"
+            print(message, error)
+            raise ServerError(
+                message,
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                Detail(context=users, cause=str(error)),
+            )
+        for upserted_user, _ in upserted_users:
+            self.user_cache.set(upserted_user)
+        return upserted_users
 
     async def retrieve_and_count_users(
-        self, page: int, limit: int
+        self,
+        page: int,
+        limit: int,
+        user_filter: UserFilter | None = None,
+        sort: UserSort = "-created_at",
+        fields: list[str] | None = None,
     ) -> tuple[list[User], int]:
         try:
-            return await self.user_repository.read_and_count_users(page, limit)
+            return await self.user_repository.read_and_count_users(
+                page, limit, user_filter, sort, fields
+            )
         except Exception as error:
             message = "An error occurred when reading and counting users from database"
             print(message, error)
             raise ServerError(
                 message,
                 status.HTTP_500_INTERNAL_SERVER_ERROR,
-                Detail(context={"page": page, "limit": limit}, cause=str(error)),
+                Detail(
+                    context={
+                        "page": page,
+                        "limit": limit,
+                        "filter": user_filter,
+                        "sort": sort,
+                        "fields": fields,
+                    },
+                    cause=str(error),
+                ),
+            )
+
+    async def retrieve_users_version(self) -> int:
+        try:
+            return await self.user_repository.read_users_version()
+        except Exception as error:
+            message = "An error occurred when reading the users version from database"
+            print(message, error)
+            raise ServerError(
+                message,
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                Detail(context=None, cause=str(error)),
             )
 
-    async def retrieve_user(self, userId: str) -> User:
-        retrieved_user: User
+    async def retrieve_users(self, userIds: list[str]) -> tuple[list[User], list[str]]:
+        keys = list(dict.fromkeys(UUID(userId).hex for userId in userIds))
+        users_by_key: dict[str, User] = {}
+        for key in keys:
+            cached_user = self.user_cache.get(key)
+            if cached_user is not None:
+                users_by_key[key] = cached_user
+        uncached_keys = [key for key in keys if key not in users_by_key]
+        if uncached_keys:
+            try:
+                read_users = await self.user_repository.read_users(uncached_keys)
+            except Exception as error:
+                message = "An error occurred when reading users from database"
+                print(message, error)
+                raise ServerError(
+                    message,
+                    status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    Detail(context=userIds, cause=str(error)),
+                )
+            for read_user in read_users:
+                self.user_cache.set(read_user)
+                users_by_key[UUID(read_user.id).hex] = read_user
+        retrieved_users = [users_by_key[key] for key in keys if key in users_by_key]
+        missing_user_ids = [key for key in keys if key not in users_by_key]
+        return retrieved_users, missing_user_ids
+
+    async def retrieve_user(self, userId: str, fields: list[str] | None = None) -> User:
+        retrieved_user = self.user_cache.get(userId)
+        if retrieved_user is not None:
+            return retrieved_user
         try:
-            retrieved_user = await self.user_repository.read_user(userId)
+            if fields is None:
+                retrieved_user = await self.user_loader.load(userId)
+            else:
+                retrieved_user = await self.user_repository.read_user(userId, fields)
         except Exception as error:
             message = "An error occurred when reading a user from database"
             print(message, error)
@@ -81,12 +275,102 @@ class UserService(IUserService):
                 status.HTTP_404_NOT_FOUND,
                 Detail(context=userId, cause=None),
             )
+        # A partial user would answer later requests for the fields it lacks.
+        if fields is None:
+            self.user_cache.set(retrieved_user)
+        return retrieved_user
+
+    async def retrieve_user_by_email(self, email: str) -> User:
+        retrieved_user = self.user_cache.get_by_email(email)
+        if retrieved_user is not None:
+            return retrieved_user
+        try:
+            retrieved_user = await self.user_repository.read_user_by_email(email)
+        except Exception as error:
+            message = "An error occurred when reading a user by email from database"
+            print(message, error)
+            raise ServerError(
+                message,
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                Detail(context=email, cause=str(error)),
+            )
+        if retrieved_user is None:
+            message = "User not found"
+            print(message)
+            raise ServerError(
+                message,
+                status.HTTP_404_NOT_FOUND,
+                Detail(context=email, cause=None),
+            )
+        self.user_cache.set(retrieved_user)
         return retrieved_user
 
-    async def replace_user(self, userId: str, user: User) -> User:
+    async def search_users(
+        self, text: str, limit: int, after: tuple[float, str] | None = None
+    ) -> tuple[list[User], tuple[float, str] | None]:
+        try:
+            found_users = await self.user_repository.search_users(
+                text, limit + 1, after
+            )
+        except Exception as error:
+            message = "An error occurred when searching users in database"
+            print(message, error)
+            raise ServerError(
+                message,
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                Detail(
+                    context={"text": text, "limit": limit, "after": after},
+                    cause=str(error),
+                ),
+            )
+        # One extra record is read to tell whether another page follows.
+        next_after = None
+        if len(found_users) > limit:
+            last_user, last_rank = found_users[limit - 1]
+            next_after = (last_rank, last_user.id)
+        return [user for user, _ in found_users[:limit]], next_after
+
+    async def retrieve_user_changes(
+        self, after: list[tuple[int, int]] | None, limit: int
+    ) -> tuple[list[UserChange], list[tuple[int, int]]]:
+        try:
+            return await self.user_repository.read_user_changes(after, limit)
+        except Exception as error:
+            message = "An error occurred when reading user changes from database"
+            print(message, error)
+            raise ServerError(
+                message,
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                Detail(context={"after": after, "limit": limit}, cause=str(error)),
+            )
+
+    async def stream_user_changes(self) -> AsyncIterator[bytes]:
+        self.user_stream.check_capacity()
+        try:
+            await self.user_stream.start()
+        except Exception as error:
+            message = "An error occurred when starting the stream of user changes"
+            print(message, error)
+            raise ServerError(
+                message,
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                Detail(context=None, cause=str(error)),
+            )
+        return self.user_stream.events()
+
+    async def replace_user(
+        self,
+        userId: str,
+        user: User,
+        expected_versions: list[datetime] | None = None,
+    ) -> User:
         replaced_user: User
+        if expected_versions is not None and len(expected_versions) == 0:
+            self.__raise_precondition_failed({"userId": userId, "user": user})
         try:
-            replaced_user = await self.user_repository.update_user(userId, user)
+            replaced_user = await self.user_repository.update_user(
+                userId, user, expected_versions
+            )
         except Exception as error:
             message = "An error occurred when updating a user in database"
             print(message, error)
@@ -95,6 +379,8 @@ class UserService(IUserService):
                 status.HTTP_500_INTERNAL_SERVER_ERROR,
                 Detail(context={"userId": userId, "user": user}, cause=str(error)),
             )
+        if replaced_user is None and expected_versions is not None:
+            self.__raise_precondition_failed({"userId": userId, "user": user})
         if replaced_user is None:
             message = "User not found"
             print(message)
@@ -103,10 +389,104 @@ class UserService(IUserService):
                 status.HTTP_404_NOT_FOUND,
                 Detail(context={"userId": userId, "user": user}, cause=None),
             )
+        self.user_cache.set(replaced_user)
         return replaced_user
 
+    async def enqueue_user_replacement(self, userId: str, user: User) -> bool:
+        try:
+            return await self.user_write_queue.enqueue(userId, user)
+        except Exception as error:
+            message = "An error occurred when queueing a user update"
+            print(message, error)
+            raise ServerError(
+                message,
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                Detail(context={"userId": userId, "user": user}, cause=str(error)),
+            )
+
+    async def retrieve_user_write_queue_metrics(self) -> UserWriteQueueMetrics:
+        try:
+            return await self.user_write_queue.get_metrics()
+        except Exception as error:
+            message = "An error occurred when reading the user write queue metrics"
+            print(message, error)
+            raise ServerError(
+                message,
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                Detail(context=None, cause=str(error)),
+            )
+
+    async def modify_user(
+        self,
+        userId: str,
+        changes: dict[str, Any],
+        expected_versions: list[datetime] | None = None,
+    ) -> User:
+        modified_user: User
+        if expected_versions is not None and len(expected_versions) == 0:
+            self.__raise_precondition_failed({"userId": userId, "changes": changes})
+        try:
+            modified_user = await self.user_repository.patch_user(
+                userId, changes, expected_versions
+            )
+        except Exception as error:
+            message = "An error occurred when patching a user in database"
+            print(message, error)
+            raise ServerError(
+                message,
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                Detail(
+                    context={"userId": userId, "changes": changes}, cause=str(error)
+                ),
+            )
+        if modified_user is None and expected_versions is not None:
+            self.__raise_precondition_failed({"userId": userId, "changes": changes})
+        if modified_user is None:
+            message = "User not found"
+            print(message)
+            raise ServerError(
+                message,
+                status.HTTP_404_NOT_FOUND,
+                Detail(context={"userId": userId, "changes": changes}, cause=None),
+            )
+        self.user_cache.set(modified_user)
+        return modified_user
+
+    async def modify_users(
+        self,
+        userIds: list[str] | None,
+        user_filter: UserFilter | None,
+        changes: dict[str, Any],
+        chunk_size: int,
+    ) -> list[str]:
+        for userId in userIds or []:
+            self.user_cache.delete(userId)
+        try:
+            modified_user_ids = await self.user_repository.patch_users(
+                userIds, user_filter, changes, chunk_size
+            )
+        except Exception as error:
+            message = "An error occurred when patching users in database"
+            print(message, error)
+            raise ServerError(
+                message,
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                Detail(
+                    context={
+                        "userIds": userIds,
+                        "filter": user_filter,
+                        "changes": changes,
+                    },
+                    cause=str(error),
+                ),
+            )
+        for modified_user_id in modified_user_ids:
+            self.user_cache.delete(modified_user_id)
+        return modified_user_ids
+
     async def remove_user(self, userId: str) -> User:
         removed_user: User
+        self.user_cache.delete(userId)
         try:
             removed_user = await self.user_repository.delete_user(userId)
         except Exception as error:
@@ -126,3 +506,111 @@ class UserService(IUserService):
                 Detail(context=userId, cause=None),
             )
         return removed_user
+
+    async def remove_users(
+        self,
+        userIds: list[str] | None,
+        user_filter: UserFilter | None,
+        chunk_size: int,
+    ) -> list[str]:
+        for userId in userIds or []:
+            self.user_cache.delete(userId)
+        try:
+            removed_user_ids = await self.user_repository.delete_users(
+                userIds, user_filter, chunk_size
+            )
+        except Exception as error:
+            message = "An error occurred when deleting users from database"
+            print(message, error)
+            raise ServerError(
+                message,
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                Detail(
+                    context={"userIds": userIds, "filter": user_filter},
+                    cause=str(error),
+                ),
+            )
+        for removed_user_id in removed_user_ids:
+            self.user_cache.delete(removed_user_id)
+        return removed_user_ids
+
+    async def apply_user_operations(
+        self, operations: list[UserOperation], atomic: bool
+    ) -> list[User | ServerError]:
+        if not atomic:
+            return [
+                await self.__apply_user_operation(operation) for operation in operations
+            ]
+        results: list[User | ServerError] = []
+        try:
+            async with self.user_repository.transaction():
+                for operation in operations:
+                    result = await self.__apply_user_operation(operation)
+                    results.append(result)
+                    if isinstance(result, ServerError):
+                        raise result
+        except BaseException as error:
+            # Nothing the batch wrote is kept, so neither is what it cached.
+            for operation, result in zip(operations, results):
+                if operation.userId is not None:
+                    self.user_cache.delete(operation.userId)
+                if isinstance(result, User):
+                    self.user_cache.delete(result.id)
+            if not isinstance(error, Exception):
+                raise
+            if results and results[-1] is error:
+                failed_index = len(results) - 1
+                return [
+                    *[
+                        self.__to_failed_dependency("Operation rolled back", index)
+                        for index in range(failed_index)
+                    ],
+                    error,
+                    *[
+                        self.__to_failed_dependency("Operation not run", index)
+                        for index in range(failed_index + 1, len(operations))
+                    ],
+                ]
+            message = "An error occurred when committing a batch of user operations"
+            print(message, error)
+            return [
+                ServerError(
+                    message,
+                    status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    Detail(context=index, cause=str(error)),
+                )
+                for index in range(len(operations))
+            ]
+        return results
+
+    async def __apply_user_operation(
+        self, operation: UserOperation
+    ) -> User | ServerError:
+        try:
+            if operation.method == "create":
+                return await self.register_user(operation.user)
+            if operation.method == "replace":
+                return await self.replace_user(operation.userId, operation.user)
+            if operation.method == "patch":
+                return await self.modify_user(operation.userId, operation.changes)
+            return await self.remove_user(operation.userId)
+        except ServerError as error:
+            return error
+
+    @staticmethod
+    def __to_failed_dependency(message: str, index: int) -> ServerError:
+        return ServerError(
+            message,
+            status.HTTP_424_FAILED_DEPENDENCY,
+            Detail(context=index, cause="Another operation of the batch failed"),
+        )
+
+    @staticmethod
+    def __raise_precondition_failed(context: Any) -> None:
+        message = "User has been modified"
+        print(message)
+        raise ServerError(
+            message,
+            status.HTTP_412_PRECONDITION_FAILED,
+            Detail(context=context, cause=None),
+        )
@@ -0,0 +1,240 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+
+from fastapi import status
+
+from api.components.user.user_mapper import UserMapper
+from api.components.user.user_models import UserChange
+from api.components.user.user_repository import UserRepository
+from api.utils.cursor import Cursor
+from server_error import Detail, ServerError
+from services.db_service import DBService
+
+
+class UserStreamSubscriber:
+    def __init__(self, buffer_size: int):
+        self.events: asyncio.Queue[bytes | None] = asyncio.Queue(buffer_size)
+
+
+class IUserStream(ABC):
+    @abstractmethod
+    def configure(
+        self,
+        buffer_size: int,
+        max_subscribers: int,
+        keepalive: float,
+        poll_interval: float,
+    ) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def start(self) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def stop(self) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def check_capacity(self) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def subscribe(self) -> UserStreamSubscriber:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def unsubscribe(self, subscriber: UserStreamSubscriber) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def events(self) -> AsyncIterator[bytes]:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def publish(self) -> int:
+        raise Exception("NotImplementedException")
+
+
+class UserStream(IUserStream):
+    CHANNEL = "user_changes"
+
+    __subscribers: set[UserStreamSubscriber]
+    __positions: list[tuple[int, int]] | None
+    __wake: asyncio.Event
+    __task: asyncio.Task | None
+
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        db_service: DBService,
+        buffer_size: int = 100,
+        max_subscribers: int = 10000,
+        keepalive: float = 15,
+        poll_interval: float = 1,
+        batch_size: int = 500,
+    ):
+        self.user_repository = user_repository
+        self.db_service = db_service
+        self.buffer_size = buffer_size
+        self.max_subscribers = max_subscribers
+        self.keepalive = keepalive
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.__subscribers = set()
+        self.__positions = None
+        self.__wake = asyncio.Event()
+        self.__task = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self.__subscribers)
+
+    def configure(
+        self,
+        buffer_size: int,
+        max_subscribers: int,
+        keepalive: float,
+        poll_interval: float,
+    ) -> None:
+        self.buffer_size = buffer_size
+        self.max_subscribers = max_subscribers
+        self.keepalive = keepalive
+        self.poll_interval = poll_interval
+
+    async def start(self) -> None:
+        # The stream only starts once someone subscribes, so that a worker
+        # nobody streams from holds no connection aside for it.
+        if self.__task is not None:
+            return
+        self.__task = asyncio.ensure_future(self.__run())
+        try:
+            self.__positions = (
+                await self.user_repository.read_latest_user_change_positions()
+            )
+            await self.db_service.listen(self.CHANNEL, self.__notify)
+        except Exception:
+            self.__task.cancel()
+            self.__task = None
+            raise
+        self.__wake.set()
+
+    async def stop(self) -> None:
+        if self.__task is None:
+            return
+        self.__task.cancel()
+        try:
+            await self.__task
+        except asyncio.CancelledError:
+            pass
+        self.__task = None
+        self.__positions = None
+        for subscriber in list(self.__subscribers):
+            self.__evict(subscriber)
+        try:
+            await self.db_service.unlisten(self.CHANNEL, self.__notify)
+        except Exception as error:
+            message = "An error occurred when no longer listening to user changes"
+            print(message, error)
+
+    def check_capacity(self) -> None:
+        if len(self.__subscribers) >= self.max_subscribers:
+            message = "Too many subscribers to user changes"
+            print(message)
+            raise ServerError(
+                message,
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                Detail(context=self.max_subscribers, cause=None),
+            )
+
+    def subscribe(self) -> UserStreamSubscriber:
+        self.check_capacity()
+        subscriber = UserStreamSubscriber(self.buffer_size)
+        self.__subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: UserStreamSubscriber) -> None:
+        self.__subscribers.discard(subscriber)
+
+    async def events(self) -> AsyncIterator[bytes]:
+        # The subscriber is only taken once the stream is read from, so that a
+        # response that never gets that far does not hold on to it.
+        subscriber = self.subscribe()
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        subscriber.events.get(), self.keepalive
+                    )
+                except TimeoutError:
+                    # A comment keeps proxies from closing an idle stream.
+                    yield b": keepalive\n\n"
+                    continue
+                if event is None:
+                    return
+                yield event
+        finally:
+            self.unsubscribe(subscriber)
+
+    async def publish(self) -> int:
+        published_count = 0
+        while True:
+            changes, self.__positions = await self.user_repository.read_user_changes(
+                self.__positions, self.batch_size
+            )
+            # Only the last event of a batch carries an id, which is a cursor of
+            # the change feed, so that a client can catch up from there.
+            cursor = Cursor.encode([list(position) for position in self.__positions])
+            for index, change in enumerate(changes):
+                self.__broadcast(
+                    self.__to_event(
+                        change, cursor if index == len(changes) - 1 else None
+                    )
+                )
+            published_count += len(changes)
+            if len(changes) < self.batch_size:
+                return published_count
+
+    def __notify(self, payload: str | None) -> None:
+        self.__wake.set()
+
+    def __broadcast(self, event: bytes) -> None:
+        for subscriber in list(self.__subscribers):
+            try:
+                subscriber.events.put_nowait(event)
+            except asyncio.QueueFull:
+                self.__evict(subscriber)
+
+    def __evict(self, subscriber: UserStreamSubscriber) -> None:
+        # A subscriber that falls a whole buffer behind is dropped rather than
+        # let the others wait for it or its buffer grow, and its stream ends.
+        self.__subscribers.discard(subscriber)
+        while not subscriber.events.empty():
+            subscriber.events.get_nowait()
+        subscriber.events.put_nowait(None)
+
+    async def __run(self) -> None:
+        while True:
+            # The feed is also read every poll interval, which picks up the
+            # changes a notification was sent for while older transactions
+            # still held them back.
+            try:
+                await asyncio.wait_for(self.__wake.wait(), self.poll_interval)
+            except TimeoutError:
+                pass
+            self.__wake.clear()
+            if self.__positions is None:
+                continue
+            try:
+                await self.publish()
+            except Exception as error:
+                message = "An error occurred when publishing user changes"
+                print(message, error)
+
+    @staticmethod
+    def __to_event(change: UserChange, cursor: str | None) -> bytes:
+        event = f"data: {UserMapper.to_change_response(change).model_dump_json()}\n"
+        if cursor is not None:
+            event += f"id: {cursor}\n"
+        return f"{event}\n".encode()
@@ -0,0 +1,383 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta, timezone
+from itertools import count
+from uuid import UUID
+
+from db.models.user_write import UserWriteModel
+from fastapi import status
+from pydantic import BaseModel
+from sqlalchemy import (
+    any_,
+    bindparam,
+    delete,
+    exists,
+    func,
+    literal,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, BIGINT
+
+from api.components.user.user_cache import UserCache
+from api.components.user.user_models import User, UserWriteQueueMetrics
+from api.components.user.user_repository import UserRepository
+from server_error import Detail, ServerError
+from services.db_service import DBService
+
+
+class QueuedUserWrite(BaseModel):
+    id: int
+    userId: str
+    user: User
+    queued_at: datetime
+
+
+class IUserWriteStore(ABC):
+    @abstractmethod
+    async def push(self, userId: str, user: User, max_depth: int) -> bool:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def claim(self, batch_size: int, lease: float) -> list[QueuedUserWrite]:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def ack(self, ids: list[int]) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def stat(self) -> tuple[int, datetime | None]:
+        raise Exception("NotImplementedException")
+
+
+class InMemoryUserWriteStore(IUserWriteStore):
+    __writes: deque[QueuedUserWrite]
+    __claimed: OrderedDict[int, QueuedUserWrite]
+
+    def __init__(self):
+        self.__ids = count(1)
+        self.__writes = deque()
+        self.__claimed = OrderedDict()
+
+    async def push(self, userId: str, user: User, max_depth: int) -> bool:
+        UUID(userId)
+        if len(self.__writes) + len(self.__claimed) >= max_depth:
+            return False
+        self.__writes.append(
+            QueuedUserWrite(
+                id=next(self.__ids),
+                userId=userId,
+                user=user,
+                queued_at=datetime.now(timezone.utc),
+            )
+        )
+        return True
+
+    async def claim(self, batch_size: int, lease: float) -> list[QueuedUserWrite]:
+        # A batch that has not been acknowledged is handed out again, as the
+        # database store does once its lease has run out.
+        while self.__writes and len(self.__claimed) < batch_size:
+            write = self.__writes.popleft()
+            self.__claimed[write.id] = write
+        return list(self.__claimed.values())
+
+    async def ack(self, ids: list[int]) -> None:
+        for id in ids:
+            self.__claimed.pop(id, None)
+
+    async def stat(self) -> tuple[int, datetime | None]:
+        oldest = next(iter(self.__claimed.values()), None) or next(
+            iter(self.__writes), None
+        )
+        return (
+            len(self.__writes) + len(self.__claimed),
+            None if oldest is None else oldest.queued_at,
+        )
+
+
+class DatabaseUserWriteStore(IUserWriteStore):
+    def __init__(self, db_service: DBService):
+        self.db_service = db_service
+
+    async def push(self, userId: str, user: User, max_depth: int) -> bool:
+        async with self.db_service.async_engine.connect() as conn:
+            user_write = UserWriteModel.__table__
+            # The depth is checked by the INSERT itself, so that a full queue
+            # turns the write away without a separate round trip.
+            query = (
+                user_write.insert()
+                .from_select(
+                    ["user_id", "name", "email"],
+                    select(
+                        literal(UUID(userId), user_write.c.user_id.type),
+                        literal(user.name),
+                        literal(user.email),
+                    ).where(
+                        select(func.count()).select_from(user_write).scalar_subquery()
+                        < max_depth
+                    ),
+                )
+                .returning(user_write.c.id)
+            )
+            result = await conn.execute(query)
+            pushed = result.first() is not None
+            await conn.commit()
+            return pushed
+
+    async def claim(self, batch_size: int, lease: float) -> list[QueuedUserWrite]:
+        async with self.db_service.async_engine.connect() as conn:
+            user_write = UserWriteModel.__table__
+            # Claims are taken one at a time across all the workers, and only
+            # once the previous batch is acknowledged or its lease has run out,
+            # so that the writes of a user are applied in the order they came.
+            await conn.execute(
+                select(func.pg_advisory_xact_lock(func.hashtext(user_write.name)))
+            )
+            result = await conn.execute(
+                select(exists().where(user_write.c.claimed_until > func.now()))
+            )
+            if result.scalar_one():
+                await conn.commit()
+                return []
+            batch = (
+                select(user_write.c.id)
+                .where(
+                    or_(
+                        user_write.c.claimed_until.is_(None),
+                        user_write.c.claimed_until <= func.now(),
+                    )
+                )
+                .order_by(user_write.c.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            query = (
+                update(user_write)
+                .where(user_write.c.id.in_(batch.scalar_subquery()))
+                .values(claimed_until=func.now() + timedelta(seconds=lease))
+                .returning(user_write)
+            )
+            result = await conn.execute(query)
+            records = sorted(result.all(), key=lambda record: record.id)
+            await conn.commit()
+            return [
+                QueuedUserWrite(
+                    id=record.id,
+                    userId=record.user_id.hex,
+                    user=User(name=record.name, email=record.email),
+                    queued_at=record.queued_at,
+                )
+                for record in records
+            ]
+
+    async def ack(self, ids: list[int]) -> None:
+        async with self.db_service.async_engine.connect() as conn:
+            user_write = UserWriteModel.__table__
+            query = delete(user_write).where(
+                user_write.c.id == any_(bindparam("ids", ids, type_=ARRAY(BIGINT)))
+            )
+            await conn.execute(query)
+            await conn.commit()
+
+    async def stat(self) -> tuple[int, datetime | None]:
+        async with self.db_service.async_engine.connect() as conn:
+            user_write = UserWriteModel.__table__
+            query = select(func.count(), func.min(user_write.c.queued_at))
+            result = await conn.execute(query)
+            depth, oldest_queued_at = result.one()
+            await conn.commit()
+            return depth, oldest_queued_at
+
+
+class IUserWriteQueue(ABC):
+    @abstractmethod
+    def connect_store(self, store_name: str) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def configure(self, max_depth: int, batch_size: int, interval: float) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def start(self) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def stop(self) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def enqueue(self, userId: str, user: User) -> bool:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def flush(self) -> int:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def get_metrics(self) -> UserWriteQueueMetrics:
+        raise Exception("NotImplementedException")
+
+
+class UserWriteQueue(IUserWriteQueue):
+    CLAIM_LEASE = 30
+
+    __store: IUserWriteStore
+    __task: asyncio.Task | None
+
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        user_cache: UserCache,
+        db_service: DBService,
+        max_depth: int = 10000,
+        batch_size: int = 500,
+        interval: float = 0.05,
+    ):
+        self.user_repository = user_repository
+        self.user_cache = user_cache
+        self.db_service = db_service
+        self.max_depth = max_depth
+        self.batch_size = batch_size
+        self.interval = interval
+        self.flush_latency = 0.0
+        self.flushed = 0
+        self.failed = 0
+        self.__store = InMemoryUserWriteStore()
+        self.__task = None
+
+    @property
+    def store(self) -> IUserWriteStore:
+        return self.__store
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.max_depth > 0 and self.batch_size > 0
+
+    def connect_store(self, store_name: str) -> None:
+        if store_name == "memory":
+            self.__store = InMemoryUserWriteStore()
+            return
+        if store_name == "database":
+            self.__store = DatabaseUserWriteStore(self.db_service)
+            return
+        message = "An error occurred when connecting to user write store!"
+        print(message, store_name)
+        raise ServerError(
+            message,
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            Detail(context=store_name, cause="Unknown user write store"),
+        )
+
+    def configure(self, max_depth: int, batch_size: int, interval: float) -> None:
+        self.max_depth = max_depth
+        self.batch_size = batch_size
+        self.interval = interval
+
+    def start(self) -> None:
+        if not self.is_enabled or self.__task is not None:
+            return
+        self.__task = asyncio.ensure_future(self.__run())
+
+    async def stop(self) -> None:
+        if self.__task is None:
+            return
+        self.__task.cancel()
+        try:
+            await self.__task
+        except asyncio.CancelledError:
+            pass
+        self.__task = None
+        # The writes still waiting are applied before the process goes away,
+        # which is all that keeps the in-memory store from losing them.
+        try:
+            while await self.flush() > 0:
+                pass
+        except Exception as error:
+            message = "An error occurred when draining the user write queue"
+            print(message, error)
+
+    async def enqueue(self, userId: str, user: User) -> bool:
+        if not self.is_enabled:
+            return False
+        return await self.__store.push(userId, user, self.max_depth)
+
+    async def flush(self) -> int:
+        writes = await self.__store.claim(self.batch_size, self.CLAIM_LEASE)
+        if not writes:
+            return 0
+        started_at = time.perf_counter()
+        users = [(write.userId, write.user) for write in writes]
+        # A write only applies when its user has not been written since it was
+        # queued, so a synchronous write that came later is never undone by it.
+        written_at = [write.queued_at for write in writes]
+        try:
+            updated_users = await self.user_repository.update_users(users, written_at)
+        except Exception as error:
+            # One bad write, such as an email taken in the meantime, must not
+            # hold back the rest of the batch, which is then written one by one.
+            message = "An error occurred when updating a batch of users in database"
+            print(message, error)
+            updated_users = await self.__update_one_by_one(users, written_at)
+        for userId, _ in users:
+            self.user_cache.delete(userId)
+        for updated_user in updated_users:
+            self.user_cache.set(updated_user)
+        await self.__store.ack([write.id for write in writes])
+        self.flush_latency = time.perf_counter() - started_at
+        # The writes of a user that was deleted or written since, or that
+        # could not be written at all, were not applied.
+        updated_user_ids = {UUID(user.id).hex for user in updated_users}
+        flushed = sum(UUID(write.userId).hex in updated_user_ids for write in writes)
+        self.flushed += flushed
+        self.failed += len(writes) - flushed
+        return len(writes)
+
+    async def get_metrics(self) -> UserWriteQueueMetrics:
+        depth, oldest_queued_at = await self.__store.stat()
+        lag = 0.0
+        if oldest_queued_at is not None:
+            lag = max(
+                (datetime.now(timezone.utc) - oldest_queued_at).total_seconds(), 0.0
+            )
+        return UserWriteQueueMetrics(
+            depth=depth,
+            lag=lag,
+            flush_latency=self.flush_latency,
+            flushed=self.flushed,
+            failed=self.failed,
+        )
+
+    async def __update_one_by_one(
+        self, users: list[tuple[str, User]], written_at: list[datetime]
+    ) -> list[User]:
+        updated_users_by_id: dict[str, User] = {}
+        for (userId, user), write_time in zip(users, written_at):
+            try:
+                updated_users = await self.user_repository.update_users(
+                    [(userId, user)], [write_time]
+                )
+            except Exception as error:
+                message = "An error occurred when updating a queued user in database"
+                print(message, error)
+                continue
+            for updated_user in updated_users:
+                updated_users_by_id[UUID(userId).hex] = updated_user
+        return list(updated_users_by_id.values())
+
+    async def __run(self) -> None:
+        while True:
+            try:
+                flushed = await self.flush()
+            except Exception as error:
+                message = "An error occurred when flushing the user write queue"
+                print(message, error)
+                flushed = 0
+            # A full batch means more writes are waiting, so the next one is
+            # taken right away, while a partial one lets more of them gather.
+            if flushed < self.batch_size:
+                await asyncio.sleep(self.interval)
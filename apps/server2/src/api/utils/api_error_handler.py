@@ -1,4 +1,5 @@
 from fastapi import Request, status
+from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 
@@ -13,7 +14,12 @@ class APIErrorHandler:
         return JSONResponse(
             content=APIErrorResponse(
                 message="Validation failed",
-                detail=Detail(context=error.body, cause=error.errors()),
+                detail=Detail(
+                    context=error.body,
+                    cause=jsonable_encoder(
+                        error.errors(), custom_encoder={Exception: str}
+                    ),
+                ),
                 is_operational=True,
             ).model_dump(),
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -27,6 +33,7 @@ class APIErrorHandler:
                 is_operational=error.is_operational,
             ).model_dump(),
             status_code=error.status_code,
+            headers=error.headers,
         )
 
     def handle_common_error(self, request: Request, error: Exception) -> JSONResponse:
@@ -0,0 +1,29 @@
+import base64
+import json
+from typing import Any
+
+from fastapi import status
+from pydantic import TypeAdapter, ValidationError
+
+from server_error import Detail, ServerError
+
+
+class Cursor:
+    @staticmethod
+    def encode(values: list[Any]) -> str:
+        raw_cursor = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw_cursor).decode().rstrip("=")
+
+    @staticmethod
+    def decode(cursor: str, type_: Any) -> Any:
+        try:
+            raw_cursor = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            return TypeAdapter(type_).validate_json(raw_cursor)
+        except (ValueError, ValidationError) as error:
+            message = "Invalid cursor"
+            print(message, error)
+            raise ServerError(
+                message,
+                status.HTTP_422_UNPROCESSABLE_ENTITY,
+                Detail(context=cursor, cause=None),
+            )
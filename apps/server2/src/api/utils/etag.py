@@ -0,0 +1,30 @@
+from hashlib import sha1
+
+
+class ETag:
+    @staticmethod
+    def matches(condition: str | None, etag: str) -> bool:
+        if condition is None:
+            return False
+        if condition.strip() == "*":
+            return True
+        return ETag.__strip_weakness(etag) in [
+            ETag.__strip_weakness(candidate.strip())
+            for candidate in condition.split(",")
+        ]
+
+    @staticmethod
+    def from_version(version: int, variant: str) -> str:
+        return f'"{version:x}-{sha1(variant.encode()).hexdigest()[:16]}"'
+
+    @staticmethod
+    def parse(condition: str) -> list[str]:
+        return [
+            candidate.strip()
+            for candidate in condition.split(",")
+            if candidate.strip() and not candidate.strip().startswith("W/")
+        ]
+
+    @staticmethod
+    def __strip_weakness(etag: str) -> str:
+        return etag[2:] if etag.startswith("W/") else etag
@@ -0,0 +1,11 @@
+class Prefer:
+    @staticmethod
+    def has(header: str | None, preference: str) -> bool:
+        if header is None:
+            return False
+        # Preferences are listed as tokens that may carry parameters after a
+        # semicolon (RFC 7240), none of which matter to the ones looked up here.
+        return preference.lower() in [
+            candidate.split(";")[0].split("=")[0].strip().lower()
+            for candidate in header.split(",")
+        ]
@@ -0,0 +1,36 @@
+from dependency_injector.wiring import Provide, inject
+from fastapi import Depends, Request, Response, status
+
+from container.container import Container
+from server_error import Detail, ServerError
+from services.rate_limit_service import RateLimit, RateLimitService
+
+
+def rate_limiter(scope: str, rate_limit: RateLimit) -> Depends:
+    @inject
+    async def limit_rate(
+        request: Request,
+        response: Response,
+        rate_limit_service: RateLimitService = Depends(
+            Provide[Container.rate_limit_service_provider]
+        ),
+    ) -> None:
+        client_identity = request.client.host if request.client else "unknown"
+        result = await rate_limit_service.hit(f"{scope}:{client_identity}", rate_limit)
+        headers = {
+            "RateLimit-Limit": str(result.limit),
+            "RateLimit-Remaining": str(result.remaining),
+            "RateLimit-Reset": str(result.reset_after),
+        }
+        if not result.allowed:
+            message = "Too many requests"
+            print(message, scope, client_identity)
+            raise ServerError(
+                message,
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                Detail(context=scope, cause=None),
+                {**headers, "Retry-After": str(result.retry_after)},
+            )
+        response.headers.update(headers)
+
+    return Depends(limit_rate)
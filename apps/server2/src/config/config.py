@@ -18,6 +18,10 @@ class Config:
     def get_database_url(self) -> str:
         return self.__get_env_var("DATABASE_URL")
 
+    def get_database_shard_urls(self) -> list[str]:
+        shard_urls = self.__get_env_var("DATABASE_SHARD_URLS", "")
+        return [shard_url for shard_url in shard_urls.split(",") if shard_url]
+
     def get_database_username(self) -> str:
         return self.__get_env_var("DATABASE_USERNAME")
 
@@ -33,13 +37,81 @@ class Config:
     def get_allowed_origins(self) -> str:
         return self.__get_env_var("ALLOWED_ORIGINS")
 
+    def get_rate_limit_store(self) -> str:
+        return self.__get_env_var("RATE_LIMIT_STORE", "memory")
+
+    def get_idempotency_store(self) -> str:
+        return self.__get_env_var("IDEMPOTENCY_STORE", "memory")
+
+    def get_idempotency_ttl(self) -> float:
+        return float(self.__get_env_var("IDEMPOTENCY_TTL", "86400"))
+
+    def get_id_generator(self) -> str:
+        return self.__get_env_var("ID_GENERATOR", "uuid7")
+
+    def get_user_cache_ttl(self) -> float:
+        return float(self.__get_env_var("USER_CACHE_TTL", "0"))
+
+    def get_user_cache_max_size(self) -> int:
+        return int(self.__get_env_var("USER_CACHE_MAX_SIZE", "10000"))
+
+    def get_user_loader_window(self) -> float:
+        return float(self.__get_env_var("USER_LOADER_WINDOW", "0"))
+
+    def get_user_loader_max_batch_size(self) -> int:
+        return int(self.__get_env_var("USER_LOADER_MAX_BATCH_SIZE", "1"))
+
+    def get_user_insert_window(self) -> float:
+        return float(self.__get_env_var("USER_INSERT_WINDOW", "0"))
+
+    def get_user_insert_max_batch_size(self) -> int:
+        return int(self.__get_env_var("USER_INSERT_MAX_BATCH_SIZE", "1"))
+
+    def get_user_delete_mode(self) -> str:
+        return self.__get_env_var("USER_DELETE_MODE", "hard")
+
+    def get_user_purge_batch_size(self) -> int:
+        return int(self.__get_env_var("USER_PURGE_BATCH_SIZE", "100"))
+
+    def get_user_purge_interval(self) -> float:
+        return float(self.__get_env_var("USER_PURGE_INTERVAL", "1"))
+
+    def get_user_purge_max_active_queries(self) -> int:
+        return int(self.__get_env_var("USER_PURGE_MAX_ACTIVE_QUERIES", "2"))
+
+    def get_user_write_queue_store(self) -> str:
+        return self.__get_env_var("USER_WRITE_QUEUE_STORE", "memory")
+
+    def get_user_write_queue_max_depth(self) -> int:
+        return int(self.__get_env_var("USER_WRITE_QUEUE_MAX_DEPTH", "10000"))
+
+    def get_user_write_queue_batch_size(self) -> int:
+        return int(self.__get_env_var("USER_WRITE_QUEUE_BATCH_SIZE", "500"))
+
+    def get_user_write_queue_interval(self) -> float:
+        return float(self.__get_env_var("USER_WRITE_QUEUE_INTERVAL", "0.05"))
+
+    def get_user_stream_buffer_size(self) -> int:
+        return int(self.__get_env_var("USER_STREAM_BUFFER_SIZE", "100"))
+
+    def get_user_stream_max_subscribers(self) -> int:
+        return int(self.__get_env_var("USER_STREAM_MAX_SUBSCRIBERS", "10000"))
+
+    def get_user_stream_keepalive(self) -> float:
+        return float(self.__get_env_var("USER_STREAM_KEEPALIVE", "15"))
+
+    def get_user_stream_poll_interval(self) -> float:
+        return float(self.__get_env_var("USER_STREAM_POLL_INTERVAL", "1"))
+
     @staticmethod
     def set_database_url(database_url: str) -> None:
         os.environ["DATABASE_URL"] = database_url
 
     @staticmethod
-    def __get_env_var(name: str) -> str:
+    def __get_env_var(name: str, default: str | None = None) -> str:
         if os.environ.get(name) is None:
+            if default is not None:
+                return default
             message = f"{name} environment variable isn't set!"
             raise ServerError(message, status.HTTP_500_INTERNAL_SERVER_ERROR)
         return os.environ.get(name)
@@ -1,10 +1,18 @@
 from dependency_injector import containers, providers
 
 from api.components.health_check.health_check_service import HealthCheckService
+from api.components.user.user_cache import UserCache
+from api.components.user.user_cache_invalidator import UserCacheInvalidator
+from api.components.user.user_loader import UserLoader
+from api.components.user.user_purger import UserPurger
 from api.components.user.user_repository import UserRepository
 from api.components.user.user_service import UserService
+from api.components.user.user_stream import UserStream
+from api.components.user.user_write_queue import UserWriteQueue
 from services.api_pagination_service import APIPaginationService
 from services.db_service import DBService
+from services.idempotency_service import IdempotencyService
+from services.rate_limit_service import RateLimitService
 
 
 class Container(containers.DeclarativeContainer):
@@ -15,7 +23,43 @@ class Container(containers.DeclarativeContainer):
     health_check_service_provider = providers.Singleton(
         HealthCheckService, db_service=db_service_provider
     )
+    user_cache_provider = providers.Singleton(UserCache)
+    user_cache_invalidator_provider = providers.Singleton(
+        UserCacheInvalidator,
+        user_cache=user_cache_provider,
+        db_service=db_service_provider,
+    )
+    user_loader_provider = providers.Singleton(
+        UserLoader, user_repository=user_repository_provider
+    )
+    user_purger_provider = providers.Singleton(
+        UserPurger,
+        user_repository=user_repository_provider,
+        db_service=db_service_provider,
+    )
+    user_write_queue_provider = providers.Singleton(
+        UserWriteQueue,
+        user_repository=user_repository_provider,
+        user_cache=user_cache_provider,
+        db_service=db_service_provider,
+    )
+    user_stream_provider = providers.Singleton(
+        UserStream,
+        user_repository=user_repository_provider,
+        db_service=db_service_provider,
+    )
     user_service_provider = providers.Singleton(
-        UserService, user_repository=user_repository_provider
+        UserService,
+        user_repository=user_repository_provider,
+        user_cache=user_cache_provider,
+        user_loader=user_loader_provider,
+        user_write_queue=user_write_queue_provider,
+        user_stream=user_stream_provider,
     )
     api_pagination_service_provider = providers.Singleton(APIPaginationService)
+    rate_limit_service_provider = providers.Singleton(
+        RateLimitService, db_service=db_service_provider
+    )
+    idempotency_service_provider = providers.Singleton(
+        IdempotencyService, db_service=db_service_provider
+    )
@@ -1,3 +1,4 @@
+from db.models.default import set_id_generator
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
@@ -5,6 +6,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from api.components.health_check import health_check_controller
 from api.components.user import user_controller
 from api.routers.routers import health_check_router, user_router
+from api.utils import rate_limiter
 from api.utils.api_error_handler import APIErrorHandler
 from config.config import Config
 from container.container import Container
@@ -39,15 +41,67 @@ class Server:
     def __init__(self, config: Config):
         container = Container()
         db_service = container.db_service_provider()
-        db_service.connect_database(config.get_database_url())
+        db_service.connect_database(
+            config.get_database_url(), config.get_database_shard_urls()
+        )
+        set_id_generator(config.get_id_generator())
+        rate_limit_service = container.rate_limit_service_provider()
+        rate_limit_service.connect_store(config.get_rate_limit_store())
+        idempotency_service = container.idempotency_service_provider()
+        idempotency_service.connect_store(config.get_idempotency_store())
+        idempotency_service.configure(config.get_idempotency_ttl())
+        user_cache = container.user_cache_provider()
+        user_cache.configure(
+            config.get_user_cache_ttl(), config.get_user_cache_max_size()
+        )
+        user_cache_invalidator = container.user_cache_invalidator_provider()
+        user_loader = container.user_loader_provider()
+        user_loader.configure(
+            config.get_user_loader_window(), config.get_user_loader_max_batch_size()
+        )
+        user_repository = container.user_repository_provider()
+        user_repository.configure(
+            config.get_user_delete_mode() == "soft",
+            config.get_user_insert_window(),
+            config.get_user_insert_max_batch_size(),
+        )
+        user_purger = container.user_purger_provider()
+        user_purger.configure(
+            config.get_user_purge_batch_size(),
+            config.get_user_purge_interval(),
+            config.get_user_purge_max_active_queries(),
+        )
+        user_write_queue = container.user_write_queue_provider()
+        user_write_queue.connect_store(config.get_user_write_queue_store())
+        user_write_queue.configure(
+            config.get_user_write_queue_max_depth(),
+            config.get_user_write_queue_batch_size(),
+            config.get_user_write_queue_interval(),
+        )
+        user_stream = container.user_stream_provider()
+        user_stream.configure(
+            config.get_user_stream_buffer_size(),
+            config.get_user_stream_max_subscribers(),
+            config.get_user_stream_keepalive(),
+            config.get_user_stream_poll_interval(),
+        )
         container.wire(modules=[health_check_controller])
         container.wire(modules=[user_controller])
+        container.wire(modules=[rate_limiter])
         self.__app.add_middleware(
             CORSMiddleware,
             allow_origins=["*"],
             allow_credentials=True,
             allow_methods=["*"],
             allow_headers=["*"],
+            expose_headers=[
+                "ETag",
+                "Idempotent-Replayed",
+                "Preference-Applied",
+                "RateLimit-Limit",
+                "RateLimit-Remaining",
+                "RateLimit-Reset",
+            ],
         )
         api_error_handler = APIErrorHandler()
         exception_handlers = {
@@ -58,6 +112,13 @@ class Server:
         self.__app.exception_handlers = exception_handlers
         self.__app.include_router(router=health_check_router)
         self.__app.include_router(router=user_router)
+        self.__app.add_event_handler("startup", user_cache_invalidator.start)
+        self.__app.add_event_handler("shutdown", user_cache_invalidator.stop)
+        self.__app.add_event_handler("startup", user_purger.start)
+        self.__app.add_event_handler("shutdown", user_purger.stop)
+        self.__app.add_event_handler("startup", user_write_queue.start)
+        self.__app.add_event_handler("shutdown", user_write_queue.stop)
+        self.__app.add_event_handler("shutdown", user_stream.stop)
 
     @property
     def app(self) -> FastAPI:
@@ -17,8 +17,9 @@ class ServerError(HTTPException):
         message: str,
         status_code: Optional[int] = None,
         detail: Optional[Detail] = None,
+        headers: Optional[dict[str, str]] = None,
     ):
-        super().__init__(status_code, detail)
+        super().__init__(status_code, detail, headers)
         self.message = message
         if status_code:
             self.status_code = status_code
@@ -1,20 +1,75 @@
+import asyncio
+import hashlib
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from contextvars import ContextVar
+from typing import Any
+from uuid import UUID
 
 from alembic import command as alembic_command
 from alembic import config as alembic_config
 from fastapi import status
 from sqlalchemy import Connection, text
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
     AsyncEngine,
+    AsyncTransaction,
     create_async_engine,
 )
 
 from server_error import Detail, ServerError
 
+_transaction_connections: ContextVar[dict[AsyncEngine, AsyncConnection] | None] = (
+    ContextVar("transaction_connections", default=None)
+)
+
+
+class SavepointConnection:
+    # Stands in for a connection of its own within a transaction that spans
+    # several calls, where a commit or a rollback only ends a savepoint.
+    __savepoint: AsyncTransaction | None
+
+    def __init__(self, conn: AsyncConnection):
+        self.conn = conn
+        self.__savepoint = None
+
+    async def begin(self) -> None:
+        self.__savepoint = await self.conn.begin_nested()
+
+    async def execute(self, *args: Any, **kwargs: Any) -> Any:
+        return await self.conn.execute(*args, **kwargs)
+
+    def begin_nested(self) -> AsyncTransaction:
+        return self.conn.begin_nested()
+
+    async def get_raw_connection(self) -> Any:
+        return await self.conn.get_raw_connection()
+
+    async def commit(self) -> None:
+        await self.__savepoint.commit()
+        await self.begin()
+
+    async def rollback(self) -> None:
+        await self.__savepoint.rollback()
+        await self.begin()
+
+    async def close(self) -> None:
+        # Whatever was not committed is undone, as when a connection closes.
+        if self.__savepoint is not None and self.__savepoint.is_active:
+            await self.__savepoint.rollback()
+        self.__savepoint = None
+
 
 class IDBService(ABC):
     @abstractmethod
-    async def connect_database(self, database_url: str) -> None:
+    async def connect_database(
+        self, database_url: str, shard_database_urls: list[str] | None = None
+    ) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def get_shard_async_engine(self, key: str) -> AsyncEngine:
         raise Exception("NotImplementedException")
 
     @abstractmethod
@@ -29,6 +84,32 @@ class IDBService(ABC):
     async def get_database_table_row_count(self, table_name: str) -> int:
         raise Exception("NotImplementedException")
 
+    @abstractmethod
+    async def get_database_active_query_count(self) -> int:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def connect(
+        self, async_engine: AsyncEngine
+    ) -> AbstractAsyncContextManager[AsyncConnection]:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def transaction(self) -> AbstractAsyncContextManager[None]:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def listen(
+        self, channel: str, callback: Callable[[str | None], None]
+    ) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def unlisten(
+        self, channel: str, callback: Callable[[str | None], None]
+    ) -> None:
+        raise Exception("NotImplementedException")
+
     @abstractmethod
     async def clear_database_tables(self) -> None:
         raise Exception("NotImplementedException")
@@ -44,9 +125,20 @@ class IDBService(ABC):
 
 class DBService(IDBService):
     __async_engine: AsyncEngine | None
+    __shard_async_engines: list[AsyncEngine]
+    __listen_connections: list[AsyncConnection]
+    __callbacks_by_channel: dict[str, list[Callable[[str | None], None]]]
+    __reconnect_task: asyncio.Task | None
+
+    LISTEN_RECONNECT_DELAY = 0.1
+    LISTEN_RECONNECT_MAX_DELAY = 5
 
     def __init__(self):
         self.__async_engine = None
+        self.__shard_async_engines = []
+        self.__listen_connections = []
+        self.__callbacks_by_channel = {}
+        self.__reconnect_task = None
 
     @property
     def async_engine(self) -> AsyncEngine:
@@ -56,11 +148,28 @@ class DBService(IDBService):
         print(message)
         raise ServerError(message, status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-    def connect_database(self, database_url: str) -> None:
+    @property
+    def shard_async_engines(self) -> list[AsyncEngine]:
+        # The primary database is the first shard, and the only one when no
+        # other shard is configured.
+        return [self.async_engine, *self.__shard_async_engines]
+
+    @property
+    def in_transaction(self) -> bool:
+        return _transaction_connections.get() is not None
+
+    def connect_database(
+        self, database_url: str, shard_database_urls: list[str] | None = None
+    ) -> None:
         try:
             self.__async_engine = create_async_engine(
                 url=database_url,
             )
+            self.__shard_async_engines = []
+            for shard_database_url in shard_database_urls or []:
+                self.__shard_async_engines.append(
+                    create_async_engine(url=shard_database_url)
+                )
         except Exception as error:
             message = "An error occurred when connecting to database!"
             print(message, error)
@@ -70,121 +179,255 @@ class DBService(IDBService):
                 Detail(context=database_url, cause=str(error)),
             )
 
+    def get_shard_async_engine(self, key: str) -> AsyncEngine:
+        shard_async_engines = self.shard_async_engines
+        if len(shard_async_engines) == 1:
+            return shard_async_engines[0]
+        # The key is hashed rather than taken as is so that time-ordered ids,
+        # whose leading bits barely change, still spread over every shard.
+        digest = hashlib.blake2b(UUID(key).bytes, digest_size=8).digest()
+        return shard_async_engines[int.from_bytes(digest) % len(shard_async_engines)]
+
     async def check_database_is_alive(self) -> bool:
         if self.__async_engine is not None:
-            async with self.__async_engine.connect() as conn:
-                try:
-                    query = text("""
-                        SELECT 1
-                    """)
-                    await conn.execute(query)
-                    await conn.commit()
-                    return True
-                except Exception as error:
-                    await conn.rollback()
-                    message = "An error occurred when checking database is alive"
-                    print(message, error)
-                    raise ServerError(message, status.HTTP_500_INTERNAL_SERVER_ERROR)
+            for async_engine in self.shard_async_engines:
+                async with async_engine.connect() as conn:
+                    try:
+                        query = text("""
+                            SELECT 1
+                        """)
+                        await conn.execute(query)
+                        await conn.commit()
+                    except Exception as error:
+                        await conn.rollback()
+                        message = "An error occurred when checking database is alive"
+                        print(message, error)
+                        raise ServerError(
+                            message, status.HTTP_500_INTERNAL_SERVER_ERROR
+                        )
+            return True
         message = "Async engine is None!"
         print(message)
         raise ServerError(message, status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     async def migrate_database(self, alembic_file_path: str) -> None:
         if self.__async_engine is not None:
-            async with self.__async_engine.connect() as conn:
-                try:
-                    await conn.run_sync(self.__run_upgrade, alembic_file_path)
-                    return
-                except Exception as error:
-                    await conn.rollback()
-                    message = "An error occurred when migrating the database"
-                    print(message, error)
-                    raise ServerError(message, status.HTTP_500_INTERNAL_SERVER_ERROR)
+            for async_engine in self.shard_async_engines:
+                async with async_engine.connect() as conn:
+                    try:
+                        await conn.run_sync(self.__run_upgrade, alembic_file_path)
+                    except Exception as error:
+                        await conn.rollback()
+                        message = "An error occurred when migrating the database"
+                        print(message, error)
+                        raise ServerError(
+                            message, status.HTTP_500_INTERNAL_SERVER_ERROR
+                        )
+            return
         message = "Async engine is None!"
         print(message)
         raise ServerError(message, status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     async def get_database_table_row_count(self, table_name: str) -> int:
         if self.__async_engine is not None:
-            async with self.__async_engine.connect() as conn:
-                try:
-                    query = text(f"""
-                        SELECT count(*)
-                        FROM {table_name};
-                    """)
-                    result = await conn.execute(query)
-                    _tuple = result.first()
-                    await conn.commit()
-                    return _tuple[0]
-                except Exception as error:
-                    await conn.rollback()
-                    message = (
-                        "An error occurred when counting rows of "
-                        f"database table {table_name}"
-                    )
-                    print(message, error)
-                    raise ServerError(message, status.HTTP_500_INTERNAL_SERVER_ERROR)
+            row_count = 0
+            for async_engine in self.shard_async_engines:
+                async with async_engine.connect() as conn:
+                    try:
+                        query = text(f"""
+                            SELECT count(*)
+                            FROM {table_name};
+                        """)
+                        result = await conn.execute(query)
+                        _tuple = result.first()
+                        await conn.commit()
+                        row_count += _tuple[0]
+                    except Exception as error:
+                        await conn.rollback()
+                        message = (
+                            "An error occurred when counting rows of "
+                            f"database table {table_name}"
+                        )
+                        print(message, error)
+                        raise ServerError(
+                            message, status.HTTP_500_INTERNAL_SERVER_ERROR
+                        )
+            return row_count
+        message = "Async engine is None!"
+        print(message)
+        raise ServerError(message, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    async def get_database_active_query_count(self) -> int:
+        if self.__async_engine is not None:
+            active_query_count = 0
+            for async_engine in self.shard_async_engines:
+                async with async_engine.connect() as conn:
+                    try:
+                        query = text("""
+                            SELECT count(*)
+                            FROM pg_stat_activity
+                                WHERE datname = current_database()
+                                    AND state = 'active'
+                                    AND pid <> pg_backend_pid();
+                        """)
+                        result = await conn.execute(query)
+                        _tuple = result.first()
+                        await conn.commit()
+                        active_query_count += _tuple[0]
+                    except Exception as error:
+                        await conn.rollback()
+                        message = (
+                            "An error occurred when counting the active queries "
+                            "of the database"
+                        )
+                        print(message, error)
+                        raise ServerError(
+                            message, status.HTTP_500_INTERNAL_SERVER_ERROR
+                        )
+            return active_query_count
         message = "Async engine is None!"
         print(message)
         raise ServerError(message, status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     async def clear_database_tables(self) -> None:
         if self.__async_engine is not None:
-            async with self.__async_engine.connect() as conn:
-                try:
-                    query = text("""
-                        SELECT table_name
-                        FROM information_schema.tables
-                            WHERE table_schema = 'public'
-                                AND table_type = 'BASE TABLE';
-                    """)
-                    result = await conn.execute(query)
-                    for _tuple in result.fetchall():
-                        table = _tuple[0]
-                        query = text(f"TRUNCATE TABLE {table} CASCADE;")
-                        await conn.execute(query)
-                    await conn.commit()
-                    return
-                except Exception as error:
-                    await conn.rollback()
-                    message = "An error occurred when cleaning the database tables"
-                    print(message, error)
-                    raise ServerError(message, status.HTTP_500_INTERNAL_SERVER_ERROR)
+            for async_engine in self.shard_async_engines:
+                async with async_engine.connect() as conn:
+                    try:
+                        query = text("""
+                            SELECT table_name
+                            FROM information_schema.tables
+                                WHERE table_schema = 'public'
+                                    AND table_type = 'BASE TABLE';
+                        """)
+                        result = await conn.execute(query)
+                        for _tuple in result.fetchall():
+                            table = _tuple[0]
+                            query = text(f"TRUNCATE TABLE {table} CASCADE;")
+                            await conn.execute(query)
+                        await conn.commit()
+                    except Exception as error:
+                        await conn.rollback()
+                        message = "An error occurred when cleaning the database tables"
+                        print(message, error)
+                        raise ServerError(
+                            message, status.HTTP_500_INTERNAL_SERVER_ERROR
+                        )
+            return
         message = "Async engine is None!"
         print(message)
         raise ServerError(message, status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     async def delete_database_tables(self) -> None:
         if self.__async_engine is not None:
-            async with self.__async_engine.connect() as conn:
-                try:
-                    query = text("""
-                        SELECT table_name
-                        FROM information_schema.tables
-                            WHERE table_schema = 'public'
-                                AND table_type = 'BASE TABLE';
-                    """)
-                    result = await conn.execute(query)
-                    for _tuple in result.fetchall():
-                        table = _tuple[0]
-                        query = text(f"DROP TABLE {table} CASCADE;")
-                        await conn.execute(query)
-                    await conn.commit()
-                    return
-                except Exception as error:
-                    await conn.rollback()
-                    message = "An error occurred when deleting the database tables"
-                    print(message, error)
-                    raise ServerError(message, status.HTTP_500_INTERNAL_SERVER_ERROR)
+            for async_engine in self.shard_async_engines:
+                async with async_engine.connect() as conn:
+                    try:
+                        query = text("""
+                            SELECT table_name
+                            FROM information_schema.tables
+                                WHERE table_schema = 'public'
+                                    AND table_type = 'BASE TABLE';
+                        """)
+                        result = await conn.execute(query)
+                        for _tuple in result.fetchall():
+                            table = _tuple[0]
+                            query = text(f"DROP TABLE IF EXISTS {table} CASCADE;")
+                            await conn.execute(query)
+                        await conn.commit()
+                    except Exception as error:
+                        await conn.rollback()
+                        message = "An error occurred when deleting the database tables"
+                        print(message, error)
+                        raise ServerError(
+                            message, status.HTTP_500_INTERNAL_SERVER_ERROR
+                        )
+            return
         message = "Async engine is None!"
         print(message)
         raise ServerError(message, status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @asynccontextmanager
+    async def connect(
+        self, async_engine: AsyncEngine
+    ) -> AsyncIterator[AsyncConnection]:
+        connections = _transaction_connections.get()
+        if connections is None:
+            async with async_engine.connect() as conn:
+                yield conn
+            return
+        # Within a transaction every call shares the connection of the shard,
+        # each under a savepoint of its own.
+        if async_engine not in connections:
+            connections[async_engine] = await async_engine.connect()
+        savepoint_connection = SavepointConnection(connections[async_engine])
+        await savepoint_connection.begin()
+        try:
+            yield savepoint_connection
+        finally:
+            await savepoint_connection.close()
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        if _transaction_connections.get() is not None:
+            yield
+            return
+        connections: dict[AsyncEngine, AsyncConnection] = {}
+        token = _transaction_connections.set(connections)
+        try:
+            yield
+            # Shards commit one after the other, so a transaction that spans
+            # several of them is only atomic within each one.
+            for conn in connections.values():
+                await conn.commit()
+        finally:
+            _transaction_connections.reset(token)
+            for conn in connections.values():
+                await conn.close()
+
+    async def listen(
+        self, channel: str, callback: Callable[[str | None], None]
+    ) -> None:
+        callbacks = self.__callbacks_by_channel.setdefault(channel, [])
+        callbacks.append(callback)
+        if len(callbacks) > 1:
+            return
+        try:
+            if not self.__listen_connections:
+                await self.__connect_listeners()
+                return
+            for conn in self.__listen_connections:
+                driver_connection = (await conn.get_raw_connection()).driver_connection
+                await driver_connection.add_listener(channel, self.__dispatch)
+        except Exception:
+            self.__callbacks_by_channel.pop(channel, None)
+            raise
+
+    async def unlisten(
+        self, channel: str, callback: Callable[[str | None], None]
+    ) -> None:
+        callbacks = self.__callbacks_by_channel.get(channel, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if callbacks:
+            return
+        self.__callbacks_by_channel.pop(channel, None)
+        for conn in self.__listen_connections:
+            driver_connection = (await conn.get_raw_connection()).driver_connection
+            await driver_connection.remove_listener(channel, self.__dispatch)
+
     async def deactivate_database(self) -> None:
         if self.__async_engine is not None:
             try:
-                await self.__async_engine.dispose()
+                self.__callbacks_by_channel = {}
+                if self.__reconnect_task is not None:
+                    self.__reconnect_task.cancel()
+                    self.__reconnect_task = None
+                await self.__close_listen_connections()
+                for async_engine in self.shard_async_engines:
+                    await async_engine.dispose()
                 self.__async_engine = None
+                self.__shard_async_engines = []
                 return
             except Exception as error:
                 message = "An error occurred when deactivating the database"
@@ -194,6 +437,68 @@ class DBService(IDBService):
         print(message)
         raise ServerError(message, status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    async def __connect_listeners(self) -> None:
+        # One connection per shard is kept aside for all the channels, since
+        # notifications are only delivered to the session that listens.
+        try:
+            for async_engine in self.shard_async_engines:
+                conn = await async_engine.connect()
+                self.__listen_connections.append(conn)
+                driver_connection = (await conn.get_raw_connection()).driver_connection
+                driver_connection.add_termination_listener(self.__reconnect)
+                for channel in self.__callbacks_by_channel:
+                    await driver_connection.add_listener(channel, self.__dispatch)
+        except Exception:
+            await self.__close_listen_connections()
+            raise
+
+    async def __close_listen_connections(self) -> None:
+        listen_connections = self.__listen_connections
+        self.__listen_connections = []
+        for conn in listen_connections:
+            try:
+                driver_connection = (await conn.get_raw_connection()).driver_connection
+                driver_connection.remove_termination_listener(self.__reconnect)
+                await conn.invalidate()
+                await conn.close()
+            except Exception as error:
+                message = "An error occurred when closing a listen connection"
+                print(message, error)
+
+    def __reconnect(self, driver_connection: Any) -> None:
+        if self.__reconnect_task is None:
+            self.__reconnect_task = asyncio.ensure_future(self.__reconnect_listeners())
+
+    async def __reconnect_listeners(self) -> None:
+        delay = self.LISTEN_RECONNECT_DELAY
+        try:
+            await self.__close_listen_connections()
+            while self.__callbacks_by_channel:
+                try:
+                    await self.__connect_listeners()
+                    break
+                except Exception as error:
+                    message = "An error occurred when listening to the database again"
+                    print(message, error)
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, self.LISTEN_RECONNECT_MAX_DELAY)
+        finally:
+            self.__reconnect_task = None
+        # The notifications sent while no one listened are gone, which the
+        # callbacks are told about with no payload at all.
+        for channel in list(self.__callbacks_by_channel):
+            self.__dispatch(None, 0, channel, None)
+
+    def __dispatch(
+        self, conn: Any, pid: int, channel: str, payload: str | None
+    ) -> None:
+        for callback in list(self.__callbacks_by_channel.get(channel, [])):
+            try:
+                callback(payload)
+            except Exception as error:
+                message = "An error occurred when handling a database notification"
+                print(message, error)
+
     @staticmethod
     def __run_upgrade(conn: Connection, alembic_file_path: str):
         cfg = alembic_config.Config(alembic_file_path)
@@ -0,0 +1,299 @@
+import asyncio
+import hashlib
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, Awaitable, Callable
+
+from db.models.idempotency_key import IdempotencyKeyModel
+from fastapi import status
+from pydantic import BaseModel
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from server_error import Detail, ServerError
+from services.db_service import DBService
+
+
+class IdempotentResponse(BaseModel):
+    status_code: int
+    body: Any
+    headers: dict[str, str] = {}
+    replayed: bool = False
+
+
+class IdempotencyRecord(BaseModel):
+    fingerprint: str
+    response: IdempotentResponse | None
+
+
+class IIdempotencyStore(ABC):
+    @abstractmethod
+    async def reserve(
+        self, key: str, fingerprint: str, ttl: float
+    ) -> IdempotencyRecord | None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def save(self, key: str, response: IdempotentResponse, ttl: float) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def release(self, key: str) -> None:
+        raise Exception("NotImplementedException")
+
+
+class InMemoryIdempotencyStore(IIdempotencyStore):
+    __records: OrderedDict[str, tuple[IdempotencyRecord, float]]
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self.__records = OrderedDict()
+
+    async def reserve(
+        self, key: str, fingerprint: str, ttl: float
+    ) -> IdempotencyRecord | None:
+        now = time.monotonic()
+        entry = self.__records.get(key)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+        self.__records.pop(key, None)
+        self.__records[key] = (
+            IdempotencyRecord(fingerprint=fingerprint, response=None),
+            now + ttl,
+        )
+        while len(self.__records) > self.max_keys:
+            self.__records.popitem(last=False)
+        return None
+
+    async def save(self, key: str, response: IdempotentResponse, ttl: float) -> None:
+        entry = self.__records.get(key)
+        if entry is None:
+            return
+        record = entry[0].model_copy(update={"response": response})
+        self.__records[key] = (record, time.monotonic() + ttl)
+
+    async def release(self, key: str) -> None:
+        self.__records.pop(key, None)
+
+
+class DatabaseIdempotencyStore(IIdempotencyStore):
+    def __init__(self, db_service: DBService):
+        self.db_service = db_service
+
+    async def reserve(
+        self, key: str, fingerprint: str, ttl: float
+    ) -> IdempotencyRecord | None:
+        async with self.db_service.async_engine.connect() as conn:
+            idempotency_key = IdempotencyKeyModel.__table__
+            expires_at = func.now() + timedelta(seconds=ttl)
+            # An expired key is taken over in place, so the table never needs
+            # a separate sweep to let a key be reused.
+            query = (
+                insert(idempotency_key)
+                .values(key=key, fingerprint=fingerprint, expires_at=expires_at)
+                .on_conflict_do_update(
+                    index_elements=[idempotency_key.c.key],
+                    set_={
+                        "fingerprint": fingerprint,
+                        "status_code": None,
+                        "body": None,
+                        "headers": None,
+                        "expires_at": expires_at,
+                    },
+                    where=idempotency_key.c.expires_at <= func.now(),
+                )
+                .returning(idempotency_key.c.key)
+            )
+            result = await conn.execute(query)
+            reserved = result.first() is not None
+            record = None
+            if not reserved:
+                query = select(idempotency_key).where(idempotency_key.c.key == key)
+                result = await conn.execute(query)
+                record = result.first()
+            await conn.commit()
+            if record is None:
+                return None
+            return IdempotencyRecord(
+                fingerprint=record.fingerprint,
+                response=None
+                if record.status_code is None
+                else IdempotentResponse(
+                    status_code=record.status_code,
+                    body=record.body,
+                    headers=record.headers,
+                ),
+            )
+
+    async def save(self, key: str, response: IdempotentResponse, ttl: float) -> None:
+        async with self.db_service.async_engine.connect() as conn:
+            idempotency_key = IdempotencyKeyModel.__table__
+            query = (
+                update(idempotency_key)
+                .where(idempotency_key.c.key == key)
+                .values(
+                    status_code=response.status_code,
+                    body=response.body,
+                    headers=response.headers,
+                    expires_at=func.now() + timedelta(seconds=ttl),
+                )
+            )
+            await conn.execute(query)
+            await conn.commit()
+
+    async def release(self, key: str) -> None:
+        async with self.db_service.async_engine.connect() as conn:
+            idempotency_key = IdempotencyKeyModel.__table__
+            query = delete(idempotency_key).where(
+                idempotency_key.c.key == key,
+                idempotency_key.c.status_code.is_(None),
+            )
+            await conn.execute(query)
+            await conn.commit()
+
+
+class IIdempotencyService(ABC):
+    @abstractmethod
+    def connect_store(self, store_name: str) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    def configure(self, ttl: float) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def execute(
+        self,
+        key: str,
+        payload: str,
+        operation: Callable[[], Awaitable[IdempotentResponse]],
+    ) -> IdempotentResponse:
+        raise Exception("NotImplementedException")
+
+
+class IdempotencyService(IIdempotencyService):
+    __store: IIdempotencyStore
+    __in_flight: dict[str, tuple[str, asyncio.Future]]
+
+    def __init__(self, db_service: DBService, ttl: float = 86400):
+        self.db_service = db_service
+        self.ttl = ttl
+        self.__store = InMemoryIdempotencyStore()
+        self.__in_flight = {}
+
+    @property
+    def store(self) -> IIdempotencyStore:
+        return self.__store
+
+    def connect_store(self, store_name: str) -> None:
+        if store_name == "memory":
+            self.__store = InMemoryIdempotencyStore()
+            return
+        if store_name == "database":
+            self.__store = DatabaseIdempotencyStore(self.db_service)
+            return
+        message = "An error occurred when connecting to idempotency store!"
+        print(message, store_name)
+        raise ServerError(
+            message,
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            Detail(context=store_name, cause="Unknown idempotency store"),
+        )
+
+    def configure(self, ttl: float) -> None:
+        self.ttl = ttl
+
+    async def execute(
+        self,
+        key: str,
+        payload: str,
+        operation: Callable[[], Awaitable[IdempotentResponse]],
+    ) -> IdempotentResponse:
+        fingerprint = hashlib.sha256(payload.encode()).hexdigest()
+        in_flight = self.__in_flight.get(key)
+        if in_flight is not None:
+            # A duplicate arriving while the first request is still running in
+            # this process waits for its outcome instead of hitting the store.
+            in_flight_fingerprint, in_flight_response = in_flight
+            self.__check_fingerprint(key, in_flight_fingerprint, fingerprint)
+            response = await asyncio.shield(in_flight_response)
+            return response.model_copy(update={"replayed": True})
+        in_flight_response = asyncio.get_running_loop().create_future()
+        self.__in_flight[key] = (fingerprint, in_flight_response)
+        try:
+            response = await self.__execute_once(key, fingerprint, operation)
+            in_flight_response.set_result(response)
+            return response
+        except Exception as error:
+            in_flight_response.set_exception(error)
+            # Marks the exception as retrieved when no duplicate is waiting.
+            in_flight_response.exception()
+            raise
+        finally:
+            if not in_flight_response.done():
+                in_flight_response.cancel()
+            self.__in_flight.pop(key, None)
+
+    async def __execute_once(
+        self,
+        key: str,
+        fingerprint: str,
+        operation: Callable[[], Awaitable[IdempotentResponse]],
+    ) -> IdempotentResponse:
+        try:
+            record = await self.__store.reserve(key, fingerprint, self.ttl)
+        except Exception as error:
+            # A broken store must not take the API down with it, so the request
+            # goes through without being recorded.
+            message = "An error occurred when reserving an idempotency key"
+            print(message, error)
+            return await operation()
+        if record is not None:
+            self.__check_fingerprint(key, record.fingerprint, fingerprint)
+            if record.response is None:
+                message = "A request with the same idempotency key is in progress"
+                print(message, key)
+                raise ServerError(
+                    message,
+                    status.HTTP_409_CONFLICT,
+                    Detail(context=key, cause=None),
+                )
+            return record.response.model_copy(update={"replayed": True})
+        # The key is released whenever no response ends up saved for it, even
+        # when the request is cancelled, since a retry would otherwise be told
+        # that it is in progress for as long as the key lives.
+        try:
+            response = await operation()
+        except BaseException:
+            await self.__release(key)
+            raise
+        try:
+            await self.__store.save(key, response, self.ttl)
+        except BaseException as error:
+            message = "An error occurred when saving an idempotent response"
+            print(message, error)
+            await self.__release(key)
+            if not isinstance(error, Exception):
+                raise
+        return response
+
+    async def __release(self, key: str) -> None:
+        try:
+            await self.__store.release(key)
+        except Exception as error:
+            message = "An error occurred when releasing an idempotency key"
+            print(message, error)
+
+    @staticmethod
+    def __check_fingerprint(key: str, expected: str, actual: str) -> None:
+        if expected == actual:
+            return
+        message = "Idempotency key has been used with a different request"
+        print(message, key)
+        raise ServerError(
+            message,
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            Detail(context=key, cause=None),
+        )
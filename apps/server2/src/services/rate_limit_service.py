@@ -0,0 +1,173 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from db.models.rate_limit_bucket import RateLimitBucketModel
+from fastapi import status
+from pydantic import BaseModel
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+
+from server_error import Detail, ServerError
+from services.db_service import DBService
+
+
+class RateLimit(BaseModel):
+    capacity: int
+    refill_rate: float
+
+
+class RateLimitResult(BaseModel):
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: int
+    retry_after: int
+
+
+class IRateLimitStore(ABC):
+    @abstractmethod
+    async def consume(self, key: str, rate_limit: RateLimit) -> RateLimitResult:
+        raise Exception("NotImplementedException")
+
+
+class InMemoryRateLimitStore(IRateLimitStore):
+    __buckets: OrderedDict[str, tuple[float, float]]
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self.__buckets = OrderedDict()
+
+    async def consume(self, key: str, rate_limit: RateLimit) -> RateLimitResult:
+        now = time.monotonic()
+        tokens, refreshed_at = self.__buckets.pop(key, (rate_limit.capacity, now))
+        tokens = min(
+            rate_limit.capacity,
+            tokens + (now - refreshed_at) * rate_limit.refill_rate,
+        )
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self.__buckets[key] = (tokens, now)
+        if len(self.__buckets) > self.max_keys:
+            self.__buckets.popitem(last=False)
+        return RateLimitResult(
+            allowed=allowed,
+            limit=rate_limit.capacity,
+            remaining=math.floor(tokens),
+            reset_after=math.ceil(
+                (rate_limit.capacity - tokens) / rate_limit.refill_rate
+            ),
+            retry_after=0
+            if allowed
+            else math.ceil((1 - tokens) / rate_limit.refill_rate),
+        )
+
+
+class DatabaseRateLimitStore(IRateLimitStore):
+    def __init__(self, db_service: DBService):
+        self.db_service = db_service
+
+    async def consume(self, key: str, rate_limit: RateLimit) -> RateLimitResult:
+        async with self.db_service.async_engine.connect() as conn:
+            bucket = RateLimitBucketModel.__table__
+            refilled_tokens = func.least(
+                rate_limit.capacity,
+                bucket.c.tokens
+                + func.extract("epoch", func.clock_timestamp() - bucket.c.refreshed_at)
+                * rate_limit.refill_rate,
+            )
+            # The conditional update only touches the bucket when a token is
+            # available, so a rejected request comes back without any row.
+            query = (
+                insert(bucket)
+                .values(
+                    key=key,
+                    tokens=rate_limit.capacity - 1,
+                    refreshed_at=func.clock_timestamp(),
+                )
+                .on_conflict_do_update(
+                    index_elements=[bucket.c.key],
+                    set_={
+                        "tokens": refilled_tokens - 1,
+                        "refreshed_at": func.clock_timestamp(),
+                    },
+                    where=refilled_tokens >= 1,
+                )
+                .returning(bucket.c.tokens)
+            )
+            result = await conn.execute(query)
+            record = result.first()
+            await conn.commit()
+            if record is None:
+                return RateLimitResult(
+                    allowed=False,
+                    limit=rate_limit.capacity,
+                    remaining=0,
+                    reset_after=math.ceil(rate_limit.capacity / rate_limit.refill_rate),
+                    retry_after=math.ceil(1 / rate_limit.refill_rate),
+                )
+            tokens = record.tokens
+            return RateLimitResult(
+                allowed=True,
+                limit=rate_limit.capacity,
+                remaining=math.floor(tokens),
+                reset_after=math.ceil(
+                    (rate_limit.capacity - tokens) / rate_limit.refill_rate
+                ),
+                retry_after=0,
+            )
+
+
+class IRateLimitService(ABC):
+    @abstractmethod
+    def connect_store(self, store_name: str) -> None:
+        raise Exception("NotImplementedException")
+
+    @abstractmethod
+    async def hit(self, key: str, rate_limit: RateLimit) -> RateLimitResult:
+        raise Exception("NotImplementedException")
+
+
+class RateLimitService(IRateLimitService):
+    __store: IRateLimitStore
+
+    def __init__(self, db_service: DBService):
+        self.db_service = db_service
+        self.__store = InMemoryRateLimitStore()
+
+    @property
+    def store(self) -> IRateLimitStore:
+        return self.__store
+
+    def connect_store(self, store_name: str) -> None:
+        if store_name == "memory":
+            self.__store = InMemoryRateLimitStore()
+            return
+        if store_name == "database":
+            self.__store = DatabaseRateLimitStore(self.db_service)
+            return
+        message = "An error occurred when connecting to rate limit store!"
+        print(message, store_name)
+        raise ServerError(
+            message,
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            Detail(context=store_name, cause="Unknown rate limit store"),
+        )
+
+    async def hit(self, key: str, rate_limit: RateLimit) -> RateLimitResult:
+        try:
+            return await self.__store.consume(key, rate_limit)
+        except Exception as error:
+            # A broken store must not take the API down with it, so the request
+            # is let through without consuming any token.
+            message = "An error occurred when consuming a rate limit token"
+            print(message, error)
+            return RateLimitResult(
+                allowed=True,
+                limit=rate_limit.capacity,
+                remaining=rate_limit.capacity,
+                reset_after=0,
+                retry_after=0,
+            )
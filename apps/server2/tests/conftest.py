@@ -3,6 +3,7 @@ from typing import AsyncGenerator
 
 import pytest
 from faker import Faker
+from fastapi import FastAPI
 from httpx import ASGITransport, AsyncClient
 from testcontainers.postgres import DbContainer, PostgresContainer
 
@@ -77,9 +78,14 @@ async def clear_database_tables(db_service: DBService) -> None:
 
 
 @pytest.fixture(scope="session")
-async def async_client(config: Config) -> AsyncGenerator[AsyncClient, None]:
+def app(config: Config) -> FastAPI:
     server = Server(config)
-    async with AsyncClient(transport=ASGITransport(app=server.app)) as async_client:
+    return server.app
+
+
+@pytest.fixture(scope="session")
+async def async_client(app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
+    async with AsyncClient(transport=ASGITransport(app=app)) as async_client:
         yield async_client
 
 
@@ -1,15 +1,18 @@
 import re
+from uuid import UUID, uuid4
 
 import pytest
 from db.models.user import UserModel
 from faker import Faker
-from fastapi import status
-from httpx import AsyncClient
-from sqlalchemy import insert
+from fastapi import FastAPI, status
+from fastapi.encoders import jsonable_encoder
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert, select
 from tests.factories.user_factory import UserFactory
 
 from api.components.user.user_mapper import UserMapper
 from api.components.user.user_models import User, UserResponse
+from api.routers.routers import user_router
 from api.shared.api_error_response import APIErrorResponse
 from api.shared.api_pagination_response import APIPaginationResponse
 from api.utils.dict_to_obj import DictToObj
@@ -68,6 +71,78 @@ class TestAddUser(TestUserHttp):
         response_body: APIErrorResponse = DictToObj(response.json())
         assert response_body.is_operational is True
 
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_return_409_status_code_when_user_email_already_exists(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        user_request = {"name": mocked_user.name, "email": mocked_user.email}
+        await async_client.post(url, json=user_request)
+
+        response = await async_client.post(url, json=user_request)
+
+        row_count = 1
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert response.status_code == status.HTTP_409_CONFLICT
+        response_body: APIErrorResponse = DictToObj(response.json())
+        assert response_body.is_operational is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_201_status_code_with_replayed_response_when_idempotency_key_is_repeated(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        user_request = {"name": mocked_user.name, "email": mocked_user.email}
+        headers = {"Idempotency-Key": uuid4().hex}
+
+        first_response = await async_client.post(
+            url, json=user_request, headers=headers
+        )
+        second_response = await async_client.post(
+            url, json=user_request, headers=headers
+        )
+
+        row_count = 1
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert first_response.status_code == status.HTTP_201_CREATED
+        assert "Idempotent-Replayed" not in first_response.headers
+        assert second_response.status_code == status.HTTP_201_CREATED
+        assert second_response.headers["Idempotent-Replayed"] == "true"
+        assert second_response.headers["ETag"] == first_response.headers["ETag"]
+        assert second_response.json() == first_response.json()
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_return_422_status_code_when_idempotency_key_is_reused_with_a_different_user_request(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_users: list[UserModel] = UserFactory.build_batch(2)
+        headers = {"Idempotency-Key": uuid4().hex}
+        for mocked_user in mocked_users[:1]:
+            user_request = {"name": mocked_user.name, "email": mocked_user.email}
+            await async_client.post(url, json=user_request, headers=headers)
+        user_request = {"name": mocked_users[1].name, "email": mocked_users[1].email}
+
+        response = await async_client.post(url, json=user_request, headers=headers)
+
+        row_count = 1
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
 
 class TestFetchPaginatedUsers(TestUserHttp):
     @pytest.mark.asyncio(loop_scope="session")
@@ -129,7 +204,7 @@ class TestFetchPaginatedUsers(TestUserHttp):
         row_count = 3
         assert await db_service.get_database_table_row_count("users") == row_count
         assert response.status_code == status.HTTP_200_OK
-        assert response.json() == expected_response_body.model_dump()
+        assert response.json() == jsonable_encoder(expected_response_body)
 
     @pytest.mark.asyncio(loop_scope="session")
     async def test_should_succeed_and_return_200_status_code_with_list_of_users_with_non_zero_total_when_page_is_not_the_first_and_cannot_be_filled(
@@ -207,12 +282,54 @@ class TestFetchPaginatedUsers(TestUserHttp):
         row_count = 5
         assert await db_service.get_database_table_row_count("users") == row_count
         assert response.status_code == status.HTTP_200_OK
-        assert response.json() == expected_response_body.model_dump()
+        assert response.json() == jsonable_encoder(expected_response_body)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_200_status_code_with_filtered_and_sorted_list_of_users(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_users: list[UserModel] = [
+            UserFactory.build(name="ann", email="ann@example.com"),
+            UserFactory.build(name="bob", email="bob@example.com"),
+            UserFactory.build(name="anna", email="anna@example.com"),
+        ]
+        for mocked_user in mocked_users:
+            user_request = {"name": mocked_user.name, "email": mocked_user.email}
+            await async_client.post(url, json=user_request)
+        base_url = f"{url}?page=1&limit=10&email_prefix=ann&sort=-name"
 
+        response = await async_client.get(base_url)
+
+        assert response.status_code == status.HTTP_200_OK
+        response_body = response.json()
+        assert response_body["total_records"] == 2
+        assert [record["name"] for record in response_body["records"]] == [
+            "anna",
+            "ann",
+        ]
 
-class TestFetchUser(TestUserHttp):
     @pytest.mark.asyncio(loop_scope="session")
-    async def test_should_succeed_and_return_200_status_code_when_user_is_fetched(
+    async def test_should_fail_and_return_422_status_code_when_sort_key_is_not_allowed(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        base_url = f"{url}?page=1&limit=1&sort=id"
+
+        response = await async_client.get(base_url)
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_304_status_code_when_users_are_not_modified(
         self,
         db_service: DBService,
         initialize_database: None,
@@ -220,46 +337,121 @@ class TestFetchUser(TestUserHttp):
         async_client: AsyncClient,
         url: str,
     ) -> None:
+        page = 1
+        limit = 1
+        first_response = await async_client.get(f"{url}?page={page}&limit={limit}")
+        etag = first_response.headers["ETag"]
+
+        response = await async_client.get(
+            f"{url}?page={page}&limit={limit}", headers={"If-None-Match": etag}
+        )
+
+        assert first_response.status_code == status.HTTP_200_OK
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_200_status_code_when_users_are_modified_after_etag_is_fetched(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        page = 1
+        limit = 1
+        first_response = await async_client.get(f"{url}?page={page}&limit={limit}")
+        etag = first_response.headers["ETag"]
         mocked_user: UserModel = UserFactory.build()
         raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
-        domain_user: User
         async with db_service.async_engine.connect() as conn:
-            query = insert(UserModel).values(raw_user_data).returning(UserModel)
-            engine_result = await conn.execute(query)
-            obj = DictToObj(engine_result.first()._asdict())
+            query = insert(UserModel).values(raw_user_data)
+            await conn.execute(query)
             await conn.commit()
-            domain_user = UserMapper.to_domain(obj)
-        expected_response_body = UserMapper.to_response(domain_user)
 
-        response = await async_client.get(f"{url}/{domain_user.id}")
+        response = await async_client.get(
+            f"{url}?page={page}&limit={limit}", headers={"If-None-Match": etag}
+        )
 
-        row_count = 1
-        assert await db_service.get_database_table_row_count("users") == row_count
         assert response.status_code == status.HTTP_200_OK
-        assert response.json() == jsonable_encoder(expected_response_body)
+        assert response.headers["ETag"] != etag
+        assert response.json()["total_records"] == 1
 
     @pytest.mark.asyncio(loop_scope="session")
-    async def test_should_fail_and_return_404_status_code_when_user_is_not_found(
+    async def test_should_succeed_and_return_200_status_code_with_records_holding_only_the_selected_fields(
         self,
         db_service: DBService,
         initialize_database: None,
         clear_database_tables: None,
         async_client: AsyncClient,
         url: str,
+    ) -> None:
+        mocked_users: list[UserModel] = UserFactory.build_batch(2)
+        for mocked_user in mocked_users:
+            user_request = {"name": mocked_user.name, "email": mocked_user.email}
+            await async_client.post(url, json=user_request)
+
+        response = await async_client.get(
+            url, params={"limit": 2, "sort": "name", "fields": "name"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["records"] == [
+            {"name": name} for name in sorted(user.name for user in mocked_users)
+        ]
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_200_status_code_with_rate_limit_headers_when_rate_limit_is_not_exceeded(
+        self,
+        initialize_database: None,
+        clear_database_tables: None,
+        app: FastAPI,
+        url: str,
         faker: Faker,
     ) -> None:
-        mocked_user: UserModel = UserFactory.build()
+        rate_limit = user_router.rate_limits["fetch_paginated_users"]
+        transport = ASGITransport(app=app, client=(faker.ipv4(), 123))
 
-        response = await async_client.get(f"{url}/{mocked_user.id}")
+        async with AsyncClient(transport=transport) as async_client:
+            response = await async_client.get(url)
 
-        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["RateLimit-Limit"] == str(rate_limit.capacity)
+        assert response.headers["RateLimit-Remaining"] == str(rate_limit.capacity - 1)
+        assert "RateLimit-Reset" in response.headers
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_return_429_status_code_when_rate_limit_is_exceeded(
+        self,
+        initialize_database: None,
+        clear_database_tables: None,
+        app: FastAPI,
+        url: str,
+        faker: Faker,
+    ) -> None:
+        rate_limit = user_router.rate_limits["fetch_paginated_users"]
+        transport = ASGITransport(app=app, client=(faker.ipv4(), 123))
+
+        async with AsyncClient(transport=transport) as async_client:
+            # Tokens keep being refilled while the requests are sent, so the
+            # bucket is drained with a margin over its capacity.
+            for _ in range(2 * rate_limit.capacity):
+                response = await async_client.get(url)
+                if response.status_code != status.HTTP_200_OK:
+                    break
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response.headers["RateLimit-Remaining"] == "0"
+        assert int(response.headers["Retry-After"]) > 0
         response_body: APIErrorResponse = DictToObj(response.json())
         assert response_body.is_operational is True
 
 
-class TestRenewUser(TestUserHttp):
+class TestFetchBatchOfUsers(TestUserHttp):
     @pytest.mark.asyncio(loop_scope="session")
-    async def test_should_succeed_and_return_200_status_code_when_user_is_renewed(
+    async def test_should_succeed_and_return_200_status_code_with_users_in_request_order_and_missing_ids(
         self,
         db_service: DBService,
         initialize_database: None,
@@ -267,38 +459,98 @@ class TestRenewUser(TestUserHttp):
         async_client: AsyncClient,
         url: str,
     ) -> None:
-        mocked_user = UserFactory.build()
-        raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
-        domain_user: User
+        mocked_users: list[UserModel] = UserFactory.build_batch(2)
+        domain_users: list[User] = []
         async with db_service.async_engine.connect() as conn:
-            query = insert(UserModel).values(raw_user_data).returning(UserModel)
-            engine_result = await conn.execute(query)
-            obj = DictToObj(engine_result.first()._asdict())
+            for mocked_user in mocked_users:
+                raw_user_data = UserMapper.to_persistence(
+                    UserMapper.to_domain(mocked_user)
+                )
+                query = insert(UserModel).values(raw_user_data).returning(UserModel)
+                engine_result = await conn.execute(query)
+                obj = DictToObj(engine_result.first()._asdict())
+                domain_users.append(UserMapper.to_domain(obj))
             await conn.commit()
-            domain_user = UserMapper.to_domain(obj)
-        mocked_updated_user: UserModel = UserFactory.build(
-            id=domain_user.id, created_at=domain_user.created_at
+        missing_user: UserModel = UserFactory.build()
+        user_batch_get_request = {
+            "ids": [domain_users[1].id, missing_user.id, domain_users[0].id]
+        }
+        expected_response_body = {
+            "records": [
+                UserMapper.to_response(domain_users[1]),
+                UserMapper.to_response(domain_users[0]),
+            ],
+            "missing": [UUID(missing_user.id).hex],
+        }
+
+        response = await async_client.post(
+            f"{url}/batch-get", json=user_batch_get_request
         )
-        user_request = {
-            "name": mocked_updated_user.name,
-            "email": mocked_updated_user.email,
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == jsonable_encoder(expected_response_body)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_return_422_status_code_when_ids_are_invalid(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+        faker: Faker,
+    ) -> None:
+        user_batch_get_request = {"ids": [faker.word()]}
+
+        response = await async_client.post(
+            f"{url}/batch-get", json=user_batch_get_request
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+class TestAmendBatchOfUsers(TestUserHttp):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_200_status_code_with_ids_of_amended_users(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+        faker: Faker,
+    ) -> None:
+        mocked_users: list[UserModel] = UserFactory.build_batch(3)
+        user_ids: list[str] = []
+        async with db_service.async_engine.connect() as conn:
+            for mocked_user in mocked_users:
+                raw_user_data = UserMapper.to_persistence(
+                    UserMapper.to_domain(mocked_user)
+                )
+                query = insert(UserModel).values(raw_user_data).returning(UserModel.id)
+                engine_result = await conn.execute(query)
+                user_ids.append(engine_result.scalar_one().hex)
+            await conn.commit()
+        name = faker.user_name()
+        user_bulk_update_request = {
+            "ids": user_ids,
+            "changes": {"name": name},
+            "chunk_size": 2,
         }
-        expected_response = DictToObj(user_request)
 
-        response = await async_client.put(f"{url}/{domain_user.id}", json=user_request)
+        response = await async_client.post(
+            f"{url}/bulk-update", json=user_bulk_update_request
+        )
 
-        row_count = 1
-        assert await db_service.get_database_table_row_count("users") == row_count
         assert response.status_code == status.HTTP_200_OK
-        response_body: UserResponse = DictToObj(response.json())
-        assert response_body.id == domain_user.id
-        assert response_body.name == expected_response.name
-        assert response_body.email == expected_response.email
-        assert response_body.created_at == domain_user.created_at.isoformat()
-        assert response_body.updated_at is not None
+        assert response.json()["count"] == len(user_ids)
+        assert sorted(response.json()["ids"]) == sorted(user_ids)
+        async with db_service.async_engine.connect() as conn:
+            query = select(UserModel.name).distinct()
+            assert (await conn.execute(query)).scalars().all() == [name]
 
     @pytest.mark.asyncio(loop_scope="session")
-    async def test_should_fail_and_return_404_status_code_when_user_is_not_found(
+    async def test_should_fail_and_return_422_status_code_when_email_is_changed(
         self,
         db_service: DBService,
         initialize_database: None,
@@ -307,22 +559,73 @@ class TestRenewUser(TestUserHttp):
         url: str,
         faker: Faker,
     ) -> None:
-        mocked_user: UserModel = UserFactory.build()
-        user_request = {
-            "name": mocked_user.name,
-            "email": mocked_user.email,
+        user_bulk_update_request = {
+            "filter": {"name_prefix": faker.user_name()},
+            "changes": {"email": faker.email()},
         }
 
-        response = await async_client.put(f"{url}/{mocked_user.id}", json=user_request)
+        response = await async_client.post(
+            f"{url}/bulk-update", json=user_bulk_update_request
+        )
 
-        row_count = 0
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+class TestDestroyBatchOfUsers(TestUserHttp):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_200_status_code_with_ids_of_destroyed_users(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_users: list[UserModel] = [
+            UserFactory.build(email=f"user{index}@tenant.test") for index in range(3)
+        ] + [UserFactory.build()]
+        user_ids: list[str] = []
+        async with db_service.async_engine.connect() as conn:
+            for mocked_user in mocked_users:
+                raw_user_data = UserMapper.to_persistence(
+                    UserMapper.to_domain(mocked_user)
+                )
+                query = insert(UserModel).values(raw_user_data).returning(UserModel.id)
+                engine_result = await conn.execute(query)
+                user_ids.append(engine_result.scalar_one().hex)
+            await conn.commit()
+        user_bulk_delete_request = {
+            "filter": {"email_suffix": "@tenant.test"},
+            "chunk_size": 2,
+        }
+
+        response = await async_client.post(
+            f"{url}/bulk-delete", json=user_bulk_delete_request
+        )
+
+        row_count = 1
         assert await db_service.get_database_table_row_count("users") == row_count
-        assert response.status_code == status.HTTP_404_NOT_FOUND
-        response_body: APIErrorResponse = DictToObj(response.json())
-        assert response_body.is_operational is True
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["count"] == len(user_ids[:3])
+        assert sorted(response.json()["ids"]) == sorted(user_ids[:3])
 
     @pytest.mark.asyncio(loop_scope="session")
-    async def test_should_fail_and_return_422_status_code_when_user_request_email_is_invalid(
+    async def test_should_fail_and_return_422_status_code_when_neither_ids_nor_filter_is_set(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        response = await async_client.post(f"{url}/bulk-delete", json={})
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+class TestSaveBatchOfUsers(TestUserHttp):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_200_status_code_with_status_of_each_saved_user(
         self,
         db_service: DBService,
         initialize_database: None,
@@ -331,19 +634,805 @@ class TestRenewUser(TestUserHttp):
         url: str,
         faker: Faker,
     ) -> None:
-        mocked_user: UserModel = UserFactory.build(email=faker.word())
-        user_request = {
-            "name": mocked_user.name,
-            "email": mocked_user.email,
+        mocked_users: list[UserModel] = UserFactory.build_batch(2)
+        for mocked_user in mocked_users[:1]:
+            user_request = {"name": mocked_user.name, "email": mocked_user.email}
+            await async_client.post(url, json=user_request)
+        user_bulk_upsert_request = {
+            "users": [
+                {"name": faker.user_name(), "email": mocked_users[0].email},
+                {"name": mocked_users[1].name, "email": mocked_users[1].email},
+            ]
         }
 
-        response = await async_client.put(f"{url}/{mocked_user.id}", json=user_request)
+        response = await async_client.put(
+            f"{url}/by-email", json=user_bulk_upsert_request
+        )
 
-        row_count = 0
+        row_count = 2
         assert await db_service.get_database_table_row_count("users") == row_count
-        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
-        response_body: APIErrorResponse = DictToObj(response.json())
-        assert response_body.is_operational is True
+        assert response.status_code == status.HTTP_200_OK
+        assert [record["status"] for record in response.json()] == [
+            "updated",
+            "created",
+        ]
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_return_422_status_code_when_emails_are_repeated(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        user_request = {"name": mocked_user.name, "email": mocked_user.email}
+        user_bulk_upsert_request = {"users": [user_request, user_request]}
+
+        response = await async_client.put(
+            f"{url}/by-email", json=user_bulk_upsert_request
+        )
+
+        row_count = 0
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+class TestProcessBatchOfUsers(TestUserHttp):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_200_status_code_with_result_of_each_isolated_operation(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_users: list[UserModel] = UserFactory.build_batch(2)
+        response = await async_client.post(
+            url, json={"name": mocked_users[0].name, "email": mocked_users[0].email}
+        )
+        user_id = response.json()["id"]
+        user_batch_request = {
+            "operations": [
+                {
+                    "method": "create",
+                    "user": {
+                        "name": mocked_users[1].name,
+                        "email": mocked_users[1].email,
+                    },
+                },
+                {"method": "patch", "id": user_id, "changes": {"name": "name"}},
+                {"method": "delete", "id": uuid4().hex},
+            ]
+        }
+
+        response = await async_client.post(f"{url}/batch", json=user_batch_request)
+
+        row_count = 2
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()["results"]
+        assert [result["status"] for result in results] == [
+            status.HTTP_201_CREATED,
+            status.HTTP_200_OK,
+            status.HTTP_404_NOT_FOUND,
+        ]
+        assert results[0]["record"]["email"] == mocked_users[1].email
+        assert results[1]["record"]["name"] == "name"
+        assert results[2]["error"]["message"] == "User not found"
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_200_status_code_without_any_change_when_an_atomic_operation_fails(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_users: list[UserModel] = UserFactory.build_batch(2)
+        response = await async_client.post(
+            url, json={"name": mocked_users[0].name, "email": mocked_users[0].email}
+        )
+        user_id = response.json()["id"]
+        user_batch_request = {
+            "operations": [
+                {
+                    "method": "create",
+                    "user": {
+                        "name": mocked_users[1].name,
+                        "email": mocked_users[1].email,
+                    },
+                },
+                {"method": "delete", "id": user_id},
+                {"method": "delete", "id": uuid4().hex},
+            ],
+            "atomic": True,
+        }
+
+        response = await async_client.post(f"{url}/batch", json=user_batch_request)
+
+        row_count = 1
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert response.status_code == status.HTTP_200_OK
+        assert [result["status"] for result in response.json()["results"]] == [
+            status.HTTP_424_FAILED_DEPENDENCY,
+            status.HTTP_424_FAILED_DEPENDENCY,
+            status.HTTP_404_NOT_FOUND,
+        ]
+        response = await async_client.get(f"{url}/{user_id}")
+        assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_return_422_status_code_when_method_is_unknown(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        user_batch_request = {"operations": [{"method": "merge", "id": uuid4().hex}]}
+
+        response = await async_client.post(f"{url}/batch", json=user_batch_request)
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+class TestSaveUser(TestUserHttp):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_201_status_code_when_user_is_created(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        user_upsert_request = {"name": mocked_user.name}
+
+        response = await async_client.put(
+            f"{url}/by-email/{mocked_user.email}", json=user_upsert_request
+        )
+
+        row_count = 1
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.headers["ETag"] is not None
+        response_body = response.json()
+        assert response_body["name"] == mocked_user.name
+        assert response_body["email"] == mocked_user.email
+        assert response_body["status"] == "created"
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_200_status_code_when_user_is_updated(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+        faker: Faker,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        user_request = {"name": mocked_user.name, "email": mocked_user.email}
+        user_id = (await async_client.post(url, json=user_request)).json()["id"]
+        user_upsert_request = {"name": faker.user_name()}
+
+        response = await async_client.put(
+            f"{url}/by-email/{mocked_user.email}", json=user_upsert_request
+        )
+
+        row_count = 1
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert response.status_code == status.HTTP_200_OK
+        response_body = response.json()
+        assert response_body["id"] == user_id
+        assert response_body["name"] == user_upsert_request["name"]
+        assert response_body["status"] == "updated"
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_return_422_status_code_when_email_is_invalid(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+        faker: Faker,
+    ) -> None:
+        user_upsert_request = {"name": faker.user_name()}
+
+        response = await async_client.put(
+            f"{url}/by-email/{faker.word()}", json=user_upsert_request
+        )
+
+        row_count = 0
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+class TestSearchUsers(TestUserHttp):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_200_status_code_with_every_matching_user_across_pages(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_users: list[UserModel] = [
+            UserFactory.build(name=f"agent_{index}", email=f"a{index}@example.com")
+            for index in range(3)
+        ]
+        for mocked_user in mocked_users:
+            user_request = {"name": mocked_user.name, "email": mocked_user.email}
+            await async_client.post(url, json=user_request)
+        next_url = f"{url}/search?q=agent&limit=2"
+        found_names: list[str] = []
+
+        while next_url is not None:
+            response = await async_client.get(next_url)
+            assert response.status_code == status.HTTP_200_OK
+            found_names += [record["name"] for record in response.json()["records"]]
+            next_url = response.json()["next"]
+
+        assert sorted(found_names) == sorted(user.name for user in mocked_users)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_return_422_status_code_when_cursor_is_invalid(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+        faker: Faker,
+    ) -> None:
+        response = await async_client.get(f"{url}/search?q=agent&cursor={faker.word()}")
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        response_body: APIErrorResponse = DictToObj(response.json())
+        assert response_body.is_operational is True
+
+
+class TestFetchUserByEmail(TestUserHttp):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_200_status_code_when_email_differs_only_in_case(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        user_request = {"name": mocked_user.name, "email": mocked_user.email}
+        user_id = (await async_client.post(url, json=user_request)).json()["id"]
+
+        response = await async_client.get(f"{url}/by-email/{mocked_user.email.upper()}")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["id"] == user_id
+        assert response.json()["email"] == mocked_user.email
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_return_404_status_code_when_user_is_not_found(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+        faker: Faker,
+    ) -> None:
+        response = await async_client.get(f"{url}/by-email/{faker.email()}")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        response_body: APIErrorResponse = DictToObj(response.json())
+        assert response_body.is_operational is True
+
+
+class TestFetchUser(TestUserHttp):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_200_status_code_when_user_is_fetched(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
+        domain_user: User
+        async with db_service.async_engine.connect() as conn:
+            query = insert(UserModel).values(raw_user_data).returning(UserModel)
+            engine_result = await conn.execute(query)
+            obj = DictToObj(engine_result.first()._asdict())
+            await conn.commit()
+            domain_user = UserMapper.to_domain(obj)
+        expected_response_body = UserMapper.to_response(domain_user)
+
+        response = await async_client.get(f"{url}/{domain_user.id}")
+
+        row_count = 1
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] == UserMapper.to_etag(domain_user)
+        assert response.json() == jsonable_encoder(expected_response_body)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_304_status_code_when_user_is_not_modified(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
+        domain_user: User
+        async with db_service.async_engine.connect() as conn:
+            query = insert(UserModel).values(raw_user_data).returning(UserModel)
+            engine_result = await conn.execute(query)
+            obj = DictToObj(engine_result.first()._asdict())
+            await conn.commit()
+            domain_user = UserMapper.to_domain(obj)
+        etag = UserMapper.to_etag(domain_user)
+
+        response = await async_client.get(
+            f"{url}/{domain_user.id}", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_200_status_code_with_only_the_selected_fields(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
+        domain_user: User
+        async with db_service.async_engine.connect() as conn:
+            query = insert(UserModel).values(raw_user_data).returning(UserModel)
+            engine_result = await conn.execute(query)
+            obj = DictToObj(engine_result.first()._asdict())
+            await conn.commit()
+            domain_user = UserMapper.to_domain(obj)
+
+        response = await async_client.get(
+            f"{url}/{domain_user.id}", params={"fields": "id,name"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] == UserMapper.to_etag(domain_user)
+        assert response.json() == {"id": domain_user.id, "name": domain_user.name}
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_return_422_status_code_when_a_field_is_unknown(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+
+        response = await async_client.get(
+            f"{url}/{mocked_user.id}", params={"fields": "id,password"}
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        response_body: APIErrorResponse = DictToObj(response.json())
+        assert response_body.is_operational is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_return_404_status_code_when_user_is_not_found(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+        faker: Faker,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+
+        response = await async_client.get(f"{url}/{mocked_user.id}")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        response_body: APIErrorResponse = DictToObj(response.json())
+        assert response_body.is_operational is True
+
+
+class TestFetchUserChanges(TestUserHttp):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_200_status_code_with_changes_made_since_the_cursor(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        user_request = {"name": mocked_user.name, "email": mocked_user.email}
+        created_response = await async_client.post(url, json=user_request)
+        user_id = created_response.json()["id"]
+        await async_client.delete(f"{url}/{user_id}")
+
+        response = await async_client.get(f"{url}/changes")
+        next_response = await async_client.get(response.json()["next"])
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [
+            (record["user_id"], record["operation"])
+            for record in response.json()["records"]
+        ] == [(UUID(user_id).hex, "created"), (UUID(user_id).hex, "deleted")]
+        assert next_response.status_code == status.HTTP_200_OK
+        assert next_response.json()["records"] == []
+        assert next_response.json()["next"] == response.json()["next"]
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_return_422_status_code_when_cursor_is_invalid(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        response = await async_client.get(f"{url}/changes", params={"since": "x"})
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        response_body: APIErrorResponse = DictToObj(response.json())
+        assert response_body.is_operational is True
+
+
+class TestRenewUser(TestUserHttp):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_200_status_code_when_user_is_renewed(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_user = UserFactory.build()
+        raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
+        domain_user: User
+        async with db_service.async_engine.connect() as conn:
+            query = insert(UserModel).values(raw_user_data).returning(UserModel)
+            engine_result = await conn.execute(query)
+            obj = DictToObj(engine_result.first()._asdict())
+            await conn.commit()
+            domain_user = UserMapper.to_domain(obj)
+        mocked_updated_user: UserModel = UserFactory.build(
+            id=domain_user.id, created_at=domain_user.created_at
+        )
+        user_request = {
+            "name": mocked_updated_user.name,
+            "email": mocked_updated_user.email,
+        }
+        expected_response = DictToObj(user_request)
+
+        response = await async_client.put(f"{url}/{domain_user.id}", json=user_request)
+
+        row_count = 1
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert response.status_code == status.HTTP_200_OK
+        response_body: UserResponse = DictToObj(response.json())
+        assert response_body.id == domain_user.id
+        assert response_body.name == expected_response.name
+        assert response_body.email == expected_response.email
+        assert response_body.created_at == domain_user.created_at.isoformat()
+        assert response_body.updated_at is not None
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_200_status_code_when_user_is_renewed_with_matching_etag(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_user = UserFactory.build()
+        raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
+        domain_user: User
+        async with db_service.async_engine.connect() as conn:
+            query = insert(UserModel).values(raw_user_data).returning(UserModel)
+            engine_result = await conn.execute(query)
+            obj = DictToObj(engine_result.first()._asdict())
+            await conn.commit()
+            domain_user = UserMapper.to_domain(obj)
+        mocked_updated_user: UserModel = UserFactory.build()
+        user_request = {
+            "name": mocked_updated_user.name,
+            "email": mocked_updated_user.email,
+        }
+        etag = UserMapper.to_etag(domain_user)
+
+        response = await async_client.put(
+            f"{url}/{domain_user.id}", json=user_request, headers={"If-Match": etag}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+        response_body: UserResponse = DictToObj(response.json())
+        assert response_body.name == user_request["name"]
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_202_status_code_when_user_renewal_is_queued(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_user = UserFactory.build()
+        raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
+        async with db_service.async_engine.connect() as conn:
+            query = insert(UserModel).values(raw_user_data).returning(UserModel)
+            engine_result = await conn.execute(query)
+            obj = DictToObj(engine_result.first()._asdict())
+            await conn.commit()
+        mocked_updated_user: UserModel = UserFactory.build()
+        user_request = {
+            "name": mocked_updated_user.name,
+            "email": mocked_updated_user.email,
+        }
+        metrics_response = await async_client.get(f"{url}/write-queue")
+
+        response = await async_client.put(
+            f"{url}/{obj.id}", json=user_request, headers={"Prefer": "respond-async"}
+        )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.headers["Preference-Applied"] == "respond-async"
+        assert response.json() == user_request
+        queued_metrics_response = await async_client.get(f"{url}/write-queue")
+        assert queued_metrics_response.status_code == status.HTTP_200_OK
+        assert (
+            queued_metrics_response.json()["depth"]
+            == metrics_response.json()["depth"] + 1
+        )
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_200_status_code_when_queued_renewal_is_conditional(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_user = UserFactory.build()
+        raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
+        async with db_service.async_engine.connect() as conn:
+            query = insert(UserModel).values(raw_user_data).returning(UserModel)
+            engine_result = await conn.execute(query)
+            obj = DictToObj(engine_result.first()._asdict())
+            await conn.commit()
+        domain_user = UserMapper.to_domain(obj)
+        mocked_updated_user: UserModel = UserFactory.build()
+        user_request = {
+            "name": mocked_updated_user.name,
+            "email": mocked_updated_user.email,
+        }
+        headers = {
+            "If-Match": UserMapper.to_etag(domain_user),
+            "Prefer": "respond-async",
+        }
+
+        response = await async_client.put(
+            f"{url}/{domain_user.id}", json=user_request, headers=headers
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "Preference-Applied" not in response.headers
+        response_body: UserResponse = DictToObj(response.json())
+        assert response_body.email == user_request["email"]
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_return_412_status_code_when_user_etag_is_stale(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_user = UserFactory.build()
+        raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
+        domain_user: User
+        async with db_service.async_engine.connect() as conn:
+            query = insert(UserModel).values(raw_user_data).returning(UserModel)
+            engine_result = await conn.execute(query)
+            obj = DictToObj(engine_result.first()._asdict())
+            await conn.commit()
+            domain_user = UserMapper.to_domain(obj)
+        etag = UserMapper.to_etag(domain_user)
+        user_requests = [
+            {"name": mocked_user.name, "email": UserFactory.build().email}
+            for _ in range(2)
+        ]
+
+        first_response = await async_client.put(
+            f"{url}/{domain_user.id}", json=user_requests[0], headers={"If-Match": etag}
+        )
+        second_response = await async_client.put(
+            f"{url}/{domain_user.id}", json=user_requests[1], headers={"If-Match": etag}
+        )
+
+        assert first_response.status_code == status.HTTP_200_OK
+        assert second_response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        response_body: APIErrorResponse = DictToObj(second_response.json())
+        assert response_body.is_operational is True
+        async with db_service.async_engine.connect() as conn:
+            query = select(UserModel.email).where(UserModel.id == UUID(domain_user.id))
+            assert (await conn.execute(query)).scalar_one() == user_requests[0]["email"]
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_return_404_status_code_when_user_is_not_found(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+        faker: Faker,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        user_request = {
+            "name": mocked_user.name,
+            "email": mocked_user.email,
+        }
+
+        response = await async_client.put(f"{url}/{mocked_user.id}", json=user_request)
+
+        row_count = 0
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        response_body: APIErrorResponse = DictToObj(response.json())
+        assert response_body.is_operational is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_return_422_status_code_when_user_request_email_is_invalid(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+        faker: Faker,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build(email=faker.word())
+        user_request = {
+            "name": mocked_user.name,
+            "email": mocked_user.email,
+        }
+
+        response = await async_client.put(f"{url}/{mocked_user.id}", json=user_request)
+
+        row_count = 0
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        response_body: APIErrorResponse = DictToObj(response.json())
+        assert response_body.is_operational is True
+
+
+class TestAmendUser(TestUserHttp):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_200_status_code_when_user_is_amended(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_user = UserFactory.build()
+        raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
+        domain_user: User
+        async with db_service.async_engine.connect() as conn:
+            query = insert(UserModel).values(raw_user_data).returning(UserModel)
+            engine_result = await conn.execute(query)
+            obj = DictToObj(engine_result.first()._asdict())
+            await conn.commit()
+            domain_user = UserMapper.to_domain(obj)
+        user_patch_request = {"name": UserFactory.build().name}
+
+        response = await async_client.patch(
+            f"{url}/{domain_user.id}", json=user_patch_request
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        response_body: UserResponse = DictToObj(response.json())
+        assert response_body.id == domain_user.id
+        assert response_body.name == user_patch_request["name"]
+        assert response_body.email == domain_user.email
+        assert response_body.updated_at is not None
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_200_status_code_without_updating_user_when_nothing_changes(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_user = UserFactory.build()
+        raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
+        domain_user: User
+        async with db_service.async_engine.connect() as conn:
+            query = insert(UserModel).values(raw_user_data).returning(UserModel)
+            engine_result = await conn.execute(query)
+            obj = DictToObj(engine_result.first()._asdict())
+            await conn.commit()
+            domain_user = UserMapper.to_domain(obj)
+        expected_response_body = UserMapper.to_response(domain_user)
+
+        response = await async_client.patch(
+            f"{url}/{domain_user.id}", json={"email": domain_user.email}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] == UserMapper.to_etag(domain_user)
+        assert response.json() == jsonable_encoder(expected_response_body)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_return_404_status_code_when_user_is_not_found(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_user = UserFactory.build()
+
+        response = await async_client.patch(
+            f"{url}/{mocked_user.id}", json={"name": mocked_user.name}
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        response_body: APIErrorResponse = DictToObj(response.json())
+        assert response_body.is_operational is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_return_422_status_code_when_user_patch_request_name_is_null(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        async_client: AsyncClient,
+        url: str,
+    ) -> None:
+        mocked_user = UserFactory.build()
+
+        response = await async_client.patch(
+            f"{url}/{mocked_user.id}", json={"name": None}
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
 class TestDestroyUser(TestUserHttp):
@@ -0,0 +1,200 @@
+import types
+from uuid import UUID
+
+import pytest
+from db.models.user import UserModel
+from pytest_mock import MockerFixture
+from tests.factories.user_factory import UserFactory
+
+from api.components.user.user_cache import UserCache
+
+
+class TestUserCache:
+    @pytest.fixture
+    def user_cache(self) -> UserCache:
+        return UserCache(ttl=60, max_size=2)
+
+
+class TestConfigure(TestUserCache):
+    def test_should_define_a_method(
+        self,
+        user_cache: UserCache,
+    ) -> None:
+        assert isinstance(user_cache.configure, types.MethodType) is True
+
+    def test_should_succeed_and_drop_cached_users_when_cache_is_configured(
+        self,
+        user_cache: UserCache,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        user_cache.set(mocked_user)
+
+        result = user_cache.configure(0, 10)
+
+        assert result is None
+        assert user_cache.is_enabled is False
+        assert user_cache.get(mocked_user.id) is None
+
+
+class TestGet(TestUserCache):
+    def test_should_define_a_method(
+        self,
+        user_cache: UserCache,
+    ) -> None:
+        assert isinstance(user_cache.get, types.MethodType) is True
+
+    def test_should_succeed_and_return_user_when_user_is_cached(
+        self,
+        user_cache: UserCache,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        user_cache.set(mocked_user)
+        expected_result = mocked_user
+
+        result = user_cache.get(UUID(mocked_user.id).hex)
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_none_when_user_is_not_cached(
+        self,
+        user_cache: UserCache,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+
+        result = user_cache.get(mocked_user.id)
+
+        assert result is None
+
+    def test_should_succeed_and_return_none_when_cached_user_is_expired(
+        self,
+        user_cache: UserCache,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        user_cache.set(mocked_user)
+        mocker.patch(
+            "api.components.user.user_cache.time.monotonic",
+            return_value=float("inf"),
+        )
+
+        result = user_cache.get(mocked_user.id)
+
+        assert result is None
+
+
+class TestGetByEmail(TestUserCache):
+    def test_should_define_a_method(
+        self,
+        user_cache: UserCache,
+    ) -> None:
+        assert isinstance(user_cache.get_by_email, types.MethodType) is True
+
+    def test_should_succeed_and_return_user_whatever_the_case_of_the_email(
+        self,
+        user_cache: UserCache,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        user_cache.set(mocked_user)
+        expected_result = mocked_user
+
+        result = user_cache.get_by_email(mocked_user.email.upper())
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_none_when_user_email_has_changed(
+        self,
+        user_cache: UserCache,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        user_cache.set(mocked_user)
+        changed_user: UserModel = UserFactory.build(id=mocked_user.id)
+        user_cache.set(changed_user)
+
+        result = user_cache.get_by_email(mocked_user.email)
+
+        assert result is None
+        assert user_cache.get_by_email(changed_user.email) == changed_user
+
+    def test_should_succeed_and_return_none_when_user_is_deleted(
+        self,
+        user_cache: UserCache,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        user_cache.set(mocked_user)
+        user_cache.delete(mocked_user.id)
+
+        result = user_cache.get_by_email(mocked_user.email)
+
+        assert result is None
+
+
+class TestSet(TestUserCache):
+    def test_should_define_a_method(
+        self,
+        user_cache: UserCache,
+    ) -> None:
+        assert isinstance(user_cache.set, types.MethodType) is True
+
+    def test_should_succeed_and_evict_least_recently_used_user_when_max_size_is_exceeded(
+        self,
+        user_cache: UserCache,
+    ) -> None:
+        mocked_users: list[UserModel] = UserFactory.build_batch(3)
+        for mocked_user in mocked_users:
+            user_cache.set(mocked_user)
+
+        assert user_cache.get(mocked_users[0].id) is None
+        assert user_cache.get(mocked_users[1].id) == mocked_users[1]
+        assert user_cache.get(mocked_users[2].id) == mocked_users[2]
+
+    def test_should_succeed_and_not_cache_user_when_cache_is_disabled(
+        self,
+    ) -> None:
+        user_cache = UserCache()
+        mocked_user: UserModel = UserFactory.build()
+
+        user_cache.set(mocked_user)
+
+        assert user_cache.get(mocked_user.id) is None
+
+
+class TestDelete(TestUserCache):
+    def test_should_define_a_method(
+        self,
+        user_cache: UserCache,
+    ) -> None:
+        assert isinstance(user_cache.delete, types.MethodType) is True
+
+    def test_should_succeed_and_drop_cached_user_when_user_is_deleted(
+        self,
+        user_cache: UserCache,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        user_cache.set(mocked_user)
+
+        result = user_cache.delete(mocked_user.id)
+
+        assert result is None
+        assert user_cache.get(mocked_user.id) is None
+
+
+class TestClear(TestUserCache):
+    def test_should_define_a_method(
+        self,
+        user_cache: UserCache,
+    ) -> None:
+        assert isinstance(user_cache.clear, types.MethodType) is True
+
+    def test_should_succeed_and_drop_all_cached_users_when_cache_is_cleared(
+        self,
+        user_cache: UserCache,
+    ) -> None:
+        mocked_users: list[UserModel] = UserFactory.build_batch(2)
+        for mocked_user in mocked_users:
+            user_cache.set(mocked_user)
+
+        result = user_cache.clear()
+
+        assert result is None
+        for mocked_user in mocked_users:
+            assert user_cache.get(mocked_user.id) is None
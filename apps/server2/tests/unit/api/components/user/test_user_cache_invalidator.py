@@ -0,0 +1,168 @@
+import asyncio
+import types
+from collections.abc import AsyncIterator
+
+import pytest
+from tests.factories.user_factory import UserFactory
+
+from api.components.user.user_cache import UserCache
+from api.components.user.user_cache_invalidator import UserCacheInvalidator
+from api.components.user.user_mapper import UserMapper
+from api.components.user.user_models import User
+from api.components.user.user_repository import UserRepository
+from config.config import Config
+from services.db_service import DBService
+
+
+async def wait_for_eviction(user_cache: UserCache, userId: str) -> None:
+    for _ in range(100):
+        if user_cache.get(userId) is None:
+            return
+        await asyncio.sleep(0.01)
+
+
+class TestUserCacheInvalidator:
+    @pytest.fixture
+    def user_repository(self, db_service: DBService) -> UserRepository:
+        return UserRepository(db_service)
+
+    @pytest.fixture
+    def user_cache(self) -> UserCache:
+        return UserCache(ttl=60)
+
+    @pytest.fixture
+    async def other_db_service(self, config: Config) -> AsyncIterator[DBService]:
+        # Stands in for the database service of another worker, whose cache
+        # only learns of the writes through its own connection.
+        other_db_service = DBService()
+        other_db_service.connect_database(config.get_database_url())
+        yield other_db_service
+        await other_db_service.deactivate_database()
+
+    @pytest.fixture
+    def user_cache_invalidator(
+        self, user_cache: UserCache, other_db_service: DBService
+    ) -> UserCacheInvalidator:
+        return UserCacheInvalidator(user_cache, other_db_service)
+
+    @pytest.fixture
+    async def cached_user(
+        self,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+        user_cache: UserCache,
+    ) -> User:
+        user = await user_repository.create_user(
+            UserMapper.to_domain(UserFactory.build())
+        )
+        user_cache.set(user)
+        return user
+
+
+class TestStart(TestUserCacheInvalidator):
+    def test_should_define_a_method(
+        self,
+        user_cache_invalidator: UserCacheInvalidator,
+    ) -> None:
+        assert isinstance(user_cache_invalidator.start, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_evict_a_user_written_on_another_connection(
+        self,
+        cached_user: User,
+        user_repository: UserRepository,
+        user_cache: UserCache,
+        user_cache_invalidator: UserCacheInvalidator,
+    ) -> None:
+        await user_cache_invalidator.start()
+
+        await user_repository.patch_user(cached_user.id, {"name": "name"})
+        await wait_for_eviction(user_cache, cached_user.id)
+
+        await user_cache_invalidator.stop()
+        assert user_cache.get(cached_user.id) is None
+        assert user_cache.get_by_email(cached_user.email) is None
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_evict_every_user_of_a_bulk_write(
+        self,
+        cached_user: User,
+        user_repository: UserRepository,
+        user_cache: UserCache,
+        user_cache_invalidator: UserCacheInvalidator,
+    ) -> None:
+        other_user = await user_repository.create_user(
+            UserMapper.to_domain(UserFactory.build())
+        )
+        user_cache.set(other_user)
+        await user_cache_invalidator.start()
+
+        await user_repository.delete_users([cached_user.id, other_user.id], None, 1)
+        await wait_for_eviction(user_cache, cached_user.id)
+        await wait_for_eviction(user_cache, other_user.id)
+
+        await user_cache_invalidator.stop()
+        assert user_cache.get(cached_user.id) is None
+        assert user_cache.get(other_user.id) is None
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_keep_a_user_whose_write_is_rolled_back(
+        self,
+        db_service: DBService,
+        cached_user: User,
+        user_repository: UserRepository,
+        user_cache: UserCache,
+        user_cache_invalidator: UserCacheInvalidator,
+    ) -> None:
+        await user_cache_invalidator.start()
+
+        with pytest.raises(ValueError):
+            async with db_service.transaction():
+                await user_repository.delete_user(cached_user.id)
+                raise ValueError("Failed")
+        await asyncio.sleep(0.1)
+
+        await user_cache_invalidator.stop()
+        assert user_cache.get(cached_user.id) == cached_user
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_not_listen_when_cache_is_disabled(
+        self,
+        cached_user: User,
+        user_repository: UserRepository,
+        user_cache: UserCache,
+        user_cache_invalidator: UserCacheInvalidator,
+    ) -> None:
+        user_cache.ttl = 0
+
+        await user_cache_invalidator.start()
+
+        user_cache.ttl = 60
+        await user_repository.delete_user(cached_user.id)
+        await asyncio.sleep(0.1)
+        assert user_cache.get(cached_user.id) == cached_user
+
+
+class TestStop(TestUserCacheInvalidator):
+    def test_should_define_a_method(
+        self,
+        user_cache_invalidator: UserCacheInvalidator,
+    ) -> None:
+        assert isinstance(user_cache_invalidator.stop, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_no_longer_evict_users_when_stopped(
+        self,
+        cached_user: User,
+        user_repository: UserRepository,
+        user_cache: UserCache,
+        user_cache_invalidator: UserCacheInvalidator,
+    ) -> None:
+        await user_cache_invalidator.start()
+
+        await user_cache_invalidator.stop()
+
+        await user_repository.delete_user(cached_user.id)
+        await asyncio.sleep(0.1)
+        assert user_cache.get(cached_user.id) == cached_user
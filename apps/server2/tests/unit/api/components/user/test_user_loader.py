@@ -0,0 +1,147 @@
+import asyncio
+import types
+from uuid import UUID
+
+import pytest
+from db.models.user import UserModel
+from pytest_mock import MockerFixture
+from tests.factories.user_factory import UserFactory
+
+from api.components.user.user_loader import UserLoader
+from api.components.user.user_repository import UserRepository
+from services.db_service import DBService
+
+
+class TestUserLoader:
+    @pytest.fixture
+    def user_repository(self, db_service: DBService) -> UserRepository:
+        return UserRepository(db_service)
+
+    @pytest.fixture
+    def user_loader(self, user_repository: UserRepository) -> UserLoader:
+        return UserLoader(user_repository, window=0.01, max_batch_size=3)
+
+
+class TestConfigure(TestUserLoader):
+    def test_should_define_a_method(
+        self,
+        user_loader: UserLoader,
+    ) -> None:
+        assert isinstance(user_loader.configure, types.MethodType) is True
+
+    def test_should_succeed_and_disable_batching_when_max_batch_size_is_one(
+        self,
+        user_loader: UserLoader,
+    ) -> None:
+        result = user_loader.configure(0, 1)
+
+        assert result is None
+        assert user_loader.is_enabled is False
+
+
+class TestLoad(TestUserLoader):
+    def test_should_define_a_method(
+        self,
+        user_loader: UserLoader,
+    ) -> None:
+        assert isinstance(user_loader.load, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_read_user_directly_when_batching_is_disabled(
+        self,
+        user_repository: UserRepository,
+        mocker: MockerFixture,
+    ) -> None:
+        user_loader = UserLoader(user_repository)
+        mocked_user: UserModel = UserFactory.build()
+        mocked_read_user = mocker.AsyncMock(return_value=mocked_user)
+        user_repository.read_user = mocked_read_user
+        expected_result = mocked_user
+
+        result = await user_loader.load(mocked_user.id)
+
+        assert result == expected_result
+        user_repository.read_user.assert_called_once_with(mocked_user.id)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_read_concurrent_users_with_one_query(
+        self,
+        user_repository: UserRepository,
+        user_loader: UserLoader,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_users: list[UserModel] = UserFactory.build_batch(2)
+        missing_user: UserModel = UserFactory.build()
+        mocked_read_users = mocker.AsyncMock(return_value=mocked_users)
+        user_repository.read_users = mocked_read_users
+        user_ids = [mocked_users[0].id, missing_user.id, mocked_users[1].id]
+        expected_result = [mocked_users[0], None, mocked_users[1]]
+
+        result = await asyncio.gather(
+            *(user_loader.load(user_id) for user_id in user_ids)
+        )
+
+        assert result == expected_result
+        user_repository.read_users.assert_called_once_with(
+            [UUID(user_id).hex for user_id in user_ids]
+        )
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_read_a_repeated_user_only_once(
+        self,
+        user_repository: UserRepository,
+        user_loader: UserLoader,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        mocked_read_users = mocker.AsyncMock(return_value=[mocked_user])
+        user_repository.read_users = mocked_read_users
+        expected_result = [mocked_user, mocked_user]
+
+        result = await asyncio.gather(
+            user_loader.load(mocked_user.id), user_loader.load(mocked_user.id)
+        )
+
+        assert result == expected_result
+        user_repository.read_users.assert_called_once_with([UUID(mocked_user.id).hex])
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_split_users_into_batches_of_max_batch_size(
+        self,
+        user_repository: UserRepository,
+        user_loader: UserLoader,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_users: list[UserModel] = UserFactory.build_batch(4)
+        mocked_read_users = mocker.AsyncMock(
+            side_effect=[mocked_users[:3], mocked_users[3:]]
+        )
+        user_repository.read_users = mocked_read_users
+        expected_result = mocked_users
+
+        result = await asyncio.gather(
+            *(user_loader.load(mocked_user.id) for mocked_user in mocked_users)
+        )
+
+        assert result == expected_result
+        assert user_repository.read_users.call_count == 2
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_for_every_user_of_a_failed_batch(
+        self,
+        user_repository: UserRepository,
+        user_loader: UserLoader,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_users: list[UserModel] = UserFactory.build_batch(2)
+        error = Exception("Failed")
+        mocked_read_users = mocker.AsyncMock(side_effect=error)
+        user_repository.read_users = mocked_read_users
+
+        result = await asyncio.gather(
+            *(user_loader.load(mocked_user.id) for mocked_user in mocked_users),
+            return_exceptions=True,
+        )
+
+        assert result == [error, error]
+        user_repository.read_users.assert_called_once()
@@ -1,12 +1,28 @@
 import types
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
 
 import pytest
 from db.models.user import UserModel
+from faker import Faker
+from fastapi import status
 from tests.factories.user_factory import UserFactory
 
 from api.components.user.user_mapper import UserMapper
-from api.components.user.user_models import UserResponse
+from api.components.user.user_models import (
+    UserChange,
+    UserCreateOperation,
+    UserDeleteOperation,
+    UserFilter,
+    UserOperation,
+    UserPatchOperation,
+    UserPatchRequest,
+    UserReplaceOperation,
+    UserRequest,
+    UserResponse,
+)
 from api.utils.dict_to_obj import DictToObj
+from server_error import Detail, ServerError
 
 
 class TestUserMapper:
@@ -65,6 +81,149 @@ class TestToDomain(TestUserMapper):
         assert result.updated_at == expected_result.updated_at
 
 
+class TestToPartialDomain(TestUserMapper):
+    def test_should_define_a_function(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        assert isinstance(user_mapper.to_partial_domain, types.FunctionType) is True
+
+    def test_should_succeed_and_return_a_user_with_only_the_read_fields(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        obj = DictToObj({"id": mocked_user.id, "name": mocked_user.name})
+
+        result = user_mapper.to_partial_domain(obj)
+
+        assert result.model_dump(exclude_unset=True) == {
+            "id": mocked_user.id,
+            "name": mocked_user.name,
+        }
+
+
+class TestToChanges(TestUserMapper):
+    def test_should_define_a_function(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        assert isinstance(user_mapper.to_changes, types.FunctionType) is True
+
+    def test_should_succeed_and_return_only_the_supplied_fields(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        user_patch_request = UserPatchRequest(name=mocked_user.name)
+        expected_result = {"name": mocked_user.name}
+
+        result = user_mapper.to_changes(user_patch_request)
+
+        assert result == expected_result
+
+
+class TestToIds(TestUserMapper):
+    def test_should_define_a_function(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        assert isinstance(user_mapper.to_ids, types.FunctionType) is True
+
+    def test_should_succeed_and_return_ids_as_hex_strings(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        ids = [uuid4(), uuid4()]
+        expected_result = [id.hex for id in ids]
+
+        result = user_mapper.to_ids(ids)
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_none_when_ids_are_none(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        result = user_mapper.to_ids(None)
+
+        assert result is None
+
+
+class TestToFilter(TestUserMapper):
+    def test_should_define_a_function(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        assert isinstance(user_mapper.to_filter, types.FunctionType) is True
+
+    def test_should_succeed_and_return_a_user_filter_with_the_supplied_conditions(
+        self,
+        user_mapper: UserMapper,
+        faker: Faker,
+    ) -> None:
+        email_prefix = faker.user_name()
+        expected_result = UserFilter(email_prefix=email_prefix)
+
+        result = user_mapper.to_filter(email_prefix=email_prefix, name_contains=None)
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_none_when_no_condition_is_supplied(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        result = user_mapper.to_filter(email_prefix=None, name_contains=None)
+
+        assert result is None
+
+
+class TestToFields(TestUserMapper):
+    def test_should_define_a_function(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        assert isinstance(user_mapper.to_fields, types.FunctionType) is True
+
+    def test_should_succeed_and_return_the_selected_fields_followed_by_the_required_ones(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        expected_result = ["name", "id", "email"]
+
+        result = user_mapper.to_fields("name,id,name", "id", "email")
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_none_when_no_field_is_selected(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        result = user_mapper.to_fields(None, "id")
+
+        assert result is None
+
+    def test_should_fail_and_raise_exception_when_a_field_is_unknown(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        fields = "id,password"
+        message = "Invalid fields"
+        server_error = ServerError(
+            message,
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            Detail(context=fields, cause=None),
+        )
+
+        with pytest.raises(ServerError) as exc_info:
+            user_mapper.to_fields(fields)
+
+        assert exc_info.value.message == server_error.message
+        assert exc_info.value.detail == server_error.detail
+        assert exc_info.value.status_code == server_error.status_code
+        assert exc_info.value.is_operational == server_error.is_operational
+
+
 class TestToResponse(TestUserMapper):
     def test_should_define_a_function(
         self,
@@ -92,3 +251,242 @@ class TestToResponse(TestUserMapper):
         assert result.email == expected_result.email
         assert result.created_at == expected_result.created_at
         assert result.updated_at == expected_result.updated_at
+
+
+class TestToPartialResponse(TestUserMapper):
+    def test_should_define_a_function(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        assert isinstance(user_mapper.to_partial_response, types.FunctionType) is True
+
+    def test_should_succeed_and_return_only_the_selected_fields(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        expected_result = {"name": mocked_user.name, "id": mocked_user.id}
+
+        result = user_mapper.to_partial_response(mocked_user, ["name", "id"])
+
+        assert result == expected_result
+
+
+class TestToUpsertResponse(TestUserMapper):
+    def test_should_define_a_function(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        assert isinstance(user_mapper.to_upsert_response, types.FunctionType) is True
+
+    def test_should_succeed_and_return_a_user_upsert_response(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        upsert_status = "created"
+
+        result = user_mapper.to_upsert_response(mocked_user, upsert_status)
+
+        assert result.id == mocked_user.id
+        assert result.name == mocked_user.name
+        assert result.email == mocked_user.email
+        assert result.created_at == mocked_user.created_at
+        assert result.updated_at == mocked_user.updated_at
+        assert result.status == upsert_status
+
+
+class TestToChange(TestUserMapper):
+    def test_should_define_a_function(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        assert isinstance(user_mapper.to_change, types.FunctionType) is True
+
+    def test_should_succeed_and_return_a_user_change(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        raw_change = DictToObj(
+            {
+                "id": 1,
+                "transaction_id": 1,
+                "user_id": uuid4(),
+                "operation": "created",
+                "name": mocked_user.name,
+                "email": mocked_user.email,
+                "created_at": mocked_user.created_at,
+                "changed_at": datetime.now(timezone.utc),
+            }
+        )
+
+        result = user_mapper.to_change(raw_change)
+
+        assert result.user_id == raw_change.user_id
+        assert result.operation == raw_change.operation
+        assert result.name == mocked_user.name
+        assert result.email == mocked_user.email
+        assert result.changed_at == raw_change.changed_at
+
+
+class TestToChangeResponse(TestUserMapper):
+    def test_should_define_a_function(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        assert isinstance(user_mapper.to_change_response, types.FunctionType) is True
+
+    def test_should_succeed_and_return_a_user_change_response(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        change = UserChange(
+            user_id=uuid4().hex,
+            operation="deleted",
+            name=mocked_user.name,
+            email=mocked_user.email,
+            created_at=mocked_user.created_at,
+            changed_at=datetime.now(timezone.utc),
+        )
+
+        result = user_mapper.to_change_response(change)
+
+        assert result.model_dump() == change.model_dump()
+
+
+class TestToOperation(TestUserMapper):
+    def test_should_define_a_function(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        assert isinstance(user_mapper.to_operation, types.FunctionType) is True
+
+    def test_should_succeed_and_return_a_user_operation_for_each_method(
+        self,
+        user_mapper: UserMapper,
+        faker: Faker,
+    ) -> None:
+        id = uuid4()
+        user_request = UserRequest(name=faker.name(), email=faker.email())
+        operations = [
+            UserCreateOperation(method="create", user=user_request),
+            UserReplaceOperation(method="replace", id=id, user=user_request),
+            UserPatchOperation(
+                method="patch", id=id, changes=UserPatchRequest(name="name")
+            ),
+            UserDeleteOperation(method="delete", id=id),
+        ]
+
+        result = [user_mapper.to_operation(operation) for operation in operations]
+
+        assert [operation.method for operation in result] == [
+            "create",
+            "replace",
+            "patch",
+            "delete",
+        ]
+        assert [operation.userId for operation in result] == [None, *[id.hex] * 3]
+        assert result[0].user.email == user_request.email
+        assert result[1].user.name == user_request.name
+        assert result[2].changes == {"name": "name"}
+        assert result[3].user is None
+
+
+class TestToBatchResult(TestUserMapper):
+    def test_should_define_a_function(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        assert isinstance(user_mapper.to_batch_result, types.FunctionType) is True
+
+    def test_should_succeed_and_return_a_created_result_when_user_is_created(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        operation = UserOperation(method="create")
+
+        result = user_mapper.to_batch_result(operation, mocked_user)
+
+        assert result.status == status.HTTP_201_CREATED
+        assert result.record.id == mocked_user.id
+        assert result.error is None
+
+    def test_should_succeed_and_return_a_failed_result_when_operation_fails(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        userId = uuid4().hex
+        operation = UserOperation(method="delete", userId=userId)
+        server_error = ServerError(
+            "User not found",
+            status.HTTP_404_NOT_FOUND,
+            Detail(context=userId, cause=None),
+        )
+
+        result = user_mapper.to_batch_result(operation, server_error)
+
+        assert result.status == status.HTTP_404_NOT_FOUND
+        assert result.record is None
+        assert result.error.message == server_error.message
+        assert result.error.detail == server_error.detail
+        assert result.error.is_operational is True
+
+
+class TestToETag(TestUserMapper):
+    def test_should_define_a_function(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        assert isinstance(user_mapper.to_etag, types.FunctionType) is True
+
+    def test_should_succeed_and_return_the_same_etag_while_user_is_not_updated(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+
+        result = user_mapper.to_etag(mocked_user)
+
+        assert result == user_mapper.to_etag(mocked_user)
+        assert result.startswith(f'"{mocked_user.id}-') is True
+        assert result.endswith('"') is True
+
+    def test_should_succeed_and_return_a_different_etag_when_user_is_updated(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        etag = user_mapper.to_etag(mocked_user)
+        mocked_user.updated_at = mocked_user.updated_at + timedelta(microseconds=1)
+
+        result = user_mapper.to_etag(mocked_user)
+
+        assert result != etag
+
+
+class TestToVersions(TestUserMapper):
+    def test_should_define_a_function(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        assert isinstance(user_mapper.to_versions, types.FunctionType) is True
+
+    def test_should_succeed_and_return_the_versions_of_the_user_etags(
+        self,
+        user_mapper: UserMapper,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        other_user: UserModel = UserFactory.build()
+        etags = [
+            user_mapper.to_etag(mocked_user),
+            user_mapper.to_etag(other_user),
+            '"invalid"',
+        ]
+        expected_result = [mocked_user.updated_at]
+
+        result = user_mapper.to_versions(mocked_user.id, etags)
+
+        assert result == expected_result
@@ -0,0 +1,139 @@
+import asyncio
+import types
+
+import pytest
+from pytest_mock import MockerFixture
+
+from api.components.user.user_purger import UserPurger
+from api.components.user.user_repository import UserRepository
+from services.db_service import DBService
+
+
+class TestUserPurger:
+    @pytest.fixture
+    def user_repository(self, db_service: DBService) -> UserRepository:
+        return UserRepository(db_service, soft_delete=True)
+
+    @pytest.fixture
+    def user_purger(
+        self, user_repository: UserRepository, db_service: DBService
+    ) -> UserPurger:
+        return UserPurger(user_repository, db_service, batch_size=2, interval=0.01)
+
+
+class TestConfigure(TestUserPurger):
+    def test_should_define_a_method(
+        self,
+        user_purger: UserPurger,
+    ) -> None:
+        assert isinstance(user_purger.configure, types.MethodType) is True
+
+    def test_should_succeed_and_disable_purge_when_batch_size_is_zero(
+        self,
+        user_purger: UserPurger,
+    ) -> None:
+        result = user_purger.configure(0, 1, 2)
+
+        assert result is None
+        assert user_purger.is_enabled is False
+
+
+class TestPurge(TestUserPurger):
+    def test_should_define_a_method(
+        self,
+        user_purger: UserPurger,
+    ) -> None:
+        assert isinstance(user_purger.purge, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_purge_a_batch_when_database_is_quiet(
+        self,
+        db_service: DBService,
+        user_repository: UserRepository,
+        user_purger: UserPurger,
+        mocker: MockerFixture,
+    ) -> None:
+        mocker.patch.object(
+            db_service,
+            "get_database_active_query_count",
+            mocker.AsyncMock(return_value=2),
+        )
+        user_repository.purge_users = mocker.AsyncMock(return_value=2)
+        expected_result = 2
+
+        result = await user_purger.purge()
+
+        assert result == expected_result
+        user_repository.purge_users.assert_called_once_with(2)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_skip_the_batch_when_database_is_busy(
+        self,
+        db_service: DBService,
+        user_repository: UserRepository,
+        user_purger: UserPurger,
+        mocker: MockerFixture,
+    ) -> None:
+        mocker.patch.object(
+            db_service,
+            "get_database_active_query_count",
+            mocker.AsyncMock(return_value=3),
+        )
+        user_repository.purge_users = mocker.AsyncMock(return_value=2)
+        expected_result = 0
+
+        result = await user_purger.purge()
+
+        assert result == expected_result
+        user_repository.purge_users.assert_not_called()
+
+
+class TestStart(TestUserPurger):
+    def test_should_define_a_method(
+        self,
+        user_purger: UserPurger,
+    ) -> None:
+        assert isinstance(user_purger.start, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_purge_in_the_background_until_stopped(
+        self,
+        db_service: DBService,
+        user_repository: UserRepository,
+        user_purger: UserPurger,
+        mocker: MockerFixture,
+    ) -> None:
+        mocker.patch.object(
+            db_service,
+            "get_database_active_query_count",
+            mocker.AsyncMock(return_value=0),
+        )
+        user_repository.purge_users = mocker.AsyncMock(
+            side_effect=[Exception("connection lost"), 2, 0, 0, 0, 0, 0, 0, 0, 0]
+        )
+
+        user_purger.start()
+        await asyncio.sleep(0.05)
+        await user_purger.stop()
+
+        call_count = user_repository.purge_users.call_count
+        assert call_count >= 2
+        await asyncio.sleep(0.03)
+        assert user_repository.purge_users.call_count == call_count
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_do_nothing_when_deletes_are_hard(
+        self,
+        db_service: DBService,
+        user_repository: UserRepository,
+        user_purger: UserPurger,
+        mocker: MockerFixture,
+    ) -> None:
+        user_repository.configure(False, 0, 1)
+        user_repository.purge_users = mocker.AsyncMock(return_value=0)
+
+        user_purger.start()
+        await asyncio.sleep(0.02)
+        await user_purger.stop()
+
+        user_repository.purge_users.assert_not_called()
@@ -1,18 +1,61 @@
+import asyncio
 import types
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+from uuid import UUID, uuid4
 
 import pytest
 from db.models.user import UserModel
 from faker import Faker
-from sqlalchemy import insert
+from sqlalchemy import event, func, insert, make_url, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
 from tests.factories.user_factory import UserFactory
 
 from api.components.user.user_mapper import UserMapper
-from api.components.user.user_models import User
+from api.components.user.user_models import User, UserFilter
 from api.components.user.user_repository import UserRepository
 from api.utils.dict_to_obj import DictToObj
+from config.config import Config
 from services.db_service import DBService
 
 
+async def insert_users(
+    db_service: DBService, mocked_users: list[UserModel]
+) -> list[User]:
+    domain_users: list[User] = []
+    async with db_service.async_engine.connect() as conn:
+        for mocked_user in mocked_users:
+            raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
+            query = insert(UserModel).values(raw_user_data).returning(UserModel)
+            engine_result = await conn.execute(query)
+            obj = DictToObj(engine_result.first()._asdict())
+            domain_users.append(UserMapper.to_domain(obj))
+        await conn.commit()
+    return domain_users
+
+
+async def explain_first_statement(
+    db_service: DBService, read: Callable[[], Awaitable[object]]
+) -> str:
+    statements: list[tuple[str, tuple]] = []
+
+    def capture_statement(conn, cursor, statement, parameters, context, many):
+        statements.append((statement, parameters))
+
+    sync_engine = db_service.async_engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", capture_statement)
+    try:
+        await read()
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", capture_statement)
+    statement, parameters = statements[0]
+    async with db_service.async_engine.connect() as conn:
+        result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+        plan = "\n".join(result.scalars())
+        await conn.commit()
+    return plan
+
+
 class TestUserRepository:
     @pytest.fixture
     def user_repository(self, db_service: DBService) -> UserRepository:
@@ -47,6 +90,181 @@ class TestCreateUser(TestUserRepository):
         assert result.created_at is not None
         assert result.updated_at is None
 
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_users_with_time_ordered_ids(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        mocked_users: list[UserModel] = UserFactory.build_batch(3)
+        results: list[User] = []
+        for mocked_user in mocked_users:
+            results.append(await user_repository.create_user(mocked_user))
+            await asyncio.sleep(0.002)
+
+        ids = [UUID(result.id) for result in results]
+        assert all(id.version == 7 for id in ids)
+        assert ids == sorted(ids)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_none_when_user_email_already_exists(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        mocked_user: UserModel = UserFactory.build()
+        await insert_users(db_service, [mocked_user])
+        duplicated_user: UserModel = UserFactory.build(email=mocked_user.email.upper())
+
+        result = await user_repository.create_user(duplicated_user)
+
+        row_count = 1
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert result is None
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_commit_concurrent_users_together_when_group_commit_is_enabled(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        mocked_user: UserModel = UserFactory.build()
+        await insert_users(db_service, [mocked_user])
+        new_user: UserModel = UserFactory.build()
+        mocked_users: list[UserModel] = [
+            *UserFactory.build_batch(2),
+            UserFactory.build(email=mocked_user.email),
+            new_user,
+            UserFactory.build(email=new_user.email.upper()),
+        ]
+        user_repository.configure(False, 60, len(mocked_users))
+        commit_count = 0
+
+        def count_commit(conn):
+            nonlocal commit_count
+            commit_count += 1
+
+        sync_engine = db_service.async_engine.sync_engine
+        event.listen(sync_engine, "commit", count_commit)
+        try:
+            results = await asyncio.gather(
+                *[
+                    user_repository.create_user(mocked_user)
+                    for mocked_user in mocked_users
+                ]
+            )
+        finally:
+            event.remove(sync_engine, "commit", count_commit)
+
+        row_count = 4
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert commit_count == 1
+        assert [result is None for result in results] == [
+            False,
+            False,
+            True,
+            False,
+            True,
+        ]
+        assert [result.email for result in results if result is not None] == [
+            mocked_users[0].email,
+            mocked_users[1].email,
+            new_user.email,
+        ]
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_user_when_group_commit_window_elapses(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        mocked_user: UserModel = UserFactory.build()
+        user_repository.configure(False, 0.01, 10)
+
+        result = await user_repository.create_user(mocked_user)
+
+        row_count = 1
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert result.email == mocked_user.email
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_user_when_its_partition_was_dropped(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        mocked_user: UserModel = UserFactory.build()
+        await insert_users(db_service, [mocked_user])
+        async with db_service.async_engine.connect() as conn:
+            query = text(
+                "SELECT drop_users_partitions("
+                "date_trunc('month', localtimestamp) + interval '1 month')"
+            )
+            await conn.execute(query)
+            await conn.commit()
+
+        result = await user_repository.create_user(mocked_user)
+
+        row_count = 1
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert result.email == mocked_user.email
+
+
+class TestUpsertUsers(TestUserRepository):
+    def test_should_define_a_method(
+        self,
+        user_repository: UserRepository,
+    ) -> None:
+        assert isinstance(user_repository.upsert_users, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_users_in_request_order_with_their_status(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+        faker: Faker,
+    ):
+        mocked_users: list[UserModel] = UserFactory.build_batch(2)
+        domain_users = await insert_users(db_service, mocked_users)
+        updated_user = User(name=faker.name(), email=domain_users[0].email.upper())
+        unchanged_user = User(name=domain_users[1].name, email=domain_users[1].email)
+        created_user: UserModel = UserFactory.build()
+        users = [
+            UserMapper.to_domain(created_user),
+            updated_user,
+            unchanged_user,
+        ]
+
+        result = await user_repository.upsert_users(users)
+
+        row_count = 3
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert [user.email.lower() for user, _ in result] == [
+            user.email.lower() for user in users
+        ]
+        assert [upsert_status for _, upsert_status in result] == [
+            "created",
+            "updated",
+            "unchanged",
+        ]
+        assert result[0][0].updated_at is None
+        assert result[1][0].id == domain_users[0].id
+        assert result[1][0].name == updated_user.name
+        assert result[1][0].updated_at is not None
+        assert result[2][0] == domain_users[1]
+
 
 class TestReadAndCountUsers(TestUserRepository):
     def test_should_define_a_method(
@@ -190,60 +408,132 @@ class TestReadAndCountUsers(TestUserRepository):
         assert records_result == expected_records_result
         assert total_result == expected_total_result
 
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_only_users_that_match_the_filter_with_their_total(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        mocked_users: list[UserModel] = [
+            UserFactory.build(name="john_doe", email="john@example.com"),
+            UserFactory.build(name="jane_doe", email="jane@example.com"),
+            UserFactory.build(name="jan%doe", email="jan@example.com"),
+        ]
+        domain_users = await insert_users(db_service, mocked_users)
+        user_filter = UserFilter(email_prefix="j", name_contains="_do")
+        expected_records_result = [domain_users[0], domain_users[1]]
 
-class TestReadUser(TestUserRepository):
-    def test_should_define_a_method(
+        (
+            records_result,
+            total_result,
+        ) = await user_repository.read_and_count_users(1, 10, user_filter, "-name")
+
+        assert records_result == expected_records_result
+        assert total_result == len(expected_records_result)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_list_of_users_in_the_requested_order(
         self,
         db_service: DBService,
         initialize_database: None,
         clear_database_tables: None,
         user_repository: UserRepository,
-    ) -> None:
-        assert isinstance(user_repository.read_user, types.MethodType) is True
+    ):
+        mocked_users: list[UserModel] = UserFactory.build_batch(5)
+        domain_users = await insert_users(db_service, mocked_users)
+
+        (
+            records_by_email,
+            _,
+        ) = await user_repository.read_and_count_users(1, 5, None, "email")
+        (
+            records_by_creation,
+            _,
+        ) = await user_repository.read_and_count_users(1, 5, None, "created_at")
+
+        assert records_by_email == sorted(domain_users, key=lambda user: user.email)
+        assert records_by_creation == sorted(
+            domain_users, key=lambda user: (user.created_at, UUID(user.id))
+        )
 
     @pytest.mark.asyncio(loop_scope="session")
-    async def test_should_succeed_and_return_user_when_user_is_read(
+    async def test_should_succeed_and_return_list_of_users_with_only_the_selected_fields(
         self,
         db_service: DBService,
         initialize_database: None,
         clear_database_tables: None,
         user_repository: UserRepository,
-    ) -> None:
-        mocked_user: UserModel = UserFactory.build()
-        raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
-        domain_user: User
+    ):
+        mocked_users: list[UserModel] = UserFactory.build_batch(3)
+        domain_users = await insert_users(db_service, mocked_users)
+
+        records_result, total_result = await user_repository.read_and_count_users(
+            1, 3, None, "name", ["id", "name"]
+        )
+
+        assert [record.model_dump(exclude_unset=True) for record in records_result] == [
+            {"id": user.id, "name": user.name}
+            for user in sorted(domain_users, key=lambda user: user.name)
+        ]
+        assert total_result == len(domain_users)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_read_the_page_in_order_from_the_created_at_index(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
         async with db_service.async_engine.connect() as conn:
-            query = insert(UserModel).values(raw_user_data).returning(UserModel)
-            engine_result = await conn.execute(query)
-            obj = DictToObj(engine_result.first()._asdict())
+            await conn.execute(
+                text(
+                    """
+                    INSERT INTO users (id, name, email, created_at)
+                    SELECT gen_random_uuid(), 'user' || g, 'user' || g || '@example.com',
+                           now() - g * interval '1 second'
+                    FROM generate_series(1, 5000) AS g
+                    """
+                )
+            )
+            await conn.execute(text("ANALYZE users"))
             await conn.commit()
-            domain_user = UserMapper.to_domain(obj)
-        expected_result = domain_user
 
-        result = await user_repository.read_user(domain_user.id)
+        plan = await explain_first_statement(
+            db_service, lambda: user_repository.read_and_count_users(10, 20)
+        )
 
-        row_count = 1
-        assert await db_service.get_database_table_row_count("users") == row_count
-        assert result == expected_result
+        month = datetime.now().strftime("%Y%m")
+        assert (
+            f"Index Only Scan Backward using users_p{month}_created_at_id_idx" in plan
+        )
+        assert "Sort Key" not in plan.split("Limit")[1]
 
     @pytest.mark.asyncio(loop_scope="session")
-    async def test_should_succeed_and_return_none_when_user_is_not_found(
+    async def test_should_succeed_and_read_only_the_partitions_in_the_created_at_range(
         self,
         db_service: DBService,
         initialize_database: None,
         clear_database_tables: None,
         user_repository: UserRepository,
-    ) -> None:
-        mocked_user: UserModel = UserFactory.build()
+    ):
+        created_after = datetime.now().replace(day=1, hour=0, minute=0, second=0)
+        user_filter = UserFilter(created_after=created_after + timedelta(days=32))
 
-        result = await user_repository.read_user(mocked_user.id)
+        plan = await explain_first_statement(
+            db_service,
+            lambda: user_repository.read_and_count_users(1, 20, user_filter),
+        )
 
-        row_count = 0
-        assert await db_service.get_database_table_row_count("users") == row_count
-        assert result is None
+        month = created_after.strftime("%Y%m")
+        assert f"users_p{month}" not in plan
+        next_month = (created_after + timedelta(days=32)).strftime("%Y%m")
+        assert f"users_p{next_month}" in plan
 
 
-class TestUpdateUser(TestUserRepository):
+class TestReadUsersVersion(TestUserRepository):
     def test_should_define_a_method(
         self,
         db_service: DBService,
@@ -251,58 +541,67 @@ class TestUpdateUser(TestUserRepository):
         clear_database_tables: None,
         user_repository: UserRepository,
     ) -> None:
-        assert isinstance(user_repository.update_user, types.MethodType) is True
+        assert isinstance(user_repository.read_users_version, types.MethodType) is True
 
     @pytest.mark.asyncio(loop_scope="session")
-    async def test_should_succeed_and_return_user_when_user_is_updated(
+    async def test_should_succeed_and_return_a_greater_version_when_users_are_written(
         self,
         db_service: DBService,
         initialize_database: None,
         clear_database_tables: None,
         user_repository: UserRepository,
-    ):
+    ) -> None:
         mocked_user: UserModel = UserFactory.build()
         raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
-        domain_user: User
+        version = await user_repository.read_users_version()
         async with db_service.async_engine.connect() as conn:
-            query = insert(UserModel).values(raw_user_data).returning(UserModel)
-            engine_result = await conn.execute(query)
-            obj = DictToObj(engine_result.first()._asdict())
+            query = insert(UserModel).values(raw_user_data)
+            await conn.execute(query)
             await conn.commit()
-            domain_user: User = UserMapper.to_domain(
-                UserFactory.build(id=obj.id, created_at=obj.created_at)
-            )
-        expected_result = domain_user
 
-        result = await user_repository.update_user(domain_user.id, domain_user)
+        result = await user_repository.read_users_version()
 
-        row_count = 1
-        assert await db_service.get_database_table_row_count("users") == row_count
-        assert result.id == expected_result.id
-        assert result.name == expected_result.name
-        assert result.email == expected_result.email
-        assert result.created_at == expected_result.created_at
-        assert result.updated_at is not None
+        assert result > version
 
     @pytest.mark.asyncio(loop_scope="session")
-    async def test_should_succeed_and_return_none_when_user_is_not_found(
+    async def test_should_succeed_and_return_the_same_version_when_users_are_only_read(
         self,
         db_service: DBService,
         initialize_database: None,
         clear_database_tables: None,
         user_repository: UserRepository,
-    ):
-        mocked_user: UserModel = UserFactory.build()
-        domain_user: User = UserMapper.to_domain(UserFactory.build())
+    ) -> None:
+        version = await user_repository.read_users_version()
+        await user_repository.read_and_count_users(1, 1)
 
-        result = await user_repository.update_user(mocked_user.id, domain_user)
+        result = await user_repository.read_users_version()
 
-        row_count = 0
-        assert await db_service.get_database_table_row_count("users") == row_count
-        assert result is None
+        assert result == version
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_count_every_write_when_users_are_written_concurrently(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ) -> None:
+        count = 4
+        version = await user_repository.read_users_version()
 
+        async def insert_user(mocked_user: UserModel) -> None:
+            raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
+            async with db_service.async_engine.connect() as conn:
+                await conn.execute(insert(UserModel).values(raw_user_data))
+                await conn.commit()
 
-class TestDeleteUser(TestUserRepository):
+        await asyncio.gather(*map(insert_user, UserFactory.build_batch(count)))
+        result = await user_repository.read_users_version()
+
+        assert result == version + count
+
+
+class TestReadUsers(TestUserRepository):
     def test_should_define_a_method(
         self,
         db_service: DBService,
@@ -310,16 +609,56 @@ class TestDeleteUser(TestUserRepository):
         clear_database_tables: None,
         user_repository: UserRepository,
     ) -> None:
-        assert isinstance(user_repository.delete_user, types.MethodType) is True
+        assert isinstance(user_repository.read_users, types.MethodType) is True
 
     @pytest.mark.asyncio(loop_scope="session")
-    async def test_should_succeed_and_return_user_when_user_is_deleted(
+    async def test_should_succeed_and_return_only_the_users_that_exist(
         self,
         db_service: DBService,
         initialize_database: None,
         clear_database_tables: None,
         user_repository: UserRepository,
-    ):
+    ) -> None:
+        mocked_users: list[UserModel] = UserFactory.build_batch(2)
+        domain_users: list[User] = []
+        async with db_service.async_engine.connect() as conn:
+            for mocked_user in mocked_users:
+                raw_user_data = UserMapper.to_persistence(
+                    UserMapper.to_domain(mocked_user)
+                )
+                query = insert(UserModel).values(raw_user_data).returning(UserModel)
+                engine_result = await conn.execute(query)
+                obj = DictToObj(engine_result.first()._asdict())
+                domain_users.append(UserMapper.to_domain(obj))
+            await conn.commit()
+        missing_user: UserModel = UserFactory.build()
+        expected_result = sorted(domain_users, key=lambda user: user.id)
+
+        result = await user_repository.read_users(
+            [domain_user.id for domain_user in domain_users] + [missing_user.id]
+        )
+
+        assert sorted(result, key=lambda user: user.id) == expected_result
+
+
+class TestReadUser(TestUserRepository):
+    def test_should_define_a_method(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ) -> None:
+        assert isinstance(user_repository.read_user, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_user_when_user_is_read(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ) -> None:
         mocked_user: UserModel = UserFactory.build()
         raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
         domain_user: User
@@ -329,27 +668,993 @@ class TestDeleteUser(TestUserRepository):
             obj = DictToObj(engine_result.first()._asdict())
             await conn.commit()
             domain_user = UserMapper.to_domain(obj)
-        mocked_user.id = domain_user.id
         expected_result = domain_user
 
-        result = await user_repository.delete_user(mocked_user.id)
+        result = await user_repository.read_user(domain_user.id)
 
-        row_count = 0
+        row_count = 1
         assert await db_service.get_database_table_row_count("users") == row_count
         assert result == expected_result
 
     @pytest.mark.asyncio(loop_scope="session")
-    async def test_should_succeed_and_return_none_when_user_is_not_found(
+    async def test_should_succeed_and_return_user_with_only_the_selected_fields(
         self,
         db_service: DBService,
         initialize_database: None,
         clear_database_tables: None,
         user_repository: UserRepository,
-    ):
+    ) -> None:
         mocked_user: UserModel = UserFactory.build()
+        [domain_user] = await insert_users(db_service, [mocked_user])
 
-        result = await user_repository.delete_user(mocked_user.id)
+        result = await user_repository.read_user(domain_user.id, ["id", "email"])
 
-        row_count = 0
-        assert await db_service.get_database_table_row_count("users") == row_count
-        assert result is None
+        assert result.model_dump(exclude_unset=True) == {
+            "id": domain_user.id,
+            "email": domain_user.email,
+        }
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_none_when_user_is_not_found(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+
+        result = await user_repository.read_user(mocked_user.id)
+
+        row_count = 0
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert result is None
+
+
+class TestReadUserByEmail(TestUserRepository):
+    def test_should_define_a_method(
+        self,
+        user_repository: UserRepository,
+    ) -> None:
+        assert isinstance(user_repository.read_user_by_email, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_user_whatever_the_case_of_the_email(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        mocked_user: UserModel = UserFactory.build(email="Jane.Doe@Example.com")
+        [domain_user] = await insert_users(db_service, [mocked_user])
+
+        result = await user_repository.read_user_by_email("jane.doe@EXAMPLE.COM")
+
+        assert result == domain_user
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_none_when_user_is_not_found(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+        faker: Faker,
+    ):
+        result = await user_repository.read_user_by_email(faker.email())
+
+        assert result is None
+
+
+class TestSearchUsers(TestUserRepository):
+    def test_should_define_a_method(
+        self,
+        user_repository: UserRepository,
+    ) -> None:
+        assert isinstance(user_repository.search_users, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_users_matching_every_word_by_prefix(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        mocked_users: list[UserModel] = [
+            UserFactory.build(name="jane_doe", email="jane.doe@example.com"),
+            UserFactory.build(name="john_smith", email="jsmith@example.com"),
+            UserFactory.build(name="doe", email="someone@sample.org"),
+        ]
+        domain_users = await insert_users(db_service, mocked_users)
+
+        result = await user_repository.search_users("Do exam", 10)
+
+        assert [user for user, _ in result] == [domain_users[0]]
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_the_next_users_when_position_is_given(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        mocked_users: list[UserModel] = [
+            UserFactory.build(name=f"member_{index}", email=f"m{index}@example.com")
+            for index in range(5)
+        ]
+        await insert_users(db_service, mocked_users)
+        first_result = await user_repository.search_users("member", 2)
+        last_user, last_rank = first_result[-1]
+
+        second_result = await user_repository.search_users(
+            "member", 10, (last_rank, last_user.id)
+        )
+
+        found_user_ids = [user.id for user, _ in first_result + second_result]
+        assert len(found_user_ids) == len(mocked_users)
+        assert len(set(found_user_ids)) == len(mocked_users)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_empty_list_when_text_has_no_words(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        result = await user_repository.search_users("&|!:*", 10)
+
+        assert result == []
+
+
+class TestReadUserChanges(TestUserRepository):
+    def test_should_define_a_method(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ) -> None:
+        assert isinstance(user_repository.read_user_changes, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_changes_in_the_order_they_were_made(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        created_user = await user_repository.create_user(UserFactory.build())
+        changed_user = UserMapper.to_domain(UserFactory.build())
+        await user_repository.update_user(created_user.id, changed_user)
+        await user_repository.update_user(created_user.id, changed_user)
+        await user_repository.delete_user(created_user.id)
+
+        result, next_after = await user_repository.read_user_changes(None, 10)
+
+        assert [(change.user_id, change.operation) for change in result] == [
+            (created_user.id, "created"),
+            (created_user.id, "updated"),
+            (created_user.id, "deleted"),
+        ]
+        assert result[1].email == changed_user.email
+        assert await user_repository.read_user_changes(next_after, 10) == (
+            [],
+            next_after,
+        )
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_the_next_page_after_the_position(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        mocked_users: list[UserModel] = UserFactory.build_batch(3)
+        for mocked_user in mocked_users:
+            await user_repository.create_user(mocked_user)
+
+        first_page, next_after = await user_repository.read_user_changes(None, 2)
+        second_page, _ = await user_repository.read_user_changes(next_after, 2)
+
+        assert [change.email for change in [*first_page, *second_page]] == [
+            mocked_user.email for mocked_user in mocked_users
+        ]
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_hold_back_changes_until_older_transactions_end(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        async with db_service.async_engine.connect() as conn:
+            # The transaction takes an id, as it would on its first write.
+            await conn.execute(select(func.pg_current_xact_id()))
+            created_user = await user_repository.create_user(UserFactory.build())
+
+            held_back_result, _ = await user_repository.read_user_changes(None, 10)
+
+            await conn.commit()
+        result, _ = await user_repository.read_user_changes(None, 10)
+
+        assert held_back_result == []
+        assert [change.email for change in result] == [created_user.email]
+
+
+class TestReadLatestUserChangePositions(TestUserRepository):
+    def test_should_define_a_method(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ) -> None:
+        assert (
+            isinstance(
+                user_repository.read_latest_user_change_positions, types.MethodType
+            )
+            is True
+        )
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_the_start_when_there_are_no_changes(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        result = await user_repository.read_latest_user_change_positions()
+
+        assert result == [(0, 0)]
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_the_position_after_the_last_change(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        await user_repository.create_user(UserFactory.build())
+        await user_repository.create_user(UserFactory.build())
+
+        result = await user_repository.read_latest_user_change_positions()
+
+        _, expected_result = await user_repository.read_user_changes(None, 10)
+        assert result == expected_result
+        assert await user_repository.read_user_changes(result, 10) == ([], result)
+
+
+class TestUpdateUser(TestUserRepository):
+    def test_should_define_a_method(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ) -> None:
+        assert isinstance(user_repository.update_user, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_user_when_user_is_updated(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        mocked_user: UserModel = UserFactory.build()
+        raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
+        domain_user: User
+        async with db_service.async_engine.connect() as conn:
+            query = insert(UserModel).values(raw_user_data).returning(UserModel)
+            engine_result = await conn.execute(query)
+            obj = DictToObj(engine_result.first()._asdict())
+            await conn.commit()
+            domain_user: User = UserMapper.to_domain(
+                UserFactory.build(id=obj.id, created_at=obj.created_at)
+            )
+        expected_result = domain_user
+
+        result = await user_repository.update_user(domain_user.id, domain_user)
+
+        row_count = 1
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert result.id == expected_result.id
+        assert result.name == expected_result.name
+        assert result.email == expected_result.email
+        assert result.created_at == expected_result.created_at
+        assert result.updated_at is not None
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_none_when_user_is_not_found(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        mocked_user: UserModel = UserFactory.build()
+        domain_user: User = UserMapper.to_domain(UserFactory.build())
+
+        result = await user_repository.update_user(mocked_user.id, domain_user)
+
+        row_count = 0
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert result is None
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_user_when_user_version_matches(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        mocked_user: UserModel = UserFactory.build()
+        raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
+        async with db_service.async_engine.connect() as conn:
+            query = insert(UserModel).values(raw_user_data).returning(UserModel)
+            engine_result = await conn.execute(query)
+            obj = DictToObj(engine_result.first()._asdict())
+            await conn.commit()
+        domain_user: User = UserMapper.to_domain(UserFactory.build(id=obj.id))
+        expected_versions = [obj.created_at]
+
+        result = await user_repository.update_user(
+            domain_user.id, domain_user, expected_versions
+        )
+
+        assert result.id == domain_user.id
+        assert result.name == domain_user.name
+        assert result.email == domain_user.email
+        assert result.updated_at is not None
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_none_without_updating_user_when_user_version_does_not_match(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        mocked_user: UserModel = UserFactory.build()
+        raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
+        async with db_service.async_engine.connect() as conn:
+            query = insert(UserModel).values(raw_user_data).returning(UserModel)
+            engine_result = await conn.execute(query)
+            obj = DictToObj(engine_result.first()._asdict())
+            await conn.commit()
+        domain_user: User = UserMapper.to_domain(UserFactory.build(id=obj.id))
+        expected_versions = [obj.created_at - timedelta(microseconds=1)]
+
+        result = await user_repository.update_user(
+            domain_user.id, domain_user, expected_versions
+        )
+
+        assert result is None
+        async with db_service.async_engine.connect() as conn:
+            query = select(UserModel.updated_at).where(UserModel.id == UUID(obj.id))
+            assert (await conn.execute(query)).scalar_one() is None
+
+
+class TestUpdateUsers(TestUserRepository):
+    def test_should_define_a_method(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ) -> None:
+        assert isinstance(user_repository.update_users, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_users_when_users_are_updated(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        domain_users = await insert_users(db_service, UserFactory.build_batch(3))
+        changed_users = [
+            UserMapper.to_domain(UserFactory.build(id=domain_user.id))
+            for domain_user in domain_users
+        ]
+        missing_user: User = UserMapper.to_domain(UserFactory.build())
+
+        result = await user_repository.update_users(
+            [(user.id, user) for user in [*changed_users, missing_user]]
+        )
+
+        assert sorted((user.id, user.name, user.email) for user in result) == sorted(
+            (user.id, user.name, user.email) for user in changed_users
+        )
+        assert all(user.updated_at is not None for user in result)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_keep_the_last_write_when_user_is_written_twice(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        [domain_user] = await insert_users(db_service, [UserFactory.build()])
+        first_user: User = UserMapper.to_domain(UserFactory.build(id=domain_user.id))
+        last_user: User = UserMapper.to_domain(UserFactory.build(id=domain_user.id))
+
+        result = await user_repository.update_users(
+            [(domain_user.id, first_user), (UUID(domain_user.id).hex, last_user)]
+        )
+
+        assert len(result) == 1
+        assert result[0].name == last_user.name
+        assert result[0].email == last_user.email
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_skip_the_users_written_since_the_write_was_made(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        stale_user, fresh_user = await insert_users(
+            db_service, UserFactory.build_batch(2)
+        )
+        written_at = datetime.now(timezone.utc)
+        await user_repository.update_user(
+            stale_user.id, UserMapper.to_domain(UserFactory.build())
+        )
+        changed_users = [
+            UserMapper.to_domain(UserFactory.build(id=domain_user.id))
+            for domain_user in [stale_user, fresh_user]
+        ]
+
+        result = await user_repository.update_users(
+            [(user.id, user) for user in changed_users], [written_at, written_at]
+        )
+
+        assert [(user.id, user.email) for user in result] == [
+            (changed_users[1].id, changed_users[1].email)
+        ]
+
+
+class TestPatchUser(TestUserRepository):
+    def test_should_define_a_method(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ) -> None:
+        assert isinstance(user_repository.patch_user, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_user_when_user_is_patched(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        mocked_user: UserModel = UserFactory.build()
+        raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
+        async with db_service.async_engine.connect() as conn:
+            query = insert(UserModel).values(raw_user_data).returning(UserModel)
+            engine_result = await conn.execute(query)
+            obj = DictToObj(engine_result.first()._asdict())
+            await conn.commit()
+        changes = {"name": UserFactory.build().name}
+
+        result = await user_repository.patch_user(obj.id, changes)
+
+        assert result.id == obj.id
+        assert result.name == changes["name"]
+        assert result.email == obj.email
+        assert result.updated_at is not None
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_user_without_updating_it_when_nothing_changes(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        mocked_user: UserModel = UserFactory.build()
+        raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
+        async with db_service.async_engine.connect() as conn:
+            query = insert(UserModel).values(raw_user_data).returning(UserModel)
+            engine_result = await conn.execute(query)
+            obj = DictToObj(engine_result.first()._asdict())
+            await conn.commit()
+        version = await user_repository.read_users_version()
+        changes = {"name": obj.name, "email": obj.email}
+
+        result = await user_repository.patch_user(obj.id, changes)
+
+        assert result.id == obj.id
+        assert result.name == obj.name
+        assert result.email == obj.email
+        assert result.updated_at is None
+        assert await user_repository.read_users_version() == version
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_none_when_user_is_not_found(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        mocked_user: UserModel = UserFactory.build()
+        changes = {"name": mocked_user.name}
+
+        result = await user_repository.patch_user(mocked_user.id, changes)
+
+        assert result is None
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_none_when_user_version_does_not_match(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        mocked_user: UserModel = UserFactory.build()
+        raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
+        async with db_service.async_engine.connect() as conn:
+            query = insert(UserModel).values(raw_user_data).returning(UserModel)
+            engine_result = await conn.execute(query)
+            obj = DictToObj(engine_result.first()._asdict())
+            await conn.commit()
+        changes = {"name": UserFactory.build().name}
+        expected_versions = [obj.created_at - timedelta(microseconds=1)]
+
+        result = await user_repository.patch_user(obj.id, changes, expected_versions)
+
+        assert result is None
+
+
+class TestPatchUsers(TestUserRepository):
+    def test_should_define_a_method(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ) -> None:
+        assert isinstance(user_repository.patch_users, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_ids_of_changed_users_when_users_are_patched_by_ids(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ) -> None:
+        domain_users = await insert_users(db_service, UserFactory.build_batch(3))
+        changes = {"name": domain_users[0].name}
+        expected_result = sorted(domain_user.id for domain_user in domain_users[1:])
+
+        result = await user_repository.patch_users(
+            [domain_user.id for domain_user in domain_users], None, changes, 2
+        )
+
+        assert sorted(result) == expected_result
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_ids_of_changed_users_when_users_are_patched_by_filter(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ) -> None:
+        domain_users = await insert_users(
+            db_service,
+            [UserFactory.build(email=f"user{index}@tenant.test") for index in range(5)]
+            + [UserFactory.build()],
+        )
+        user_filter = UserFilter(email_suffix="@tenant.test")
+        changes = {"name": "renamed"}
+        expected_result = sorted(domain_user.id for domain_user in domain_users[:5])
+
+        result = await user_repository.patch_users(None, user_filter, changes, 2)
+
+        assert sorted(result) == expected_result
+
+
+class TestDeleteUser(TestUserRepository):
+    def test_should_define_a_method(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ) -> None:
+        assert isinstance(user_repository.delete_user, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_user_when_user_is_deleted(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        mocked_user: UserModel = UserFactory.build()
+        raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
+        domain_user: User
+        async with db_service.async_engine.connect() as conn:
+            query = insert(UserModel).values(raw_user_data).returning(UserModel)
+            engine_result = await conn.execute(query)
+            obj = DictToObj(engine_result.first()._asdict())
+            await conn.commit()
+            domain_user = UserMapper.to_domain(obj)
+        mocked_user.id = domain_user.id
+        expected_result = domain_user
+
+        result = await user_repository.delete_user(mocked_user.id)
+
+        row_count = 0
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert result == expected_result
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_none_when_user_is_not_found(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ):
+        mocked_user: UserModel = UserFactory.build()
+
+        result = await user_repository.delete_user(mocked_user.id)
+
+        row_count = 0
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert result is None
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_keep_user_out_of_reads_when_user_is_soft_deleted(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+    ):
+        user_repository = UserRepository(db_service, soft_delete=True)
+        mocked_user: UserModel = UserFactory.build()
+        domain_users = await insert_users(db_service, [mocked_user])
+
+        result = await user_repository.delete_user(domain_users[0].id)
+
+        row_count = 1
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert result == domain_users[0]
+        assert await user_repository.delete_user(domain_users[0].id) is None
+        assert await user_repository.read_user(domain_users[0].id) is None
+        assert await user_repository.read_user_by_email(mocked_user.email) is None
+        assert await user_repository.read_and_count_users(1, 10) == ([], 0)
+        assert await user_repository.create_user(mocked_user) is not None
+
+
+class TestDeleteUsers(TestUserRepository):
+    def test_should_define_a_method(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ) -> None:
+        assert isinstance(user_repository.delete_users, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_ids_of_deleted_users_when_users_are_deleted_by_ids(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ) -> None:
+        domain_users = await insert_users(db_service, UserFactory.build_batch(4))
+        missing_user: UserModel = UserFactory.build()
+        user_ids = [domain_user.id for domain_user in domain_users[:3]]
+        expected_result = user_ids
+
+        result = await user_repository.delete_users(
+            user_ids + [missing_user.id], None, 2
+        )
+
+        row_count = 1
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert sorted(result) == sorted(expected_result)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_ids_of_deleted_users_when_users_are_deleted_by_filter(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+    ) -> None:
+        domain_users = await insert_users(
+            db_service,
+            [UserFactory.build(name=f"tenant_{index}") for index in range(5)]
+            + [UserFactory.build(name="tenantless")],
+        )
+        user_filter = UserFilter(name_prefix="tenant_")
+        expected_result = sorted(domain_user.id for domain_user in domain_users[:5])
+
+        result = await user_repository.delete_users(None, user_filter, 2)
+
+        row_count = 1
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert sorted(result) == expected_result
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_ids_of_soft_deleted_users_only_once(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+    ) -> None:
+        user_repository = UserRepository(db_service, soft_delete=True)
+        domain_users = await insert_users(
+            db_service,
+            [UserFactory.build(name=f"tenant_{index}") for index in range(5)]
+            + [UserFactory.build(name="tenantless")],
+        )
+        user_filter = UserFilter(name_prefix="tenant_")
+        expected_result = sorted(domain_user.id for domain_user in domain_users[:5])
+
+        result = await user_repository.delete_users(None, user_filter, 2)
+
+        row_count = 6
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert sorted(result) == expected_result
+        assert await user_repository.delete_users(None, user_filter, 2) == []
+        assert await user_repository.delete_users(
+            [domain_user.id for domain_user in domain_users], None, 2
+        ) == [domain_users[5].id]
+
+
+class TestPurgeUsers(TestUserRepository):
+    def test_should_define_a_method(
+        self,
+        user_repository: UserRepository,
+    ) -> None:
+        assert isinstance(user_repository.purge_users, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_delete_soft_deleted_users_in_batches(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+    ) -> None:
+        user_repository = UserRepository(db_service, soft_delete=True)
+        domain_users = await insert_users(db_service, UserFactory.build_batch(4))
+        await user_repository.delete_users(
+            [domain_user.id for domain_user in domain_users[:3]], None, 10
+        )
+
+        results = [await user_repository.purge_users(2) for _ in range(3)]
+
+        row_count = 1
+        assert await db_service.get_database_table_row_count("users") == row_count
+        assert results == [2, 1, 0]
+        assert await user_repository.read_user(domain_users[3].id) == domain_users[3]
+
+
+class TestShardedUserRepository(TestUserRepository):
+    @pytest.fixture(scope="class")
+    async def sharded_db_service(self, request, config: Config) -> DBService:
+        # The second shard is another database of the same server.
+        database_url = make_url(config.get_database_url())
+        shard_database_name = f"{database_url.database}_shard"
+        async_engine = create_async_engine(database_url, isolation_level="AUTOCOMMIT")
+        async with async_engine.connect() as conn:
+            query = text("SELECT 1 FROM pg_database WHERE datname = :name")
+            if (
+                await conn.execute(query, {"name": shard_database_name})
+            ).first() is None:
+                await conn.execute(text(f'CREATE DATABASE "{shard_database_name}"'))
+        await async_engine.dispose()
+        sharded_db_service = DBService()
+        sharded_db_service.connect_database(
+            database_url.render_as_string(hide_password=False),
+            [
+                database_url.set(database=shard_database_name).render_as_string(
+                    hide_password=False
+                )
+            ],
+        )
+        await sharded_db_service.migrate_database("alembic.ini")
+
+        def finalize():
+            async def finalize_database() -> None:
+                await sharded_db_service.delete_database_tables()
+                await sharded_db_service.deactivate_database()
+
+            asyncio.get_event_loop().run_until_complete(finalize_database())
+
+        request.addfinalizer(finalize)
+        return sharded_db_service
+
+    @pytest.fixture
+    async def user_repository(self, sharded_db_service: DBService) -> UserRepository:
+        await sharded_db_service.clear_database_tables()
+        return UserRepository(sharded_db_service)
+
+    @staticmethod
+    async def count_users_by_shard(sharded_db_service: DBService) -> list[int]:
+        users_by_shard: list[int] = []
+        for async_engine in sharded_db_service.shard_async_engines:
+            async with async_engine.connect() as conn:
+                result = await conn.execute(select(func.count()).select_from(UserModel))
+                users_by_shard.append(result.scalar_one())
+        return users_by_shard
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_spread_created_users_over_every_shard(
+        self,
+        sharded_db_service: DBService,
+        user_repository: UserRepository,
+    ):
+        mocked_users: list[UserModel] = [
+            UserFactory.build(email=f"{uuid4().hex}@example.com") for _ in range(20)
+        ]
+
+        results = [
+            await user_repository.create_user(mocked_user)
+            for mocked_user in mocked_users
+        ]
+
+        users_by_shard = await self.count_users_by_shard(sharded_db_service)
+        assert sum(users_by_shard) == len(mocked_users)
+        assert all(user_count > 0 for user_count in users_by_shard)
+        for result in results:
+            assert await user_repository.read_user(result.id) == result
+        assert sorted(
+            user.id
+            for user in await user_repository.read_users(
+                [result.id for result in results]
+            )
+        ) == sorted(result.id for result in results)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_none_when_user_email_already_exists_on_any_shard(
+        self,
+        user_repository: UserRepository,
+    ):
+        mocked_user: UserModel = UserFactory.build()
+        await user_repository.create_user(mocked_user)
+
+        results = [
+            await user_repository.create_user(
+                UserFactory.build(email=mocked_user.email.upper())
+            )
+            for _ in range(10)
+        ]
+
+        assert results == [None] * 10
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_pages_merged_from_every_shard_in_order(
+        self,
+        user_repository: UserRepository,
+    ):
+        created_users: list[User] = []
+        for index in range(10):
+            created_users.append(
+                await user_repository.create_user(
+                    UserFactory.build(email=f"{uuid4().hex}@example.com")
+                )
+            )
+        expected_result = sorted(
+            created_users,
+            key=lambda user: (user.created_at, UUID(user.id)),
+            reverse=True,
+        )
+
+        results: list[User] = []
+        for page in range(1, 5):
+            records_result, total_result = await user_repository.read_and_count_users(
+                page, 3, None, "-created_at", ["id", "name"]
+            )
+            assert total_result == len(created_users)
+            results.extend(records_result)
+
+        assert [record.model_dump(exclude_unset=True) for record in results] == [
+            {"id": user.id, "name": user.name} for user in expected_result
+        ]
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_changes_of_every_shard_page_by_page(
+        self,
+        sharded_db_service: DBService,
+        user_repository: UserRepository,
+    ):
+        created_users: list[User] = []
+        for index in range(10):
+            created_users.append(
+                await user_repository.create_user(
+                    UserFactory.build(email=f"{uuid4().hex}@example.com")
+                )
+            )
+
+        results = []
+        after = None
+        for page in range(4):
+            changes, after = await user_repository.read_user_changes(after, 3)
+            results.extend(changes)
+
+        assert len(after) == len(sharded_db_service.shard_async_engines)
+        assert sorted(change.user_id for change in results) == sorted(
+            user.id for user in created_users
+        )
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_upsert_users_on_the_shard_holding_their_email(
+        self,
+        sharded_db_service: DBService,
+        user_repository: UserRepository,
+        faker: Faker,
+    ):
+        created_users = [
+            await user_repository.create_user(
+                UserFactory.build(email=f"{uuid4().hex}@example.com")
+            )
+            for _ in range(10)
+        ]
+        users = [
+            User(name=faker.name(), email=user.email.upper()) for user in created_users
+        ]
+
+        result = await user_repository.upsert_users(users)
+
+        assert sum(await self.count_users_by_shard(sharded_db_service)) == len(users)
+        assert [(user.id, upsert_status) for user, upsert_status in result] == [
+            (user.id, "updated") for user in created_users
+        ]
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_search_and_delete_users_on_every_shard(
+        self,
+        sharded_db_service: DBService,
+        user_repository: UserRepository,
+    ):
+        created_users = [
+            await user_repository.create_user(
+                UserFactory.build(
+                    name=f"member_{index}", email=f"{uuid4().hex}@example.com"
+                )
+            )
+            for index in range(10)
+        ]
+        version = await user_repository.read_users_version()
+
+        search_result = await user_repository.search_users("member", 10)
+        delete_result = await user_repository.delete_users(
+            None, UserFilter(name_prefix="member_"), 3
+        )
+
+        expected_result = sorted(user.id for user in created_users)
+        assert sorted(user.id for user, _ in search_result) == expected_result
+        assert sorted(delete_result) == expected_result
+        assert await self.count_users_by_shard(sharded_db_service) == [0, 0]
+        assert await user_repository.read_users_version() > version
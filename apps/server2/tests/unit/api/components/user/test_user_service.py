@@ -1,4 +1,5 @@
 import types
+from uuid import UUID
 
 import pytest
 from db.models.user import UserModel
@@ -7,8 +8,14 @@ from fastapi import status
 from pytest_mock import MockerFixture
 from tests.factories.user_factory import UserFactory
 
+from api.components.user.user_cache import UserCache
+from api.components.user.user_loader import UserLoader
+from api.components.user.user_mapper import UserMapper
+from api.components.user.user_models import UserFilter, UserOperation
 from api.components.user.user_repository import UserRepository
 from api.components.user.user_service import UserService
+from api.components.user.user_stream import UserStream
+from api.components.user.user_write_queue import UserWriteQueue
 from server_error import Detail, ServerError
 from services.db_service import DBService
 
@@ -21,12 +28,43 @@ class TestUserService:
     ) -> UserRepository:
         return UserRepository(db_service)
 
+    @pytest.fixture
+    def user_cache(self) -> UserCache:
+        return UserCache(ttl=60)
+
+    @pytest.fixture
+    def user_loader(self, user_repository: UserRepository) -> UserLoader:
+        return UserLoader(user_repository)
+
+    @pytest.fixture
+    def user_write_queue(
+        self,
+        db_service: DBService,
+        user_repository: UserRepository,
+        user_cache: UserCache,
+    ) -> UserWriteQueue:
+        return UserWriteQueue(user_repository, user_cache, db_service)
+
+    @pytest.fixture
+    def user_stream(
+        self,
+        db_service: DBService,
+        user_repository: UserRepository,
+    ) -> UserStream:
+        return UserStream(user_repository, db_service, max_subscribers=1)
+
     @pytest.fixture
     def user_service(
         self,
         user_repository: UserRepository,
+        user_cache: UserCache,
+        user_loader: UserLoader,
+        user_write_queue: UserWriteQueue,
+        user_stream: UserStream,
     ) -> UserService:
-        return UserService(user_repository)
+        return UserService(
+            user_repository, user_cache, user_loader, user_write_queue, user_stream
+        )
 
 
 class TestRegisterUser(TestUserService):
@@ -80,6 +118,88 @@ class TestRegisterUser(TestUserService):
         assert exc_info.value.is_operational == server_error.is_operational
         user_repository.create_user.assert_called_once_with(mocked_user)
 
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_when_user_already_exists(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        message = "User already exists"
+        server_error = ServerError(
+            message,
+            status.HTTP_409_CONFLICT,
+            Detail(context=mocked_user, cause=None),
+        )
+        mocked_create_user = mocker.AsyncMock(return_value=None)
+        user_repository.create_user = mocked_create_user
+
+        with pytest.raises(ServerError) as exc_info:
+            await user_service.register_user(mocked_user)
+
+        assert exc_info.value.message == server_error.message
+        assert exc_info.value.detail == server_error.detail
+        assert exc_info.value.status_code == server_error.status_code
+        assert exc_info.value.is_operational == server_error.is_operational
+        user_repository.create_user.assert_called_once_with(mocked_user)
+
+
+class TestUpsertUsers(TestUserService):
+    def test_should_define_a_method(
+        self,
+        user_service: UserService,
+    ) -> None:
+        assert isinstance(user_service.upsert_users, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_and_cache_users_when_users_are_upserted(
+        self,
+        user_repository: UserRepository,
+        user_cache: UserCache,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_users: list[UserModel] = UserFactory.build_batch(2)
+        upserted_users = [(mocked_users[0], "created"), (mocked_users[1], "updated")]
+        mocked_upsert_users = mocker.AsyncMock(return_value=upserted_users)
+        user_repository.upsert_users = mocked_upsert_users
+        expected_result = upserted_users
+
+        result = await user_service.upsert_users(mocked_users)
+
+        assert result == expected_result
+        assert user_cache.get(mocked_users[0].id) == mocked_users[0]
+        assert user_cache.get(mocked_users[1].id) == mocked_users[1]
+        user_repository.upsert_users.assert_called_once_with(mocked_users)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_when_users_cannot_be_upserted(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_users: list[UserModel] = UserFactory.build_batch(2)
+        error = Exception("Failed")
+        message = "An error occurred when upserting users into database"
+        server_error = ServerError(
+            message,
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            Detail(context=mocked_users, cause=str(error)),
+        )
+        mocked_upsert_users = mocker.Mock(side_effect=error)
+        user_repository.upsert_users = mocked_upsert_users
+
+        with pytest.raises(ServerError) as exc_info:
+            await user_service.upsert_users(mocked_users)
+
+        assert exc_info.value.message == server_error.message
+        assert exc_info.value.detail == server_error.detail
+        assert exc_info.value.status_code == server_error.status_code
+        assert exc_info.value.is_operational == server_error.is_operational
+        user_repository.upsert_users.assert_called_once_with(mocked_users)
+
 
 class TestRetrieveAndCountUsers(TestUserService):
     def test_should_define_a_method(
@@ -111,7 +231,33 @@ class TestRetrieveAndCountUsers(TestUserService):
         result = await user_service.retrieve_and_count_users(page, limit)
 
         assert result == expected_result
-        user_repository.read_and_count_users.assert_called_once_with(page, limit)
+        user_repository.read_and_count_users.assert_called_once_with(
+            page, limit, None, "-created_at", None
+        )
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_pass_filter_sort_and_fields_to_the_repository(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+        faker: Faker,
+    ) -> None:
+        page = faker.pyint()
+        limit = faker.pyint()
+        user_filter = UserFilter(email_prefix=faker.user_name())
+        sort = "name"
+        fields = ["id", "name"]
+        mocked_read_and_count_users = mocker.AsyncMock(return_value=[[], 0])
+        user_repository.read_and_count_users = mocked_read_and_count_users
+
+        await user_service.retrieve_and_count_users(
+            page, limit, user_filter, sort, fields
+        )
+
+        user_repository.read_and_count_users.assert_called_once_with(
+            page, limit, user_filter, sort, fields
+        )
 
     @pytest.mark.asyncio(loop_scope="session")
     async def test_should_fail_and_raise_exception_when_list_of_users_and_total_cannot_be_retrieved(
@@ -128,7 +274,16 @@ class TestRetrieveAndCountUsers(TestUserService):
         server_error = ServerError(
             message,
             status.HTTP_500_INTERNAL_SERVER_ERROR,
-            Detail(context={"page": page, "limit": limit}, cause=str(error)),
+            Detail(
+                context={
+                    "page": page,
+                    "limit": limit,
+                    "filter": None,
+                    "sort": "-created_at",
+                    "fields": None,
+                },
+                cause=str(error),
+            ),
         )
         mocked_read_and_count_users = mocker.Mock(side_effect=error)
         user_repository.read_and_count_users = mocked_read_and_count_users
@@ -140,113 +295,209 @@ class TestRetrieveAndCountUsers(TestUserService):
         assert exc_info.value.detail == server_error.detail
         assert exc_info.value.status_code == server_error.status_code
         assert exc_info.value.is_operational == server_error.is_operational
-        user_repository.read_and_count_users.assert_called_once_with(page, limit)
+        user_repository.read_and_count_users.assert_called_once_with(
+            page, limit, None, "-created_at", None
+        )
 
 
-class TestRetrieveUser(TestUserService):
+class TestRetrieveUsersVersion(TestUserService):
     def test_should_define_a_method(
         self,
         user_service: UserService,
     ) -> None:
-        assert isinstance(user_service.retrieve_user, types.MethodType) is True
+        assert isinstance(user_service.retrieve_users_version, types.MethodType) is True
 
     @pytest.mark.asyncio(loop_scope="session")
-    async def test_should_succeed_and_return_user_when_user_is_retrieved(
+    async def test_should_succeed_and_return_version_when_users_version_is_retrieved(
         self,
         user_repository: UserRepository,
         user_service: UserService,
         mocker: MockerFixture,
+        faker: Faker,
     ) -> None:
-        mocked_user: UserModel = UserFactory.build()
-        mocked_read_user = mocker.AsyncMock(return_value=mocked_user)
-        user_repository.read_user = mocked_read_user
-        expected_result = mocked_user
+        version = faker.pyint()
+        mocked_read_users_version = mocker.AsyncMock(return_value=version)
+        user_repository.read_users_version = mocked_read_users_version
+        expected_result = version
 
-        result = await user_service.retrieve_user(mocked_user.id)
+        result = await user_service.retrieve_users_version()
 
         assert result == expected_result
-        user_repository.read_user.assert_called_once_with(mocked_user.id)
+        user_repository.read_users_version.assert_called_once_with()
 
     @pytest.mark.asyncio(loop_scope="session")
-    async def test_should_fail_and_raise_exception_when_user_cannot_be_retrieved(
+    async def test_should_fail_and_raise_exception_when_users_version_cannot_be_retrieved(
         self,
         user_repository: UserRepository,
         user_service: UserService,
         mocker: MockerFixture,
     ) -> None:
-        mocked_user: UserModel = UserFactory.build()
         error = Exception("Failed")
-        message = "An error occurred when reading a user from database"
+        message = "An error occurred when reading the users version from database"
         server_error = ServerError(
             message,
             status.HTTP_500_INTERNAL_SERVER_ERROR,
-            Detail(context=mocked_user.id, cause=str(error)),
+            Detail(context=None, cause=str(error)),
         )
-        mocked_read_user = mocker.Mock(side_effect=error)
-        user_repository.read_user = mocked_read_user
+        mocked_read_users_version = mocker.Mock(side_effect=error)
+        user_repository.read_users_version = mocked_read_users_version
 
         with pytest.raises(ServerError) as exc_info:
-            await user_service.retrieve_user(mocked_user.id)
+            await user_service.retrieve_users_version()
 
         assert exc_info.value.message == server_error.message
         assert exc_info.value.detail == server_error.detail
         assert exc_info.value.status_code == server_error.status_code
         assert exc_info.value.is_operational == server_error.is_operational
-        user_repository.read_user.assert_called_once_with(mocked_user.id)
+        user_repository.read_users_version.assert_called_once_with()
+
+
+class TestRetrieveUsers(TestUserService):
+    def test_should_define_a_method(
+        self,
+        user_service: UserService,
+    ) -> None:
+        assert isinstance(user_service.retrieve_users, types.MethodType) is True
 
     @pytest.mark.asyncio(loop_scope="session")
-    async def test_should_fail_and_raise_exception_when_user_is_not_found(
+    async def test_should_succeed_and_return_users_in_request_order_with_missing_ids(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_users: list[UserModel] = UserFactory.build_batch(2)
+        missing_user: UserModel = UserFactory.build()
+        mocked_read_users = mocker.AsyncMock(return_value=mocked_users)
+        user_repository.read_users = mocked_read_users
+        user_ids = [mocked_users[1].id, missing_user.id, mocked_users[0].id]
+        expected_result = (
+            [mocked_users[1], mocked_users[0]],
+            [UUID(missing_user.id).hex],
+        )
+
+        result = await user_service.retrieve_users(user_ids)
+
+        assert result == expected_result
+        user_repository.read_users.assert_called_once_with(
+            [UUID(user_id).hex for user_id in user_ids]
+        )
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_read_only_uncached_users_when_some_users_are_cached(
+        self,
+        user_repository: UserRepository,
+        user_cache: UserCache,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_users: list[UserModel] = UserFactory.build_batch(2)
+        user_cache.set(mocked_users[0])
+        mocked_read_users = mocker.AsyncMock(return_value=[mocked_users[1]])
+        user_repository.read_users = mocked_read_users
+        user_ids = [mocked_user.id for mocked_user in mocked_users]
+        expected_result = (mocked_users, [])
+
+        result = await user_service.retrieve_users(user_ids)
+
+        assert result == expected_result
+        user_repository.read_users.assert_called_once_with(
+            [UUID(mocked_users[1].id).hex]
+        )
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_when_users_cannot_be_retrieved(
         self,
         user_repository: UserRepository,
         user_service: UserService,
         mocker: MockerFixture,
     ) -> None:
         mocked_user: UserModel = UserFactory.build()
-        message = "User not found"
+        error = Exception("Failed")
+        message = "An error occurred when reading users from database"
         server_error = ServerError(
             message,
-            status.HTTP_404_NOT_FOUND,
-            Detail(context=mocked_user.id, cause=None),
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            Detail(context=[mocked_user.id], cause=str(error)),
         )
-        mocked_read_user = mocker.AsyncMock(return_value=None)
-        user_repository.read_user = mocked_read_user
+        mocked_read_users = mocker.Mock(side_effect=error)
+        user_repository.read_users = mocked_read_users
 
         with pytest.raises(ServerError) as exc_info:
-            await user_service.retrieve_user(mocked_user.id)
+            await user_service.retrieve_users([mocked_user.id])
 
         assert exc_info.value.message == server_error.message
         assert exc_info.value.detail == server_error.detail
         assert exc_info.value.status_code == server_error.status_code
         assert exc_info.value.is_operational == server_error.is_operational
-        user_repository.read_user.assert_called_once_with(mocked_user.id)
+        user_repository.read_users.assert_called_once_with([UUID(mocked_user.id).hex])
 
 
-class TestReplaceUser(TestUserService):
+class TestRetrieveUser(TestUserService):
     def test_should_define_a_method(
         self,
         user_service: UserService,
     ) -> None:
-        assert isinstance(user_service.replace_user, types.MethodType) is True
+        assert isinstance(user_service.retrieve_user, types.MethodType) is True
 
     @pytest.mark.asyncio(loop_scope="session")
-    async def test_should_succeed_and_return_user_when_user_is_replaced(
+    async def test_should_succeed_and_return_user_when_user_is_retrieved(
         self,
         user_repository: UserRepository,
         user_service: UserService,
         mocker: MockerFixture,
     ) -> None:
         mocked_user: UserModel = UserFactory.build()
-        mocked_update_user = mocker.AsyncMock(return_value=mocked_user)
-        user_repository.update_user = mocked_update_user
+        mocked_read_user = mocker.AsyncMock(return_value=mocked_user)
+        user_repository.read_user = mocked_read_user
         expected_result = mocked_user
 
-        result = await user_service.replace_user(mocked_user.id, mocked_user)
+        result = await user_service.retrieve_user(mocked_user.id)
 
         assert result == expected_result
-        user_repository.update_user.assert_called_once_with(mocked_user.id, mocked_user)
+        user_repository.read_user.assert_called_once_with(mocked_user.id)
 
     @pytest.mark.asyncio(loop_scope="session")
-    async def test_should_fail_and_raise_exception_when_user_cannot_be_replaced(
+    async def test_should_succeed_and_return_cached_user_without_reading_database_when_user_is_cached(
+        self,
+        user_repository: UserRepository,
+        user_cache: UserCache,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        user_cache.set(mocked_user)
+        mocked_read_user = mocker.AsyncMock(return_value=None)
+        user_repository.read_user = mocked_read_user
+        expected_result = mocked_user
+
+        result = await user_service.retrieve_user(mocked_user.id)
+
+        assert result == expected_result
+        user_repository.read_user.assert_not_called()
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_user_without_caching_it_when_fields_are_selected(
+        self,
+        user_repository: UserRepository,
+        user_cache: UserCache,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        fields = ["id", "name"]
+        mocked_read_user = mocker.AsyncMock(return_value=mocked_user)
+        user_repository.read_user = mocked_read_user
+        expected_result = mocked_user
+
+        result = await user_service.retrieve_user(mocked_user.id, fields)
+
+        assert result == expected_result
+        assert user_cache.get(mocked_user.id) is None
+        user_repository.read_user.assert_called_once_with(mocked_user.id, fields)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_when_user_cannot_be_retrieved(
         self,
         user_repository: UserRepository,
         user_service: UserService,
@@ -254,26 +505,23 @@ class TestReplaceUser(TestUserService):
     ) -> None:
         mocked_user: UserModel = UserFactory.build()
         error = Exception("Failed")
-        message = "An error occurred when updating a user in database"
+        message = "An error occurred when reading a user from database"
         server_error = ServerError(
             message,
             status.HTTP_500_INTERNAL_SERVER_ERROR,
-            Detail(
-                context={"userId": mocked_user.id, "user": mocked_user},
-                cause=str(error),
-            ),
+            Detail(context=mocked_user.id, cause=str(error)),
         )
-        mocked_update_user = mocker.Mock(side_effect=error)
-        user_repository.update_user = mocked_update_user
+        mocked_read_user = mocker.Mock(side_effect=error)
+        user_repository.read_user = mocked_read_user
 
         with pytest.raises(ServerError) as exc_info:
-            await user_service.replace_user(mocked_user.id, mocked_user)
+            await user_service.retrieve_user(mocked_user.id)
 
         assert exc_info.value.message == server_error.message
         assert exc_info.value.detail == server_error.detail
         assert exc_info.value.status_code == server_error.status_code
         assert exc_info.value.is_operational == server_error.is_operational
-        user_repository.update_user.assert_called_once_with(mocked_user.id, mocked_user)
+        user_repository.read_user.assert_called_once_with(mocked_user.id)
 
     @pytest.mark.asyncio(loop_scope="session")
     async def test_should_fail_and_raise_exception_when_user_is_not_found(
@@ -287,71 +535,93 @@ class TestReplaceUser(TestUserService):
         server_error = ServerError(
             message,
             status.HTTP_404_NOT_FOUND,
-            Detail(context={"userId": mocked_user.id, "user": mocked_user}, cause=None),
+            Detail(context=mocked_user.id, cause=None),
         )
-        mocked_update_user = mocker.AsyncMock(return_value=None)
-        user_repository.update_user = mocked_update_user
+        mocked_read_user = mocker.AsyncMock(return_value=None)
+        user_repository.read_user = mocked_read_user
 
         with pytest.raises(ServerError) as exc_info:
-            await user_service.replace_user(mocked_user.id, mocked_user)
+            await user_service.retrieve_user(mocked_user.id)
 
         assert exc_info.value.message == server_error.message
         assert exc_info.value.detail == server_error.detail
         assert exc_info.value.status_code == server_error.status_code
         assert exc_info.value.is_operational == server_error.is_operational
-        user_repository.update_user.assert_called_once_with(mocked_user.id, mocked_user)
+        user_repository.read_user.assert_called_once_with(mocked_user.id)
 
 
-class TestRemoveUser(TestUserService):
+class TestRetrieveUserByEmail(TestUserService):
     def test_should_define_a_method(
         self,
         user_service: UserService,
     ) -> None:
-        assert isinstance(user_service.remove_user, types.MethodType) is True
+        assert isinstance(user_service.retrieve_user_by_email, types.MethodType) is True
 
     @pytest.mark.asyncio(loop_scope="session")
-    async def test_should_succeed_and_return_user_when_user_is_removed(
+    async def test_should_succeed_and_return_and_cache_user_when_user_is_retrieved(
         self,
         user_repository: UserRepository,
+        user_cache: UserCache,
         user_service: UserService,
         mocker: MockerFixture,
     ) -> None:
         mocked_user: UserModel = UserFactory.build()
-        mocked_delete_user = mocker.AsyncMock(return_value=mocked_user)
-        user_repository.delete_user = mocked_delete_user
+        mocked_read_user_by_email = mocker.AsyncMock(return_value=mocked_user)
+        user_repository.read_user_by_email = mocked_read_user_by_email
         expected_result = mocked_user
 
-        result = await user_service.remove_user(mocked_user.id)
+        result = await user_service.retrieve_user_by_email(mocked_user.email)
 
         assert result == expected_result
-        user_repository.delete_user.assert_called_once_with(mocked_user.id)
+        assert user_cache.get(mocked_user.id) == mocked_user
+        user_repository.read_user_by_email.assert_called_once_with(mocked_user.email)
 
     @pytest.mark.asyncio(loop_scope="session")
-    async def test_should_fail_and_raise_exception_when_user_cannot_be_removed(
+    async def test_should_succeed_and_return_cached_user_without_reading_database_when_user_is_cached(
         self,
         user_repository: UserRepository,
+        user_cache: UserCache,
         user_service: UserService,
         mocker: MockerFixture,
     ) -> None:
         mocked_user: UserModel = UserFactory.build()
+        user_cache.set(mocked_user)
+        mocked_read_user_by_email = mocker.AsyncMock(return_value=None)
+        user_repository.read_user_by_email = mocked_read_user_by_email
+        expected_result = mocked_user
+
+        result = await user_service.retrieve_user_by_email(mocked_user.email.upper())
+
+        assert result == expected_result
+        user_repository.read_user_by_email.assert_not_called()
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_when_user_cannot_be_retrieved(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+        faker: Faker,
+    ) -> None:
+        email = faker.email()
         error = Exception("Failed")
-        message = "An error occurred when deleting a user from database"
+        message = "An error occurred when reading a user by email from database"
         server_error = ServerError(
             message,
             status.HTTP_500_INTERNAL_SERVER_ERROR,
-            Detail(context=mocked_user.id, cause=str(error)),
+            Detail(context=email, cause=str(error)),
         )
-        mocked_delete_user = mocker.Mock(side_effect=error)
-        user_repository.delete_user = mocked_delete_user
+        mocked_read_user_by_email = mocker.Mock(side_effect=error)
+        user_repository.read_user_by_email = mocked_read_user_by_email
 
         with pytest.raises(ServerError) as exc_info:
-            await user_service.remove_user(mocked_user.id)
+            await user_service.retrieve_user_by_email(email)
 
         assert exc_info.value.message == server_error.message
         assert exc_info.value.detail == server_error.detail
         assert exc_info.value.status_code == server_error.status_code
         assert exc_info.value.is_operational == server_error.is_operational
-        user_repository.delete_user.assert_called_once_with(mocked_user.id)
+        user_repository.read_user_by_email.assert_called_once_with(email)
 
     @pytest.mark.asyncio(loop_scope="session")
     async def test_should_fail_and_raise_exception_when_user_is_not_found(
@@ -359,22 +629,867 @@ class TestRemoveUser(TestUserService):
         user_repository: UserRepository,
         user_service: UserService,
         mocker: MockerFixture,
+        faker: Faker,
     ) -> None:
-        mocked_user: UserModel = UserFactory.build()
+        email = faker.email()
         message = "User not found"
         server_error = ServerError(
             message,
             status.HTTP_404_NOT_FOUND,
-            Detail(context=mocked_user.id, cause=None),
+            Detail(context=email, cause=None),
         )
-        mocked_delete_user = mocker.AsyncMock(return_value=None)
-        user_repository.delete_user = mocked_delete_user
+        mocked_read_user_by_email = mocker.AsyncMock(return_value=None)
+        user_repository.read_user_by_email = mocked_read_user_by_email
 
         with pytest.raises(ServerError) as exc_info:
-            await user_service.remove_user(mocked_user.id)
+            await user_service.retrieve_user_by_email(email)
 
         assert exc_info.value.message == server_error.message
         assert exc_info.value.detail == server_error.detail
         assert exc_info.value.status_code == server_error.status_code
         assert exc_info.value.is_operational == server_error.is_operational
-        user_repository.delete_user.assert_called_once_with(mocked_user.id)
+
+
+class TestSearchUsers(TestUserService):
+    def test_should_define_a_method(
+        self,
+        user_service: UserService,
+    ) -> None:
+        assert isinstance(user_service.search_users, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_users_with_position_of_the_last_one_when_more_users_follow(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+        faker: Faker,
+    ) -> None:
+        text = faker.word()
+        limit = 2
+        mocked_users: list[UserModel] = UserFactory.build_batch(limit + 1)
+        ranks = [0.3, 0.2, 0.1]
+        mocked_search_users = mocker.AsyncMock(
+            return_value=list(zip(mocked_users, ranks))
+        )
+        user_repository.search_users = mocked_search_users
+        expected_result = (mocked_users[:limit], (ranks[1], mocked_users[1].id))
+
+        result = await user_service.search_users(text, limit)
+
+        assert result == expected_result
+        user_repository.search_users.assert_called_once_with(text, limit + 1, None)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_users_without_position_when_no_more_users_follow(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+        faker: Faker,
+    ) -> None:
+        text = faker.word()
+        limit = 2
+        mocked_users: list[UserModel] = UserFactory.build_batch(limit)
+        mocked_search_users = mocker.AsyncMock(
+            return_value=[(mocked_user, 0.1) for mocked_user in mocked_users]
+        )
+        user_repository.search_users = mocked_search_users
+        expected_result = (mocked_users, None)
+
+        result = await user_service.search_users(text, limit)
+
+        assert result == expected_result
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_when_users_cannot_be_searched(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+        faker: Faker,
+    ) -> None:
+        text = faker.word()
+        limit = faker.pyint(min_value=1)
+        error = Exception("Failed")
+        message = "An error occurred when searching users in database"
+        server_error = ServerError(
+            message,
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            Detail(
+                context={"text": text, "limit": limit, "after": None},
+                cause=str(error),
+            ),
+        )
+        mocked_search_users = mocker.Mock(side_effect=error)
+        user_repository.search_users = mocked_search_users
+
+        with pytest.raises(ServerError) as exc_info:
+            await user_service.search_users(text, limit)
+
+        assert exc_info.value.message == server_error.message
+        assert exc_info.value.detail == server_error.detail
+        assert exc_info.value.status_code == server_error.status_code
+        assert exc_info.value.is_operational == server_error.is_operational
+
+
+class TestRetrieveUserChanges(TestUserService):
+    def test_should_define_a_method(
+        self,
+        user_service: UserService,
+    ) -> None:
+        assert isinstance(user_service.retrieve_user_changes, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_changes_with_the_next_positions(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        after = [(10, 1)]
+        expected_result = ([], [(12, 3)])
+        user_repository.read_user_changes = mocker.AsyncMock(
+            return_value=expected_result
+        )
+
+        result = await user_service.retrieve_user_changes(after, 100)
+
+        assert result == expected_result
+        user_repository.read_user_changes.assert_called_once_with(after, 100)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_when_changes_cannot_be_retrieved(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        error = Exception("Failed")
+        message = "An error occurred when reading user changes from database"
+        server_error = ServerError(
+            message,
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            Detail(context={"after": None, "limit": 100}, cause=str(error)),
+        )
+        user_repository.read_user_changes = mocker.AsyncMock(side_effect=error)
+
+        with pytest.raises(ServerError) as exc_info:
+            await user_service.retrieve_user_changes(None, 100)
+
+        assert exc_info.value.message == server_error.message
+        assert exc_info.value.detail == server_error.detail
+        assert exc_info.value.status_code == server_error.status_code
+        assert exc_info.value.is_operational == server_error.is_operational
+
+
+class TestStreamUserChanges(TestUserService):
+    def test_should_define_a_method(
+        self,
+        user_service: UserService,
+    ) -> None:
+        assert isinstance(user_service.stream_user_changes, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_events_when_stream_is_started(
+        self,
+        user_stream: UserStream,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        user_stream.start = mocker.AsyncMock(return_value=None)
+
+        result = await user_service.stream_user_changes()
+
+        assert user_stream.subscriber_count == 0
+        user_stream.start.assert_called_once_with()
+        await result.aclose()
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_when_there_are_too_many_subscribers(
+        self,
+        user_stream: UserStream,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        user_stream.start = mocker.AsyncMock(return_value=None)
+        user_stream.subscribe()
+
+        with pytest.raises(ServerError) as exc_info:
+            await user_service.stream_user_changes()
+
+        assert exc_info.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        user_stream.start.assert_not_called()
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_when_stream_cannot_be_started(
+        self,
+        user_stream: UserStream,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        error = Exception("Failed")
+        message = "An error occurred when starting the stream of user changes"
+        server_error = ServerError(
+            message,
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            Detail(context=None, cause=str(error)),
+        )
+        user_stream.start = mocker.AsyncMock(side_effect=error)
+
+        with pytest.raises(ServerError) as exc_info:
+            await user_service.stream_user_changes()
+
+        assert exc_info.value.message == server_error.message
+        assert exc_info.value.detail == server_error.detail
+        assert exc_info.value.status_code == server_error.status_code
+        assert exc_info.value.is_operational == server_error.is_operational
+
+
+class TestReplaceUser(TestUserService):
+    def test_should_define_a_method(
+        self,
+        user_service: UserService,
+    ) -> None:
+        assert isinstance(user_service.replace_user, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_user_when_user_is_replaced(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        mocked_update_user = mocker.AsyncMock(return_value=mocked_user)
+        user_repository.update_user = mocked_update_user
+        expected_result = mocked_user
+
+        result = await user_service.replace_user(mocked_user.id, mocked_user)
+
+        assert result == expected_result
+        user_repository.update_user.assert_called_once_with(
+            mocked_user.id, mocked_user, None
+        )
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_when_user_cannot_be_replaced(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        error = Exception("Failed")
+        message = "An error occurred when updating a user in database"
+        server_error = ServerError(
+            message,
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            Detail(
+                context={"userId": mocked_user.id, "user": mocked_user},
+                cause=str(error),
+            ),
+        )
+        mocked_update_user = mocker.Mock(side_effect=error)
+        user_repository.update_user = mocked_update_user
+
+        with pytest.raises(ServerError) as exc_info:
+            await user_service.replace_user(mocked_user.id, mocked_user)
+
+        assert exc_info.value.message == server_error.message
+        assert exc_info.value.detail == server_error.detail
+        assert exc_info.value.status_code == server_error.status_code
+        assert exc_info.value.is_operational == server_error.is_operational
+        user_repository.update_user.assert_called_once_with(
+            mocked_user.id, mocked_user, None
+        )
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_when_user_is_not_found(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        message = "User not found"
+        server_error = ServerError(
+            message,
+            status.HTTP_404_NOT_FOUND,
+            Detail(context={"userId": mocked_user.id, "user": mocked_user}, cause=None),
+        )
+        mocked_update_user = mocker.AsyncMock(return_value=None)
+        user_repository.update_user = mocked_update_user
+
+        with pytest.raises(ServerError) as exc_info:
+            await user_service.replace_user(mocked_user.id, mocked_user)
+
+        assert exc_info.value.message == server_error.message
+        assert exc_info.value.detail == server_error.detail
+        assert exc_info.value.status_code == server_error.status_code
+        assert exc_info.value.is_operational == server_error.is_operational
+        user_repository.update_user.assert_called_once_with(
+            mocked_user.id, mocked_user, None
+        )
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_when_user_version_does_not_match(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        expected_versions = [mocked_user.updated_at]
+        message = "User has been modified"
+        server_error = ServerError(
+            message,
+            status.HTTP_412_PRECONDITION_FAILED,
+            Detail(context={"userId": mocked_user.id, "user": mocked_user}, cause=None),
+        )
+        mocked_update_user = mocker.AsyncMock(return_value=None)
+        user_repository.update_user = mocked_update_user
+
+        with pytest.raises(ServerError) as exc_info:
+            await user_service.replace_user(
+                mocked_user.id, mocked_user, expected_versions
+            )
+
+        assert exc_info.value.message == server_error.message
+        assert exc_info.value.detail == server_error.detail
+        assert exc_info.value.status_code == server_error.status_code
+        assert exc_info.value.is_operational == server_error.is_operational
+        user_repository.update_user.assert_called_once_with(
+            mocked_user.id, mocked_user, expected_versions
+        )
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_without_updating_user_when_no_version_is_expected(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        mocked_update_user = mocker.AsyncMock(return_value=mocked_user)
+        user_repository.update_user = mocked_update_user
+
+        with pytest.raises(ServerError) as exc_info:
+            await user_service.replace_user(mocked_user.id, mocked_user, [])
+
+        assert exc_info.value.status_code == status.HTTP_412_PRECONDITION_FAILED
+        user_repository.update_user.assert_not_called()
+
+
+class TestEnqueueUserReplacement(TestUserService):
+    def test_should_define_a_method(
+        self,
+        user_service: UserService,
+    ) -> None:
+        assert (
+            isinstance(user_service.enqueue_user_replacement, types.MethodType) is True
+        )
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_true_when_user_replacement_is_queued(
+        self,
+        user_write_queue: UserWriteQueue,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        user_write_queue.enqueue = mocker.AsyncMock(return_value=True)
+
+        result = await user_service.enqueue_user_replacement(
+            mocked_user.id, mocked_user
+        )
+
+        assert result is True
+        user_write_queue.enqueue.assert_called_once_with(mocked_user.id, mocked_user)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_when_user_replacement_cannot_be_queued(
+        self,
+        user_write_queue: UserWriteQueue,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        error = Exception("Failed")
+        message = "An error occurred when queueing a user update"
+        server_error = ServerError(
+            message,
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            Detail(
+                context={"userId": mocked_user.id, "user": mocked_user},
+                cause=str(error),
+            ),
+        )
+        user_write_queue.enqueue = mocker.AsyncMock(side_effect=error)
+
+        with pytest.raises(ServerError) as exc_info:
+            await user_service.enqueue_user_replacement(mocked_user.id, mocked_user)
+
+        assert exc_info.value.message == server_error.message
+        assert exc_info.value.detail == server_error.detail
+        assert exc_info.value.status_code == server_error.status_code
+        assert exc_info.value.is_operational == server_error.is_operational
+
+
+class TestRetrieveUserWriteQueueMetrics(TestUserService):
+    def test_should_define_a_method(
+        self,
+        user_service: UserService,
+    ) -> None:
+        assert (
+            isinstance(user_service.retrieve_user_write_queue_metrics, types.MethodType)
+            is True
+        )
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_metrics_when_queue_is_empty(
+        self,
+        user_service: UserService,
+    ) -> None:
+        result = await user_service.retrieve_user_write_queue_metrics()
+
+        assert result.depth == 0
+        assert result.lag == 0
+
+
+class TestModifyUser(TestUserService):
+    def test_should_define_a_method(
+        self,
+        user_service: UserService,
+    ) -> None:
+        assert isinstance(user_service.modify_user, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_user_when_user_is_modified(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        changes = {"name": mocked_user.name}
+        mocked_patch_user = mocker.AsyncMock(return_value=mocked_user)
+        user_repository.patch_user = mocked_patch_user
+        expected_result = mocked_user
+
+        result = await user_service.modify_user(mocked_user.id, changes)
+
+        assert result == expected_result
+        user_repository.patch_user.assert_called_once_with(
+            mocked_user.id, changes, None
+        )
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_when_user_cannot_be_modified(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        changes = {"name": mocked_user.name}
+        error = Exception("Failed")
+        message = "An error occurred when patching a user in database"
+        server_error = ServerError(
+            message,
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            Detail(
+                context={"userId": mocked_user.id, "changes": changes},
+                cause=str(error),
+            ),
+        )
+        mocked_patch_user = mocker.Mock(side_effect=error)
+        user_repository.patch_user = mocked_patch_user
+
+        with pytest.raises(ServerError) as exc_info:
+            await user_service.modify_user(mocked_user.id, changes)
+
+        assert exc_info.value.message == server_error.message
+        assert exc_info.value.detail == server_error.detail
+        assert exc_info.value.status_code == server_error.status_code
+        assert exc_info.value.is_operational == server_error.is_operational
+        user_repository.patch_user.assert_called_once_with(
+            mocked_user.id, changes, None
+        )
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_when_user_is_not_found(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        changes = {"name": mocked_user.name}
+        message = "User not found"
+        server_error = ServerError(
+            message,
+            status.HTTP_404_NOT_FOUND,
+            Detail(context={"userId": mocked_user.id, "changes": changes}, cause=None),
+        )
+        mocked_patch_user = mocker.AsyncMock(return_value=None)
+        user_repository.patch_user = mocked_patch_user
+
+        with pytest.raises(ServerError) as exc_info:
+            await user_service.modify_user(mocked_user.id, changes)
+
+        assert exc_info.value.message == server_error.message
+        assert exc_info.value.detail == server_error.detail
+        assert exc_info.value.status_code == server_error.status_code
+        assert exc_info.value.is_operational == server_error.is_operational
+        user_repository.patch_user.assert_called_once_with(
+            mocked_user.id, changes, None
+        )
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_when_user_version_does_not_match(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        changes = {"name": mocked_user.name}
+        expected_versions = [mocked_user.updated_at]
+        message = "User has been modified"
+        server_error = ServerError(
+            message,
+            status.HTTP_412_PRECONDITION_FAILED,
+            Detail(context={"userId": mocked_user.id, "changes": changes}, cause=None),
+        )
+        mocked_patch_user = mocker.AsyncMock(return_value=None)
+        user_repository.patch_user = mocked_patch_user
+
+        with pytest.raises(ServerError) as exc_info:
+            await user_service.modify_user(mocked_user.id, changes, expected_versions)
+
+        assert exc_info.value.message == server_error.message
+        assert exc_info.value.detail == server_error.detail
+        assert exc_info.value.status_code == server_error.status_code
+        assert exc_info.value.is_operational == server_error.is_operational
+        user_repository.patch_user.assert_called_once_with(
+            mocked_user.id, changes, expected_versions
+        )
+
+
+class TestModifyUsers(TestUserService):
+    def test_should_define_a_method(
+        self,
+        user_service: UserService,
+    ) -> None:
+        assert isinstance(user_service.modify_users, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_ids_and_drop_cached_users_when_users_are_modified(
+        self,
+        user_repository: UserRepository,
+        user_cache: UserCache,
+        user_service: UserService,
+        mocker: MockerFixture,
+        faker: Faker,
+    ) -> None:
+        mocked_users: list[UserModel] = UserFactory.build_batch(2)
+        for mocked_user in mocked_users:
+            user_cache.set(mocked_user)
+        user_ids = [mocked_user.id for mocked_user in mocked_users]
+        user_filter = UserFilter(email_suffix=faker.domain_name())
+        changes = {"name": faker.user_name()}
+        chunk_size = faker.pyint(min_value=1)
+        mocked_patch_users = mocker.AsyncMock(return_value=user_ids)
+        user_repository.patch_users = mocked_patch_users
+        expected_result = user_ids
+
+        result = await user_service.modify_users(None, user_filter, changes, chunk_size)
+
+        assert result == expected_result
+        for mocked_user in mocked_users:
+            assert user_cache.get(mocked_user.id) is None
+        user_repository.patch_users.assert_called_once_with(
+            None, user_filter, changes, chunk_size
+        )
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_when_users_cannot_be_modified(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+        faker: Faker,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        changes = {"name": faker.user_name()}
+        error = Exception("Failed")
+        message = "An error occurred when patching users in database"
+        server_error = ServerError(
+            message,
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            Detail(
+                context={
+                    "userIds": [mocked_user.id],
+                    "filter": None,
+                    "changes": changes,
+                },
+                cause=str(error),
+            ),
+        )
+        mocked_patch_users = mocker.Mock(side_effect=error)
+        user_repository.patch_users = mocked_patch_users
+
+        with pytest.raises(ServerError) as exc_info:
+            await user_service.modify_users([mocked_user.id], None, changes, 1)
+
+        assert exc_info.value.message == server_error.message
+        assert exc_info.value.detail == server_error.detail
+        assert exc_info.value.status_code == server_error.status_code
+        assert exc_info.value.is_operational == server_error.is_operational
+        user_repository.patch_users.assert_called_once_with(
+            [mocked_user.id], None, changes, 1
+        )
+
+
+class TestRemoveUser(TestUserService):
+    def test_should_define_a_method(
+        self,
+        user_service: UserService,
+    ) -> None:
+        assert isinstance(user_service.remove_user, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_user_when_user_is_removed(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        mocked_delete_user = mocker.AsyncMock(return_value=mocked_user)
+        user_repository.delete_user = mocked_delete_user
+        expected_result = mocked_user
+
+        result = await user_service.remove_user(mocked_user.id)
+
+        assert result == expected_result
+        user_repository.delete_user.assert_called_once_with(mocked_user.id)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_when_user_cannot_be_removed(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        error = Exception("Failed")
+        message = "An error occurred when deleting a user from database"
+        server_error = ServerError(
+            message,
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            Detail(context=mocked_user.id, cause=str(error)),
+        )
+        mocked_delete_user = mocker.Mock(side_effect=error)
+        user_repository.delete_user = mocked_delete_user
+
+        with pytest.raises(ServerError) as exc_info:
+            await user_service.remove_user(mocked_user.id)
+
+        assert exc_info.value.message == server_error.message
+        assert exc_info.value.detail == server_error.detail
+        assert exc_info.value.status_code == server_error.status_code
+        assert exc_info.value.is_operational == server_error.is_operational
+        user_repository.delete_user.assert_called_once_with(mocked_user.id)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_when_user_is_not_found(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked_user: UserModel = UserFactory.build()
+        message = "User not found"
+        server_error = ServerError(
+            message,
+            status.HTTP_404_NOT_FOUND,
+            Detail(context=mocked_user.id, cause=None),
+        )
+        mocked_delete_user = mocker.AsyncMock(return_value=None)
+        user_repository.delete_user = mocked_delete_user
+
+        with pytest.raises(ServerError) as exc_info:
+            await user_service.remove_user(mocked_user.id)
+
+        assert exc_info.value.message == server_error.message
+        assert exc_info.value.detail == server_error.detail
+        assert exc_info.value.status_code == server_error.status_code
+        assert exc_info.value.is_operational == server_error.is_operational
+        user_repository.delete_user.assert_called_once_with(mocked_user.id)
+
+
+class TestRemoveUsers(TestUserService):
+    def test_should_define_a_method(
+        self,
+        user_service: UserService,
+    ) -> None:
+        assert isinstance(user_service.remove_users, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_ids_and_drop_cached_users_when_users_are_removed(
+        self,
+        user_repository: UserRepository,
+        user_cache: UserCache,
+        user_service: UserService,
+        mocker: MockerFixture,
+        faker: Faker,
+    ) -> None:
+        mocked_users: list[UserModel] = UserFactory.build_batch(2)
+        for mocked_user in mocked_users:
+            user_cache.set(mocked_user)
+        user_ids = [mocked_user.id for mocked_user in mocked_users]
+        chunk_size = faker.pyint(min_value=1)
+        mocked_delete_users = mocker.AsyncMock(return_value=user_ids)
+        user_repository.delete_users = mocked_delete_users
+        expected_result = user_ids
+
+        result = await user_service.remove_users(user_ids, None, chunk_size)
+
+        assert result == expected_result
+        for mocked_user in mocked_users:
+            assert user_cache.get(mocked_user.id) is None
+        user_repository.delete_users.assert_called_once_with(user_ids, None, chunk_size)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_when_users_cannot_be_removed(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+        faker: Faker,
+    ) -> None:
+        user_filter = UserFilter(name_prefix=faker.user_name())
+        error = Exception("Failed")
+        message = "An error occurred when deleting users from database"
+        server_error = ServerError(
+            message,
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            Detail(
+                context={"userIds": None, "filter": user_filter},
+                cause=str(error),
+            ),
+        )
+        mocked_delete_users = mocker.Mock(side_effect=error)
+        user_repository.delete_users = mocked_delete_users
+
+        with pytest.raises(ServerError) as exc_info:
+            await user_service.remove_users(None, user_filter, 1)
+
+        assert exc_info.value.message == server_error.message
+        assert exc_info.value.detail == server_error.detail
+        assert exc_info.value.status_code == server_error.status_code
+        assert exc_info.value.is_operational == server_error.is_operational
+        user_repository.delete_users.assert_called_once_with(None, user_filter, 1)
+
+
+class TestApplyUserOperations(TestUserService):
+    def test_should_define_a_method(
+        self,
+        user_service: UserService,
+    ) -> None:
+        assert isinstance(user_service.apply_user_operations, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_each_result_when_operations_are_isolated(
+        self,
+        user_repository: UserRepository,
+        user_service: UserService,
+        mocker: MockerFixture,
+    ) -> None:
+        created_user, removed_user = [
+            UserMapper.to_domain(user) for user in UserFactory.build_batch(2)
+        ]
+        user_repository.create_user = mocker.AsyncMock(return_value=created_user)
+        user_repository.delete_user = mocker.AsyncMock(side_effect=[None, removed_user])
+        operations = [
+            UserOperation(method="create", user=created_user),
+            UserOperation(method="delete", userId=created_user.id),
+            UserOperation(method="delete", userId=removed_user.id),
+        ]
+
+        result = await user_service.apply_user_operations(operations, False)
+
+        assert result[0] == created_user
+        assert isinstance(result[1], ServerError) is True
+        assert result[1].status_code == status.HTTP_404_NOT_FOUND
+        assert result[2] == removed_user
+        assert user_repository.delete_user.call_count == 2
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_keep_every_operation_when_atomic_operations_succeed(
+        self,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+        user_service: UserService,
+    ) -> None:
+        new_user, patched_user, removed_user = [
+            UserMapper.to_domain(user) for user in UserFactory.build_batch(3)
+        ]
+        patched_user = await user_repository.create_user(patched_user)
+        removed_user = await user_repository.create_user(removed_user)
+        operations = [
+            UserOperation(method="create", user=new_user),
+            UserOperation(
+                method="patch", userId=patched_user.id, changes={"name": "name"}
+            ),
+            UserOperation(method="delete", userId=removed_user.id),
+        ]
+
+        result = await user_service.apply_user_operations(operations, True)
+
+        assert result[0].email == new_user.email
+        assert result[1].name == "name"
+        assert result[2].id == removed_user.id
+        assert await user_repository.read_user_by_email(new_user.email) is not None
+        assert (await user_repository.read_user(patched_user.id)).name == "name"
+        assert await user_repository.read_user(removed_user.id) is None
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_roll_back_every_operation_when_an_atomic_one_fails(
+        self,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+        user_service: UserService,
+        faker: Faker,
+    ) -> None:
+        new_user, removed_user, other_user = [
+            UserMapper.to_domain(user) for user in UserFactory.build_batch(3)
+        ]
+        removed_user = await user_repository.create_user(removed_user)
+        other_user = await user_repository.create_user(other_user)
+        missing_user_id = UUID(faker.uuid4()).hex
+        operations = [
+            UserOperation(method="create", user=new_user),
+            UserOperation(method="delete", userId=removed_user.id),
+            UserOperation(method="delete", userId=missing_user_id),
+            UserOperation(method="delete", userId=other_user.id),
+        ]
+
+        result = await user_service.apply_user_operations(operations, True)
+
+        assert [error.status_code for error in result] == [
+            status.HTTP_424_FAILED_DEPENDENCY,
+            status.HTTP_424_FAILED_DEPENDENCY,
+            status.HTTP_404_NOT_FOUND,
+            status.HTTP_424_FAILED_DEPENDENCY,
+        ]
+        assert result[0].message == "Operation rolled back"
+        assert result[2].detail == Detail(context=missing_user_id, cause=None)
+        assert result[3].message == "Operation not run"
+        assert await user_repository.read_user_by_email(new_user.email) is None
+        assert await user_repository.read_user(removed_user.id) is not None
+        assert await user_repository.read_user(other_user.id) is not None
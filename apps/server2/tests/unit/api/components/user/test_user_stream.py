@@ -0,0 +1,171 @@
+import asyncio
+import json
+import types
+from collections.abc import AsyncIterator
+
+import pytest
+from fastapi import status
+from tests.factories.user_factory import UserFactory
+
+from api.components.user.user_repository import UserRepository
+from api.components.user.user_stream import UserStream
+from server_error import ServerError
+from services.db_service import DBService
+
+
+async def read_event(events: AsyncIterator[bytes]) -> bytes:
+    async for event in events:
+        if not event.startswith(b":"):
+            return event
+
+
+async def wait_for_subscribers(user_stream: UserStream, count: int) -> None:
+    for _ in range(100):
+        if user_stream.subscriber_count == count:
+            return
+        await asyncio.sleep(0.05)
+
+
+class TestUserStream:
+    @pytest.fixture
+    def user_repository(self, db_service: DBService) -> UserRepository:
+        return UserRepository(db_service)
+
+    @pytest.fixture
+    def user_stream(
+        self,
+        db_service: DBService,
+        user_repository: UserRepository,
+    ) -> UserStream:
+        return UserStream(
+            user_repository,
+            db_service,
+            buffer_size=10,
+            max_subscribers=2,
+            keepalive=0.05,
+            poll_interval=0.05,
+        )
+
+
+class TestSubscribe(TestUserStream):
+    def test_should_define_a_method(
+        self,
+        user_stream: UserStream,
+    ) -> None:
+        assert isinstance(user_stream.subscribe, types.MethodType) is True
+
+    def test_should_fail_and_raise_exception_when_there_are_too_many_subscribers(
+        self,
+        user_stream: UserStream,
+    ) -> None:
+        user_stream.subscribe()
+        user_stream.subscribe()
+
+        with pytest.raises(ServerError) as exc_info:
+            user_stream.subscribe()
+
+        assert exc_info.value.message == "Too many subscribers to user changes"
+        assert exc_info.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert user_stream.subscriber_count == 2
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_drop_the_subscriber_when_it_falls_behind(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+        user_stream: UserStream,
+    ) -> None:
+        user_stream.configure(1, 2, 60, 0.05)
+        await user_stream.start()
+        slow_subscriber = user_stream.subscribe()
+
+        await user_repository.create_user(UserFactory.build())
+        await user_repository.create_user(UserFactory.build())
+        await wait_for_subscribers(user_stream, 0)
+
+        await user_stream.stop()
+        assert slow_subscriber.events.get_nowait() is None
+        assert slow_subscriber.events.empty() is True
+
+
+class TestEvents(TestUserStream):
+    def test_should_define_a_method(
+        self,
+        user_stream: UserStream,
+    ) -> None:
+        assert isinstance(user_stream.events, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_send_changes_made_after_subscribing(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+        user_stream: UserStream,
+    ) -> None:
+        await user_repository.create_user(UserFactory.build())
+        await user_stream.start()
+        events = user_stream.events()
+        reading = asyncio.ensure_future(read_event(events))
+        await wait_for_subscribers(user_stream, 1)
+
+        created_user = await user_repository.create_user(UserFactory.build())
+        result = await asyncio.wait_for(reading, 5)
+
+        await events.aclose()
+        await user_stream.stop()
+        data, id = result.decode().removesuffix("\n\n").split("\n")
+        change = json.loads(data.removeprefix("data: "))
+        assert change["user_id"] == created_user.id
+        assert change["operation"] == "created"
+        assert id.startswith("id: ")
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_keep_the_stream_alive_when_it_is_idle(
+        self,
+        user_stream: UserStream,
+    ) -> None:
+        events = user_stream.events()
+
+        result = await asyncio.wait_for(events.__anext__(), 1)
+
+        await events.aclose()
+        assert result == b": keepalive\n\n"
+        assert user_stream.subscriber_count == 0
+
+    def test_should_succeed_and_take_no_subscriber_until_the_stream_is_read(
+        self,
+        user_stream: UserStream,
+    ) -> None:
+        user_stream.events()
+
+        assert user_stream.subscriber_count == 0
+
+
+class TestStop(TestUserStream):
+    def test_should_define_a_method(
+        self,
+        user_stream: UserStream,
+    ) -> None:
+        assert isinstance(user_stream.stop, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_end_the_streams_when_stopped(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_stream: UserStream,
+    ) -> None:
+        await user_stream.start()
+        events = user_stream.events()
+        reading = asyncio.ensure_future(read_event(events))
+        await wait_for_subscribers(user_stream, 1)
+
+        await user_stream.stop()
+
+        assert await asyncio.wait_for(reading, 5) is None
+        assert user_stream.subscriber_count == 0
@@ -0,0 +1,317 @@
+import asyncio
+import types
+from uuid import UUID
+
+import pytest
+from db.models.user import UserModel
+from sqlalchemy import insert, select
+from tests.factories.user_factory import UserFactory
+
+from api.components.user.user_cache import UserCache
+from api.components.user.user_mapper import UserMapper
+from api.components.user.user_models import User
+from api.components.user.user_repository import UserRepository
+from api.components.user.user_write_queue import (
+    DatabaseUserWriteStore,
+    InMemoryUserWriteStore,
+    UserWriteQueue,
+)
+from api.utils.dict_to_obj import DictToObj
+from server_error import ServerError
+from services.db_service import DBService
+
+
+async def insert_user(db_service: DBService) -> User:
+    mocked_user: UserModel = UserFactory.build()
+    raw_user_data = UserMapper.to_persistence(UserMapper.to_domain(mocked_user))
+    async with db_service.async_engine.connect() as conn:
+        query = insert(UserModel).values(raw_user_data).returning(UserModel)
+        engine_result = await conn.execute(query)
+        obj = DictToObj(engine_result.first()._asdict())
+        await conn.commit()
+    return UserMapper.to_domain(obj)
+
+
+async def read_email(db_service: DBService, userId: str) -> str:
+    async with db_service.async_engine.connect() as conn:
+        query = select(UserModel.email).where(UserModel.id == UUID(userId))
+        return (await conn.execute(query)).scalar_one()
+
+
+class TestUserWriteQueue:
+    @pytest.fixture
+    def user_repository(self, db_service: DBService) -> UserRepository:
+        return UserRepository(db_service)
+
+    @pytest.fixture(params=["memory", "database"])
+    def user_write_queue(
+        self,
+        request,
+        db_service: DBService,
+        user_repository: UserRepository,
+    ) -> UserWriteQueue:
+        user_write_queue = UserWriteQueue(
+            user_repository,
+            UserCache(ttl=60),
+            db_service,
+            max_depth=3,
+            batch_size=10,
+            interval=0.01,
+        )
+        user_write_queue.connect_store(request.param)
+        return user_write_queue
+
+
+class TestConnectStore(TestUserWriteQueue):
+    def test_should_define_a_method(
+        self,
+        user_write_queue: UserWriteQueue,
+    ) -> None:
+        assert isinstance(user_write_queue.connect_store, types.MethodType) is True
+
+    def test_should_succeed_and_use_the_store_when_store_is_known(
+        self,
+        user_write_queue: UserWriteQueue,
+    ) -> None:
+        user_write_queue.connect_store("memory")
+        assert isinstance(user_write_queue.store, InMemoryUserWriteStore) is True
+
+        user_write_queue.connect_store("database")
+        assert isinstance(user_write_queue.store, DatabaseUserWriteStore) is True
+
+    def test_should_fail_and_raise_exception_when_store_is_unknown(
+        self,
+        user_write_queue: UserWriteQueue,
+    ) -> None:
+        with pytest.raises(ServerError) as exc_info:
+            user_write_queue.connect_store("unknown")
+
+        assert exc_info.value.detail.cause == "Unknown user write store"
+
+
+class TestEnqueue(TestUserWriteQueue):
+    def test_should_define_a_method(
+        self,
+        user_write_queue: UserWriteQueue,
+    ) -> None:
+        assert isinstance(user_write_queue.enqueue, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_false_when_queue_is_full(
+        self,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_write_queue: UserWriteQueue,
+    ) -> None:
+        domain_user: User = UserMapper.to_domain(UserFactory.build())
+
+        results = [
+            await user_write_queue.enqueue(domain_user.id, domain_user)
+            for _ in range(4)
+        ]
+
+        assert results == [True, True, True, False]
+        assert (await user_write_queue.get_metrics()).depth == 3
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_false_when_queue_is_disabled(
+        self,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_write_queue: UserWriteQueue,
+    ) -> None:
+        domain_user: User = UserMapper.to_domain(UserFactory.build())
+        user_write_queue.configure(0, 10, 0.01)
+
+        result = await user_write_queue.enqueue(domain_user.id, domain_user)
+
+        assert result is False
+        assert (await user_write_queue.get_metrics()).depth == 0
+
+
+class TestFlush(TestUserWriteQueue):
+    def test_should_define_a_method(
+        self,
+        user_write_queue: UserWriteQueue,
+    ) -> None:
+        assert isinstance(user_write_queue.flush, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_apply_the_last_write_of_every_user(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_write_queue: UserWriteQueue,
+    ) -> None:
+        first_user = await insert_user(db_service)
+        second_user = await insert_user(db_service)
+        writes = [
+            (first_user.id, UserMapper.to_domain(UserFactory.build())),
+            (second_user.id, UserMapper.to_domain(UserFactory.build())),
+            (first_user.id, UserMapper.to_domain(UserFactory.build())),
+        ]
+        for userId, user in writes:
+            await user_write_queue.enqueue(userId, user)
+
+        result = await user_write_queue.flush()
+
+        assert result == 3
+        assert await read_email(db_service, first_user.id) == writes[2][1].email
+        assert await read_email(db_service, second_user.id) == writes[1][1].email
+        metrics = await user_write_queue.get_metrics()
+        assert metrics.depth == 0
+        assert metrics.lag == 0
+        assert metrics.flushed == 3
+        assert metrics.failed == 0
+        assert await user_write_queue.flush() == 0
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_apply_the_other_writes_when_one_write_fails(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_write_queue: UserWriteQueue,
+    ) -> None:
+        first_user = await insert_user(db_service)
+        second_user = await insert_user(db_service)
+        taken_email_user = User(name=first_user.name, email=second_user.email)
+        changed_user: User = UserMapper.to_domain(UserFactory.build())
+        await user_write_queue.enqueue(first_user.id, taken_email_user)
+        await user_write_queue.enqueue(second_user.id, changed_user)
+
+        result = await user_write_queue.flush()
+
+        assert result == 2
+        assert await read_email(db_service, first_user.id) == first_user.email
+        assert await read_email(db_service, second_user.id) == changed_user.email
+        metrics = await user_write_queue.get_metrics()
+        assert metrics.depth == 0
+        assert metrics.failed == 1
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_keep_a_write_made_after_the_queued_one(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+        user_write_queue: UserWriteQueue,
+    ) -> None:
+        domain_user = await insert_user(db_service)
+        queued_user: User = UserMapper.to_domain(UserFactory.build())
+        written_user: User = UserMapper.to_domain(UserFactory.build())
+        await user_write_queue.enqueue(domain_user.id, queued_user)
+        await user_repository.update_user(domain_user.id, written_user)
+
+        result = await user_write_queue.flush()
+
+        assert result == 1
+        assert await read_email(db_service, domain_user.id) == written_user.email
+        metrics = await user_write_queue.get_metrics()
+        assert metrics.depth == 0
+        assert metrics.flushed == 0
+        assert metrics.failed == 1
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_count_the_write_as_failed_when_user_is_deleted(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_repository: UserRepository,
+        user_write_queue: UserWriteQueue,
+    ) -> None:
+        domain_user = await insert_user(db_service)
+        changed_user: User = UserMapper.to_domain(UserFactory.build())
+        await user_write_queue.enqueue(domain_user.id, changed_user)
+        await user_repository.delete_user(domain_user.id)
+
+        result = await user_write_queue.flush()
+
+        assert result == 1
+        metrics = await user_write_queue.get_metrics()
+        assert metrics.depth == 0
+        assert metrics.flushed == 0
+        assert metrics.failed == 1
+
+
+class TestGetMetrics(TestUserWriteQueue):
+    def test_should_define_a_method(
+        self,
+        user_write_queue: UserWriteQueue,
+    ) -> None:
+        assert isinstance(user_write_queue.get_metrics, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_the_lag_of_the_oldest_write(
+        self,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_write_queue: UserWriteQueue,
+    ) -> None:
+        domain_user: User = UserMapper.to_domain(UserFactory.build())
+        await user_write_queue.enqueue(domain_user.id, domain_user)
+        await asyncio.sleep(0.02)
+
+        result = await user_write_queue.get_metrics()
+
+        assert result.depth == 1
+        assert result.lag >= 0.02
+        assert result.flushed == 0
+
+
+class TestStart(TestUserWriteQueue):
+    def test_should_define_a_method(
+        self,
+        user_write_queue: UserWriteQueue,
+    ) -> None:
+        assert isinstance(user_write_queue.start, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_flush_in_the_background_until_stopped(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_write_queue: UserWriteQueue,
+    ) -> None:
+        domain_user = await insert_user(db_service)
+        changed_user: User = UserMapper.to_domain(UserFactory.build())
+
+        user_write_queue.start()
+        await user_write_queue.enqueue(domain_user.id, changed_user)
+        await asyncio.sleep(0.1)
+        await user_write_queue.stop()
+
+        assert await read_email(db_service, domain_user.id) == changed_user.email
+        assert (await user_write_queue.get_metrics()).depth == 0
+
+
+class TestStop(TestUserWriteQueue):
+    def test_should_define_a_method(
+        self,
+        user_write_queue: UserWriteQueue,
+    ) -> None:
+        assert isinstance(user_write_queue.stop, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_drain_the_queue_when_stopped(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        user_write_queue: UserWriteQueue,
+    ) -> None:
+        domain_user = await insert_user(db_service)
+        changed_user: User = UserMapper.to_domain(UserFactory.build())
+        user_write_queue.configure(3, 10, 60)
+        user_write_queue.start()
+        await asyncio.sleep(0.01)
+        await user_write_queue.enqueue(domain_user.id, changed_user)
+
+        await user_write_queue.stop()
+
+        assert await read_email(db_service, domain_user.id) == changed_user.email
+        assert (await user_write_queue.get_metrics()).depth == 0
@@ -187,6 +187,40 @@ class TestGetDatabaseULR(TestConfig):
         assert exc_info.value.is_operational == server_error.is_operational
 
 
+class TestGetDatabaseShardUrls(TestConfig):
+    @pytest.fixture
+    def var_name(self) -> str:
+        return "DATABASE_SHARD_URLS"
+
+    @pytest.fixture(autouse=True)
+    def database_shard_urls(
+        self, var_name: str, faker: Faker
+    ) -> Generator[str, None, None]:
+        yield from self.setup_and_teardown(var_name, f"{faker.url()},{faker.url()}")
+
+    def test_should_define_a_method(self, config: Config) -> None:
+        assert isinstance(config.get_database_shard_urls, types.MethodType) is True
+
+    def test_should_succeed_and_return_environment_variable_when_it_is_set(
+        self, config: Config, database_shard_urls: Generator[str, None, None]
+    ) -> None:
+        expected_result = database_shard_urls.split(",")
+
+        result = config.get_database_shard_urls()
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_default_value_when_environment_variable_is_not_set(
+        self, var_name: str, config: Config
+    ) -> None:
+        os.environ.pop(var_name)
+        expected_result = []
+
+        result = config.get_database_shard_urls()
+
+        assert result == expected_result
+
+
 class TestGetDatabaseUsername(TestConfig):
     @pytest.fixture
     def var_name(self) -> str:
@@ -391,6 +425,767 @@ class TestGetAllowedOrigins(TestConfig):
         assert exc_info.value.is_operational == server_error.is_operational
 
 
+class TestGetRateLimitStore(TestConfig):
+    @pytest.fixture
+    def var_name(self) -> str:
+        return "RATE_LIMIT_STORE"
+
+    @pytest.fixture(autouse=True)
+    def rate_limit_store(
+        self, var_name: str, faker: Faker
+    ) -> Generator[str, None, None]:
+        yield from self.setup_and_teardown(var_name, faker.pystr())
+
+    def test_should_define_a_method(self, config: Config) -> None:
+        assert isinstance(config.get_rate_limit_store, types.MethodType) is True
+
+    def test_should_succeed_and_return_environment_variable_when_it_is_set(
+        self, config: Config, rate_limit_store: Generator[str, None, None]
+    ) -> None:
+        expected_result = rate_limit_store
+
+        result = config.get_rate_limit_store()
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_default_value_when_environment_variable_is_not_set(
+        self, var_name: str, config: Config
+    ) -> None:
+        os.environ.pop(var_name)
+        expected_result = "memory"
+
+        result = config.get_rate_limit_store()
+
+        assert result == expected_result
+
+
+class TestGetIdGenerator(TestConfig):
+    @pytest.fixture
+    def var_name(self) -> str:
+        return "ID_GENERATOR"
+
+    @pytest.fixture(autouse=True)
+    def id_generator(self, var_name: str, faker: Faker) -> Generator[str, None, None]:
+        yield from self.setup_and_teardown(var_name, faker.pystr())
+
+    def test_should_define_a_method(self, config: Config) -> None:
+        assert isinstance(config.get_id_generator, types.MethodType) is True
+
+    def test_should_succeed_and_return_environment_variable_when_it_is_set(
+        self, config: Config, id_generator: Generator[str, None, None]
+    ) -> None:
+        expected_result = id_generator
+
+        result = config.get_id_generator()
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_default_value_when_environment_variable_is_not_set(
+        self, var_name: str, config: Config
+    ) -> None:
+        os.environ.pop(var_name)
+        expected_result = "uuid7"
+
+        result = config.get_id_generator()
+
+        assert result == expected_result
+
+
+class TestGetIdempotencyStore(TestConfig):
+    @pytest.fixture
+    def var_name(self) -> str:
+        return "IDEMPOTENCY_STORE"
+
+    @pytest.fixture(autouse=True)
+    def idempotency_store(
+        self, var_name: str, faker: Faker
+    ) -> Generator[str, None, None]:
+        yield from self.setup_and_teardown(var_name, faker.pystr())
+
+    def test_should_define_a_method(self, config: Config) -> None:
+        assert isinstance(config.get_idempotency_store, types.MethodType) is True
+
+    def test_should_succeed_and_return_environment_variable_when_it_is_set(
+        self, config: Config, idempotency_store: Generator[str, None, None]
+    ) -> None:
+        expected_result = idempotency_store
+
+        result = config.get_idempotency_store()
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_default_value_when_environment_variable_is_not_set(
+        self, var_name: str, config: Config
+    ) -> None:
+        os.environ.pop(var_name)
+        expected_result = "memory"
+
+        result = config.get_idempotency_store()
+
+        assert result == expected_result
+
+
+class TestGetIdempotencyTTL(TestConfig):
+    @pytest.fixture
+    def var_name(self) -> str:
+        return "IDEMPOTENCY_TTL"
+
+    @pytest.fixture(autouse=True)
+    def idempotency_ttl(
+        self, var_name: str, faker: Faker
+    ) -> Generator[str, None, None]:
+        yield from self.setup_and_teardown(var_name, str(faker.pyfloat(positive=True)))
+
+    def test_should_define_a_method(self, config: Config) -> None:
+        assert isinstance(config.get_idempotency_ttl, types.MethodType) is True
+
+    def test_should_succeed_and_return_environment_variable_when_it_is_set(
+        self, config: Config, idempotency_ttl: Generator[str, None, None]
+    ) -> None:
+        expected_result = float(idempotency_ttl)
+
+        result = config.get_idempotency_ttl()
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_default_value_when_environment_variable_is_not_set(
+        self, var_name: str, config: Config
+    ) -> None:
+        os.environ.pop(var_name)
+        expected_result = 86400
+
+        result = config.get_idempotency_ttl()
+
+        assert result == expected_result
+
+
+class TestGetUserCacheTTL(TestConfig):
+    @pytest.fixture
+    def var_name(self) -> str:
+        return "USER_CACHE_TTL"
+
+    @pytest.fixture(autouse=True)
+    def user_cache_ttl(self, var_name: str, faker: Faker) -> Generator[str, None, None]:
+        yield from self.setup_and_teardown(var_name, str(faker.pyfloat(positive=True)))
+
+    def test_should_define_a_method(self, config: Config) -> None:
+        assert isinstance(config.get_user_cache_ttl, types.MethodType) is True
+
+    def test_should_succeed_and_return_environment_variable_when_it_is_set(
+        self, config: Config, user_cache_ttl: Generator[str, None, None]
+    ) -> None:
+        expected_result = float(user_cache_ttl)
+
+        result = config.get_user_cache_ttl()
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_default_value_when_environment_variable_is_not_set(
+        self, var_name: str, config: Config
+    ) -> None:
+        os.environ.pop(var_name)
+        expected_result = 0
+
+        result = config.get_user_cache_ttl()
+
+        assert result == expected_result
+
+
+class TestGetUserCacheMaxSize(TestConfig):
+    @pytest.fixture
+    def var_name(self) -> str:
+        return "USER_CACHE_MAX_SIZE"
+
+    @pytest.fixture(autouse=True)
+    def user_cache_max_size(
+        self, var_name: str, faker: Faker
+    ) -> Generator[str, None, None]:
+        yield from self.setup_and_teardown(var_name, str(faker.pyint()))
+
+    def test_should_define_a_method(self, config: Config) -> None:
+        assert isinstance(config.get_user_cache_max_size, types.MethodType) is True
+
+    def test_should_succeed_and_return_environment_variable_when_it_is_set(
+        self, config: Config, user_cache_max_size: Generator[str, None, None]
+    ) -> None:
+        expected_result = int(user_cache_max_size)
+
+        result = config.get_user_cache_max_size()
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_default_value_when_environment_variable_is_not_set(
+        self, var_name: str, config: Config
+    ) -> None:
+        os.environ.pop(var_name)
+        expected_result = 10000
+
+        result = config.get_user_cache_max_size()
+
+        assert result == expected_result
+
+
+class TestGetUserLoaderWindow(TestConfig):
+    @pytest.fixture
+    def var_name(self) -> str:
+        return "USER_LOADER_WINDOW"
+
+    @pytest.fixture(autouse=True)
+    def user_loader_window(
+        self, var_name: str, faker: Faker
+    ) -> Generator[str, None, None]:
+        yield from self.setup_and_teardown(var_name, str(faker.pyfloat(positive=True)))
+
+    def test_should_define_a_method(self, config: Config) -> None:
+        assert isinstance(config.get_user_loader_window, types.MethodType) is True
+
+    def test_should_succeed_and_return_environment_variable_when_it_is_set(
+        self, config: Config, user_loader_window: Generator[str, None, None]
+    ) -> None:
+        expected_result = float(user_loader_window)
+
+        result = config.get_user_loader_window()
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_default_value_when_environment_variable_is_not_set(
+        self, var_name: str, config: Config
+    ) -> None:
+        os.environ.pop(var_name)
+        expected_result = 0
+
+        result = config.get_user_loader_window()
+
+        assert result == expected_result
+
+
+class TestGetUserLoaderMaxBatchSize(TestConfig):
+    @pytest.fixture
+    def var_name(self) -> str:
+        return "USER_LOADER_MAX_BATCH_SIZE"
+
+    @pytest.fixture(autouse=True)
+    def user_loader_max_batch_size(
+        self, var_name: str, faker: Faker
+    ) -> Generator[str, None, None]:
+        yield from self.setup_and_teardown(var_name, str(faker.pyint()))
+
+    def test_should_define_a_method(self, config: Config) -> None:
+        assert (
+            isinstance(config.get_user_loader_max_batch_size, types.MethodType) is True
+        )
+
+    def test_should_succeed_and_return_environment_variable_when_it_is_set(
+        self, config: Config, user_loader_max_batch_size: Generator[str, None, None]
+    ) -> None:
+        expected_result = int(user_loader_max_batch_size)
+
+        result = config.get_user_loader_max_batch_size()
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_default_value_when_environment_variable_is_not_set(
+        self, var_name: str, config: Config
+    ) -> None:
+        os.environ.pop(var_name)
+        expected_result = 1
+
+        result = config.get_user_loader_max_batch_size()
+
+        assert result == expected_result
+
+
+class TestGetUserInsertWindow(TestConfig):
+    @pytest.fixture
+    def var_name(self) -> str:
+        return "USER_INSERT_WINDOW"
+
+    @pytest.fixture(autouse=True)
+    def user_insert_window(
+        self, var_name: str, faker: Faker
+    ) -> Generator[str, None, None]:
+        yield from self.setup_and_teardown(var_name, str(faker.pyfloat()))
+
+    def test_should_define_a_method(self, config: Config) -> None:
+        assert isinstance(config.get_user_insert_window, types.MethodType) is True
+
+    def test_should_succeed_and_return_environment_variable_when_it_is_set(
+        self, config: Config, user_insert_window: Generator[str, None, None]
+    ) -> None:
+        expected_result = float(user_insert_window)
+
+        result = config.get_user_insert_window()
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_default_value_when_environment_variable_is_not_set(
+        self, var_name: str, config: Config
+    ) -> None:
+        os.environ.pop(var_name)
+        expected_result = 0
+
+        result = config.get_user_insert_window()
+
+        assert result == expected_result
+
+
+class TestGetUserInsertMaxBatchSize(TestConfig):
+    @pytest.fixture
+    def var_name(self) -> str:
+        return "USER_INSERT_MAX_BATCH_SIZE"
+
+    @pytest.fixture(autouse=True)
+    def user_insert_max_batch_size(
+        self, var_name: str, faker: Faker
+    ) -> Generator[str, None, None]:
+        yield from self.setup_and_teardown(var_name, str(faker.pyint()))
+
+    def test_should_define_a_method(self, config: Config) -> None:
+        assert (
+            isinstance(config.get_user_insert_max_batch_size, types.MethodType) is True
+        )
+
+    def test_should_succeed_and_return_environment_variable_when_it_is_set(
+        self, config: Config, user_insert_max_batch_size: Generator[str, None, None]
+    ) -> None:
+        expected_result = int(user_insert_max_batch_size)
+
+        result = config.get_user_insert_max_batch_size()
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_default_value_when_environment_variable_is_not_set(
+        self, var_name: str, config: Config
+    ) -> None:
+        os.environ.pop(var_name)
+        expected_result = 1
+
+        result = config.get_user_insert_max_batch_size()
+
+        assert result == expected_result
+
+
+class TestGetUserDeleteMode(TestConfig):
+    @pytest.fixture
+    def var_name(self) -> str:
+        return "USER_DELETE_MODE"
+
+    @pytest.fixture(autouse=True)
+    def user_delete_mode(
+        self, var_name: str, faker: Faker
+    ) -> Generator[str, None, None]:
+        yield from self.setup_and_teardown(var_name, faker.pystr())
+
+    def test_should_define_a_method(self, config: Config) -> None:
+        assert isinstance(config.get_user_delete_mode, types.MethodType) is True
+
+    def test_should_succeed_and_return_environment_variable_when_it_is_set(
+        self, config: Config, user_delete_mode: Generator[str, None, None]
+    ) -> None:
+        expected_result = user_delete_mode
+
+        result = config.get_user_delete_mode()
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_default_value_when_environment_variable_is_not_set(
+        self, var_name: str, config: Config
+    ) -> None:
+        os.environ.pop(var_name)
+        expected_result = "hard"
+
+        result = config.get_user_delete_mode()
+
+        assert result == expected_result
+
+
+class TestGetUserPurgeBatchSize(TestConfig):
+    @pytest.fixture
+    def var_name(self) -> str:
+        return "USER_PURGE_BATCH_SIZE"
+
+    @pytest.fixture(autouse=True)
+    def user_purge_batch_size(
+        self, var_name: str, faker: Faker
+    ) -> Generator[str, None, None]:
+        yield from self.setup_and_teardown(var_name, str(faker.pyint()))
+
+    def test_should_define_a_method(self, config: Config) -> None:
+        assert isinstance(config.get_user_purge_batch_size, types.MethodType) is True
+
+    def test_should_succeed_and_return_environment_variable_when_it_is_set(
+        self, config: Config, user_purge_batch_size: Generator[str, None, None]
+    ) -> None:
+        expected_result = int(user_purge_batch_size)
+
+        result = config.get_user_purge_batch_size()
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_default_value_when_environment_variable_is_not_set(
+        self, var_name: str, config: Config
+    ) -> None:
+        os.environ.pop(var_name)
+        expected_result = 100
+
+        result = config.get_user_purge_batch_size()
+
+        assert result == expected_result
+
+
+class TestGetUserPurgeInterval(TestConfig):
+    @pytest.fixture
+    def var_name(self) -> str:
+        return "USER_PURGE_INTERVAL"
+
+    @pytest.fixture(autouse=True)
+    def user_purge_interval(
+        self, var_name: str, faker: Faker
+    ) -> Generator[str, None, None]:
+        yield from self.setup_and_teardown(var_name, str(faker.pyfloat()))
+
+    def test_should_define_a_method(self, config: Config) -> None:
+        assert isinstance(config.get_user_purge_interval, types.MethodType) is True
+
+    def test_should_succeed_and_return_environment_variable_when_it_is_set(
+        self, config: Config, user_purge_interval: Generator[str, None, None]
+    ) -> None:
+        expected_result = float(user_purge_interval)
+
+        result = config.get_user_purge_interval()
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_default_value_when_environment_variable_is_not_set(
+        self, var_name: str, config: Config
+    ) -> None:
+        os.environ.pop(var_name)
+        expected_result = 1
+
+        result = config.get_user_purge_interval()
+
+        assert result == expected_result
+
+
+class TestGetUserPurgeMaxActiveQueries(TestConfig):
+    @pytest.fixture
+    def var_name(self) -> str:
+        return "USER_PURGE_MAX_ACTIVE_QUERIES"
+
+    @pytest.fixture(autouse=True)
+    def user_purge_max_active_queries(
+        self, var_name: str, faker: Faker
+    ) -> Generator[str, None, None]:
+        yield from self.setup_and_teardown(var_name, str(faker.pyint()))
+
+    def test_should_define_a_method(self, config: Config) -> None:
+        assert (
+            isinstance(config.get_user_purge_max_active_queries, types.MethodType)
+            is True
+        )
+
+    def test_should_succeed_and_return_environment_variable_when_it_is_set(
+        self, config: Config, user_purge_max_active_queries: Generator[str, None, None]
+    ) -> None:
+        expected_result = int(user_purge_max_active_queries)
+
+        result = config.get_user_purge_max_active_queries()
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_default_value_when_environment_variable_is_not_set(
+        self, var_name: str, config: Config
+    ) -> None:
+        os.environ.pop(var_name)
+        expected_result = 2
+
+        result = config.get_user_purge_max_active_queries()
+
+        assert result == expected_result
+
+
+class TestGetUserWriteQueueStore(TestConfig):
+    @pytest.fixture
+    def var_name(self) -> str:
+        return "USER_WRITE_QUEUE_STORE"
+
+    @pytest.fixture(autouse=True)
+    def user_write_queue_store(
+        self, var_name: str, faker: Faker
+    ) -> Generator[str, None, None]:
+        yield from self.setup_and_teardown(var_name, faker.pystr())
+
+    def test_should_define_a_method(self, config: Config) -> None:
+        assert isinstance(config.get_user_write_queue_store, types.MethodType) is True
+
+    def test_should_succeed_and_return_environment_variable_when_it_is_set(
+        self, config: Config, user_write_queue_store: Generator[str, None, None]
+    ) -> None:
+        expected_result = user_write_queue_store
+
+        result = config.get_user_write_queue_store()
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_default_value_when_environment_variable_is_not_set(
+        self, var_name: str, config: Config
+    ) -> None:
+        os.environ.pop(var_name)
+        expected_result = "memory"
+
+        result = config.get_user_write_queue_store()
+
+        assert result == expected_result
+
+
+class TestGetUserWriteQueueMaxDepth(TestConfig):
+    @pytest.fixture
+    def var_name(self) -> str:
+        return "USER_WRITE_QUEUE_MAX_DEPTH"
+
+    @pytest.fixture(autouse=True)
+    def user_write_queue_max_depth(
+        self, var_name: str, faker: Faker
+    ) -> Generator[str, None, None]:
+        yield from self.setup_and_teardown(var_name, str(faker.pyint()))
+
+    def test_should_define_a_method(self, config: Config) -> None:
+        assert (
+            isinstance(config.get_user_write_queue_max_depth, types.MethodType) is True
+        )
+
+    def test_should_succeed_and_return_environment_variable_when_it_is_set(
+        self, config: Config, user_write_queue_max_depth: Generator[str, None, None]
+    ) -> None:
+        expected_result = int(user_write_queue_max_depth)
+
+        result = config.get_user_write_queue_max_depth()
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_default_value_when_environment_variable_is_not_set(
+        self, var_name: str, config: Config
+    ) -> None:
+        os.environ.pop(var_name)
+        expected_result = 10000
+
+        result = config.get_user_write_queue_max_depth()
+
+        assert result == expected_result
+
+
+class TestGetUserWriteQueueBatchSize(TestConfig):
+    @pytest.fixture
+    def var_name(self) -> str:
+        return "USER_WRITE_QUEUE_BATCH_SIZE"
+
+    @pytest.fixture(autouse=True)
+    def user_write_queue_batch_size(
+        self, var_name: str, faker: Faker
+    ) -> Generator[str, None, None]:
+        yield from self.setup_and_teardown(var_name, str(faker.pyint()))
+
+    def test_should_define_a_method(self, config: Config) -> None:
+        assert (
+            isinstance(config.get_user_write_queue_batch_size, types.MethodType) is True
+        )
+
+    def test_should_succeed_and_return_environment_variable_when_it_is_set(
+        self, config: Config, user_write_queue_batch_size: Generator[str, None, None]
+    ) -> None:
+        expected_result = int(user_write_queue_batch_size)
+
+        result = config.get_user_write_queue_batch_size()
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_default_value_when_environment_variable_is_not_set(
+        self, var_name: str, config: Config
+    ) -> None:
+        os.environ.pop(var_name)
+        expected_result = 500
+
+        result = config.get_user_write_queue_batch_size()
+
+        assert result == expected_result
+
+
+class TestGetUserWriteQueueInterval(TestConfig):
+    @pytest.fixture
+    def var_name(self) -> str:
+        return "USER_WRITE_QUEUE_INTERVAL"
+
+    @pytest.fixture(autouse=True)
+    def user_write_queue_interval(
+        self, var_name: str, faker: Faker
+    ) -> Generator[str, None, None]:
+        yield from self.setup_and_teardown(var_name, str(faker.pyfloat()))
+
+    def test_should_define_a_method(self, config: Config) -> None:
+        assert (
+            isinstance(config.get_user_write_queue_interval, types.MethodType) is True
+        )
+
+    def test_should_succeed_and_return_environment_variable_when_it_is_set(
+        self, config: Config, user_write_queue_interval: Generator[str, None, None]
+    ) -> None:
+        expected_result = float(user_write_queue_interval)
+
+        result = config.get_user_write_queue_interval()
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_default_value_when_environment_variable_is_not_set(
+        self, var_name: str, config: Config
+    ) -> None:
+        os.environ.pop(var_name)
+        expected_result = 0.05
+
+        result = config.get_user_write_queue_interval()
+
+        assert result == expected_result
+
+
+class TestGetUserStreamBufferSize(TestConfig):
+    @pytest.fixture
+    def var_name(self) -> str:
+        return "USER_STREAM_BUFFER_SIZE"
+
+    @pytest.fixture(autouse=True)
+    def user_stream_buffer_size(
+        self, var_name: str, faker: Faker
+    ) -> Generator[str, None, None]:
+        yield from self.setup_and_teardown(var_name, str(faker.pyint()))
+
+    def test_should_define_a_method(self, config: Config) -> None:
+        assert isinstance(config.get_user_stream_buffer_size, types.MethodType) is True
+
+    def test_should_succeed_and_return_environment_variable_when_it_is_set(
+        self, config: Config, user_stream_buffer_size: Generator[str, None, None]
+    ) -> None:
+        expected_result = int(user_stream_buffer_size)
+
+        result = config.get_user_stream_buffer_size()
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_default_value_when_environment_variable_is_not_set(
+        self, var_name: str, config: Config
+    ) -> None:
+        os.environ.pop(var_name)
+        expected_result = 100
+
+        result = config.get_user_stream_buffer_size()
+
+        assert result == expected_result
+
+
+class TestGetUserStreamMaxSubscribers(TestConfig):
+    @pytest.fixture
+    def var_name(self) -> str:
+        return "USER_STREAM_MAX_SUBSCRIBERS"
+
+    @pytest.fixture(autouse=True)
+    def user_stream_max_subscribers(
+        self, var_name: str, faker: Faker
+    ) -> Generator[str, None, None]:
+        yield from self.setup_and_teardown(var_name, str(faker.pyint()))
+
+    def test_should_define_a_method(self, config: Config) -> None:
+        assert (
+            isinstance(config.get_user_stream_max_subscribers, types.MethodType) is True
+        )
+
+    def test_should_succeed_and_return_environment_variable_when_it_is_set(
+        self, config: Config, user_stream_max_subscribers: Generator[str, None, None]
+    ) -> None:
+        expected_result = int(user_stream_max_subscribers)
+
+        result = config.get_user_stream_max_subscribers()
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_default_value_when_environment_variable_is_not_set(
+        self, var_name: str, config: Config
+    ) -> None:
+        os.environ.pop(var_name)
+        expected_result = 10000
+
+        result = config.get_user_stream_max_subscribers()
+
+        assert result == expected_result
+
+
+class TestGetUserStreamKeepalive(TestConfig):
+    @pytest.fixture
+    def var_name(self) -> str:
+        return "USER_STREAM_KEEPALIVE"
+
+    @pytest.fixture(autouse=True)
+    def user_stream_keepalive(
+        self, var_name: str, faker: Faker
+    ) -> Generator[str, None, None]:
+        yield from self.setup_and_teardown(var_name, str(faker.pyfloat()))
+
+    def test_should_define_a_method(self, config: Config) -> None:
+        assert isinstance(config.get_user_stream_keepalive, types.MethodType) is True
+
+    def test_should_succeed_and_return_environment_variable_when_it_is_set(
+        self, config: Config, user_stream_keepalive: Generator[str, None, None]
+    ) -> None:
+        expected_result = float(user_stream_keepalive)
+
+        result = config.get_user_stream_keepalive()
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_default_value_when_environment_variable_is_not_set(
+        self, var_name: str, config: Config
+    ) -> None:
+        os.environ.pop(var_name)
+        expected_result = 15
+
+        result = config.get_user_stream_keepalive()
+
+        assert result == expected_result
+
+
+class TestGetUserStreamPollInterval(TestConfig):
+    @pytest.fixture
+    def var_name(self) -> str:
+        return "USER_STREAM_POLL_INTERVAL"
+
+    @pytest.fixture(autouse=True)
+    def user_stream_poll_interval(
+        self, var_name: str, faker: Faker
+    ) -> Generator[str, None, None]:
+        yield from self.setup_and_teardown(var_name, str(faker.pyfloat()))
+
+    def test_should_define_a_method(self, config: Config) -> None:
+        assert (
+            isinstance(config.get_user_stream_poll_interval, types.MethodType) is True
+        )
+
+    def test_should_succeed_and_return_environment_variable_when_it_is_set(
+        self, config: Config, user_stream_poll_interval: Generator[str, None, None]
+    ) -> None:
+        expected_result = float(user_stream_poll_interval)
+
+        result = config.get_user_stream_poll_interval()
+
+        assert result == expected_result
+
+    def test_should_succeed_and_return_default_value_when_environment_variable_is_not_set(
+        self, var_name: str, config: Config
+    ) -> None:
+        os.environ.pop(var_name)
+        expected_result = 1
+
+        result = config.get_user_stream_poll_interval()
+
+        assert result == expected_result
+
+
 class TestSetDatabaseURL(TestConfig):
     @pytest.fixture
     def var_name(self) -> str:
@@ -1,11 +1,19 @@
 import pytest
 
 from api.components.health_check.health_check_service import HealthCheckService
+from api.components.user.user_cache import UserCache
+from api.components.user.user_cache_invalidator import UserCacheInvalidator
+from api.components.user.user_loader import UserLoader
+from api.components.user.user_purger import UserPurger
 from api.components.user.user_repository import UserRepository
 from api.components.user.user_service import UserService
+from api.components.user.user_stream import UserStream
+from api.components.user.user_write_queue import UserWriteQueue
 from container.container import Container
 from services.api_pagination_service import APIPaginationService
 from services.db_service import DBService
+from services.idempotency_service import IdempotencyService
+from services.rate_limit_service import RateLimitService
 
 
 class TestContainer:
@@ -22,8 +30,16 @@ class TestContainer:
             "db_service_provider": container.db_service_provider,
             "user_repository_provider": container.user_repository_provider,
             "health_check_service_provider": container.health_check_service_provider,
+            "user_cache_provider": container.user_cache_provider,
+            "user_cache_invalidator_provider": container.user_cache_invalidator_provider,
+            "user_loader_provider": container.user_loader_provider,
+            "user_purger_provider": container.user_purger_provider,
+            "user_write_queue_provider": container.user_write_queue_provider,
+            "user_stream_provider": container.user_stream_provider,
             "user_service_provider": container.user_service_provider,
             "api_pagination_service_provider": container.api_pagination_service_provider,
+            "rate_limit_service_provider": container.rate_limit_service_provider,
+            "idempotency_service_provider": container.idempotency_service_provider,
         }
         assert container.providers == providers_by_name
         assert isinstance(providers_by_name["db_service_provider"](), DBService) is True
@@ -38,6 +54,27 @@ class TestContainer:
             )
             is True
         )
+        assert isinstance(providers_by_name["user_cache_provider"](), UserCache) is True
+        assert (
+            isinstance(
+                providers_by_name["user_cache_invalidator_provider"](),
+                UserCacheInvalidator,
+            )
+            is True
+        )
+        assert (
+            isinstance(providers_by_name["user_loader_provider"](), UserLoader) is True
+        )
+        assert (
+            isinstance(providers_by_name["user_purger_provider"](), UserPurger) is True
+        )
+        assert (
+            isinstance(providers_by_name["user_write_queue_provider"](), UserWriteQueue)
+            is True
+        )
+        assert (
+            isinstance(providers_by_name["user_stream_provider"](), UserStream) is True
+        )
         assert (
             isinstance(providers_by_name["user_service_provider"](), UserService)
             is True
@@ -49,3 +86,17 @@ class TestContainer:
             )
             is True
         )
+        assert (
+            isinstance(
+                providers_by_name["rate_limit_service_provider"](),
+                RateLimitService,
+            )
+            is True
+        )
+        assert (
+            isinstance(
+                providers_by_name["idempotency_service_provider"](),
+                IdempotencyService,
+            )
+            is True
+        )
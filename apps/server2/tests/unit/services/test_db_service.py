@@ -1,4 +1,6 @@
+import asyncio
 import types
+from uuid import UUID, uuid4
 
 import pytest
 from db.models.user import UserModel
@@ -106,6 +108,41 @@ class TestConnectDatabase(TestDBService):
         assert exc_info.value.is_operational == server_error.is_operational
 
 
+class TestGetShardAsyncEngine(TestDBService):
+    def test_should_define_a_method(self, db_service: DBService) -> None:
+        assert isinstance(db_service.get_shard_async_engine, types.MethodType) is True
+
+    def test_should_succeed_and_return_async_engine_when_there_is_no_other_shard(
+        self,
+        config: Config,
+        db_service: DBService,
+    ) -> None:
+        db_service.connect_database(config.get_database_url())
+
+        result = db_service.get_shard_async_engine(str(uuid4()))
+
+        assert result is db_service.async_engine
+
+    def test_should_succeed_and_return_the_same_shard_for_the_same_key_across_shards(
+        self,
+        config: Config,
+        db_service: DBService,
+    ) -> None:
+        database_url = config.get_database_url()
+        db_service.connect_database(database_url, [database_url, database_url])
+        keys = [str(uuid4()) for _ in range(100)]
+
+        result = [db_service.get_shard_async_engine(key) for key in keys]
+
+        assert len(db_service.shard_async_engines) == 3
+        assert {id(async_engine) for async_engine in result} == {
+            id(async_engine) for async_engine in db_service.shard_async_engines
+        }
+        assert [
+            db_service.get_shard_async_engine(UUID(key).hex) for key in keys
+        ] == result
+
+
 class TestCheckDatabaseIsAlive(TestDBService):
     def test_should_define_a_method(self, db_service: DBService) -> None:
         assert isinstance(db_service.check_database_is_alive, types.MethodType) is True
@@ -273,6 +310,273 @@ class TestGetDatabaseTableRowCount(TestDBService):
         assert exc_info.value.is_operational == server_error.is_operational
 
 
+class TestGetDatabaseActiveQueryCount(TestDBService):
+    def test_should_define_a_method(self, db_service: DBService) -> None:
+        assert (
+            isinstance(db_service.get_database_active_query_count, types.MethodType)
+            is True
+        )
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_number_of_other_active_queries(
+        self,
+        config: Config,
+        db_service: DBService,
+    ) -> None:
+        db_service.connect_database(config.get_database_url())
+        async with db_service.async_engine.connect() as conn:
+            busy_query = asyncio.ensure_future(
+                conn.execute(text("SELECT pg_sleep(0.5)"))
+            )
+            await asyncio.sleep(0.1)
+
+            result = await db_service.get_database_active_query_count()
+
+            await busy_query
+        assert result >= 1
+        await db_service.deactivate_database()
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_when_async_engine_is_none(
+        self, db_service: DBService
+    ) -> None:
+        message = "Async engine is None!"
+        server_error = ServerError(message, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        with pytest.raises(ServerError) as exc_info:
+            await db_service.get_database_active_query_count()
+
+        assert exc_info.value.message == server_error.message
+        assert exc_info.value.detail == server_error.detail
+        assert exc_info.value.status_code == server_error.status_code
+        assert exc_info.value.is_operational == server_error.is_operational
+
+
+class TestConnect(TestDBService):
+    def test_should_define_a_method(self, db_service: DBService) -> None:
+        assert isinstance(db_service.connect, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_share_a_connection_within_a_transaction(
+        self,
+        config: Config,
+        db_service: DBService,
+    ) -> None:
+        db_service.connect_database(config.get_database_url())
+
+        async with db_service.transaction():
+            async with db_service.connect(db_service.async_engine) as conn:
+                first_pid = (
+                    await conn.execute(text("SELECT pg_backend_pid()"))
+                ).scalar()
+            async with db_service.connect(db_service.async_engine) as conn:
+                second_pid = (
+                    await conn.execute(text("SELECT pg_backend_pid()"))
+                ).scalar()
+
+        assert first_pid == second_pid
+        await db_service.deactivate_database()
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_undo_only_what_a_call_rolls_back(
+        self,
+        config: Config,
+        db_service: DBService,
+    ) -> None:
+        table_name = "users"
+        db_service.connect_database(config.get_database_url())
+        alembic_file_path = "alembic.ini"
+        await db_service.migrate_database(alembic_file_path)
+        kept_user, undone_user = UserFactory.build_batch(2)
+
+        async with db_service.transaction():
+            async with db_service.connect(db_service.async_engine) as conn:
+                await conn.execute(
+                    insert(UserModel).values(UserMapper.to_persistence(kept_user))
+                )
+                await conn.commit()
+            async with db_service.connect(db_service.async_engine) as conn:
+                await conn.execute(
+                    insert(UserModel).values(UserMapper.to_persistence(undone_user))
+                )
+                await conn.rollback()
+
+        assert await db_service.get_database_table_row_count(table_name) == 1
+        await db_service.delete_database_tables()
+        await db_service.deactivate_database()
+
+
+class TestTransaction(TestDBService):
+    def test_should_define_a_method(self, db_service: DBService) -> None:
+        assert isinstance(db_service.transaction, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_commit_the_calls_made_within_it(
+        self,
+        config: Config,
+        db_service: DBService,
+    ) -> None:
+        table_name = "users"
+        db_service.connect_database(config.get_database_url())
+        alembic_file_path = "alembic.ini"
+        await db_service.migrate_database(alembic_file_path)
+        count = 3
+        mocked_user_list: list[UserModel] = UserFactory.build_batch(count)
+
+        async with db_service.transaction():
+            assert db_service.in_transaction is True
+            for mocked_user in mocked_user_list:
+                async with db_service.connect(db_service.async_engine) as conn:
+                    query = insert(UserModel).values(
+                        UserMapper.to_persistence(mocked_user)
+                    )
+                    await conn.execute(query)
+                    await conn.commit()
+            assert await db_service.get_database_table_row_count(table_name) == 0
+
+        assert db_service.in_transaction is False
+        assert await db_service.get_database_table_row_count(table_name) == count
+        await db_service.delete_database_tables()
+        await db_service.deactivate_database()
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_roll_back_the_calls_made_within_it_when_it_raises(
+        self,
+        config: Config,
+        db_service: DBService,
+        faker: Faker,
+    ) -> None:
+        table_name = "users"
+        db_service.connect_database(config.get_database_url())
+        alembic_file_path = "alembic.ini"
+        await db_service.migrate_database(alembic_file_path)
+        message = faker.sentence()
+
+        with pytest.raises(ValueError) as exc_info:
+            async with db_service.transaction():
+                async with db_service.connect(db_service.async_engine) as conn:
+                    query = insert(UserModel).values(
+                        UserMapper.to_persistence(UserFactory.build())
+                    )
+                    await conn.execute(query)
+                    await conn.commit()
+                raise ValueError(message)
+
+        assert str(exc_info.value) == message
+        assert db_service.in_transaction is False
+        assert await db_service.get_database_table_row_count(table_name) == 0
+        await db_service.delete_database_tables()
+        await db_service.deactivate_database()
+
+
+class TestListen(TestDBService):
+    def test_should_define_a_method(self, db_service: DBService) -> None:
+        assert isinstance(db_service.listen, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_call_back_with_payload_when_channel_is_notified(
+        self,
+        config: Config,
+        db_service: DBService,
+    ) -> None:
+        db_service.connect_database(config.get_database_url())
+        payloads: list[str] = []
+        notified = asyncio.Event()
+
+        def callback(payload: str) -> None:
+            payloads.append(payload)
+            notified.set()
+
+        await db_service.listen("test_channel", callback)
+        async with db_service.async_engine.connect() as conn:
+            await conn.execute(text("SELECT pg_notify('test_channel', 'payload')"))
+            await conn.commit()
+        await asyncio.wait_for(notified.wait(), 5)
+
+        assert payloads == ["payload"]
+        await db_service.deactivate_database()
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_listen_again_when_connection_is_lost(
+        self,
+        config: Config,
+        db_service: DBService,
+    ) -> None:
+        db_service.connect_database(config.get_database_url())
+        payloads: asyncio.Queue[str | None] = asyncio.Queue()
+        await db_service.listen("test_channel", payloads.put_nowait)
+
+        async with db_service.async_engine.connect() as conn:
+            await conn.execute(
+                text(
+                    """
+                    SELECT pg_terminate_backend(pid)
+                    FROM pg_stat_activity
+                    WHERE query = 'LISTEN "test_channel"'
+                    """
+                )
+            )
+            await conn.commit()
+        missed_payload = await asyncio.wait_for(payloads.get(), 5)
+        async with db_service.async_engine.connect() as conn:
+            await conn.execute(text("SELECT pg_notify('test_channel', 'payload')"))
+            await conn.commit()
+        payload = await asyncio.wait_for(payloads.get(), 5)
+
+        assert missed_payload is None
+        assert payload == "payload"
+        await db_service.deactivate_database()
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_when_async_engine_is_none(
+        self, db_service: DBService
+    ) -> None:
+        message = "Async engine is None!"
+        server_error = ServerError(message, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        with pytest.raises(ServerError) as exc_info:
+            await db_service.listen("test_channel", lambda payload: None)
+
+        assert exc_info.value.message == server_error.message
+        assert exc_info.value.detail == server_error.detail
+        assert exc_info.value.status_code == server_error.status_code
+        assert exc_info.value.is_operational == server_error.is_operational
+
+
+class TestUnlisten(TestDBService):
+    def test_should_define_a_method(self, db_service: DBService) -> None:
+        assert isinstance(db_service.unlisten, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_stop_calling_back_when_callback_is_removed(
+        self,
+        config: Config,
+        db_service: DBService,
+    ) -> None:
+        db_service.connect_database(config.get_database_url())
+        removed_payloads: list[str] = []
+        kept_payloads: list[str] = []
+        notified = asyncio.Event()
+
+        def kept_callback(payload: str) -> None:
+            kept_payloads.append(payload)
+            notified.set()
+
+        await db_service.listen("test_channel", removed_payloads.append)
+        await db_service.listen("test_channel", kept_callback)
+
+        result = await db_service.unlisten("test_channel", removed_payloads.append)
+
+        assert result is None
+        async with db_service.async_engine.connect() as conn:
+            await conn.execute(text("SELECT pg_notify('test_channel', 'payload')"))
+            await conn.commit()
+        await asyncio.wait_for(notified.wait(), 5)
+        assert removed_payloads == []
+        assert kept_payloads == ["payload"]
+        await db_service.deactivate_database()
+
+
 class TestClearDatabaseTable(TestDBService):
     def test_should_define_a_method(self, db_service: DBService) -> None:
         assert isinstance(db_service.clear_database_tables, types.MethodType) is True
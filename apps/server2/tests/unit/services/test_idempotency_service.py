@@ -0,0 +1,367 @@
+import asyncio
+import types
+
+import pytest
+from faker import Faker
+from fastapi import status
+from pytest_mock import MockerFixture
+
+from server_error import Detail, ServerError
+from services.db_service import DBService
+from services.idempotency_service import (
+    DatabaseIdempotencyStore,
+    IdempotencyRecord,
+    IdempotencyService,
+    IdempotentResponse,
+    InMemoryIdempotencyStore,
+)
+
+
+class TestIdempotencyService:
+    @pytest.fixture
+    def idempotent_response(self, faker: Faker) -> IdempotentResponse:
+        return IdempotentResponse(
+            status_code=status.HTTP_201_CREATED,
+            body={"name": faker.name()},
+            headers={"ETag": faker.pystr()},
+        )
+
+    @pytest.fixture
+    def idempotency_service(self, db_service: DBService) -> IdempotencyService:
+        return IdempotencyService(db_service)
+
+
+class TestInMemoryIdempotencyStoreReserve(TestIdempotencyService):
+    @pytest.fixture
+    def in_memory_idempotency_store(self) -> InMemoryIdempotencyStore:
+        return InMemoryIdempotencyStore()
+
+    def test_should_define_a_method(
+        self,
+        in_memory_idempotency_store: InMemoryIdempotencyStore,
+    ) -> None:
+        assert isinstance(in_memory_idempotency_store.reserve, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_none_when_key_is_reserved_for_the_first_time(
+        self,
+        in_memory_idempotency_store: InMemoryIdempotencyStore,
+        faker: Faker,
+    ) -> None:
+        key = faker.uuid4()
+
+        result = await in_memory_idempotency_store.reserve(key, faker.sha256(), 60)
+
+        assert result is None
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_saved_record_when_key_is_reserved_again(
+        self,
+        in_memory_idempotency_store: InMemoryIdempotencyStore,
+        idempotent_response: IdempotentResponse,
+        faker: Faker,
+    ) -> None:
+        key = faker.uuid4()
+        fingerprint = faker.sha256()
+        await in_memory_idempotency_store.reserve(key, fingerprint, 60)
+        await in_memory_idempotency_store.save(key, idempotent_response, 60)
+        expected_result = IdempotencyRecord(
+            fingerprint=fingerprint, response=idempotent_response
+        )
+
+        result = await in_memory_idempotency_store.reserve(key, fingerprint, 60)
+
+        assert result == expected_result
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_none_when_reserved_key_has_expired(
+        self,
+        in_memory_idempotency_store: InMemoryIdempotencyStore,
+        faker: Faker,
+    ) -> None:
+        key = faker.uuid4()
+        fingerprint = faker.sha256()
+        await in_memory_idempotency_store.reserve(key, fingerprint, 0)
+
+        result = await in_memory_idempotency_store.reserve(key, fingerprint, 60)
+
+        assert result is None
+
+
+class TestDatabaseIdempotencyStoreReserve(TestIdempotencyService):
+    @pytest.fixture
+    def database_idempotency_store(
+        self, db_service: DBService
+    ) -> DatabaseIdempotencyStore:
+        return DatabaseIdempotencyStore(db_service)
+
+    def test_should_define_a_method(
+        self,
+        database_idempotency_store: DatabaseIdempotencyStore,
+    ) -> None:
+        assert isinstance(database_idempotency_store.reserve, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_saved_record_when_key_is_reserved_again(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        database_idempotency_store: DatabaseIdempotencyStore,
+        idempotent_response: IdempotentResponse,
+        faker: Faker,
+    ) -> None:
+        key = faker.uuid4()
+        fingerprint = faker.sha256()
+        expected_result = IdempotencyRecord(
+            fingerprint=fingerprint, response=idempotent_response
+        )
+
+        first_result = await database_idempotency_store.reserve(key, fingerprint, 60)
+        second_result = await database_idempotency_store.reserve(key, fingerprint, 60)
+        await database_idempotency_store.save(key, idempotent_response, 60)
+        third_result = await database_idempotency_store.reserve(key, fingerprint, 60)
+
+        row_count = 1
+        assert (
+            await db_service.get_database_table_row_count("idempotency_keys")
+            == row_count
+        )
+        assert first_result is None
+        assert second_result == IdempotencyRecord(
+            fingerprint=fingerprint, response=None
+        )
+        assert third_result == expected_result
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_none_when_key_is_released(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        database_idempotency_store: DatabaseIdempotencyStore,
+        faker: Faker,
+    ) -> None:
+        key = faker.uuid4()
+        fingerprint = faker.sha256()
+        await database_idempotency_store.reserve(key, fingerprint, 60)
+        await database_idempotency_store.release(key)
+
+        result = await database_idempotency_store.reserve(key, fingerprint, 60)
+
+        assert result is None
+
+
+class TestConnectStore(TestIdempotencyService):
+    def test_should_define_a_method(
+        self,
+        idempotency_service: IdempotencyService,
+    ) -> None:
+        assert isinstance(idempotency_service.connect_store, types.MethodType) is True
+
+    def test_should_succeed_and_return_none_when_store_is_in_memory(
+        self,
+        idempotency_service: IdempotencyService,
+    ) -> None:
+        result = idempotency_service.connect_store("memory")
+
+        assert result is None
+        assert isinstance(idempotency_service.store, InMemoryIdempotencyStore) is True
+
+    def test_should_succeed_and_return_none_when_store_is_the_database(
+        self,
+        idempotency_service: IdempotencyService,
+    ) -> None:
+        result = idempotency_service.connect_store("database")
+
+        assert result is None
+        assert isinstance(idempotency_service.store, DatabaseIdempotencyStore) is True
+
+    def test_should_fail_and_raise_exception_when_store_is_unknown(
+        self,
+        idempotency_service: IdempotencyService,
+        faker: Faker,
+    ) -> None:
+        store_name = faker.word()
+        message = "An error occurred when connecting to idempotency store!"
+        server_error = ServerError(
+            message,
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            Detail(context=store_name, cause="Unknown idempotency store"),
+        )
+
+        with pytest.raises(ServerError) as exc_info:
+            idempotency_service.connect_store(store_name)
+
+        assert exc_info.value.message == server_error.message
+        assert exc_info.value.detail == server_error.detail
+        assert exc_info.value.status_code == server_error.status_code
+        assert exc_info.value.is_operational == server_error.is_operational
+
+
+class TestExecute(TestIdempotencyService):
+    def test_should_define_a_method(
+        self,
+        idempotency_service: IdempotencyService,
+    ) -> None:
+        assert isinstance(idempotency_service.execute, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_replay_response_without_running_operation_again(
+        self,
+        idempotency_service: IdempotencyService,
+        idempotent_response: IdempotentResponse,
+        mocker: MockerFixture,
+        faker: Faker,
+    ) -> None:
+        key = faker.uuid4()
+        payload = faker.json()
+        mocked_operation = mocker.AsyncMock(return_value=idempotent_response)
+
+        first_result = await idempotency_service.execute(key, payload, mocked_operation)
+        second_result = await idempotency_service.execute(
+            key, payload, mocked_operation
+        )
+
+        assert first_result == idempotent_response
+        assert second_result == idempotent_response.model_copy(
+            update={"replayed": True}
+        )
+        mocked_operation.assert_called_once_with()
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_run_operation_once_when_duplicates_are_concurrent(
+        self,
+        idempotency_service: IdempotencyService,
+        idempotent_response: IdempotentResponse,
+        mocker: MockerFixture,
+        faker: Faker,
+    ) -> None:
+        key = faker.uuid4()
+        payload = faker.json()
+
+        async def operation() -> IdempotentResponse:
+            await asyncio.sleep(0.01)
+            return idempotent_response
+
+        mocked_operation = mocker.AsyncMock(side_effect=operation)
+
+        results = await asyncio.gather(
+            *(
+                idempotency_service.execute(key, payload, mocked_operation)
+                for _ in range(3)
+            )
+        )
+
+        assert [result.replayed for result in results] == [False, True, True]
+        mocked_operation.assert_called_once_with()
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_run_operation_again_when_it_has_failed(
+        self,
+        idempotency_service: IdempotencyService,
+        idempotent_response: IdempotentResponse,
+        mocker: MockerFixture,
+        faker: Faker,
+    ) -> None:
+        key = faker.uuid4()
+        payload = faker.json()
+        mocked_operation = mocker.AsyncMock(
+            side_effect=[Exception("Failed"), idempotent_response]
+        )
+
+        with pytest.raises(Exception):
+            await idempotency_service.execute(key, payload, mocked_operation)
+        result = await idempotency_service.execute(key, payload, mocked_operation)
+
+        assert result == idempotent_response
+        assert mocked_operation.call_count == 2
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_fail_and_raise_exception_when_key_is_reused_with_a_different_payload(
+        self,
+        idempotency_service: IdempotencyService,
+        idempotent_response: IdempotentResponse,
+        mocker: MockerFixture,
+        faker: Faker,
+    ) -> None:
+        key = faker.uuid4()
+        mocked_operation = mocker.AsyncMock(return_value=idempotent_response)
+        message = "Idempotency key has been used with a different request"
+        server_error = ServerError(
+            message,
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            Detail(context=key, cause=None),
+        )
+        await idempotency_service.execute(key, faker.json(), mocked_operation)
+
+        with pytest.raises(ServerError) as exc_info:
+            await idempotency_service.execute(key, faker.json(), mocked_operation)
+
+        assert exc_info.value.message == server_error.message
+        assert exc_info.value.detail == server_error.detail
+        assert exc_info.value.status_code == server_error.status_code
+        assert exc_info.value.is_operational == server_error.is_operational
+        mocked_operation.assert_called_once_with()
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_run_operation_when_store_fails(
+        self,
+        idempotency_service: IdempotencyService,
+        idempotent_response: IdempotentResponse,
+        mocker: MockerFixture,
+        faker: Faker,
+    ) -> None:
+        key = faker.uuid4()
+        idempotency_service.store.reserve = mocker.AsyncMock(
+            side_effect=Exception("Failed")
+        )
+        mocked_operation = mocker.AsyncMock(return_value=idempotent_response)
+
+        result = await idempotency_service.execute(key, faker.json(), mocked_operation)
+
+        assert result == idempotent_response
+        mocked_operation.assert_called_once_with()
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_run_operation_again_when_it_has_been_cancelled(
+        self,
+        idempotency_service: IdempotencyService,
+        idempotent_response: IdempotentResponse,
+        mocker: MockerFixture,
+        faker: Faker,
+    ) -> None:
+        key = faker.uuid4()
+        payload = faker.json()
+        mocked_operation = mocker.AsyncMock(
+            side_effect=[asyncio.CancelledError(), idempotent_response]
+        )
+
+        with pytest.raises(asyncio.CancelledError):
+            await idempotency_service.execute(key, payload, mocked_operation)
+        result = await idempotency_service.execute(key, payload, mocked_operation)
+
+        assert result == idempotent_response
+        assert mocked_operation.call_count == 2
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_run_operation_again_when_response_cannot_be_saved(
+        self,
+        idempotency_service: IdempotencyService,
+        idempotent_response: IdempotentResponse,
+        mocker: MockerFixture,
+        faker: Faker,
+    ) -> None:
+        key = faker.uuid4()
+        payload = faker.json()
+        idempotency_service.store.save = mocker.AsyncMock(
+            side_effect=[Exception("Failed"), None]
+        )
+        mocked_operation = mocker.AsyncMock(return_value=idempotent_response)
+
+        await idempotency_service.execute(key, payload, mocked_operation)
+        result = await idempotency_service.execute(key, payload, mocked_operation)
+
+        assert result == idempotent_response
+        assert result.replayed is False
+        assert mocked_operation.call_count == 2
@@ -0,0 +1,275 @@
+import types
+
+import pytest
+from faker import Faker
+from fastapi import status
+from pytest_mock import MockerFixture
+
+from server_error import Detail, ServerError
+from services.db_service import DBService
+from services.rate_limit_service import (
+    DatabaseRateLimitStore,
+    InMemoryRateLimitStore,
+    RateLimit,
+    RateLimitResult,
+    RateLimitService,
+)
+
+
+class TestRateLimitService:
+    @pytest.fixture
+    def rate_limit(self) -> RateLimit:
+        return RateLimit(capacity=2, refill_rate=0.5)
+
+    @pytest.fixture
+    def rate_limit_service(self, db_service: DBService) -> RateLimitService:
+        return RateLimitService(db_service)
+
+
+class TestInMemoryRateLimitStoreConsume(TestRateLimitService):
+    @pytest.fixture
+    def in_memory_rate_limit_store(self) -> InMemoryRateLimitStore:
+        return InMemoryRateLimitStore()
+
+    def test_should_define_a_method(
+        self,
+        in_memory_rate_limit_store: InMemoryRateLimitStore,
+    ) -> None:
+        assert isinstance(in_memory_rate_limit_store.consume, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_allowed_result_while_bucket_has_tokens(
+        self,
+        in_memory_rate_limit_store: InMemoryRateLimitStore,
+        rate_limit: RateLimit,
+        faker: Faker,
+    ) -> None:
+        key = faker.ipv4()
+
+        first_result = await in_memory_rate_limit_store.consume(key, rate_limit)
+        second_result = await in_memory_rate_limit_store.consume(key, rate_limit)
+
+        assert first_result.allowed is True
+        assert first_result.limit == rate_limit.capacity
+        assert first_result.remaining == 1
+        assert second_result.allowed is True
+        assert second_result.remaining == 0
+        assert second_result.retry_after == 0
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_rejected_result_when_bucket_is_empty(
+        self,
+        in_memory_rate_limit_store: InMemoryRateLimitStore,
+        rate_limit: RateLimit,
+        faker: Faker,
+    ) -> None:
+        key = faker.ipv4()
+        for _ in range(rate_limit.capacity):
+            await in_memory_rate_limit_store.consume(key, rate_limit)
+
+        result = await in_memory_rate_limit_store.consume(key, rate_limit)
+
+        assert result.allowed is False
+        assert result.remaining == 0
+        assert result.retry_after == 2
+        assert result.reset_after == 4
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_keep_buckets_of_different_keys_apart(
+        self,
+        in_memory_rate_limit_store: InMemoryRateLimitStore,
+        rate_limit: RateLimit,
+        faker: Faker,
+    ) -> None:
+        key = faker.ipv4()
+        other_key = faker.ipv6()
+        for _ in range(rate_limit.capacity):
+            await in_memory_rate_limit_store.consume(key, rate_limit)
+
+        result = await in_memory_rate_limit_store.consume(other_key, rate_limit)
+
+        assert result.allowed is True
+        assert result.remaining == rate_limit.capacity - 1
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_evict_least_recently_used_bucket_when_max_keys_is_exceeded(
+        self,
+        rate_limit: RateLimit,
+        faker: Faker,
+    ) -> None:
+        in_memory_rate_limit_store = InMemoryRateLimitStore(max_keys=1)
+        key = faker.ipv4()
+        other_key = faker.ipv6()
+        for _ in range(rate_limit.capacity):
+            await in_memory_rate_limit_store.consume(key, rate_limit)
+        await in_memory_rate_limit_store.consume(other_key, rate_limit)
+
+        result = await in_memory_rate_limit_store.consume(key, rate_limit)
+
+        assert result.allowed is True
+        assert result.remaining == rate_limit.capacity - 1
+
+
+class TestDatabaseRateLimitStoreConsume(TestRateLimitService):
+    @pytest.fixture
+    def database_rate_limit_store(
+        self, db_service: DBService
+    ) -> DatabaseRateLimitStore:
+        return DatabaseRateLimitStore(db_service)
+
+    def test_should_define_a_method(
+        self,
+        database_rate_limit_store: DatabaseRateLimitStore,
+    ) -> None:
+        assert isinstance(database_rate_limit_store.consume, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_allowed_result_while_bucket_has_tokens(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        database_rate_limit_store: DatabaseRateLimitStore,
+        rate_limit: RateLimit,
+        faker: Faker,
+    ) -> None:
+        key = faker.ipv4()
+
+        first_result = await database_rate_limit_store.consume(key, rate_limit)
+        second_result = await database_rate_limit_store.consume(key, rate_limit)
+
+        row_count = 1
+        assert (
+            await db_service.get_database_table_row_count("rate_limit_buckets")
+            == row_count
+        )
+        assert first_result.allowed is True
+        assert first_result.limit == rate_limit.capacity
+        assert first_result.remaining == 1
+        assert second_result.allowed is True
+        assert second_result.remaining == 0
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_rejected_result_when_bucket_is_empty(
+        self,
+        db_service: DBService,
+        initialize_database: None,
+        clear_database_tables: None,
+        database_rate_limit_store: DatabaseRateLimitStore,
+        rate_limit: RateLimit,
+        faker: Faker,
+    ) -> None:
+        key = faker.ipv4()
+        for _ in range(rate_limit.capacity):
+            await database_rate_limit_store.consume(key, rate_limit)
+
+        result = await database_rate_limit_store.consume(key, rate_limit)
+
+        assert result.allowed is False
+        assert result.remaining == 0
+        assert result.retry_after == 2
+        assert result.reset_after == 4
+
+
+class TestConnectStore(TestRateLimitService):
+    def test_should_define_a_method(
+        self,
+        rate_limit_service: RateLimitService,
+    ) -> None:
+        assert isinstance(rate_limit_service.connect_store, types.MethodType) is True
+
+    def test_should_succeed_and_return_none_when_store_is_in_memory(
+        self,
+        rate_limit_service: RateLimitService,
+    ) -> None:
+        result = rate_limit_service.connect_store("memory")
+
+        assert result is None
+        assert isinstance(rate_limit_service.store, InMemoryRateLimitStore) is True
+
+    def test_should_succeed_and_return_none_when_store_is_the_database(
+        self,
+        rate_limit_service: RateLimitService,
+    ) -> None:
+        result = rate_limit_service.connect_store("database")
+
+        assert result is None
+        assert isinstance(rate_limit_service.store, DatabaseRateLimitStore) is True
+
+    def test_should_fail_and_raise_exception_when_store_is_unknown(
+        self,
+        rate_limit_service: RateLimitService,
+        faker: Faker,
+    ) -> None:
+        store_name = faker.word()
+        message = "An error occurred when connecting to rate limit store!"
+        server_error = ServerError(
+            message,
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            Detail(context=store_name, cause="Unknown rate limit store"),
+        )
+
+        with pytest.raises(ServerError) as exc_info:
+            rate_limit_service.connect_store(store_name)
+
+        assert exc_info.value.message == server_error.message
+        assert exc_info.value.detail == server_error.detail
+        assert exc_info.value.status_code == server_error.status_code
+        assert exc_info.value.is_operational == server_error.is_operational
+
+
+class TestHit(TestRateLimitService):
+    def test_should_define_a_method(
+        self,
+        rate_limit_service: RateLimitService,
+    ) -> None:
+        assert isinstance(rate_limit_service.hit, types.MethodType) is True
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_result_of_the_store(
+        self,
+        rate_limit_service: RateLimitService,
+        rate_limit: RateLimit,
+        mocker: MockerFixture,
+        faker: Faker,
+    ) -> None:
+        key = faker.ipv4()
+        rate_limit_result = RateLimitResult(
+            allowed=False,
+            limit=rate_limit.capacity,
+            remaining=0,
+            reset_after=4,
+            retry_after=2,
+        )
+        mocked_consume = mocker.AsyncMock(return_value=rate_limit_result)
+        rate_limit_service.store.consume = mocked_consume
+        expected_result = rate_limit_result
+
+        result = await rate_limit_service.hit(key, rate_limit)
+
+        assert result == expected_result
+        rate_limit_service.store.consume.assert_called_once_with(key, rate_limit)
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_should_succeed_and_return_allowed_result_when_store_fails(
+        self,
+        rate_limit_service: RateLimitService,
+        rate_limit: RateLimit,
+        mocker: MockerFixture,
+        faker: Faker,
+    ) -> None:
+        key = faker.ipv4()
+        mocked_consume = mocker.AsyncMock(side_effect=Exception("Failed"))
+        rate_limit_service.store.consume = mocked_consume
+        expected_result = RateLimitResult(
+            allowed=True,
+            limit=rate_limit.capacity,
+            remaining=rate_limit.capacity,
+            reset_after=0,
+            retry_after=0,
+        )
+
+        result = await rate_limit_service.hit(key, rate_limit)
+
+        assert result == expected_result
+        rate_limit_service.store.consume.assert_called_once_with(key, rate_limit)